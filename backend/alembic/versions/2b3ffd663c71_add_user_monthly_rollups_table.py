@@ -0,0 +1,63 @@
+"""add_user_monthly_rollups_table
+
+Revision ID: 2b3ffd663c71
+Revises: e8f434d7c412
+Create Date: 2025-06-23 10:12:45.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b3ffd663c71'
+down_revision: Union[str, None] = 'e8f434d7c412'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 月次集計テーブルを作成
+    op.create_table('user_monthly_rollups',
+        sa.Column('user_id', sa.dialects.postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('month', sa.SmallInteger(), nullable=False),
+        sa.Column('category_id', sa.dialects.postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('transaction_type', sa.String(length=10), nullable=False),
+        sa.Column('sharing_type', sa.String(length=10), nullable=False),
+        sa.Column('total_amount', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('transaction_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('love_rating_sum', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('love_rating_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'year', 'month', 'category_id', 'transaction_type', 'sharing_type')
+    )
+
+    # 既存の取引から集計値を作成
+    op.execute("""
+        INSERT INTO user_monthly_rollups (
+            user_id, year, month, category_id, transaction_type, sharing_type,
+            total_amount, transaction_count, love_rating_sum, love_rating_count
+        )
+        SELECT
+            user_id,
+            EXTRACT(YEAR FROM transaction_date)::int,
+            EXTRACT(MONTH FROM transaction_date)::int,
+            category_id,
+            transaction_type,
+            sharing_type,
+            SUM(amount),
+            COUNT(*),
+            COALESCE(SUM(love_rating), 0),
+            COUNT(love_rating)
+        FROM transactions
+        GROUP BY 1, 2, 3, 4, 5, 6
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('user_monthly_rollups')
@@ -0,0 +1,68 @@
+"""add_hot_query_composite_indexes
+
+Revision ID: 5fb4bf7918e7
+Revises: 2b3ffd663c71
+Create Date: 2025-06-24 09:41:27.583116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5fb4bf7918e7'
+down_revision: Union[str, None] = '2b3ffd663c71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 取引: 期間指定の集計・一覧（ダッシュボード、レポート、最近の取引）
+    op.create_index(
+        'ix_transactions_user_date_created',
+        'transactions',
+        ['user_id', sa.text('transaction_date DESC'), sa.text('created_at DESC')],
+        postgresql_include=['amount', 'transaction_type', 'category_id']
+    )
+    # 取引: カテゴリ別の期間集計（予算の進捗、Love Goal）
+    op.create_index(
+        'ix_transactions_user_category_date',
+        'transactions',
+        ['user_id', 'category_id', 'transaction_date'],
+        postgresql_include=['amount', 'transaction_type']
+    )
+
+    # 予算: ユーザーの有効な予算
+    op.create_index('ix_budgets_user_active', 'budgets', ['user_id', 'is_active', 'category_id'])
+
+    # 通知: 一覧（新しい順）と未読通知
+    op.create_index(
+        'ix_notifications_user_created',
+        'notifications',
+        ['user_id', sa.text('created_at DESC')]
+    )
+    op.create_index(
+        'ix_notifications_user_unread',
+        'notifications',
+        ['user_id', 'type'],
+        postgresql_include=['expires_at'],
+        postgresql_where=sa.text('is_read = false')
+    )
+
+    # Loveイベント: パートナーシップの有効なイベント（日付順）
+    op.create_index(
+        'ix_love_events_partnership_active_date',
+        'love_events',
+        ['partnership_id', 'is_active', 'event_date']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_love_events_partnership_active_date', table_name='love_events')
+    op.drop_index('ix_notifications_user_unread', table_name='notifications')
+    op.drop_index('ix_notifications_user_created', table_name='notifications')
+    op.drop_index('ix_budgets_user_active', table_name='budgets')
+    op.drop_index('ix_transactions_user_category_date', table_name='transactions')
+    op.drop_index('ix_transactions_user_date_created', table_name='transactions')
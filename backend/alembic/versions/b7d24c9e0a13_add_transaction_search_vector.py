@@ -0,0 +1,118 @@
+"""add_transaction_search_vector
+
+Revision ID: b7d24c9e0a13
+Revises: e1beaf6f5388
+Create Date: 2026-10-18 11:02:31.518742
+
+"""
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d24c9e0a13'
+down_revision: Union[str, None] = 'e1beaf6f5388'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+# このリビジョン時点の app.utils.text_search の tsvector の作成処理の複製
+# （アプリケーション側の分割方法を変更しても、このマイグレーションが書き込む値は変わらない）
+WORD_START = "^"
+WORD_END = "$"
+TAG_PREFIX = "#"
+MAX_POSITION = 16383
+MAX_POSITIONS_PER_LEXEME = 256
+DESCRIPTION_WEIGHT = "A"
+LOCATION_WEIGHT = "B"
+TAG_WEIGHT = "C"
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def _word_bigrams(word: str) -> List[str]:
+    padded = WORD_START + word + WORD_END
+    return [padded[index:index + 2] for index in range(len(padded) - 1)]
+
+
+def _document_lexemes(
+    description: Optional[str],
+    location: Optional[str],
+    tags: Optional[Sequence[str]]
+) -> Dict[str, List[Tuple[int, str]]]:
+    lexemes: Dict[str, List[Tuple[int, str]]] = {}
+    position = 1
+    fields = [(description, DESCRIPTION_WEIGHT), (location, LOCATION_WEIGHT)]
+    fields.extend((tag, TAG_WEIGHT) for tag in tags or ())
+    for text, weight in fields:
+        for word in _normalize(text or "").split():
+            for bigram in _word_bigrams(word):
+                lexemes.setdefault(bigram, []).append((min(position, MAX_POSITION), weight))
+                position += 1
+    for tag in tags or ():
+        lexemes.setdefault(TAG_PREFIX + _normalize(tag), []).append((min(position, MAX_POSITION), TAG_WEIGHT))
+        position += 1
+    return lexemes
+
+
+def _quote(lexeme: str) -> str:
+    return "'" + lexeme.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def build_search_vector(
+    description: Optional[str],
+    location: Optional[str],
+    tags: Optional[Sequence[str]]
+) -> str:
+    return " ".join(
+        _quote(lexeme) + ":" + ",".join(
+            f"{position}{weight}" for position, weight in positions[:MAX_POSITIONS_PER_LEXEME]
+        )
+        for lexeme, positions in _document_lexemes(description, location, tags).items()
+    )
+
+
+def upgrade() -> None:
+    # 説明・場所・タグの検索（ILIKE '%...%' の順次スキャンの代わりにバイグラムのGINインデックスを使う）
+    op.add_column('transactions', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # 既存の取引の検索用の列を作成（バイグラムへの分割は上の複製で行う）
+    connection = op.get_bind()
+    last_id = None
+    while True:
+        rows = connection.execute(sa.text("""
+            SELECT id, description, location, tags FROM transactions
+            WHERE CAST(:last_id AS uuid) IS NULL OR id > CAST(:last_id AS uuid)
+            ORDER BY id
+            LIMIT :batch_size
+        """), {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE}).all()
+        if not rows:
+            break
+        connection.execute(
+            sa.text("UPDATE transactions SET search_vector = CAST(:search_vector AS tsvector) WHERE id = :id"),
+            [
+                {"id": row.id, "search_vector": build_search_vector(row.description, row.location, row.tags)}
+                for row in rows
+            ]
+        )
+        last_id = rows[-1].id
+
+    op.create_index(
+        'ix_transactions_search_vector',
+        'transactions',
+        ['search_vector'],
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_search_vector', table_name='transactions')
+    op.drop_column('transactions', 'search_vector')
@@ -0,0 +1,39 @@
+"""add_id_to_transaction_list_index
+
+Revision ID: e1beaf6f5388
+Revises: 5fb4bf7918e7
+Create Date: 2026-10-18 10:12:45.271903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1beaf6f5388'
+down_revision: Union[str, None] = '5fb4bf7918e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 取引一覧のキーセットページネーション: (transaction_date, created_at, id) の行値比較で範囲検索する
+    op.drop_index('ix_transactions_user_date_created', table_name='transactions')
+    op.create_index(
+        'ix_transactions_user_date_created',
+        'transactions',
+        ['user_id', sa.text('transaction_date DESC'), sa.text('created_at DESC'), sa.text('id DESC')],
+        postgresql_include=['amount', 'transaction_type', 'category_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_user_date_created', table_name='transactions')
+    op.create_index(
+        'ix_transactions_user_date_created',
+        'transactions',
+        ['user_id', sa.text('transaction_date DESC'), sa.text('created_at DESC')],
+        postgresql_include=['amount', 'transaction_type', 'category_id']
+    )
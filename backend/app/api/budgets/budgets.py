@@ -1,8 +1,8 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, extract
-from datetime import date, datetime
+from sqlalchemy import and_, or_, extract
+from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 
@@ -15,62 +15,14 @@ from app.schemas.budget import (
     BudgetSummary
 )
 from app.api.partnerships.partnerships import get_user_partnership
+from app.services.budget_progress import calculate_budgets_progress
 
 router = APIRouter()
 
 
 def calculate_budget_progress(db: Session, budget: models.Budget, user_id: UUID) -> dict:
     """予算の進捗を計算"""
-    # 現在の日付
-    today = date.today()
-    
-    # 予算期間の計算
-    if budget.period == 'monthly':
-        start_date = date(today.year, today.month, 1)
-        if today.month == 12:
-            end_date = date(today.year + 1, 1, 1)
-        else:
-            end_date = date(today.year, today.month + 1, 1)
-    elif budget.period == 'yearly':
-        start_date = date(today.year, 1, 1)
-        end_date = date(today.year + 1, 1, 1)
-    else:  # custom
-        start_date = budget.start_date
-        end_date = budget.end_date or today
-    
-    # 期間内の支出を計算
-    query = db.query(func.coalesce(func.sum(models.Transaction.amount), 0)).filter(
-        models.Transaction.user_id == user_id,
-        models.Transaction.transaction_type == 'expense',
-        models.Transaction.transaction_date >= start_date,
-        models.Transaction.transaction_date < end_date
-    )
-    
-    # カテゴリ予算の場合
-    if budget.category_id:
-        query = query.filter(models.Transaction.category_id == budget.category_id)
-    
-    spent_amount = Decimal(str(query.scalar()))
-    
-    # 進捗計算
-    remaining_amount = budget.amount - spent_amount
-    usage_percentage = (spent_amount / budget.amount * 100) if budget.amount > 0 else Decimal('0')
-    
-    # 残り日数
-    days_remaining = (end_date - today).days if end_date > today else 0
-    
-    # アラート判定
-    is_over_budget = spent_amount > budget.amount
-    is_alert_threshold_reached = usage_percentage >= budget.alert_threshold
-    
-    return {
-        "spent_amount": float(spent_amount),
-        "remaining_amount": float(remaining_amount),
-        "usage_percentage": float(usage_percentage),
-        "days_remaining": days_remaining,
-        "is_over_budget": is_over_budget,
-        "is_alert_threshold_reached": is_alert_threshold_reached
-    }
+    return calculate_budgets_progress(db, [budget], user_id)[budget.id]
 
 
 @router.get("/", response_model=List[BudgetWithProgress])
@@ -100,6 +52,9 @@ def get_budgets(
     
     budgets = query.order_by(models.Budget.created_at.desc()).all()
     
+    # 進捗情報をまとめて計算
+    progress_by_budget = calculate_budgets_progress(db, budgets, current_user.id)
+    
     # 進捗情報を追加
     result = []
     for budget in budgets:
@@ -120,9 +75,7 @@ def get_budgets(
             "updated_at": budget.updated_at
         }
         
-        # 進捗情報を計算
-        progress = calculate_budget_progress(db, budget, current_user.id)
-        budget_dict.update(progress)
+        budget_dict.update(progress_by_budget[budget.id])
         
         result.append(budget_dict)
     
@@ -149,9 +102,10 @@ def get_budget_summary(
     over_budget_count = 0
     alert_count = 0
     
+    progress_by_budget = calculate_budgets_progress(db, active_budgets, current_user.id)
     for budget in active_budgets:
         total_budget += budget.amount
-        progress = calculate_budget_progress(db, budget, current_user.id)
+        progress = progress_by_budget[budget.id]
         total_spent += Decimal(str(progress["spent_amount"]))
         
         if progress["is_over_budget"]:
@@ -188,6 +142,9 @@ def get_love_budgets(
         models.Budget.is_active == True
     ).all()
     
+    # 進捗情報をまとめて計算
+    progress_by_budget = calculate_budgets_progress(db, budgets, current_user.id)
+    
     # 進捗情報を追加
     result = []
     for budget in budgets:
@@ -208,8 +165,7 @@ def get_love_budgets(
             "updated_at": budget.updated_at
         }
         
-        progress = calculate_budget_progress(db, budget, current_user.id)
-        budget_dict.update(progress)
+        budget_dict.update(progress_by_budget[budget.id])
         
         result.append(budget_dict)
     
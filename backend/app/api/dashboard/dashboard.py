@@ -1,10 +1,11 @@
 from datetime import datetime, timedelta, date
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, extract, or_
 
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_current_user_async, get_read_db
 from app import models, schemas
 from app.schemas.dashboard import (
     DashboardSummary,
@@ -12,203 +13,66 @@ from app.schemas.dashboard import (
     LoveStatistics,
     BudgetProgress
 )
+from app.services.dashboard_summary import build_dashboard_summary
+from app.services.monthly_rollup import month_range_filter
+from app.services.time_series import build_cash_flow_series
 
 router = APIRouter()
 
 
 @router.get("/summary")
-def get_dashboard_summary(
+async def get_dashboard_summary(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user_async)
 ) -> Any:
     """
     Get dashboard summary including monthly stats, category breakdown, and recent transactions.
     """
-    now = datetime.now()
-    current_month_start = datetime(now.year, now.month, 1)
-    
-    # Calculate previous month
-    if now.month == 1:
-        prev_month_start = datetime(now.year - 1, 12, 1)
-        prev_month_end = datetime(now.year, 1, 1) - timedelta(seconds=1)
-    else:
-        prev_month_start = datetime(now.year, now.month - 1, 1)
-        prev_month_end = current_month_start - timedelta(seconds=1)
-    
-    # Current month stats
-    current_month_stats = db.query(
-        func.sum(models.Transaction.amount).filter(
-            models.Transaction.transaction_type == 'income'
-        ).label('income'),
-        func.sum(models.Transaction.amount).filter(
-            models.Transaction.transaction_type == 'expense'
-        ).label('expense')
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_date >= current_month_start,
-        models.Transaction.transaction_date < datetime.now() + timedelta(days=1)
-    ).first()
-    
-    # Previous month stats
-    prev_month_stats = db.query(
-        func.sum(models.Transaction.amount).filter(
-            models.Transaction.transaction_type == 'income'
-        ).label('income'),
-        func.sum(models.Transaction.amount).filter(
-            models.Transaction.transaction_type == 'expense'
-        ).label('expense')
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_date >= prev_month_start,
-        models.Transaction.transaction_date <= prev_month_end
-    ).first()
-    
-    # Category breakdown for current month
-    category_stats = db.query(
-        models.Category,
-        func.sum(models.Transaction.amount).label('amount'),
-        func.count(models.Transaction.id).label('transaction_count')
-    ).join(
-        models.Transaction, models.Transaction.category_id == models.Category.id
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_date >= current_month_start,
-        models.Transaction.transaction_type == 'expense'
-    ).group_by(models.Category.id).all()
-    
-    # Calculate total expense for percentage
-    total_expense = sum(stat[1] or 0 for stat in category_stats)
-    
-    # Format category stats
-    categories = []
-    for category, amount, count in category_stats:
-        categories.append({
-            "category": {
-                "id": str(category.id),
-                "name": category.name,
-                "icon": category.icon,
-                "color": category.color,
-                "is_default": category.is_default,
-                "is_love_category": category.is_love_category
-            },
-            "amount": float(amount or 0),
-            "percentage": float((amount or 0) / total_expense * 100) if total_expense > 0 else 0,
-            "transaction_count": count
-        })
-    
-    # Recent transactions
-    recent_transactions_query = db.query(models.Transaction).filter(
-        models.Transaction.user_id == current_user.id
-    ).order_by(
-        models.Transaction.transaction_date.desc(),
-        models.Transaction.created_at.desc()
-    ).limit(10).all()
-    
-    # Format transactions
-    recent_transactions = []
-    for transaction in recent_transactions_query:
-        category = db.query(models.Category).filter(
-            models.Category.id == transaction.category_id
-        ).first()
-        
-        recent_transactions.append({
-            "id": str(transaction.id),
-            "amount": float(transaction.amount),
-            "transaction_type": transaction.transaction_type,
-            "sharing_type": transaction.sharing_type,
-            "payment_method": transaction.payment_method,
-            "description": transaction.description,
-            "transaction_date": transaction.transaction_date.isoformat(),
-            "category": {
-                "id": str(category.id),
-                "name": category.name,
-                "icon": category.icon,
-                "color": category.color,
-                "is_love_category": category.is_love_category
-            } if category else None,
-            "love_rating": transaction.love_rating,
-            "created_at": transaction.created_at.isoformat()
-        })
-    
-    # Love stats
-    love_categories = db.query(models.Category).filter(
-        models.Category.is_love_category == True
-    ).all()
-    love_category_ids = [cat.id for cat in love_categories]
-    
-    love_stats = db.query(
-        func.sum(models.Transaction.amount).label('love_spending'),
-        func.count(models.Transaction.id).label('love_transactions'),
-        func.avg(models.Transaction.love_rating).label('average_love_rating')
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.category_id.in_(love_category_ids),
-        models.Transaction.transaction_date >= current_month_start
-    ).first()
-    
-    return {
-        "current_month": {
-            "income": float(current_month_stats.income or 0),
-            "expense": float(current_month_stats.expense or 0),
-            "balance": float((current_month_stats.income or 0) - (current_month_stats.expense or 0))
-        },
-        "previous_month": {
-            "income": float(prev_month_stats.income or 0),
-            "expense": float(prev_month_stats.expense or 0),
-            "balance": float((prev_month_stats.income or 0) - (prev_month_stats.expense or 0))
-        },
-        "categories": categories,
-        "recent_transactions": recent_transactions,
-        "love_stats": {
-            "love_spending": float(love_stats.love_spending or 0) if love_stats else 0,
-            "love_transactions": int(love_stats.love_transactions or 0) if love_stats else 0,
-            "average_love_rating": float(love_stats.average_love_rating or 0) if love_stats else 0
-        }
-    }
+    return await db.run_sync(build_dashboard_summary, current_user.id)
 
 
 @router.get("/monthly-stats")
-def get_monthly_stats(
+async def get_monthly_stats(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user_async),
     year: int,
     month: int
 ) -> Any:
     """
     Get detailed stats for a specific month.
     """
+    return await db.run_sync(
+        _get_monthly_stats,
+        current_user=current_user,
+        year=year,
+        month=month
+    )
+
+
+def _get_monthly_stats(db: Session, *, current_user: models.User, year: int, month: int) -> Any:
     if month < 1 or month > 12:
         raise HTTPException(status_code=400, detail="Invalid month")
     
-    month_start = datetime(year, month, 1)
-    if month == 12:
-        month_end = datetime(year + 1, 1, 1) - timedelta(seconds=1)
-    else:
-        month_end = datetime(year, month + 1, 1) - timedelta(seconds=1)
-    
-    # Daily stats for the month
-    daily_stats = db.query(
-        models.Transaction.transaction_date,
-        models.Transaction.transaction_type,
-        func.sum(models.Transaction.amount).label('amount')
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_date >= month_start,
-        models.Transaction.transaction_date <= month_end
-    ).group_by(
-        models.Transaction.transaction_date,
-        models.Transaction.transaction_type
-    ).all()
-    
-    # Process daily stats
-    daily_data = {}
-    for date, trans_type, amount in daily_stats:
-        date_str = date.strftime('%Y-%m-%d')
-        if date_str not in daily_data:
-            daily_data[date_str] = {'income': 0, 'expense': 0}
-        daily_data[date_str][trans_type] = float(amount)
+    month_start = date(year, month, 1)
+    next_month_start = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    
+    # Daily stats for the month (days without transactions are zero)
+    daily_series = build_cash_flow_series(
+        db,
+        db.query(models.Transaction).filter(models.Transaction.user_id == current_user.id),
+        month_start,
+        next_month_start,
+        'daily'
+    )
+    daily_data = {
+        point['period_start'].strftime('%Y-%m-%d'): {
+            'income': float(point['income']),
+            'expense': float(point['expense'])
+        }
+        for point in daily_series
+    }
     
     return {
         "year": year,
@@ -218,15 +82,23 @@ def get_monthly_stats(
 
 
 @router.get("/category-stats")
-def get_category_stats(
+async def get_category_stats(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user_async),
     period: str = 'month'
 ) -> Any:
     """
     Get category statistics for specified period.
     """
+    return await db.run_sync(
+        _get_category_stats,
+        current_user=current_user,
+        period=period
+    )
+
+
+def _get_category_stats(db: Session, *, current_user: models.User, period: str = 'month') -> Any:
     now = datetime.now()
     
     if period == 'month':
@@ -282,11 +154,19 @@ def get_category_stats(
 async def get_monthly_summary(
     year: int = Query(..., description="Year"),
     month: int = Query(..., ge=1, le=12, description="Month"),
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: models.User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get monthly dashboard summary"""
-    
+    return await db.run_sync(
+        _get_monthly_summary,
+        year=year,
+        month=month,
+        current_user=current_user
+    )
+
+
+def _get_monthly_summary(db: Session, *, year: int, month: int, current_user: models.User):
     # Current month data
     current_month_start = date(year, month, 1)
     if month == 12:
@@ -297,72 +177,69 @@ async def get_monthly_summary(
     # Previous month for comparison
     if month == 1:
         prev_month_start = date(year - 1, 12, 1)
-        prev_month_end = date(year - 1, 12, 31)
     else:
         prev_month_start = date(year, month - 1, 1)
-        prev_month_end = current_month_start - timedelta(days=1)
-    
-    # Current month query
-    current_month_query = db.query(
-        func.sum(models.Transaction.amount).filter(models.Transaction.transaction_type == 'income').label('total_income'),
-        func.sum(models.Transaction.amount).filter(models.Transaction.transaction_type == 'expense').label('total_expense'),
-        func.sum(models.Transaction.amount).filter(
-            and_(models.Transaction.transaction_type == 'expense', models.Transaction.sharing_type == 'personal')
+    
+    # Current and previous month totals from the monthly rollups
+    rollup = models.UserMonthlyRollup
+    is_current = and_(rollup.year == year, rollup.month == month)
+    is_previous = ~is_current
+    is_income = rollup.transaction_type == 'income'
+    is_expense = rollup.transaction_type == 'expense'
+    
+    stats = db.query(
+        func.sum(rollup.total_amount).filter(and_(is_current, is_income)).label('total_income'),
+        func.sum(rollup.total_amount).filter(and_(is_current, is_expense)).label('total_expense'),
+        func.sum(rollup.total_amount).filter(
+            and_(is_current, is_expense, rollup.sharing_type == 'personal')
         ).label('personal_expense'),
-        func.sum(models.Transaction.amount).filter(
-            and_(models.Transaction.transaction_type == 'expense', models.Transaction.sharing_type == 'shared')
+        func.sum(rollup.total_amount).filter(
+            and_(is_current, is_expense, rollup.sharing_type == 'shared')
         ).label('shared_expense'),
-        func.count(models.Transaction.id).label('transaction_count'),
-        func.avg(models.Transaction.love_rating).label('avg_love_rating')
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_date >= current_month_start,
-        models.Transaction.transaction_date <= current_month_end
-    ).first()
-    
-    # Previous month query for comparison
-    prev_month_query = db.query(
-        func.sum(models.Transaction.amount).filter(models.Transaction.transaction_type == 'income').label('prev_income'),
-        func.sum(models.Transaction.amount).filter(models.Transaction.transaction_type == 'expense').label('prev_expense')
+        func.sum(rollup.total_amount).filter(
+            and_(is_current, is_expense, models.Category.is_love_category == True)
+        ).label('love_expense'),
+        func.sum(rollup.transaction_count).filter(is_current).label('transaction_count'),
+        func.sum(rollup.love_rating_sum).filter(is_current).label('love_rating_sum'),
+        func.sum(rollup.love_rating_count).filter(is_current).label('love_rating_count'),
+        func.sum(rollup.total_amount).filter(and_(is_previous, is_income)).label('prev_income'),
+        func.sum(rollup.total_amount).filter(and_(is_previous, is_expense)).label('prev_expense')
+    ).join(
+        models.Category, models.Category.id == rollup.category_id
     ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_date >= prev_month_start,
-        models.Transaction.transaction_date <= prev_month_end
-    ).first()
+        rollup.user_id == current_user.id,
+        *month_range_filter(prev_month_start, current_month_end + timedelta(days=1))
+    ).one()
     
-    # Love expense (categories marked as love categories)
-    love_expense = db.query(func.sum(models.Transaction.amount)).join(models.Category).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'expense',
-        models.Transaction.transaction_date >= current_month_start,
-        models.Transaction.transaction_date <= current_month_end,
-        models.Category.is_love_category == True
-    ).scalar() or 0
+    love_expense = stats.love_expense or 0
+    avg_love_rating = (
+        stats.love_rating_sum / stats.love_rating_count if stats.love_rating_count else 0
+    )
     
     # Calculate changes
     income_change = None
     expense_change = None
     
-    if prev_month_query.prev_income and prev_month_query.prev_income > 0:
+    if stats.prev_income and stats.prev_income > 0:
         income_change = round(
-            ((current_month_query.total_income or 0) - prev_month_query.prev_income) / prev_month_query.prev_income * 100,
+            ((stats.total_income or 0) - stats.prev_income) / stats.prev_income * 100,
             1
         )
     
-    if prev_month_query.prev_expense and prev_month_query.prev_expense > 0:
+    if stats.prev_expense and stats.prev_expense > 0:
         expense_change = round(
-            ((current_month_query.total_expense or 0) - prev_month_query.prev_expense) / prev_month_query.prev_expense * 100,
+            ((stats.total_expense or 0) - stats.prev_expense) / stats.prev_expense * 100,
             1
         )
     
     return DashboardSummary(
-        total_income=float(current_month_query.total_income or 0),
-        total_expense=float(current_month_query.total_expense or 0),
-        personal_expense=float(current_month_query.personal_expense or 0),
-        shared_expense=float(current_month_query.shared_expense or 0),
+        total_income=float(stats.total_income or 0),
+        total_expense=float(stats.total_expense or 0),
+        personal_expense=float(stats.personal_expense or 0),
+        shared_expense=float(stats.shared_expense or 0),
         love_expense=float(love_expense),
-        transaction_count=current_month_query.transaction_count or 0,
-        avg_love_rating=float(current_month_query.avg_love_rating or 0),
+        transaction_count=stats.transaction_count or 0,
+        avg_love_rating=float(avg_love_rating),
         income_change=income_change,
         expense_change=expense_change,
         month=f"{year}-{month:02d}",
@@ -374,36 +251,45 @@ async def get_monthly_summary(
 async def get_category_breakdown(
     year: int = Query(...),
     month: int = Query(..., ge=1, le=12),
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: models.User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get category breakdown for the month"""
-    
+    return await db.run_sync(
+        _get_category_breakdown,
+        year=year,
+        month=month,
+        current_user=current_user
+    )
+
+
+def _get_category_breakdown(db: Session, *, year: int, month: int, current_user: models.User):
     month_start = date(year, month, 1)
     if month == 12:
-        month_end = date(year + 1, 1, 1) - timedelta(days=1)
+        next_month_start = date(year + 1, 1, 1)
     else:
-        month_end = date(year, month + 1, 1) - timedelta(days=1)
-    
-    # Get total expenses for percentage calculation
-    total_expense = db.query(func.sum(models.Transaction.amount)).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'expense',
-        models.Transaction.transaction_date >= month_start,
-        models.Transaction.transaction_date <= month_end
-    ).scalar() or 0
+        next_month_start = date(year, month + 1, 1)
     
-    # Get breakdown by category
+    # Get breakdown by category from the monthly rollups
+    rollup = models.UserMonthlyRollup
     breakdown = db.query(
         models.Category,
-        func.sum(models.Transaction.amount).label('amount'),
-        func.count(models.Transaction.id).label('transaction_count')
-    ).join(models.Transaction).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'expense',
-        models.Transaction.transaction_date >= month_start,
-        models.Transaction.transaction_date <= month_end
-    ).group_by(models.Category.id).all()
+        func.sum(rollup.total_amount).label('amount'),
+        func.sum(rollup.transaction_count).label('transaction_count')
+    ).join(
+        rollup, rollup.category_id == models.Category.id
+    ).filter(
+        rollup.user_id == current_user.id,
+        rollup.transaction_type == 'expense',
+        *month_range_filter(month_start, next_month_start)
+    ).group_by(
+        models.Category.id
+    ).having(
+        func.sum(rollup.transaction_count) > 0
+    ).all()
+    
+    # Total expenses for percentage calculation
+    total_expense = sum(amount for _, amount, _ in breakdown)
     
     result = []
     for category, amount, count in breakdown:
@@ -427,11 +313,18 @@ async def get_category_breakdown(
 @router.get("/love-statistics", response_model=LoveStatistics)
 async def get_love_statistics(
     period: str = Query('month', regex='^(month|year|all)$'),
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: models.User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get love-themed statistics"""
-    
+    return await db.run_sync(
+        _get_love_statistics,
+        period=period,
+        current_user=current_user
+    )
+
+
+def _get_love_statistics(db: Session, *, period: str = 'month', current_user: models.User):
     # Determine date range
     today = date.today()
     if period == 'month':
@@ -540,8 +433,7 @@ async def get_love_statistics(
 
 @router.get("/budget-progress", response_model=BudgetProgress)
 async def get_budget_progress(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: models.User = Depends(get_current_user_async)
 ):
     """Get budget progress (placeholder for now)"""
     
@@ -554,4 +446,4 @@ async def get_budget_progress(
         total_spent=0,
         total_remaining=0,
         overall_percentage=0
-    )
\ No newline at end of file
+    )
@@ -1,5 +1,6 @@
 from typing import Any, List, Optional, Dict
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import func, extract, and_, or_, desc
 from datetime import date, datetime, timedelta
@@ -9,7 +10,7 @@ from uuid import UUID
 import calendar
 
 from app import models, schemas
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_async_db, get_current_user_async, get_read_db
 from app.schemas.love import (
     LoveEventCreate,
     LoveEventUpdate,
@@ -29,31 +30,22 @@ from app.schemas.love import (
     LoveGoalWithProgress
 )
 from app.api.partnerships.partnerships import get_user_partnership
+from app.services.love_goals import GOAL_ACHIEVED_NOTIFICATION, evaluate_love_goals
+from app.services.love_statistics import (
+    get_love_aggregates,
+    get_love_streak,
+    get_most_loved_category,
+    get_most_loved_day
+)
+from app.services.monthly_rollup import rollup_snapshot, update_transaction_rollups
+from app.services.time_series import Measure, build_time_series, period_label
 
 router = APIRouter()
 
 
 def calculate_goal_achievement_status(db: Session, goal: models.Budget) -> bool:
     """Love Goalが達成されているかを計算"""
-    # 期間内の支出を計算
-    query = db.query(
-        func.coalesce(func.sum(models.Transaction.amount), 0)
-    ).filter(
-        models.Transaction.user_id == goal.user_id,
-        models.Transaction.transaction_type == 'expense',
-        models.Transaction.transaction_date >= goal.start_date
-    )
-    
-    if goal.end_date:
-        query = query.filter(models.Transaction.transaction_date <= goal.end_date)
-    
-    if goal.category_id:
-        query = query.filter(models.Transaction.category_id == goal.category_id)
-    else:
-        # カテゴリ未指定の場合はLoveカテゴリのみ
-        query = query.join(models.Category).filter(models.Category.is_love_category == True)
-    
-    spent_amount = query.scalar() or 0
+    spent_amount, _ = evaluate_love_goals(db, [goal], goal.user_id)[goal.id]
     
     # 達成判定
     return spent_amount >= goal.amount
@@ -63,7 +55,7 @@ def create_goal_achievement_notification(db: Session, goal: models.Budget, user:
     """Love Goal達成時の通知を作成"""
     notification = models.Notification(
         user_id=user.id,
-        type='love_goal_achieved',
+        type=GOAL_ACHIEVED_NOTIFICATION,
         title='🎉 Love Goal達成！',
         message=f'目標「{goal.name.split(" - ")[0] if " - " in goal.name else goal.name}」を達成しました！',
         data={
@@ -101,16 +93,31 @@ def calculate_days_until(event_date: date, from_date: date = None) -> Dict[str,
 
 
 @router.get("/events", response_model=List[LoveEventWithDays])
-def get_love_events(
+async def get_love_events(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
     include_past: bool = False,
     event_type: Optional[str] = None
 ) -> Any:
     """
     Love イベント一覧を取得
     """
+    return await db.run_sync(
+        _get_love_events,
+        current_user=current_user,
+        include_past=include_past,
+        event_type=event_type
+    )
+
+
+def _get_love_events(
+    db: Session,
+    *,
+    current_user: models.User,
+    include_past: bool = False,
+    event_type: Optional[str] = None
+) -> Any:
     # パートナーシップを確認
     partnership = get_user_partnership(db, current_user.id)
     if not partnership:
@@ -160,16 +167,24 @@ def get_love_events(
 
 
 @router.get("/events/upcoming", response_model=List[LoveEventWithDays])
-def get_upcoming_events(
+async def get_upcoming_events(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
     days: int = 30
 ) -> Any:
     """
     今後のLove イベントを取得（指定日数以内）
     """
-    events = get_love_events(db=db, current_user=current_user, include_past=False)
+    return await db.run_sync(
+        _get_upcoming_events,
+        current_user=current_user,
+        days=days
+    )
+
+
+def _get_upcoming_events(db: Session, *, current_user: models.User, days: int = 30) -> Any:
+    events = _get_love_events(db=db, current_user=current_user, include_past=False)
     
     # 指定日数以内のイベントのみフィルター
     upcoming_events = [
@@ -181,15 +196,23 @@ def get_upcoming_events(
 
 
 @router.post("/events", response_model=LoveEvent)
-def create_love_event(
+async def create_love_event(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     event_in: LoveEventCreate,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user_async)
 ) -> Any:
     """
     Love イベントを作成
     """
+    return await db.run_sync(
+        _create_love_event,
+        event_in=event_in,
+        current_user=current_user
+    )
+
+
+def _create_love_event(db: Session, *, event_in: LoveEventCreate, current_user: models.User) -> Any:
     # パートナーシップを確認
     partnership = get_user_partnership(db, current_user.id)
     if not partnership:
@@ -212,16 +235,31 @@ def create_love_event(
 
 
 @router.put("/events/{event_id}", response_model=LoveEvent)
-def update_love_event(
+async def update_love_event(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     event_id: UUID,
     event_update: LoveEventUpdate,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user_async)
 ) -> Any:
     """
     Love イベントを更新
     """
+    return await db.run_sync(
+        _update_love_event,
+        event_id=event_id,
+        event_update=event_update,
+        current_user=current_user
+    )
+
+
+def _update_love_event(
+    db: Session,
+    *,
+    event_id: UUID,
+    event_update: LoveEventUpdate,
+    current_user: models.User
+) -> Any:
     # パートナーシップを確認
     partnership = get_user_partnership(db, current_user.id)
     if not partnership:
@@ -254,15 +292,23 @@ def update_love_event(
 
 
 @router.delete("/events/{event_id}")
-def delete_love_event(
+async def delete_love_event(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     event_id: UUID,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user_async)
 ) -> Any:
     """
     Love イベントを削除（非アクティブ化）
     """
+    return await db.run_sync(
+        _delete_love_event,
+        event_id=event_id,
+        current_user=current_user
+    )
+
+
+def _delete_love_event(db: Session, *, event_id: UUID, current_user: models.User) -> Any:
     # パートナーシップを確認
     partnership = get_user_partnership(db, current_user.id)
     if not partnership:
@@ -291,16 +337,31 @@ def delete_love_event(
 
 
 @router.put("/transactions/{transaction_id}/love-rating", response_model=Dict[str, Any])
-def update_love_rating(
+async def update_love_rating(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     transaction_id: UUID,
     rating_update: LoveRatingUpdate,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user_async)
 ) -> Any:
     """
     取引のLove評価を更新
     """
+    return await db.run_sync(
+        _update_love_rating,
+        transaction_id=transaction_id,
+        rating_update=rating_update,
+        current_user=current_user
+    )
+
+
+def _update_love_rating(
+    db: Session,
+    *,
+    transaction_id: UUID,
+    rating_update: LoveRatingUpdate,
+    current_user: models.User
+) -> Any:
     # 取引を取得
     transaction = db.query(models.Transaction).filter(
         models.Transaction.id == transaction_id,
@@ -314,7 +375,9 @@ def update_love_rating(
         )
     
     # Love評価を更新
+    rollup_before = rollup_snapshot(transaction)
     transaction.love_rating = rating_update.love_rating
+    update_transaction_rollups(db, rollup_before, transaction)
     db.commit()
     
     return {
@@ -325,16 +388,31 @@ def update_love_rating(
 
 
 @router.get("/stats", response_model=LoveStats)
-def get_love_stats(
+async def get_love_stats(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user_async),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
 ) -> Any:
     """
     Love統計情報を取得
     """
+    return await db.run_sync(
+        _get_love_stats,
+        current_user=current_user,
+        start_date=start_date,
+        end_date=end_date
+    )
+
+
+def _get_love_stats(
+    db: Session,
+    *,
+    current_user: models.User,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Any:
     # デフォルトは今月
     if not start_date:
         today = datetime.now().date()
@@ -342,80 +420,30 @@ def get_love_stats(
     if not end_date:
         end_date = datetime.now().date()
     
-    # Love取引を取得
-    love_transactions = db.query(models.Transaction).join(
-        models.Category
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Category.is_love_category == True,
-        models.Transaction.transaction_date >= start_date,
-        models.Transaction.transaction_date <= end_date
-    ).all()
-    
-    # 基本統計
-    total_love_transactions = len(love_transactions)
-    
-    # Love評価の平均
-    rated_transactions = [t for t in love_transactions if t.love_rating is not None]
+    # Love取引の件数・評価・支出と全体の支出（SQLで集計）
+    period_end = end_date + timedelta(days=1)
+    aggregates = get_love_aggregates(db, current_user.id, start_date, period_end)
+    total_love_transactions = aggregates['love_transaction_count']
     average_love_rating = (
-        sum(t.love_rating for t in rated_transactions) / len(rated_transactions)
-        if rated_transactions else 0.0
+        aggregates['love_rating_sum'] / aggregates['love_rating_count']
+        if aggregates['love_rating_count'] else 0.0
     )
-    
-    # Love支出合計
-    total_love_spending = sum(
-        t.amount for t in love_transactions 
-        if t.transaction_type == 'expense'
-    )
-    
-    # 全体支出に対する割合
-    total_expense = db.query(
-        func.coalesce(func.sum(models.Transaction.amount), 0)
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'expense',
-        models.Transaction.transaction_date >= start_date,
-        models.Transaction.transaction_date <= end_date
-    ).scalar()
+    total_love_spending = aggregates['love_spending']
+    total_expense = aggregates['total_expense']
     
     love_spending_percentage = (
-        Decimal(str(total_love_spending)) / Decimal(str(total_expense)) * 100
+        total_love_spending / total_expense * 100
         if total_expense > 0 else Decimal('0')
     )
     
-    # 最もLoveな日
-    love_by_date = {}
-    for t in love_transactions:
-        if t.transaction_type == 'expense':
-            date_key = t.transaction_date
-            love_by_date[date_key] = love_by_date.get(date_key, 0) + t.amount
-    
-    most_love_day = max(love_by_date.keys(), key=lambda k: love_by_date[k]) if love_by_date else None
-    
-    # 最もLoveなカテゴリ
-    love_by_category = {}
-    for t in love_transactions:
-        if t.transaction_type == 'expense':
-            cat_name = t.category.name
-            love_by_category[cat_name] = love_by_category.get(cat_name, 0) + t.amount
-    
-    most_love_category = max(love_by_category.keys(), key=lambda k: love_by_category[k]) if love_by_category else None
-    
-    # Love連続記録（簡易版：連続してLove取引がある日数）
-    love_dates = sorted(set(t.transaction_date for t in love_transactions))
+    # 最もLoveな日・カテゴリ、Love連続記録（Love取引がない場合は集計しない）
+    most_love_day = None
+    most_love_category = None
     love_streak = 0
-    current_streak = 0
-    
-    for i, date in enumerate(love_dates):
-        if i == 0:
-            current_streak = 1
-        else:
-            if (date - love_dates[i-1]).days == 1:
-                current_streak += 1
-            else:
-                love_streak = max(love_streak, current_streak)
-                current_streak = 1
-    love_streak = max(love_streak, current_streak)
+    if total_love_transactions:
+        most_love_day = get_most_loved_day(db, current_user.id, start_date, period_end)
+        most_love_category = get_most_loved_category(db, current_user.id, start_date, period_end)
+        love_streak = get_love_streak(db, current_user.id, start_date, period_end)
     
     # パートナーシップ確認
     partnership = get_user_partnership(db, current_user.id)
@@ -431,7 +459,7 @@ def get_love_stats(
         ).scalar()
         
         # 今後のイベント数
-        events = get_love_events(db=db, current_user=current_user, include_past=False)
+        events = _get_love_events(db=db, current_user=current_user, include_past=False)
         upcoming_events_count = len([e for e in events if e["days_until"] <= 30])
     
     return LoveStats(
@@ -448,16 +476,31 @@ def get_love_stats(
 
 
 @router.get("/memories", response_model=List[LoveMemory])
-def get_love_memories(
+async def get_love_memories(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user_async),
     limit: int = Query(10, ge=1, le=50),
     min_rating: Optional[int] = Query(None, ge=1, le=5)
 ) -> Any:
     """
     Love思い出（高評価の取引）を取得
     """
+    return await db.run_sync(
+        _get_love_memories,
+        current_user=current_user,
+        limit=limit,
+        min_rating=min_rating
+    )
+
+
+def _get_love_memories(
+    db: Session,
+    *,
+    current_user: models.User,
+    limit: int = 10,
+    min_rating: Optional[int] = None
+) -> Any:
     # Love取引を取得
     query = db.query(models.Transaction).join(
         models.Category
@@ -495,16 +538,25 @@ def get_love_memories(
 
 
 @router.get("/calendar/{year}/{month}", response_model=LoveCalendar)
-def get_love_calendar(
+async def get_love_calendar(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user_async),
     year: int,
     month: int
 ) -> Any:
     """
     Love カレンダーを取得（月別）
     """
+    return await db.run_sync(
+        _get_love_calendar,
+        current_user=current_user,
+        year=year,
+        month=month
+    )
+
+
+def _get_love_calendar(db: Session, *, current_user: models.User, year: int, month: int) -> Any:
     # 期間を計算
     start_date = date(year, month, 1)
     last_day = calendar.monthrange(year, month)[1]
@@ -615,90 +667,77 @@ def get_love_calendar(
 
 
 @router.get("/trends", response_model=LoveTrend)
-def get_love_trends(
+async def get_love_trends(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user_async),
     period: str = Query("monthly", pattern="^(daily|weekly|monthly)$"),
     months: int = Query(6, ge=1, le=12)
 ) -> Any:
     """
     Love傾向分析を取得
     """
+    return await db.run_sync(
+        _get_love_trends,
+        current_user=current_user,
+        period=period,
+        months=months
+    )
+
+
+def _get_love_trends(
+    db: Session,
+    *,
+    current_user: models.User,
+    period: str = "monthly",
+    months: int = 6
+) -> Any:
     end_date = date.today()
     start_date = end_date - relativedelta(months=months)
     
-    # Love取引を取得
-    love_transactions = db.query(
-        models.Transaction.transaction_date,
-        func.sum(models.Transaction.amount).label('amount'),
-        func.count(models.Transaction.id).label('count'),
-        func.avg(models.Transaction.love_rating).label('avg_rating')
-    ).join(
+    # Love支出の期間別の推移（取引がない期間は0）
+    transaction = models.Transaction
+    love_query = db.query(transaction).join(
         models.Category
     ).filter(
-        models.Transaction.user_id == current_user.id,
+        transaction.user_id == current_user.id,
         models.Category.is_love_category == True,
-        models.Transaction.transaction_type == 'expense',
-        models.Transaction.transaction_date >= start_date,
-        models.Transaction.transaction_date <= end_date
-    ).group_by(
-        models.Transaction.transaction_date
-    ).all()
-    
-    # 期間別に集計
-    trends_data = {}
-    
-    for trans in love_transactions:
-        if period == "daily":
-            key = trans.transaction_date.isoformat()
-        elif period == "weekly":
-            # 週の開始日（月曜日）を計算
-            week_start = trans.transaction_date - timedelta(days=trans.transaction_date.weekday())
-            key = week_start.isoformat()
-        else:  # monthly
-            key = f"{trans.transaction_date.year}-{trans.transaction_date.month:02d}"
-        
-        if key not in trends_data:
-            trends_data[key] = {
-                "period": key,
-                "amount": Decimal('0'),
-                "count": 0,
-                "avg_rating": 0.0,
-                "rating_sum": 0.0
-            }
-        
-        trends_data[key]["amount"] += trans.amount
-        trends_data[key]["count"] += trans.count
-        if trans.avg_rating:
-            trends_data[key]["rating_sum"] += trans.avg_rating * trans.count
-    
-    # 平均評価を計算
-    for key in trends_data:
-        if trends_data[key]["count"] > 0:
-            trends_data[key]["avg_rating"] = trends_data[key]["rating_sum"] / trends_data[key]["count"]
+        transaction.transaction_type == 'expense'
+    )
+    series = build_time_series(
+        db, love_query, start_date, end_date + timedelta(days=1), period,
+        {
+            "amount": Measure(transaction.amount),
+            "count": Measure(),
+            "rating_sum": Measure(transaction.love_rating),
+            "rating_count": Measure(condition=transaction.love_rating.isnot(None))
+        }
+    )
     
-    # リストに変換してソート
     trends = [
         {
-            "period": data["period"],
-            "amount": float(data["amount"]),
-            "count": data["count"],
-            "avg_rating": round(data["avg_rating"], 1)
+            "period": period_label(point["period_start"], period),
+            "amount": float(point["amount"]),
+            "count": int(point["count"]),
+            "avg_rating": (
+                round(float(point["rating_sum"]) / int(point["rating_count"]), 1)
+                if point["rating_count"] else 0.0
+            )
         }
-        for data in sorted(trends_data.values(), key=lambda x: x["period"])
+        for point in series
     ]
     
-    # ピーク期間を特定
+    # ピーク期間を特定（Love取引がある期間から）
+    active_trends = [trend for trend in trends if trend["count"]]
     peak_love_period = None
-    if trends:
-        peak_love_period = max(trends, key=lambda x: x["amount"])["period"]
+    if active_trends:
+        peak_love_period = max(active_trends, key=lambda x: x["amount"])["period"]
     
-    # 成長率を計算（最初と最後の期間を比較）
+    # 成長率を計算（Love取引がある最初と最後の期間を比較）
     love_growth_rate = Decimal('0')
-    if len(trends) >= 2:
-        first_amount = Decimal(str(trends[0]["amount"]))
-        last_amount = Decimal(str(trends[-1]["amount"]))
+    if len(active_trends) >= 2:
+        first_amount = Decimal(str(active_trends[0]["amount"]))
+        last_amount = Decimal(str(active_trends[-1]["amount"]))
         if first_amount > 0:
             love_growth_rate = ((last_amount - first_amount) / first_amount * 100)
     
@@ -712,15 +751,28 @@ def get_love_trends(
 
 # Love Memory エンドポイント（独立したメモリー機能）
 @router.post("/memories/create", response_model=LoveMemoryResponse)
-def create_love_memory(
+async def create_love_memory(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     memory_in: LoveMemoryCreate,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user_async)
 ) -> Any:
     """
     Loveメモリーを作成
     """
+    return await db.run_sync(
+        _create_love_memory,
+        memory_in=memory_in,
+        current_user=current_user
+    )
+
+
+def _create_love_memory(
+    db: Session,
+    *,
+    memory_in: LoveMemoryCreate,
+    current_user: models.User
+) -> Any:
     # パートナーシップを確認
     partnership = get_user_partnership(db, current_user.id)
     if not partnership:
@@ -747,16 +799,31 @@ def create_love_memory(
 
 
 @router.get("/memories/list", response_model=List[LoveMemoryResponse])
-def get_love_memories_list(
+async def get_love_memories_list(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0)
 ) -> Any:
     """
     Loveメモリー一覧を取得
     """
+    return await db.run_sync(
+        _get_love_memories_list,
+        current_user=current_user,
+        limit=limit,
+        offset=offset
+    )
+
+
+def _get_love_memories_list(
+    db: Session,
+    *,
+    current_user: models.User,
+    limit: int = 20,
+    offset: int = 0
+) -> Any:
     # パートナーシップを確認
     partnership = get_user_partnership(db, current_user.id)
     if not partnership:
@@ -773,15 +840,23 @@ def get_love_memories_list(
 
 
 @router.delete("/memories/{memory_id}")
-def delete_love_memory(
+async def delete_love_memory(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     memory_id: UUID,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user_async)
 ) -> Any:
     """
     Loveメモリーを削除
     """
+    return await db.run_sync(
+        _delete_love_memory,
+        memory_id=memory_id,
+        current_user=current_user
+    )
+
+
+def _delete_love_memory(db: Session, *, memory_id: UUID, current_user: models.User) -> Any:
     # パートナーシップを確認
     partnership = get_user_partnership(db, current_user.id)
     if not partnership:
@@ -811,16 +886,31 @@ def delete_love_memory(
 
 # Love Goals エンドポイント
 @router.get("/goals", response_model=List[LoveGoalWithProgress])
-def get_love_goals(
+async def get_love_goals(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
     is_active: Optional[bool] = True,
     category_id: Optional[UUID] = None
 ) -> Any:
     """
     Love Goals一覧を取得（進捗情報付き）
     """
+    return await db.run_sync(
+        _get_love_goals,
+        current_user=current_user,
+        is_active=is_active,
+        category_id=category_id
+    )
+
+
+def _get_love_goals(
+    db: Session,
+    *,
+    current_user: models.User,
+    is_active: Optional[bool] = True,
+    category_id: Optional[UUID] = None
+) -> Any:
     # 基本クエリ
     query = db.query(models.Budget).filter(
         models.Budget.user_id == current_user.id,
@@ -837,49 +927,13 @@ def get_love_goals(
     
     goals = query.order_by(desc(models.Budget.created_at)).all()
     
+    # 全ゴールの支出・取引数をまとめて計算
+    totals = evaluate_love_goals(db, goals, current_user.id)
+    
     # 各ゴールの進捗を計算
     result = []
     for goal in goals:
-        # 期間内の支出を計算
-        start_date = goal.start_date
-        end_date = goal.end_date or date.today()
-        
-        # Loveカテゴリの支出を集計
-        spent_query = db.query(
-            func.coalesce(func.sum(models.Transaction.amount), 0)
-        ).join(
-            models.Category
-        ).filter(
-            models.Transaction.user_id == current_user.id,
-            models.Transaction.transaction_type == 'expense',
-            models.Transaction.transaction_date >= start_date,
-            models.Transaction.transaction_date <= end_date,
-            models.Category.is_love_category == True
-        )
-        
-        # 特定のカテゴリに限定されている場合
-        if goal.category_id:
-            spent_query = spent_query.filter(models.Transaction.category_id == goal.category_id)
-        
-        spent_amount = spent_query.scalar() or Decimal('0')
-        
-        # 取引数を取得
-        count_query = db.query(
-            func.count(models.Transaction.id)
-        ).join(
-            models.Category
-        ).filter(
-            models.Transaction.user_id == current_user.id,
-            models.Transaction.transaction_type == 'expense',
-            models.Transaction.transaction_date >= start_date,
-            models.Transaction.transaction_date <= end_date,
-            models.Category.is_love_category == True
-        )
-        
-        if goal.category_id:
-            count_query = count_query.filter(models.Transaction.category_id == goal.category_id)
-        
-        transaction_count = count_query.scalar() or 0
+        spent_amount, transaction_count = totals[goal.id]
         
         # 進捗計算
         progress_percentage = (spent_amount / goal.amount * 100) if goal.amount > 0 else Decimal('0')
@@ -897,12 +951,12 @@ def get_love_goals(
             id=goal.id,
             user_id=goal.user_id,
             partnership_id=goal.partnership_id,
-            name=goal.name,
+            name=goal.name.split(' - ')[0] if ' - ' in goal.name else goal.name,
             amount=goal.amount,
             period=goal.period,
             start_date=goal.start_date,
             end_date=goal.end_date,
-            description=goal.description,
+            description=goal.name.split(' - ', 1)[1] if ' - ' in goal.name else None,
             category_id=goal.category_id,
             is_active=goal.is_active,
             created_at=goal.created_at,
@@ -921,15 +975,23 @@ def get_love_goals(
 
 
 @router.post("/goals", response_model=LoveGoal)
-def create_love_goal(
+async def create_love_goal(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     goal_in: LoveGoalCreate,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user_async)
 ) -> Any:
     """
     Love Goalを作成
     """
+    return await db.run_sync(
+        _create_love_goal,
+        goal_in=goal_in,
+        current_user=current_user
+    )
+
+
+def _create_love_goal(db: Session, *, goal_in: LoveGoalCreate, current_user: models.User) -> Any:
     # パートナーシップを確認（オプション）
     partnership = get_user_partnership(db, current_user.id)
     
@@ -975,16 +1037,31 @@ def create_love_goal(
 
 
 @router.put("/goals/{goal_id}", response_model=LoveGoal)
-def update_love_goal(
+async def update_love_goal(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     goal_id: UUID,
     goal_update: LoveGoalUpdate,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user_async)
 ) -> Any:
     """
     Love Goalを更新
     """
+    return await db.run_sync(
+        _update_love_goal,
+        goal_id=goal_id,
+        goal_update=goal_update,
+        current_user=current_user
+    )
+
+
+def _update_love_goal(
+    db: Session,
+    *,
+    goal_id: UUID,
+    goal_update: LoveGoalUpdate,
+    current_user: models.User
+) -> Any:
     # ゴールを取得
     goal = db.query(models.Budget).filter(
         models.Budget.id == goal_id,
@@ -1055,15 +1132,23 @@ def update_love_goal(
 
 
 @router.delete("/goals/{goal_id}")
-def delete_love_goal(
+async def delete_love_goal(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     goal_id: UUID,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user_async)
 ) -> Any:
     """
     Love Goalを削除（非アクティブ化）
     """
+    return await db.run_sync(
+        _delete_love_goal,
+        goal_id=goal_id,
+        current_user=current_user
+    )
+
+
+def _delete_love_goal(db: Session, *, goal_id: UUID, current_user: models.User) -> Any:
     # ゴールを取得
     goal = db.query(models.Budget).filter(
         models.Budget.id == goal_id,
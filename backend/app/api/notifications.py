@@ -9,6 +9,7 @@ from app import models, schemas
 from app.core.deps import get_db, get_current_user
 from app.models.user import User
 from app.models.notification import Notification
+from app.services.budget_progress import build_budget_notification
 from app.schemas.notification import (
     NotificationCreate,
     NotificationResponse,
@@ -243,18 +244,8 @@ def create_budget_warning_notification(
     """
     予算警告通知を作成
     """
-    notification = Notification(
-        user_id=user_id,
-        type="budget_warning",
-        title=f"予算「{budget_name}」が{int(percentage)}%に達しました",
-        message=f"¥{amount_used:,.0f} / ¥{amount_total:,.0f} を使用しています。",
-        priority="high" if percentage >= 90 else "normal",
-        data={
-            "budget_name": budget_name,
-            "percentage": percentage,
-            "amount_used": amount_used,
-            "amount_total": amount_total
-        }
+    notification = build_budget_notification(
+        user_id, budget_name, "budget_warning", percentage, amount_used, amount_total
     )
     
     db.add(notification)
@@ -1,10 +1,11 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_
 from datetime import date, datetime, timedelta
 from dateutil.relativedelta import relativedelta
 from uuid import UUID
+import calendar
 import logging
 
 from app import models, schemas
@@ -15,6 +16,9 @@ from app.schemas.recurring_transaction import (
     RecurringTransactionResponse,
     RecurringTransactionList
 )
+from app.services.monthly_rollup import add_transaction_to_rollups
+from app.services.forecast import invalidate_forecast
+from app.services.transaction_events import notify_transactions_changed
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -47,7 +51,6 @@ def calculate_next_execution_date(
             # 月末の処理
             if day_of_month > 28:
                 # 月の最終日を取得
-                import calendar
                 last_day = calendar.monthrange(next_date.year, next_date.month)[1]
                 actual_day = min(day_of_month, last_day)
             else:
@@ -91,17 +94,17 @@ def get_recurring_transactions(
     # 総数を取得
     total = query.count()
     
-    # ページネーション適用
-    recurring_transactions = query.order_by(
+    # ページネーション適用（カテゴリは定期取引ごとに取得せず、まとめて読み込む）
+    recurring_transactions = query.options(
+        joinedload(models.RecurringTransaction.category)
+    ).order_by(
         models.RecurringTransaction.next_execution_date.asc()
     ).offset(skip).limit(limit).all()
     
     # レスポンス作成
     result = []
     for rt in recurring_transactions:
-        category = db.query(models.Category).filter(
-            models.Category.id == rt.category_id
-        ).first()
+        category = rt.category
         
         remaining_executions = None
         if rt.max_executions:
@@ -232,6 +235,7 @@ def create_recurring_transaction(
     db.add(rt)
     db.commit()
     db.refresh(rt)
+    invalidate_forecast(current_user.id)
     
     logger.info(f"Created recurring transaction with amount: {rt.amount}, type: {type(rt.amount)}")
     
@@ -272,6 +276,7 @@ def update_recurring_transaction(
     
     db.commit()
     db.refresh(rt)
+    invalidate_forecast(current_user.id)
     
     return get_recurring_transaction(
         db=db,
@@ -304,6 +309,7 @@ def delete_recurring_transaction(
     # 非アクティブ化
     rt.is_active = False
     db.commit()
+    invalidate_forecast(current_user.id)
     
     return {"message": "定期取引を削除しました"}
 
@@ -357,6 +363,7 @@ def execute_recurring_transaction(
     )
     
     db.add(transaction)
+    add_transaction_to_rollups(db, transaction)
     
     # 実行記録を更新
     rt.last_execution_date = date.today()
@@ -382,6 +389,8 @@ def execute_recurring_transaction(
     db.commit()
     db.refresh(transaction)
     
+    notify_transactions_changed(current_user.id)
+    
     return {
         "message": "定期取引を実行しました",
         "transaction_id": transaction.id,
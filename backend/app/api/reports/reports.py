@@ -1,7 +1,8 @@
-from typing import Any, List, Optional, Dict
+from typing import Any, List, Optional, Dict, Tuple
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract, and_, or_, case
+from sqlalchemy import func, and_, or_, case
 from datetime import date, datetime, timedelta
 from dateutil.relativedelta import relativedelta
 from decimal import Decimal
@@ -9,18 +10,25 @@ from uuid import UUID
 import calendar
 
 from app import models, schemas
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_current_user_async, get_read_db, use_report_timeouts
+from app.services.forecast import get_cash_flow_forecast
+from app.services.love_statistics import get_love_aggregates
+from app.services.monthly_rollup import month_range_filter
+from app.services.time_series import build_cash_flow_series
 from app.schemas.report import (
     MonthlyReport,
     YearlyReport,
     CustomReport,
     CustomReportRequest,
+    CashFlowForecast,
     CategoryReport,
     MonthlyTrend,
     LoveStatistics
 )
 
-router = APIRouter()
+# 集計を行う読み取り用のセッション（get_read_db）の statement_timeout を延ばす
+# （認証のユーザー取得は get_async_db の別のセッションのため、通常の値のまま）
+router = APIRouter(dependencies=[Depends(use_report_timeouts)])
 
 
 def get_category_report(
@@ -60,21 +68,100 @@ def get_category_report(
         models.Category.is_love_category
     ).all()
     
-    # 合計金額を計算
-    total_amount = sum(stat.total_amount for stat in category_stats)
+    return build_category_reports(category_stats)
+
+
+def get_category_report_from_rollups(
+    db: Session,
+    user_id: UUID,
+    start_month: date,
+    end_month: date,
+    transaction_type: str = 'expense'
+) -> List[CategoryReport]:
+    """月次集計からカテゴリ別レポートを生成（月範囲 [start_month, end_month)）"""
+    rollup = models.UserMonthlyRollup
+    category_stats = db.query(
+        models.Category.id,
+        models.Category.name,
+        models.Category.icon,
+        models.Category.is_love_category,
+        func.sum(rollup.total_amount).label('total_amount'),
+        func.sum(rollup.transaction_count).label('transaction_count')
+    ).join(
+        rollup, rollup.category_id == models.Category.id
+    ).filter(
+        rollup.user_id == user_id,
+        rollup.transaction_type == transaction_type,
+        *month_range_filter(start_month, end_month),
+        or_(
+            models.Category.is_default == True,
+            models.Category.user_id == user_id
+        )
+    ).group_by(
+        models.Category.id
+    ).having(
+        func.sum(rollup.transaction_count) > 0
+    ).all()
+    
+    return build_category_reports(category_stats)
+
+
+def get_category_reports_by_type_from_rollups(
+    db: Session,
+    user_id: UUID,
+    start_month: date,
+    end_month: date
+) -> Dict[str, List[CategoryReport]]:
+    """月次集計から収入・支出のカテゴリ別レポートを1回の集計で生成（月範囲 [start_month, end_month)）"""
+    rollup = models.UserMonthlyRollup
+    category_stats = db.query(
+        rollup.transaction_type,
+        models.Category.id,
+        models.Category.name,
+        models.Category.icon,
+        models.Category.is_love_category,
+        func.sum(rollup.total_amount).label('total_amount'),
+        func.sum(rollup.transaction_count).label('transaction_count')
+    ).join(
+        rollup, rollup.category_id == models.Category.id
+    ).filter(
+        rollup.user_id == user_id,
+        *month_range_filter(start_month, end_month),
+        or_(
+            models.Category.is_default == True,
+            models.Category.user_id == user_id
+        )
+    ).group_by(
+        rollup.transaction_type,
+        models.Category.id
+    ).having(
+        func.sum(rollup.transaction_count) > 0
+    ).all()
+    
+    return {
+        transaction_type: build_category_reports(
+            [stat for stat in category_stats if stat.transaction_type == transaction_type]
+        )
+        for transaction_type in ('income', 'expense')
+    }
+
+
+def build_category_reports(category_stats) -> List[CategoryReport]:
+    """カテゴリ別集計行からレポートを作成（金額の降順）"""
+    total_amount = sum(Decimal(str(stat.total_amount)) for stat in category_stats)
     
-    # カテゴリレポートを作成
     reports = []
     for stat in category_stats:
         if stat.transaction_count > 0:  # 取引がある場合のみ
-            percentage = (Decimal(str(stat.total_amount)) / total_amount * 100) if total_amount > 0 else Decimal('0')
-            average_amount = Decimal(str(stat.total_amount)) / stat.transaction_count
+            stat_amount = Decimal(str(stat.total_amount))
+            percentage = (stat_amount / total_amount * 100) if total_amount > 0 else Decimal('0')
+            average_amount = stat_amount / stat.transaction_count
             
             reports.append(CategoryReport(
                 category_id=stat.id,
                 category_name=stat.name,
                 category_icon=stat.icon,
-                total_amount=Decimal(str(stat.total_amount)),
+                total_amount=stat_amount,
                 transaction_count=stat.transaction_count,
                 percentage=percentage,
                 average_amount=average_amount,
@@ -92,56 +179,21 @@ def get_love_statistics(
     start_date: date,
     end_date: date
 ) -> Optional[LoveStatistics]:
-    """Love統計を生成"""
-    # Love取引を取得
-    love_transactions = db.query(models.Transaction).join(
-        models.Category
-    ).filter(
-        models.Transaction.user_id == user_id,
-        models.Category.is_love_category == True,
-        models.Transaction.transaction_date >= start_date,
-        models.Transaction.transaction_date <= end_date
-    ).all()
-    
-    if not love_transactions:
+    """Love統計を生成（件数・支出・評価はSQLで集計する）"""
+    end = end_date + timedelta(days=1)
+    aggregates = get_love_aggregates(db, user_id, start_date, end)
+    if not aggregates['love_transaction_count']:
         return None
     
-    # 基本統計
-    total_love_spending = sum(t.amount for t in love_transactions if t.transaction_type == 'expense')
-    love_transaction_count = len(love_transactions)
-    
-    # Love rating平均
-    rated_transactions = [t for t in love_transactions if t.love_rating is not None]
-    average_love_rating = (
-        sum(t.love_rating for t in rated_transactions) / len(rated_transactions)
-        if rated_transactions else 0.0
-    )
-    
-    # 全体支出に対するLove支出の割合
-    total_expense = db.query(
-        func.coalesce(func.sum(models.Transaction.amount), 0)
-    ).filter(
-        models.Transaction.user_id == user_id,
-        models.Transaction.transaction_type == 'expense',
-        models.Transaction.transaction_date >= start_date,
-        models.Transaction.transaction_date <= end_date
-    ).scalar()
-    
-    love_spending_percentage = (
-        Decimal(str(total_love_spending)) / Decimal(str(total_expense)) * 100
-        if total_expense > 0 else Decimal('0')
+    return build_love_statistics(
+        **aggregates,
+        expense_by_category=get_category_report(db, user_id, start_date, end_date, 'expense'),
+        love_trend=get_love_trend(db, user_id, start_date, end)
     )
-    
-    # Love支出のカテゴリ別内訳
-    love_categories = get_category_report(
-        db, user_id, start_date, end_date, 'expense'
-    )
-    love_categories = [cat for cat in love_categories if cat.is_love_category]
-    
-    # お気に入りLoveカテゴリ
-    favorite_love_category = love_categories[0] if love_categories else None
-    
-    # Love支出の日別推移
+
+
+def get_love_trend(db: Session, user_id: UUID, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+    """Love支出の日別推移（期間 [start_date, end_date)）"""
     love_trend = db.query(
         models.Transaction.transaction_date,
         func.sum(models.Transaction.amount).label('amount')
@@ -152,84 +204,194 @@ def get_love_statistics(
         models.Category.is_love_category == True,
         models.Transaction.transaction_type == 'expense',
         models.Transaction.transaction_date >= start_date,
-        models.Transaction.transaction_date <= end_date
+        models.Transaction.transaction_date < end_date
     ).group_by(
         models.Transaction.transaction_date
     ).order_by(
         models.Transaction.transaction_date
     ).all()
     
-    love_trend_data = [
+    return [
         {
             "date": str(trend.transaction_date),
             "amount": float(trend.amount)
         }
         for trend in love_trend
     ]
+
+
+def get_largest_expense_and_love_trend(
+    db: Session,
+    user_id: UUID,
+    start_date: date,
+    end_date: date
+) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    期間 [start_date, end_date) の最大支出とLove支出の日別推移を1回のクエリで取得
+
+    支出の取引に日ごとのウィンドウ関数（1回の並べ替え）で日ごとの最大金額とLove支出の合計を付け、
+    日ごとの最大金額の行と、Love支出がある日の1行だけを返す（期間の最大支出はその中から選ぶ）。
+    ウィンドウ関数の対象の列は ix_transactions_user_date_created に含まれ、説明は返す行だけ結合して取得する。
+    """
+    transaction = models.Transaction
+    is_love = models.Category.is_love_category == True
+    ranked = db.query(
+        transaction.id,
+        transaction.amount,
+        transaction.transaction_date,
+        transaction.category_id,
+        func.max(transaction.amount).over(partition_by=transaction.transaction_date).label('day_max_amount'),
+        func.row_number().over(partition_by=transaction.transaction_date).label('day_rank'),
+        func.sum(transaction.amount).filter(is_love).over(
+            partition_by=transaction.transaction_date
+        ).label('love_amount')
+    ).join(
+        models.Category, models.Category.id == transaction.category_id
+    ).filter(
+        transaction.user_id == user_id,
+        transaction.transaction_type == 'expense',
+        transaction.transaction_date >= start_date,
+        transaction.transaction_date < end_date
+    ).subquery()
+    
+    rows = db.query(
+        ranked,
+        transaction.description
+    ).join(
+        transaction, transaction.id == ranked.c.id
+    ).filter(
+        or_(
+            ranked.c.amount == ranked.c.day_max_amount,
+            and_(ranked.c.day_rank == 1, ranked.c.love_amount.isnot(None))
+        )
+    ).order_by(
+        ranked.c.transaction_date, ranked.c.id
+    ).all()
+    
+    largest = None
+    love_trend = []
+    for row in rows:
+        if row.amount == row.day_max_amount and (largest is None or row.amount > largest.amount):
+            largest = row
+        if row.day_rank == 1 and row.love_amount is not None:
+            love_trend.append({
+                "date": str(row.transaction_date),
+                "amount": float(row.love_amount)
+            })
+    
+    largest_expense = None
+    if largest is not None:
+        largest_expense = {
+            "id": str(largest.id),
+            "amount": float(largest.amount),
+            "description": largest.description,
+            "date": str(largest.transaction_date),
+            "category_id": str(largest.category_id)
+        }
+    return largest_expense, love_trend
+
+
+def build_love_statistics(
+    love_spending: Decimal,
+    love_transaction_count: int,
+    love_rating_sum: int,
+    love_rating_count: int,
+    total_expense: Decimal,
+    expense_by_category: List[CategoryReport],
+    love_trend: List[Dict[str, Any]]
+) -> Optional[LoveStatistics]:
+    """集計済みの値からLove統計を作成（Love取引がない場合はNone）"""
+    if not love_transaction_count:
+        return None
     
+    love_categories = [cat for cat in expense_by_category if cat.is_love_category]
     return LoveStatistics(
-        total_love_spending=Decimal(str(total_love_spending)),
+        total_love_spending=love_spending,
         love_transaction_count=love_transaction_count,
-        average_love_rating=average_love_rating,
-        love_spending_percentage=love_spending_percentage,
-        favorite_love_category=favorite_love_category,
+        average_love_rating=love_rating_sum / love_rating_count if love_rating_count else 0.0,
+        love_spending_percentage=(
+            love_spending / total_expense * 100 if total_expense > 0 else Decimal('0')
+        ),
+        favorite_love_category=love_categories[0] if love_categories else None,
         love_spending_by_category=love_categories,
-        love_trend=love_trend_data
+        love_trend=love_trend
     )
 
 
 @router.get("/monthly/{year}/{month}", response_model=MonthlyReport)
-def get_monthly_report(
+async def get_monthly_report(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user_async),
     year: int,
     month: int
 ) -> Any:
     """
     月次レポートを取得
     """
+    return await db.run_sync(
+        _get_monthly_report,
+        current_user=current_user,
+        year=year,
+        month=month
+    )
+
+
+def _get_monthly_report(db: Session, *, current_user: models.User, year: int, month: int) -> Any:
     # 期間を計算
     period_start = date(year, month, 1)
     last_day = calendar.monthrange(year, month)[1]
     period_end = date(year, month, last_day)
     
-    # 収支サマリー
-    income_sum = db.query(
-        func.coalesce(func.sum(models.Transaction.amount), 0)
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'income',
-        models.Transaction.transaction_date >= period_start,
-        models.Transaction.transaction_date <= period_end
-    ).scalar()
-    
-    expense_sum = db.query(
-        func.coalesce(func.sum(models.Transaction.amount), 0)
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'expense',
-        models.Transaction.transaction_date >= period_start,
-        models.Transaction.transaction_date <= period_end
-    ).scalar()
-    
-    # カテゴリ別分析
-    expense_by_category = get_category_report(db, current_user.id, period_start, period_end, 'expense')
-    income_by_category = get_category_report(db, current_user.id, period_start, period_end, 'income')
-    
-    # 前月との比較
+    next_month_start = period_start + relativedelta(months=1)
     prev_month_start = period_start - relativedelta(months=1)
-    prev_month_end = period_start - timedelta(days=1)
     
-    previous_month_expense = db.query(
-        func.coalesce(func.sum(models.Transaction.amount), 0)
+    # 収支サマリー・前月支出・共有支出・取引数・Love支出と評価を月次集計から1回で取得
+    rollup = models.UserMonthlyRollup
+    is_current_month = and_(rollup.year == year, rollup.month == month)
+    is_expense = rollup.transaction_type == 'expense'
+    is_current_love = and_(is_current_month, models.Category.is_love_category == True)
+    summary = db.query(
+        func.coalesce(func.sum(rollup.total_amount).filter(
+            and_(is_current_month, rollup.transaction_type == 'income')
+        ), 0).label('income'),
+        func.coalesce(func.sum(rollup.total_amount).filter(
+            and_(is_current_month, is_expense)
+        ), 0).label('expense'),
+        func.coalesce(func.sum(rollup.total_amount).filter(
+            and_(is_current_month, is_expense, rollup.sharing_type == 'shared')
+        ), 0).label('shared_expense'),
+        func.coalesce(func.sum(rollup.transaction_count).filter(is_current_month), 0).label('transaction_count'),
+        func.coalesce(func.sum(rollup.total_amount).filter(
+            and_(~is_current_month, is_expense)
+        ), 0).label('previous_expense'),
+        func.coalesce(func.sum(rollup.total_amount).filter(
+            and_(is_current_love, is_expense)
+        ), 0).label('love_spending'),
+        func.coalesce(func.sum(rollup.transaction_count).filter(is_current_love), 0).label('love_transaction_count'),
+        func.coalesce(func.sum(rollup.love_rating_sum).filter(is_current_love), 0).label('love_rating_sum'),
+        func.coalesce(func.sum(rollup.love_rating_count).filter(is_current_love), 0).label('love_rating_count')
+    ).join(
+        models.Category, models.Category.id == rollup.category_id
     ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'expense',
-        models.Transaction.transaction_date >= prev_month_start,
-        models.Transaction.transaction_date <= prev_month_end
-    ).scalar()
+        rollup.user_id == current_user.id,
+        *month_range_filter(prev_month_start, next_month_start)
+    ).one()
+    
+    income_sum = summary.income
+    expense_sum = summary.expense
+    previous_month_expense = summary.previous_expense
+    shared_expense = summary.shared_expense
+    transaction_count = summary.transaction_count
+    
+    # カテゴリ別分析（収入・支出を1回で集計）
+    category_reports = get_category_reports_by_type_from_rollups(
+        db, current_user.id, period_start, next_month_start
+    )
+    expense_by_category = category_reports['expense']
+    income_by_category = category_reports['income']
     
+    # 前月との比較
     expense_change_percentage = None
     if previous_month_expense > 0:
         expense_change_percentage = (
@@ -237,54 +399,32 @@ def get_monthly_report(
             Decimal(str(previous_month_expense)) * 100
         )
     
+    # 最大支出・Love支出の日別推移
+    largest_expense, love_trend = get_largest_expense_and_love_trend(
+        db, current_user.id, period_start, next_month_start
+    )
+    
     # Love統計
-    love_statistics = get_love_statistics(db, current_user.id, period_start, period_end)
+    love_statistics = build_love_statistics(
+        love_spending=Decimal(str(summary.love_spending)),
+        love_transaction_count=int(summary.love_transaction_count),
+        love_rating_sum=int(summary.love_rating_sum),
+        love_rating_count=int(summary.love_rating_count),
+        total_expense=Decimal(str(expense_sum)),
+        expense_by_category=expense_by_category,
+        love_trend=love_trend
+    )
     
     # 共有・個人支出
-    shared_expense = db.query(
-        func.coalesce(func.sum(models.Transaction.amount), 0)
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'expense',
-        models.Transaction.sharing_type == 'shared',
-        models.Transaction.transaction_date >= period_start,
-        models.Transaction.transaction_date <= period_end
-    ).scalar()
-    
     personal_expense = Decimal(str(expense_sum)) - Decimal(str(shared_expense))
     shared_percentage = (
         Decimal(str(shared_expense)) / Decimal(str(expense_sum)) * 100
         if expense_sum > 0 else Decimal('0')
     )
     
-    # トランザクション統計
-    transaction_count = db.query(func.count(models.Transaction.id)).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_date >= period_start,
-        models.Transaction.transaction_date <= period_end
-    ).scalar()
-    
     days_in_month = (period_end - period_start).days + 1
     daily_average_expense = Decimal(str(expense_sum)) / days_in_month
     
-    # 最大支出
-    largest_expense_query = db.query(models.Transaction).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'expense',
-        models.Transaction.transaction_date >= period_start,
-        models.Transaction.transaction_date <= period_end
-    ).order_by(models.Transaction.amount.desc()).first()
-    
-    largest_expense = None
-    if largest_expense_query:
-        largest_expense = {
-            "id": str(largest_expense_query.id),
-            "amount": float(largest_expense_query.amount),
-            "description": largest_expense_query.description,
-            "date": str(largest_expense_query.transaction_date),
-            "category_id": str(largest_expense_query.category_id)
-        }
-    
     return MonthlyReport(
         year=year,
         month=month,
@@ -308,47 +448,47 @@ def get_monthly_report(
 
 
 @router.get("/yearly/{year}", response_model=YearlyReport)
-def get_yearly_report(
+async def get_yearly_report(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user_async),
     year: int
 ) -> Any:
     """
     年次レポートを取得
     """
-    # 年間の期間
+    return await db.run_sync(
+        _get_yearly_report,
+        current_user=current_user,
+        year=year
+    )
+
+
+def _get_yearly_report(db: Session, *, current_user: models.User, year: int) -> Any:
+    # 年間の期間（月次集計・取引ともに [1月1日, 翌年1月1日) の範囲で検索する）
     year_start = date(year, 1, 1)
-    year_end = date(year, 12, 31)
+    next_year_start = date(year + 1, 1, 1)
     
-    # 年間サマリー
-    yearly_income = db.query(
-        func.coalesce(func.sum(models.Transaction.amount), 0)
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'income',
-        extract('year', models.Transaction.transaction_date) == year
-    ).scalar()
-    
-    yearly_expense = db.query(
-        func.coalesce(func.sum(models.Transaction.amount), 0)
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'expense',
-        extract('year', models.Transaction.transaction_date) == year
-    ).scalar()
-    
-    # 月次トレンド
+    # 月別の収支・Love支出・Love取引数と評価・取引数を月次集計から1回で取得
+    rollup = models.UserMonthlyRollup
+    is_expense = rollup.transaction_type == 'expense'
+    is_love = models.Category.is_love_category == True
     monthly_stats = db.query(
-        extract('month', models.Transaction.transaction_date).label('month'),
-        models.Transaction.transaction_type,
-        func.sum(models.Transaction.amount).label('total')
+        rollup.month,
+        func.coalesce(func.sum(rollup.total_amount).filter(rollup.transaction_type == 'income'), 0).label('income'),
+        func.coalesce(func.sum(rollup.total_amount).filter(is_expense), 0).label('expense'),
+        func.coalesce(func.sum(rollup.total_amount).filter(and_(is_expense, is_love)), 0).label('love_spending'),
+        func.coalesce(func.sum(rollup.transaction_count).filter(is_love), 0).label('love_transaction_count'),
+        func.coalesce(func.sum(rollup.love_rating_sum).filter(is_love), 0).label('love_rating_sum'),
+        func.coalesce(func.sum(rollup.love_rating_count).filter(is_love), 0).label('love_rating_count'),
+        func.coalesce(func.sum(rollup.transaction_count), 0).label('transaction_count')
+    ).join(
+        models.Category, models.Category.id == rollup.category_id
     ).filter(
-        models.Transaction.user_id == current_user.id,
-        extract('year', models.Transaction.transaction_date) == year
+        rollup.user_id == current_user.id,
+        *month_range_filter(year_start, next_year_start)
     ).group_by(
-        extract('month', models.Transaction.transaction_date),
-        models.Transaction.transaction_type
+        rollup.month
     ).all()
     
     # 月次トレンドデータを整形
@@ -357,51 +497,21 @@ def get_yearly_report(
         monthly_data[month_num] = {
             'income': Decimal('0'),
             'expense': Decimal('0'),
-            'love_spending': Decimal('0')
+            'love_spending': Decimal('0'),
+            'transaction_count': 0
         }
     
     for stat in monthly_stats:
-        month_num = int(stat.month)
-        if stat.transaction_type == 'income':
-            monthly_data[month_num]['income'] = Decimal(str(stat.total))
-        else:
-            monthly_data[month_num]['expense'] = Decimal(str(stat.total))
-    
-    # Love支出の月次データ
-    love_monthly = db.query(
-        extract('month', models.Transaction.transaction_date).label('month'),
-        func.sum(models.Transaction.amount).label('total')
-    ).join(
-        models.Category
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'expense',
-        models.Category.is_love_category == True,
-        extract('year', models.Transaction.transaction_date) == year
-    ).group_by(
-        extract('month', models.Transaction.transaction_date)
-    ).all()
-    
-    for stat in love_monthly:
-        month_num = int(stat.month)
-        monthly_data[month_num]['love_spending'] = Decimal(str(stat.total))
-    
-    # トランザクション数の月次データ
-    transaction_counts = db.query(
-        extract('month', models.Transaction.transaction_date).label('month'),
-        func.count(models.Transaction.id).label('count')
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        extract('year', models.Transaction.transaction_date) == year
-    ).group_by(
-        extract('month', models.Transaction.transaction_date)
-    ).all()
+        monthly_data[stat.month] = {
+            'income': Decimal(str(stat.income)),
+            'expense': Decimal(str(stat.expense)),
+            'love_spending': Decimal(str(stat.love_spending)),
+            'transaction_count': int(stat.transaction_count)
+        }
     
-    for stat in transaction_counts:
-        month_num = int(stat.month)
-        if month_num not in monthly_data:
-            monthly_data[month_num] = {}
-        monthly_data[month_num]['transaction_count'] = stat.count
+    # 年間サマリー
+    yearly_income = sum(data['income'] for data in monthly_data.values())
+    yearly_expense = sum(data['expense'] for data in monthly_data.values())
     
     # MonthlyTrendオブジェクトのリストを作成
     monthly_trends = []
@@ -417,10 +527,24 @@ def get_yearly_report(
         ))
     
     # カテゴリ別年間集計
-    expense_by_category = get_category_report(db, current_user.id, year_start, year_end, 'expense')
+    expense_by_category = get_category_report_from_rollups(
+        db, current_user.id, year_start, next_year_start, 'expense'
+    )
     
-    # Love統計
-    yearly_love_statistics = get_love_statistics(db, current_user.id, year_start, year_end) or LoveStatistics(
+    # Love統計（日別推移のみ取引から取得）
+    love_transaction_count = sum(int(stat.love_transaction_count) for stat in monthly_stats)
+    yearly_love_statistics = build_love_statistics(
+        love_spending=sum((data['love_spending'] for data in monthly_data.values()), Decimal('0')),
+        love_transaction_count=love_transaction_count,
+        love_rating_sum=sum(int(stat.love_rating_sum) for stat in monthly_stats),
+        love_rating_count=sum(int(stat.love_rating_count) for stat in monthly_stats),
+        total_expense=Decimal(str(yearly_expense)),
+        expense_by_category=expense_by_category,
+        love_trend=(
+            get_love_trend(db, current_user.id, year_start, next_year_start)
+            if love_transaction_count else []
+        )
+    ) or LoveStatistics(
         total_love_spending=Decimal('0'),
         love_transaction_count=0,
         average_love_rating=0.0,
@@ -458,15 +582,28 @@ def get_yearly_report(
 
 
 @router.post("/custom", response_model=CustomReport)
-def create_custom_report(
+async def create_custom_report(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user_async),
     report_request: CustomReportRequest
 ) -> Any:
     """
     カスタムレポートを作成
     """
+    return await db.run_sync(
+        _create_custom_report,
+        current_user=current_user,
+        report_request=report_request
+    )
+
+
+def _create_custom_report(
+    db: Session,
+    *,
+    current_user: models.User,
+    report_request: CustomReportRequest
+) -> Any:
     # 基本クエリ
     base_query = db.query(models.Transaction).filter(
         models.Transaction.user_id == current_user.id,
@@ -491,10 +628,17 @@ def create_custom_report(
         base_query = base_query.filter(models.Transaction.sharing_type != 'personal')
     
     # 収支計算
-    transactions = base_query.all()
-    
-    total_income = sum(t.amount for t in transactions if t.transaction_type == 'income')
-    total_expense = sum(t.amount for t in transactions if t.transaction_type == 'expense')
+    totals = base_query.with_entities(
+        func.coalesce(func.sum(models.Transaction.amount).filter(
+            models.Transaction.transaction_type == 'income'
+        ), 0).label('income'),
+        func.coalesce(func.sum(models.Transaction.amount).filter(
+            models.Transaction.transaction_type == 'expense'
+        ), 0).label('expense')
+    ).one()
+    
+    total_income = totals.income
+    total_expense = totals.expense
     
     # カテゴリ分析
     expense_by_category = get_category_report(
@@ -505,42 +649,23 @@ def create_custom_report(
         'expense'
     )
     
-    # 日別推移
-    daily_stats = db.query(
-        models.Transaction.transaction_date,
-        models.Transaction.transaction_type,
-        func.sum(models.Transaction.amount).label('total')
-    ).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_date >= report_request.start_date,
-        models.Transaction.transaction_date <= report_request.end_date
-    ).group_by(
-        models.Transaction.transaction_date,
-        models.Transaction.transaction_type
-    ).order_by(
-        models.Transaction.transaction_date
-    ).all()
-    
-    daily_trends = []
-    current_date = report_request.start_date
-    while current_date <= report_request.end_date:
-        day_income = sum(
-            stat.total for stat in daily_stats
-            if stat.transaction_date == current_date and stat.transaction_type == 'income'
-        )
-        day_expense = sum(
-            stat.total for stat in daily_stats
-            if stat.transaction_date == current_date and stat.transaction_type == 'expense'
-        )
-        
-        daily_trends.append({
-            "date": str(current_date),
-            "income": float(day_income),
-            "expense": float(day_expense),
-            "balance": float(day_income - day_expense)
-        })
-        
-        current_date += timedelta(days=1)
+    # 日別推移（取引がない日は0）
+    daily_series = build_cash_flow_series(
+        db,
+        db.query(models.Transaction).filter(models.Transaction.user_id == current_user.id),
+        report_request.start_date,
+        report_request.end_date + timedelta(days=1),
+        'daily'
+    )
+    daily_trends = [
+        {
+            "date": str(point['period_start']),
+            "income": float(point['income']),
+            "expense": float(point['expense']),
+            "balance": float(point['balance'])
+        }
+        for point in daily_series
+    ]
     
     # Love統計（report_typeがlove_onlyまたはオプションで含める場合）
     love_statistics = None
@@ -568,17 +693,49 @@ def create_custom_report(
     )
 
 
+@router.get("/forecast", response_model=CashFlowForecast)
+async def get_forecast(
+    *,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user_async),
+    months: int = Query(6, ge=1, le=24, description="予測する月数（来月から）"),
+    history_months: int = Query(3, ge=1, le=24, description="ベースラインの計算に使う過去の月数")
+) -> Any:
+    """
+    収支予測を取得
+    
+    定期取引の実行予定と、過去の定期取引以外の収支の月平均から、
+    来月以降のカテゴリ別収支を予測する。
+    """
+    return await db.run_sync(get_cash_flow_forecast, current_user.id, months, history_months)
+
+
 @router.get("/love/summary")
-def get_love_summary(
+async def get_love_summary(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user_async),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
 ) -> Any:
     """
     Love統計サマリーを取得
     """
+    return await db.run_sync(
+        _get_love_summary,
+        current_user=current_user,
+        start_date=start_date,
+        end_date=end_date
+    )
+
+
+def _get_love_summary(
+    db: Session,
+    *,
+    current_user: models.User,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Any:
     # デフォルトは今月
     if not start_date:
         today = date.today()
@@ -1,15 +1,18 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func, extract
+from sqlalchemy import and_, or_, func
 from datetime import date, datetime
+from dateutil.relativedelta import relativedelta
 from uuid import UUID
 import base64
 import os
 import logging
 
 from app import schemas, models
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_async_db, get_current_user_async
 from app.core.config import settings
 from app.schemas.transaction import (
     TransactionCreate,
@@ -19,72 +22,36 @@ from app.schemas.transaction import (
 )
 from app.api.partnerships.partnerships import get_user_partnership
 from app.utils.file_security import (
+    MAX_FILE_SIZE,
     validate_file_content,
     generate_secure_filename,
     create_secure_upload_directory,
     scan_for_malware
 )
 from app.utils.rate_limiter import limiter, RateLimits
+from app.utils.text_search import SearchQuery
+from app.services.monthly_rollup import (
+    add_transaction_to_rollups,
+    month_range_filter,
+    remove_transaction_from_rollups,
+    rollup_snapshot,
+    update_transaction_rollups
+)
+from app.services.transaction_events import notify_transactions_changed
+from app.services.transaction_pagination import (
+    KEYSET_ORDER,
+    after_cursor,
+    decode_cursor,
+    encode_cursor,
+    estimate_transaction_count
+)
+from app.services.transaction_search import apply_search
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-
-def check_love_goals_achievement(db: Session, user: models.User):
-    """Love Goals達成チェックと通知作成"""
-    # アクティブなLove Goalsを取得
-    love_goals = db.query(models.Budget).filter(
-        models.Budget.user_id == user.id,
-        models.Budget.is_love_budget == True,
-        models.Budget.is_active == True
-    ).all()
-    
-    for goal in love_goals:
-        # 期間内の支出を計算
-        query = db.query(
-            func.coalesce(func.sum(models.Transaction.amount), 0)
-        ).filter(
-            models.Transaction.user_id == user.id,
-            models.Transaction.transaction_type == 'expense',
-            models.Transaction.transaction_date >= goal.start_date
-        )
-        
-        if goal.end_date:
-            query = query.filter(models.Transaction.transaction_date <= goal.end_date)
-        
-        if goal.category_id:
-            query = query.filter(models.Transaction.category_id == goal.category_id)
-        else:
-            # カテゴリ未指定の場合はLoveカテゴリのみ
-            query = query.join(models.Category).filter(models.Category.is_love_category == True)
-        
-        spent_amount = query.scalar() or 0
-        
-        # 既に通知済みかチェック（同じゴールで既に通知がある場合はスキップ）
-        existing_notification = db.query(models.Notification).filter(
-            models.Notification.user_id == user.id,
-            models.Notification.type == 'love_goal_achieved',
-            models.Notification.data['goal_id'].astext == str(goal.id)
-        ).first()
-        
-        # 新たに達成した場合のみ通知を作成
-        if spent_amount >= goal.amount and not existing_notification:
-            notification = models.Notification(
-                user_id=user.id,
-                type='love_goal_achieved',
-                title='🎉 Love Goal達成！',
-                message=f'目標「{goal.name}」を達成しました！',
-                data={
-                    'goal_id': str(goal.id),
-                    'goal_name': goal.name,
-                    'amount': float(goal.amount),
-                    'spent_amount': float(spent_amount)
-                },
-                priority='high'
-            )
-            db.add(notification)
-    
-    db.commit()
+# Base64のレシート画像の最大長（MAX_FILE_SIZE をエンコードした長さ。76文字ごとの改行を許容する）
+MAX_RECEIPT_BASE64_LENGTH = 4 * -(-MAX_FILE_SIZE // 3) * 78 // 76
 
 
 def save_receipt_image(file_content: bytes, user_id: UUID) -> str:
@@ -146,11 +113,11 @@ def save_receipt_image(file_content: bytes, user_id: UUID) -> str:
 
 @router.get("/", response_model=dict)
 @limiter.limit(RateLimits.API_READ)
-def get_transactions(
+async def get_transactions(
     request: Request,
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     category_id: Optional[UUID] = None,
@@ -159,11 +126,77 @@ def get_transactions(
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     love_rating: Optional[int] = Query(None, ge=1, le=5),
-    search: Optional[str] = None
+    search: Optional[str] = Query(None, max_length=200),
+    tags: Optional[List[str]] = Query(None),
+    sort: str = Query("date", pattern="^(date|relevance)$"),
+    cursor: Optional[str] = None,
+    count: Optional[str] = Query(None, pattern="^(exact|estimated|none)$")
 ) -> Any:
     """
     取引一覧を取得
+
+    - page: ページ番号で取得（OFFSET のため、後ろのページほど遅くなる）
+    - cursor: 前のレスポンスの pagination.next_cursor より後ろを取得（ページ番号によらず一定の速さ）
+    - count: 総件数の取得方法（exact: 正確な件数、estimated: 月次集計からの推定値、none: 取得しない）。
+      省略時は page の場合 exact、cursor の場合 none
+    - search: 説明・場所・タグの検索（空白区切りで全てを含む。部分一致、末尾が "*" の語は単語の前方一致）
+    - tags: 指定したタグを全て持つ取引に絞り込む（複数指定可）
+    - sort: 並び順（date: 日付の新しい順、relevance: 検索の関連度順。relevance は cursor と併用できない）
     """
+    return await db.run_sync(
+        _get_transactions,
+        current_user=current_user,
+        page=page,
+        limit=limit,
+        cursor=cursor,
+        count=count,
+        category_id=category_id,
+        transaction_type=transaction_type,
+        sharing_type=sharing_type,
+        date_from=date_from,
+        date_to=date_to,
+        love_rating=love_rating,
+        search=search,
+        tags=tags,
+        sort=sort
+    )
+
+
+def _get_transactions(
+    db: Session,
+    *,
+    current_user: models.User,
+    page: int = 1,
+    limit: int = 20,
+    category_id: Optional[UUID] = None,
+    transaction_type: Optional[str] = None,
+    sharing_type: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    love_rating: Optional[int] = None,
+    search: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    sort: str = "date",
+    cursor: Optional[str] = None,
+    count: Optional[str] = None
+) -> Any:
+    position = None
+    if cursor is not None:
+        if sort == "relevance":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="関連度順ではカーソルを使用できません"
+            )
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="カーソルが不正です"
+            )
+    if count is None:
+        count = "none" if position is not None else "exact"
+
     # 基本クエリ
     query = db.query(models.Transaction).filter(
         models.Transaction.user_id == current_user.id
@@ -182,25 +215,45 @@ def get_transactions(
         query = query.filter(models.Transaction.transaction_date <= date_to)
     if love_rating:
         query = query.filter(models.Transaction.love_rating == love_rating)
-    if search:
-        query = query.filter(
-            or_(
-                models.Transaction.description.ilike(f"%{search}%"),
-                models.Transaction.location.ilike(f"%{search}%")
-            )
-        )
-    
-    # ページネーション計算
-    skip = (page - 1) * limit
+    search_query = SearchQuery(search, tags)
+    query, rank = apply_search(db, query, search_query)
     
     # 総件数を取得
-    total_count = query.count()
+    total_count = None
+    total_is_estimate = False
+    if count == "exact":
+        total_count = query.count()
+    elif count == "estimated":
+        total_count, exact = estimate_transaction_count(
+            db,
+            current_user.id,
+            category_id=category_id,
+            transaction_type=transaction_type,
+            sharing_type=sharing_type,
+            date_from=date_from,
+            date_to=date_to,
+            exact_filters=not (love_rating or search_query)
+        )
+        total_is_estimate = not exact
     
-    # 関連データを含めて取得
-    transactions = query.options(
+    # 関連データを含めて取得（次のページの有無を判定するため1件多く取得）
+    page_query = query.options(
         joinedload(models.Transaction.category),
         joinedload(models.Transaction.shared_transaction).joinedload(models.SharedTransaction.payer)
-    ).order_by(models.Transaction.transaction_date.desc()).offset(skip).limit(limit).all()
+    )
+    if sort == "relevance" and rank is not None:
+        page_query = page_query.order_by(rank.desc(), *KEYSET_ORDER)
+    else:
+        page_query = page_query.order_by(*KEYSET_ORDER)
+    if position is not None:
+        page_query = page_query.filter(after_cursor(position))
+    else:
+        page_query = page_query.offset((page - 1) * limit)
+    transactions = page_query.limit(limit + 1).all()
+    has_next = len(transactions) > limit
+    transactions = transactions[:limit]
+    # 関連度順の続きはページ番号で取得する
+    next_cursor = encode_cursor(transactions[-1]) if has_next and sort == "date" else None
     
     # 結果を整形
     result = []
@@ -253,71 +306,83 @@ def get_transactions(
         result.append(transaction_dict)
     
     # ページネーション情報を含む結果を返す
-    return {
-        "transactions": result,
-        "pagination": {
+    if position is not None:
+        pagination = {
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "has_next": has_next,
+            "has_prev": True,
+            "total": total_count,
+            "total_is_estimate": total_is_estimate
+        }
+    else:
+        pagination = {
             "page": page,
             "limit": limit,
             "total": total_count,
-            "total_pages": (total_count + limit - 1) // limit,
-            "has_next": page * limit < total_count,
-            "has_prev": page > 1
+            "total_pages": (total_count + limit - 1) // limit if total_count is not None else None,
+            "total_is_estimate": total_is_estimate,
+            "has_next": has_next,
+            "has_prev": page > 1,
+            "next_cursor": next_cursor
         }
+    return {
+        "transactions": result,
+        "pagination": pagination
     }
 
 
 @router.get("/stats/monthly")
-def get_monthly_stats(
+async def get_monthly_stats(
     *,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
     year: int = Query(..., ge=2020, le=2100),
     month: int = Query(..., ge=1, le=12)
 ) -> Any:
     """
     月次統計を取得
     """
-    # 収入合計
-    income_sum = db.query(func.coalesce(func.sum(models.Transaction.amount), 0)).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'income',
-        extract('year', models.Transaction.transaction_date) == year,
-        extract('month', models.Transaction.transaction_date) == month
-    ).scalar()
-    
-    # 支出合計
-    expense_sum = db.query(func.coalesce(func.sum(models.Transaction.amount), 0)).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'expense',
-        extract('year', models.Transaction.transaction_date) == year,
-        extract('month', models.Transaction.transaction_date) == month
-    ).scalar()
-    
-    # 個人支出
-    personal_expense = db.query(func.coalesce(func.sum(models.Transaction.amount), 0)).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'expense',
-        models.Transaction.sharing_type == 'personal',
-        extract('year', models.Transaction.transaction_date) == year,
-        extract('month', models.Transaction.transaction_date) == month
-    ).scalar()
-    
-    # 共有支出
-    shared_expense = db.query(func.coalesce(func.sum(models.Transaction.amount), 0)).filter(
-        models.Transaction.user_id == current_user.id,
-        models.Transaction.transaction_type == 'expense',
-        models.Transaction.sharing_type == 'shared',
-        extract('year', models.Transaction.transaction_date) == year,
-        extract('month', models.Transaction.transaction_date) == month
-    ).scalar()
-    
-    # Love支出
+    return await db.run_sync(
+        _get_monthly_stats,
+        current_user=current_user,
+        year=year,
+        month=month
+    )
+
+
+def _get_monthly_stats(db: Session, *, current_user: models.User, year: int, month: int) -> Any:
+    month_start = date(year, month, 1)
+    next_month_start = month_start + relativedelta(months=1)
+    rollup = models.UserMonthlyRollup
+    is_expense = rollup.transaction_type == 'expense'
+    
+    # 収支・個人/共有支出を月次集計から取得
+    stats = db.query(
+        func.coalesce(func.sum(rollup.total_amount).filter(rollup.transaction_type == 'income'), 0).label('income'),
+        func.coalesce(func.sum(rollup.total_amount).filter(is_expense), 0).label('expense'),
+        func.coalesce(func.sum(rollup.total_amount).filter(
+            and_(is_expense, rollup.sharing_type == 'personal')
+        ), 0).label('personal_expense'),
+        func.coalesce(func.sum(rollup.total_amount).filter(
+            and_(is_expense, rollup.sharing_type == 'shared')
+        ), 0).label('shared_expense')
+    ).filter(
+        rollup.user_id == current_user.id,
+        *month_range_filter(month_start, next_month_start)
+    ).one()
+    income_sum = stats.income
+    expense_sum = stats.expense
+    personal_expense = stats.personal_expense
+    shared_expense = stats.shared_expense
+    
+    # Love支出（Love評価付きの支出）
     love_expense = db.query(func.coalesce(func.sum(models.Transaction.amount), 0)).filter(
         models.Transaction.user_id == current_user.id,
         models.Transaction.transaction_type == 'expense',
         models.Transaction.love_rating.isnot(None),
-        extract('year', models.Transaction.transaction_date) == year,
-        extract('month', models.Transaction.transaction_date) == month
+        models.Transaction.transaction_date >= month_start,
+        models.Transaction.transaction_date < next_month_start
     ).scalar()
     
     return {
@@ -333,15 +398,23 @@ def get_monthly_stats(
 
 
 @router.get("/{transaction_id}", response_model=TransactionWithDetails)
-def get_transaction(
+async def get_transaction(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     transaction_id: UUID,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user_async)
 ) -> Any:
     """
     特定の取引を取得
     """
+    return await db.run_sync(
+        _get_transaction,
+        transaction_id=transaction_id,
+        current_user=current_user
+    )
+
+
+def _get_transaction(db: Session, *, transaction_id: UUID, current_user: models.User) -> Any:
     transaction = db.query(models.Transaction).options(
         joinedload(models.Transaction.category),
         joinedload(models.Transaction.shared_transaction).joinedload(models.SharedTransaction.payer)
@@ -407,16 +480,77 @@ def get_transaction(
 
 @router.post("/", response_model=TransactionWithDetails)
 @limiter.limit(RateLimits.API_WRITE)
-def create_transaction(
+async def create_transaction(
     request: Request,
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     transaction_in: TransactionCreate,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user_async)
 ) -> Any:
     """
     取引を作成
     """
+    receipt_image_url = None
+    if transaction_in.receipt_image:
+        # デコード前に大きすぎる画像を拒否する
+        if len(transaction_in.receipt_image) > MAX_RECEIPT_BASE64_LENGTH:
+            raise HTTPException(
+                status_code=413,
+                detail=f"ファイルサイズが制限を超えています。最大 {MAX_FILE_SIZE // (1024 * 1024)}MB まで"
+            )
+        # デコード・検証・ファイルの書き込みはイベントループを止めないようスレッドプールで実行
+        receipt_image_url = await run_in_threadpool(
+            _save_base64_receipt_image, transaction_in.receipt_image, current_user.id
+        )
+    
+    return await db.run_sync(
+        _create_transaction,
+        transaction_in=transaction_in,
+        current_user=current_user,
+        receipt_image_url=receipt_image_url
+    )
+
+
+def _save_base64_receipt_image(receipt_image: str, user_id: UUID) -> str:
+    """Base64のレシート画像をデコードして保存（保存したURLを返す）"""
+    try:
+        # Base64デコード（入力検証付き）
+        if not receipt_image.strip():
+            raise HTTPException(
+                status_code=400,
+                detail="画像データが空です"
+            )
+        
+        # Base64形式の検証とデコード
+        try:
+            image_data = base64.b64decode(receipt_image)
+        except Exception:
+            raise HTTPException(
+                status_code=400,
+                detail="無効なBase64形式です"
+            )
+        
+        # 画像を保存（セキュアな検証付き）
+        return save_receipt_image(image_data, user_id)
+        
+    except HTTPException:
+        # HTTPExceptionは再発生
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error processing receipt image for user {user_id}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="画像の処理中にエラーが発生しました"
+        )
+
+
+def _create_transaction(
+    db: Session,
+    *,
+    transaction_in: TransactionCreate,
+    current_user: models.User,
+    receipt_image_url: Optional[str] = None
+) -> Any:
     # カテゴリの存在確認
     category = db.query(models.Category).filter(
         models.Category.id == transaction_in.category_id,
@@ -444,45 +578,16 @@ def create_transaction(
         description=transaction_in.description,
         love_rating=transaction_in.love_rating,
         tags=transaction_in.tags,
-        location=transaction_in.location
+        location=transaction_in.location,
+        receipt_image_url=receipt_image_url
     )
     
-    # レシート画像がある場合
-    if transaction_in.receipt_image:
-        try:
-            # Base64デコード（入力検証付き）
-            if not transaction_in.receipt_image.strip():
-                raise HTTPException(
-                    status_code=400,
-                    detail="画像データが空です"
-                )
-            
-            # Base64形式の検証とデコード
-            try:
-                image_data = base64.b64decode(transaction_in.receipt_image)
-            except Exception:
-                raise HTTPException(
-                    status_code=400,
-                    detail="無効なBase64形式です"
-                )
-            
-            # 画像を保存（セキュアな検証付き）
-            receipt_url = save_receipt_image(image_data, current_user.id)
-            transaction.receipt_image_url = receipt_url
-            
-        except HTTPException:
-            # HTTPExceptionは再発生
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error processing receipt image for user {current_user.id}: {str(e)}")
-            raise HTTPException(
-                status_code=500,
-                detail="画像の処理中にエラーが発生しました"
-            )
-    
     db.add(transaction)
     db.flush()  # IDを取得するため
     
+    # 月次集計に反映
+    add_transaction_to_rollups(db, transaction)
+    
     # 共有取引の場合
     if transaction_in.sharing_type == 'shared' and transaction_in.shared_info:
         # パートナーシップの確認
@@ -517,25 +622,39 @@ def create_transaction(
     db.commit()
     db.refresh(transaction)
     
-    # Love Goal達成チェック（Loveカテゴリの支出の場合）
-    if transaction.transaction_type == 'expense' and category.is_love_category:
-        check_love_goals_achievement(db, current_user)
+    # Love Goal達成・予算アラートの判定はバックグラウンドで実行
+    notify_transactions_changed(current_user.id)
     
     # 取得して返す
-    return get_transaction(db=db, transaction_id=transaction.id, current_user=current_user)
+    return _get_transaction(db=db, transaction_id=transaction.id, current_user=current_user)
 
 
 @router.put("/{transaction_id}", response_model=TransactionWithDetails)
-def update_transaction(
+async def update_transaction(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     transaction_id: UUID,
     transaction_update: TransactionUpdate,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user_async)
 ) -> Any:
     """
     取引を更新
     """
+    return await db.run_sync(
+        _update_transaction,
+        transaction_id=transaction_id,
+        transaction_update=transaction_update,
+        current_user=current_user
+    )
+
+
+def _update_transaction(
+    db: Session,
+    *,
+    transaction_id: UUID,
+    transaction_update: TransactionUpdate,
+    current_user: models.User
+) -> Any:
     # 取引を取得
     transaction = db.query(models.Transaction).filter(
         models.Transaction.id == transaction_id,
@@ -549,10 +668,14 @@ def update_transaction(
         )
     
     # 更新
+    rollup_before = rollup_snapshot(transaction)
     update_data = transaction_update.dict(exclude_unset=True, exclude={'shared_info'})
     for field, value in update_data.items():
         setattr(transaction, field, value)
     
+    # 月次集計に差分を反映
+    update_transaction_rollups(db, rollup_before, transaction)
+    
     # 共有取引情報の更新
     if transaction.sharing_type == 'shared' and transaction_update.shared_info:
         shared_transaction = db.query(models.SharedTransaction).filter(
@@ -577,21 +700,31 @@ def update_transaction(
     db.commit()
     db.refresh(transaction)
     
-    return get_transaction(db=db, transaction_id=transaction_id, current_user=current_user)
+    notify_transactions_changed(current_user.id)
+    
+    return _get_transaction(db=db, transaction_id=transaction_id, current_user=current_user)
 
 
 @router.delete("/{transaction_id}")
 @limiter.limit(RateLimits.API_DELETE)
-def delete_transaction(
+async def delete_transaction(
     request: Request,
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     transaction_id: UUID,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user_async)
 ) -> Any:
     """
     取引を削除
     """
+    return await db.run_sync(
+        _delete_transaction,
+        transaction_id=transaction_id,
+        current_user=current_user
+    )
+
+
+def _delete_transaction(db: Session, *, transaction_id: UUID, current_user: models.User) -> Any:
     transaction = db.query(models.Transaction).filter(
         models.Transaction.id == transaction_id,
         models.Transaction.user_id == current_user.id
@@ -603,7 +736,10 @@ def delete_transaction(
             detail="Transaction not found"
         )
     
+    remove_transaction_from_rollups(db, transaction)
     db.delete(transaction)
     db.commit()
     
+    notify_transactions_changed(current_user.id)
+    
     return {"message": "取引を削除しました"}
\ No newline at end of file
@@ -1,5 +1,7 @@
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 import os
@@ -7,8 +9,7 @@ import uuid
 from PIL import Image
 import io
 
-from app.db.session import get_db
-from app.core.deps import get_current_user
+from app.core.deps import get_async_db, get_db, get_current_user, get_current_user_async
 from app.models.user import User
 from app.schemas.user import (
     UserUpdate, 
@@ -46,10 +47,8 @@ def update_profile(
     current_user: User = Depends(get_current_user)
 ):
     """プロフィール情報を更新"""
-    # current_userをセッションに再アタッチする必要がある
-    user = db.query(User).filter(User.id == current_user.id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    # current_userは同じセッションに読み込み済み
+    user = current_user
     
     # 更新可能なフィールドのみ更新
     update_data = profile_update.model_dump(exclude_unset=True)
@@ -67,8 +66,8 @@ def update_profile(
 @router.post("/profile-image")
 async def upload_profile_image(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """プロフィール画像をアップロード"""
     # ファイルサイズチェック
@@ -87,48 +86,52 @@ async def upload_profile_image(
             detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
         )
     
-    # 画像の検証と最適化
+    # 画像の変換・ファイルの読み書きはイベントループを止めないようスレッドプールで実行
     try:
-        image = Image.open(io.BytesIO(contents))
-        
-        # 画像サイズの最適化（最大1024x1024）
-        max_size = (1024, 1024)
-        image.thumbnail(max_size, Image.Resampling.LANCZOS)
-        
-        # JPEGに変換して保存
-        file_name = f"{current_user.id}_{uuid.uuid4()}.jpg"
-        file_path = os.path.join(UPLOAD_DIR, file_name)
-        
-        # RGBモードに変換（透過PNGなどの対応）
-        if image.mode in ('RGBA', 'LA', 'P'):
-            rgb_image = Image.new('RGB', image.size, (255, 255, 255))
-            rgb_image.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-            image = rgb_image
-        
-        image.save(file_path, "JPEG", quality=85, optimize=True)
-        
-        # 古い画像を削除
-        if current_user.profile_image_url:
-            old_path = current_user.profile_image_url.replace("/uploads/", "uploads/")
-            if os.path.exists(old_path):
-                os.remove(old_path)
-        
-        # URLを保存
-        # current_userをセッションに再アタッチする
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        user.profile_image_url = f"/{file_path}"
-        db.commit()
-        
-        return {"profile_image_url": user.profile_image_url}
-        
+        file_path = await run_in_threadpool(
+            _save_profile_image, contents, current_user.id, current_user.profile_image_url
+        )
     except Exception as e:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid image file: {str(e)}"
         )
+    
+    # URLを保存
+    profile_image_url = f"/{file_path}"
+    current_user.profile_image_url = profile_image_url
+    await db.commit()
+    
+    return {"profile_image_url": profile_image_url}
+
+
+def _save_profile_image(contents: bytes, user_id: uuid.UUID, old_image_url: Optional[str]) -> str:
+    """画像の検証と最適化を行って保存し、古い画像を削除（保存したパスを返す）"""
+    image = Image.open(io.BytesIO(contents))
+    
+    # 画像サイズの最適化（最大1024x1024）
+    max_size = (1024, 1024)
+    image.thumbnail(max_size, Image.Resampling.LANCZOS)
+    
+    # JPEGに変換して保存
+    file_name = f"{user_id}_{uuid.uuid4()}.jpg"
+    file_path = os.path.join(UPLOAD_DIR, file_name)
+    
+    # RGBモードに変換（透過PNGなどの対応）
+    if image.mode in ('RGBA', 'LA', 'P'):
+        rgb_image = Image.new('RGB', image.size, (255, 255, 255))
+        rgb_image.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
+        image = rgb_image
+    
+    image.save(file_path, "JPEG", quality=85, optimize=True)
+    
+    # 古い画像を削除
+    if old_image_url:
+        old_path = old_image_url.replace("/uploads/", "uploads/")
+        if os.path.exists(old_path):
+            os.remove(old_path)
+    
+    return file_path
 
 
 @router.get("/notification-settings", response_model=NotificationSettings)
@@ -155,12 +158,10 @@ def update_notification_settings(
     current_user: User = Depends(get_current_user)
 ):
     """通知設定を更新"""
-    # current_userをセッションに再アタッチする
-    user = db.query(User).filter(User.id == current_user.id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = current_user
     
-    current_settings = user.notification_settings or {}
+    # JSONBの変更を検知させるため、コピーを更新して再代入する
+    current_settings = dict(user.notification_settings or {})
     
     # 更新されたフィールドのみ上書き
     update_data = settings_update.model_dump(exclude_unset=True)
@@ -194,11 +195,7 @@ def change_password(
         )
     
     # パスワードを更新
-    # current_userをセッションに再アタッチする
-    user = db.query(User).filter(User.id == current_user.id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
+    user = current_user
     user.hashed_password = get_password_hash(password_data.new_password)
     db.commit()
     
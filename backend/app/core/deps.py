@@ -1,13 +1,22 @@
-from typing import Generator, Optional
+from typing import AsyncGenerator, Generator, Optional
+from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core import security
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.user_cache import load_user
+from app.db.session import (
+    USER_ID_KEY,
+    SessionLocal,
+    get_async_db,
+    open_read_session,
+    set_statement_timeout,
+)
 from app import schemas, models
 
 
@@ -24,10 +33,8 @@ def get_db() -> Generator:
         db.close()
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> models.User:
+def decode_access_token(token: str) -> UUID:
+    """アクセストークンを検証してユーザーIDを取得"""
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -47,12 +54,63 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(models.User).filter(models.User.id == token_data.sub).first()
+    try:
+        return UUID(str(token_data.sub))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> models.User:
+    user_id = decode_access_token(token)
+    
+    # キャッシュ済みのユーザーはSELECTを発行せずにセッションへアタッチする
+    user = load_user(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    # 書き込みをコミットしたユーザーの読み取りをしばらくプライマリに固定する
+    db.info[USER_ID_KEY] = user.id
+    return user
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+) -> models.User:
+    """非同期ルート用の get_current_user（ユーザーはリクエストの AsyncSession にアタッチされる）"""
+    user_id = decode_access_token(token)
+    
+    user = await db.run_sync(load_user, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    db.info[USER_ID_KEY] = user.id
     return user
 
 
+async def get_read_db(token: str = Depends(oauth2_scheme)) -> AsyncGenerator[AsyncSession, None]:
+    """
+    読み取り専用ルート用のセッション（レプリカがあればラウンドロビンで振り分ける）
+
+    ユーザーが直前に書き込んだ場合は、レプリカの遅延で古い値を返さないようプライマリを使用する。
+    """
+    db = await open_read_session(decode_access_token(token))
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def use_report_timeouts(db: AsyncSession = Depends(get_read_db)) -> None:
+    """レポート系のルートでは集計が長くなるため statement_timeout を延ばす"""
+    await db.run_sync(set_statement_timeout, "report")
+
+
 def get_current_active_user(
     current_user: models.User = Depends(get_current_user),
 ) -> models.User:
@@ -0,0 +1,164 @@
+"""
+イベントループの停止（ブロッキング）の検出
+
+async def のルートで同期的なDBアクセス・画像処理などを行うと、その間はワーカーの全てのリクエストが止まる。
+
+- ハートビート: イベントループ上で interval ごとに起き、予定より遅れた時間（ラグ）を記録する
+- 監視スレッド: ハートビートが threshold を超えて止まっている間に、イベントループのスレッドのスタックと
+  実行中のリクエストのルートを取得する
+
+停止が終わると、ルートごとの停止時間をメトリクスに記録し、スタックをログに出力する。
+リクエストは SecurityMiddleware が track_request で登録する。
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Deque, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# リクエストの処理中でない停止（起動処理・バックグラウンドタスクなど）のルート
+NO_REQUEST_ROUTE = "none"
+# 停止が短く、監視スレッドが確認する前に終わった場合のルート
+UNKNOWN_ROUTE = "unknown"
+
+# スタックに含めるフレーム数（イベントループ内部の呼び出しを除いた末尾）
+MAX_STACK_FRAMES = 30
+
+# 処理中のリクエスト（タスク → ASGIのscope）
+_request_scopes: "WeakKeyDictionary[asyncio.Task, dict]" = WeakKeyDictionary()
+
+
+def track_request(scope: dict) -> None:
+    """現在のタスクで処理中のリクエストを登録（停止の原因のルートの特定に使う）"""
+    task = asyncio.current_task()
+    if task is not None:
+        _request_scopes[task] = scope
+
+
+def untrack_request() -> None:
+    task = asyncio.current_task()
+    if task is not None:
+        _request_scopes.pop(task, None)
+
+
+@dataclass
+class LoopStall:
+    """しきい値を超えたイベントループの停止"""
+    route: str
+    seconds: float
+    stack: str
+
+
+class LoopLagMonitor:
+    """イベントループの遅れ・停止を記録する"""
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.05, history: int = 100):
+        self.threshold = threshold
+        self.interval = interval
+        # 直近の停止（テスト・調査用）
+        self.stalls: Deque[LoopStall] = deque(maxlen=history)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._last_beat = 0.0
+        # 監視スレッドが取得した停止中の情報（ハートビートの時刻, ルート, スタック）
+        self._captured: Optional[Tuple[float, str, str]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat_task is not None
+
+    def start(self) -> None:
+        """現在のイベントループの監視を開始"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._captured = None
+        self._stopped.clear()
+        self._heartbeat_task = self._loop.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._stopped.set()
+        self._heartbeat_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._heartbeat_task
+        self._heartbeat_task = None
+        self._watchdog.join()
+        self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        # 前回のハートビート（初回は開始時刻）から interval 後に起きる予定の時刻との差をラグとする
+        while True:
+            beat = self._last_beat
+            await asyncio.sleep(max(beat + self.interval - time.monotonic(), 0.0))
+            now = time.monotonic()
+            lag = max(now - beat - self.interval, 0.0)
+            metrics.EVENT_LOOP_LAG.observe(lag)
+            if lag >= self.threshold:
+                self._record_stall(beat, lag)
+            self._last_beat = now
+
+    def _watch(self) -> None:
+        # しきい値より短い間隔で確認し、停止している間にスタックを取得する
+        poll = min(self.interval, self.threshold / 2)
+        while not self._stopped.wait(poll):
+            beat = self._last_beat
+            blocked = time.monotonic() - beat - self.interval
+            if blocked >= self.threshold and (self._captured is None or self._captured[0] != beat):
+                route, stack = self._capture()
+                self._captured = (beat, route, stack)
+
+    def _capture(self) -> Tuple[str, str]:
+        """イベントループのスレッドで実行中のルートとスタック"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)[-MAX_STACK_FRAMES:]) if frame is not None else ""
+        route = NO_REQUEST_ROUTE
+        try:
+            task = asyncio.current_task(self._loop)
+            scope = _request_scopes.get(task) if task is not None else None
+        except RuntimeError:
+            # 停止が終わり、イベントループのスレッドが登録を変更している
+            scope = None
+        if scope is not None:
+            route = f"{scope['method']} {metrics.route_template(scope)}"
+        return route, stack
+
+    def _record_stall(self, beat: float, seconds: float) -> None:
+        captured = self._captured
+        self._captured = None
+        if captured is not None and captured[0] == beat:
+            _, route, stack = captured
+        else:
+            route, stack = UNKNOWN_ROUTE, ""
+        stall = LoopStall(route=route, seconds=seconds, stack=stack)
+        self.stalls.append(stall)
+        metrics.EVENT_LOOP_STALLS.labels(route).observe(seconds)
+        logger.warning(
+            "Event loop blocked for %.0f ms (route: %s)\n%s",
+            seconds * 1000, route, stack or "(stack not captured)"
+        )
+
+
+loop_monitor = LoopLagMonitor(
+    threshold=settings.LOOP_LAG_THRESHOLD_MS / 1000,
+    interval=settings.LOOP_LAG_INTERVAL_MS / 1000
+)
@@ -0,0 +1,173 @@
+"""
+Prometheusのメトリクス
+
+- HTTP: ルート（パスのテンプレート）ごとのレイテンシ・レスポンスサイズ、処理中のリクエスト数
+- DB: リクエストごとのクエリ数・DB時間（SQLAlchemyのイベントで計測）
+- コネクションプール: チェックアウト数・オーバーフロー数など（/metrics の取得時に読み取る）
+- イベントループ: ハートビートの遅れ、しきい値を超えた停止（LoopLagMonitor が記録する）
+
+リクエストごとの集計は SecurityMiddleware が開始する。
+"""
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# ルートに一致しなかったリクエストのラベル（パスをそのまま使うとラベルが際限なく増えるため）
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTPリクエストの処理時間",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "処理中のHTTPリクエスト数",
+    ["method"],
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTPレスポンスのサイズ",
+    ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "リクエストごとのSQLクエリ数",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_duration_seconds",
+    "リクエストごとのSQLクエリの合計実行時間",
+    ["method", "route"],
+)
+DB_QUERIES = Counter(
+    "db_queries",
+    "実行されたSQLクエリ数（リクエスト外を含む）",
+)
+SUSPICIOUS_REQUESTS = Counter(
+    "suspicious_requests",
+    "疑わしいパターンを検出したリクエスト数",
+    ["attack_type"],
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "イベントループのハートビートの遅れ",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+EVENT_LOOP_STALLS = Histogram(
+    "event_loop_stall_duration_seconds",
+    "しきい値を超えたイベントループの停止（停止中に処理していたルートごと）",
+    ["route"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+
+def route_template(scope: dict) -> str:
+    """
+    ルートのパスのテンプレートを取得（ラベルの種類を抑えるため、IDなどを含む実際のパスは使わない）
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    # include_router のプレフィックスを含まないテンプレートの場合は、実際のパスから補う
+    depth = template.rstrip("/").count("/")
+    segments = scope["path"].rstrip("/").split("/")
+    return "/".join(segments[:len(segments) - depth]) + template
+
+
+@dataclass
+class RequestDBStats:
+    """リクエスト内のクエリ数・DB時間"""
+    queries: int = 0
+    seconds: float = 0.0
+
+
+# スレッドプール・run_sync のグリーンレットにもコンテキストが引き継がれる
+_request_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+
+def start_request_stats() -> RequestDBStats:
+    """現在のリクエストのDB集計を開始"""
+    stats = RequestDBStats()
+    _request_db_stats.set(stats)
+    return stats
+
+
+def current_request_stats() -> Optional[RequestDBStats]:
+    return _request_db_stats.get()
+
+
+def observe_request(
+    method: str,
+    route: str,
+    status: int,
+    seconds: float,
+    response_size: Optional[int],
+    db_stats: RequestDBStats
+) -> None:
+    """リクエストの計測値を記録"""
+    REQUEST_LATENCY.labels(method, route, str(status)).observe(seconds)
+    if response_size is not None:
+        RESPONSE_SIZE.labels(method, route).observe(response_size)
+    REQUEST_DB_QUERIES.labels(method, route).observe(db_stats.queries)
+    REQUEST_DB_SECONDS.labels(method, route).observe(db_stats.seconds)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started_at"].pop()
+    DB_QUERIES.inc()
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += time.perf_counter() - started
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_query_timer(exception_context):
+    # 失敗したクエリは after_cursor_execute が呼ばれないため、開始時刻を破棄する
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started_at"):
+        connection.info["query_started_at"].pop()
+
+
+class PoolCollector:
+    """コネクションプールの状態を /metrics の取得時に読み取る"""
+
+    def collect(self):
+        from app.db.session import get_pool_status
+
+        gauges = {
+            "size": GaugeMetricFamily("db_pool_size", "プールの常時接続数", labels=["pool"]),
+            "checked_out": GaugeMetricFamily("db_pool_checked_out", "チェックアウト中の接続数", labels=["pool"]),
+            "overflow": GaugeMetricFamily("db_pool_overflow", "オーバーフローの接続数", labels=["pool"]),
+        }
+        counters = {
+            "checkouts": CounterMetricFamily("db_pool_checkouts", "チェックアウト回数", labels=["pool"]),
+            "timeouts": CounterMetricFamily("db_pool_checkout_timeouts", "チェックアウトのタイムアウト回数", labels=["pool"]),
+            "wait_seconds_total": CounterMetricFamily(
+                "db_pool_checkout_wait_seconds", "チェックアウトの待ち時間の合計", labels=["pool"]
+            ),
+        }
+        for status in get_pool_status():
+            for key, metric in {**gauges, **counters}.items():
+                metric.add_metric([status["pool"]], status[key])
+        yield from gauges.values()
+        yield from counters.values()
+
+
+REGISTRY.register(PoolCollector())
@@ -0,0 +1,167 @@
+"""
+リクエスト単位のSQLプロファイラ
+
+リクエスト中に実行されたSQLを正規化した形（リテラル・パラメータを ? に置き換えたもの）ごとに集計し、
+同じ形のクエリが繰り返し実行されている箇所（N+1）を検出する。
+結果は Server-Timing ヘッダー・JSONのログ行として出力する（SecurityMiddleware から使用）。
+
+有効にする方法:
+- SQL_PROFILING_ENABLED: 全てのリクエストを計測
+- SQL_PROFILING_HEADER_ENABLED: X-SQL-Profile ヘッダーを付けたリクエストのみ計測
+"""
+import re
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+PROFILE_HEADER = "x-sql-profile"
+# Server-Timing に出力するクエリの形の数（合計時間の長い順）
+SERVER_TIMING_SHAPES = 5
+SHAPE_DESCRIPTION_LENGTH = 80
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PARAMETER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+_TYPE_CAST = re.compile(r"::\w+(?:\[\])?")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """SQLをパラメータ・リテラルの値に依存しない形に正規化"""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PARAMETER.sub("?", shape)
+    shape = _TYPE_CAST.sub("", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _VALUE_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryShape:
+    """同じ形のクエリの実行回数・合計時間"""
+    shape: str
+    count: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class SQLProfile:
+    """リクエスト中に実行されたSQLの集計"""
+    shapes: "OrderedDict[str, QueryShape]" = field(default_factory=OrderedDict)
+    total_queries: int = 0
+    total_seconds: float = 0.0
+
+    def record(self, statement: str, seconds: float) -> None:
+        shape = normalize_statement(statement)
+        entry = self.shapes.get(shape)
+        if entry is None:
+            entry = self.shapes[shape] = QueryShape(shape)
+        entry.count += 1
+        entry.seconds += seconds
+        self.total_queries += 1
+        self.total_seconds += seconds
+
+    def n_plus_one(self, threshold: Optional[int] = None) -> List[QueryShape]:
+        """同じ形のクエリが threshold 回以上実行されたもの（N+1の疑い）"""
+        if threshold is None:
+            threshold = settings.SQL_PROFILING_N_PLUS_ONE_THRESHOLD
+        return [entry for entry in self.shapes.values() if entry.count >= threshold]
+
+    def server_timing(self) -> str:
+        """Server-Timing ヘッダーの値"""
+        metrics = [
+            _timing_metric("db", self.total_seconds, f"{self.total_queries} queries")
+        ]
+        slowest = sorted(self.shapes.values(), key=lambda entry: entry.seconds, reverse=True)
+        for index, entry in enumerate(slowest[:SERVER_TIMING_SHAPES], start=1):
+            metrics.append(_timing_metric(
+                f"sql-{index}", entry.seconds, f"{entry.count}x {entry.shape[:SHAPE_DESCRIPTION_LENGTH]}"
+            ))
+        for index, entry in enumerate(self.n_plus_one(), start=1):
+            metrics.append(_timing_metric(
+                f"n-plus-one-{index}", entry.seconds, f"{entry.count}x {entry.shape[:SHAPE_DESCRIPTION_LENGTH]}"
+            ))
+        return ", ".join(metrics)
+
+    def to_dict(self) -> dict:
+        return {
+            "queries": self.total_queries,
+            "db_ms": round(self.total_seconds * 1000, 3),
+            "shapes": [
+                {"shape": entry.shape, "count": entry.count, "ms": round(entry.seconds * 1000, 3)}
+                for entry in self.shapes.values()
+            ],
+            "n_plus_one": [entry.shape for entry in self.n_plus_one()],
+        }
+
+
+def _timing_metric(name: str, seconds: float, description: str) -> str:
+    # ヘッダーに使えない文字（引用符・非ASCII）を除く
+    description = description.replace("\\", "").replace('"', "'").encode("ascii", "replace").decode()
+    return f'{name};dur={seconds * 1000:.2f};desc="{description}"'
+
+
+_active_profile: ContextVar[Optional[SQLProfile]] = ContextVar("sql_profile", default=None)
+
+# 計測結果の購読者（pytestのクエリバジェットの検証などで使用）
+_subscribers: List[Callable[[str, SQLProfile], None]] = []
+
+
+def should_profile(headers) -> bool:
+    """リクエストを計測するか"""
+    if settings.SQL_PROFILING_ENABLED:
+        return True
+    return settings.SQL_PROFILING_HEADER_ENABLED and headers.get(PROFILE_HEADER, "") not in ("", "0")
+
+
+def start_profile() -> SQLProfile:
+    """現在のコンテキスト（リクエスト）の計測を開始"""
+    profile = SQLProfile()
+    _active_profile.set(profile)
+    return profile
+
+
+@contextmanager
+def profile_queries() -> Iterator[SQLProfile]:
+    """ブロック内で実行されたSQLを計測"""
+    profile = SQLProfile()
+    token = _active_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _active_profile.reset(token)
+
+
+def subscribe(callback: Callable[[str, SQLProfile], None]) -> Callable[[], None]:
+    """計測結果の購読を開始（購読を解除する関数を返す）"""
+    _subscribers.append(callback)
+    return lambda: _subscribers.remove(callback)
+
+
+def publish(endpoint: str, profile: SQLProfile) -> None:
+    """リクエストの計測結果を購読者に通知"""
+    for callback in list(_subscribers):
+        callback(endpoint, profile)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    if _active_profile.get() is not None and context is not None:
+        context._sql_profile_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    profile = _active_profile.get()
+    started = getattr(context, "_sql_profile_started", None)
+    if profile is not None and started is not None:
+        profile.record(statement, time.perf_counter() - started)
@@ -0,0 +1,180 @@
+"""
+プロセス内タスクキュー
+
+キーごとにイベントをまとめ（コアレス）、一定時間後にハンドラを1回だけ実行する。
+バックエンドは以下から選択する:
+
+- thread: ディスパッチャスレッドとスレッドプールで実行（デフォルト）
+- celery: 実行をCeleryワーカーに委譲（app.worker を参照）
+- sync: 自動実行しない。drain() で呼び出し元のスレッドで同期的に実行（テスト用）
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('thread', 'celery', 'sync')
+
+
+class CoalescingTaskQueue:
+    """キー単位でイベントをまとめて実行するタスクキュー"""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Hashable], None],
+        backend: str = 'thread',
+        workers: int = 2,
+        coalesce_seconds: float = 0.5,
+        celery_task_name: Optional[str] = None
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown task queue backend: {backend}")
+        if backend == 'celery' and not celery_task_name:
+            raise ValueError("celery_task_name is required for the celery backend")
+
+        self.name = name
+        self.handler = handler
+        self.backend = backend
+        self.workers = workers
+        self.coalesce_seconds = coalesce_seconds
+        self.celery_task_name = celery_task_name
+
+        # キー -> 実行予定時刻（time.monotonic）
+        self._pending: Dict[Hashable, float] = {}
+        # 実行中のキー（同じキーのハンドラを並行して実行しない）
+        self._running: Set[Hashable] = set()
+        self._condition = threading.Condition()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+    def enqueue(self, key: Hashable) -> None:
+        """
+        キーのイベントを登録
+
+        実行待ちのキーに対する再登録は無視されるため、短時間に連続した
+        イベントはハンドラ1回の実行にまとめられる。
+        """
+        with self._condition:
+            if self._closed or key in self._pending:
+                return
+            self._pending[key] = time.monotonic() + self.coalesce_seconds
+            if self.backend != 'sync':
+                self._ensure_dispatcher()
+                self._condition.notify()
+
+    def pending_count(self) -> int:
+        """実行待ちのキー数"""
+        with self._condition:
+            return len(self._pending)
+
+    def drain(self, handler: Optional[Callable[[Hashable], None]] = None) -> int:
+        """
+        実行待ちのキーを呼び出し元のスレッドで即時に実行
+
+        Args:
+            handler: 指定した場合は登録済みのハンドラの代わりに使用する
+
+        Returns:
+            実行したキーの数
+        """
+        handler = handler or self.handler
+        with self._condition:
+            keys = list(self._pending)
+            self._pending.clear()
+
+        for key in keys:
+            self._run(handler, key)
+        return len(keys)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """キューを停止（実行待ちのキーは wait=True の場合に実行してから終了）"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+        if wait:
+            self._dispatch_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop,
+                name=f"{self.name}-dispatcher",
+                daemon=True
+            )
+            self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        """実行予定時刻を過ぎたキーを取り出して実行に回す"""
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                waiting = {
+                    key: due_at for key, due_at in self._pending.items()
+                    if key not in self._running
+                }
+                due = [key for key, due_at in waiting.items() if due_at <= now]
+                for key in due:
+                    del self._pending[key]
+                    self._running.add(key)
+                if not due:
+                    # 実行中のキーは完了通知で再評価する
+                    timeout = max(min(waiting.values()) - now, 0) if waiting else None
+                    self._condition.wait(timeout)
+                    continue
+
+            for key in due:
+                self._dispatch(key)
+
+    def _dispatch_all(self) -> None:
+        with self._condition:
+            keys = list(self._pending)
+            self._pending.clear()
+        for key in keys:
+            self._dispatch(key)
+
+    def _dispatch(self, key: Hashable) -> None:
+        if self.backend == 'sync':
+            self._run(self.handler, key)
+            return
+
+        if self.backend == 'celery':
+            from app.worker import celery_app
+
+            try:
+                celery_app.send_task(self.celery_task_name, args=[str(key)])
+            except Exception:
+                logger.exception(f"Task queue {self.name} failed to send {key} to celery")
+            finally:
+                self._finish(key)
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix=self.name
+            )
+        self._executor.submit(self._run, self.handler, key)
+
+    def _run(self, handler: Callable[[Hashable], None], key: Hashable) -> None:
+        try:
+            handler(key)
+        except Exception:
+            logger.exception(f"Task queue {self.name} failed for {key}")
+        finally:
+            self._finish(key)
+
+    def _finish(self, key: Hashable) -> None:
+        with self._condition:
+            self._running.discard(key)
+            self._condition.notify()
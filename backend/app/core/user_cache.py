@@ -0,0 +1,206 @@
+"""
+認証ユーザーのキャッシュ
+
+get_current_user がリクエストごとに発行していたユーザー取得のSELECTを省略するため、
+ユーザーの列の値をユーザーIDごとに短期間キャッシュする。バックエンドは以下から選択する:
+
+- memory: プロセス内のLRUキャッシュ（デフォルト）
+- redis: 複数ワーカー間で共有（REDIS_URL を使用）
+- none: キャッシュしない
+
+ユーザーの更新・削除はORMのイベントで検知し、コミット後にキャッシュを破棄する。
+パスワードハッシュはキャッシュせず、参照時に読み込む。
+"""
+import copy
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('memory', 'redis', 'none')
+# キャッシュしない列（参照時にDBから読み込む）
+EXCLUDED_COLUMNS = {'hashed_password'}
+CACHED_COLUMNS = [
+    column for column in User.__table__.columns
+    if column.key not in EXCLUDED_COLUMNS
+]
+
+# コミット待ちの破棄対象ユーザーIDを保持する Session.info のキー
+_PENDING_KEY = 'user_cache_invalidations'
+
+
+def user_snapshot(user: User) -> Dict[str, Any]:
+    """キャッシュするユーザーの列の値を取得"""
+    return {column.key: getattr(user, column.key) for column in CACHED_COLUMNS}
+
+
+def _encode(snapshot: Dict[str, Any]) -> str:
+    def default(value):
+        if isinstance(value, (UUID, Decimal)):
+            return str(value)
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        raise TypeError(f"Cannot serialize {type(value)}")
+
+    return json.dumps(snapshot, default=default)
+
+
+def _decode(payload: str) -> Dict[str, Any]:
+    raw = json.loads(payload)
+    snapshot = {}
+    for column in CACHED_COLUMNS:
+        value = raw.get(column.key)
+        if value is not None:
+            try:
+                python_type = column.type.python_type
+            except NotImplementedError:
+                python_type = None
+            if python_type is UUID:
+                value = UUID(value)
+            elif python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            elif python_type is Decimal:
+                value = Decimal(value)
+        snapshot[column.key] = value
+    return snapshot
+
+
+class MemoryUserCacheBackend:
+    """プロセス内のLRUキャッシュ"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self._cache = TTLCache(ttl_seconds, max_entries)
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        snapshot = self._cache.get(user_id)
+        # JSONの列を変更されてもキャッシュに影響しないようにコピーを返す
+        return copy.deepcopy(snapshot) if snapshot is not None else None
+
+    def set(self, user_id: str, snapshot: Dict[str, Any]) -> None:
+        self._cache.set(user_id, copy.deepcopy(snapshot))
+
+    def delete(self, user_id: str) -> None:
+        self._cache.delete(user_id)
+
+
+class RedisUserCacheBackend:
+    """Redisのキャッシュ（Redisの障害時はキャッシュなしとして動作）"""
+
+    key_prefix = 'user:'
+
+    def __init__(self, url: str, ttl_seconds: int):
+        import redis
+
+        self.ttl_seconds = ttl_seconds
+        self._client = redis.Redis.from_url(url, socket_timeout=0.1)
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            payload = self._client.get(self.key_prefix + user_id)
+        except Exception:
+            logger.warning("User cache lookup failed", exc_info=True)
+            return None
+        return _decode(payload) if payload else None
+
+    def set(self, user_id: str, snapshot: Dict[str, Any]) -> None:
+        try:
+            self._client.setex(self.key_prefix + user_id, self.ttl_seconds, _encode(snapshot))
+        except Exception:
+            logger.warning("User cache store failed", exc_info=True)
+
+    def delete(self, user_id: str) -> None:
+        try:
+            self._client.delete(self.key_prefix + user_id)
+        except Exception:
+            logger.warning("User cache invalidation failed", exc_info=True)
+
+
+class NullUserCacheBackend:
+    """キャッシュしない"""
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def set(self, user_id: str, snapshot: Dict[str, Any]) -> None:
+        pass
+
+    def delete(self, user_id: str) -> None:
+        pass
+
+
+def create_backend(backend: str):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown user cache backend: {backend}")
+    if backend == 'none' or settings.USER_CACHE_TTL_SECONDS <= 0:
+        return NullUserCacheBackend()
+    if backend == 'redis':
+        return RedisUserCacheBackend(settings.REDIS_URL, settings.USER_CACHE_TTL_SECONDS)
+    return MemoryUserCacheBackend(settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MAX_ENTRIES)
+
+
+user_cache = create_backend(settings.USER_CACHE_BACKEND)
+
+
+def invalidate_user(user_id: UUID) -> None:
+    """ユーザーのキャッシュを破棄"""
+    user_cache.delete(str(user_id))
+
+
+def load_user(db: Session, user_id: UUID) -> Optional[User]:
+    """
+    ユーザーを取得（セッション内・キャッシュにあればSELECTを発行しない）
+
+    キャッシュから復元したユーザーはセッションにアタッチされるため、
+    通常の取得結果と同じように更新・関連の参照ができる。
+    """
+    user = db.identity_map.get(identity_key(User, user_id))
+    if user is not None:
+        return user
+
+    snapshot = user_cache.get(str(user_id))
+    if snapshot is not None:
+        user = User(**snapshot)
+        # 読み込み済みの永続オブジェクトとして扱う（未設定の列は参照時に読み込まれる）
+        make_transient_to_detached(user)
+        db.add(user)
+        return user
+
+    user = db.get(User, user_id)
+    if user is not None:
+        user_cache.set(str(user_id), user_snapshot(user))
+    return user
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _record_user_change(mapper, connection, target: User) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+    # コミット前に他のリクエストが古い値を読み込まないよう、変更時点でも破棄する
+    invalidate_user(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed_users(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -7,4 +7,5 @@ from app.models.category import Category  # noqa
 from app.models.transaction import Transaction, SharedTransaction  # noqa
 from app.models.budget import Budget  # noqa
 from app.models.password_reset import PasswordReset  # noqa
-from app.models.email_verification import EmailVerification  # noqa
\ No newline at end of file
+from app.models.email_verification import EmailVerification  # noqa
+from app.models.user_monthly_rollup import UserMonthlyRollup  # noqa
\ No newline at end of file
@@ -1,12 +1,249 @@
-from typing import Generator
-from sqlalchemy import create_engine
+import itertools
+import logging
+import time
+from typing import AsyncGenerator, Generator, List, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 
 from app.core.config import settings
+from app.db import write_pins
+from app.db.pool import TimedAsyncAdaptedQueuePool, TimedQueuePool, attach_metrics
+
+# ルートの種類ごとの statement_timeout（ミリ秒）。default は接続時に設定される
+STATEMENT_TIMEOUTS_MS = {
+    "default": settings.DB_STATEMENT_TIMEOUT_MS,
+    "report": settings.DB_REPORT_STATEMENT_TIMEOUT_MS,
+}
+# トランザクション開始時に適用する statement_timeout を保持する Session.info のキー
+STATEMENT_TIMEOUT_KEY = "statement_timeout_ms"
+# リクエストのユーザーID・書き込みの有無を保持する Session.info のキー（read-your-writes 用）
+USER_ID_KEY = "user_id"
+_HAS_WRITES_KEY = "has_writes"
+
+logger = logging.getLogger(__name__)
+
+
+def async_database_url(url: str) -> str:
+    """同期ドライバのDB URLをasyncpgのURLに変換"""
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def _server_settings() -> dict:
+    """接続時に設定するサーバー側のタイムアウト"""
+    return {
+        "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+        "idle_in_transaction_session_timeout": str(settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS),
+    }
+
+
+def _sync_connect_args() -> dict:
+    # PgBouncer は起動パラメータの options を受け付けないため、トランザクションごとに設定する
+    if settings.DB_PGBOUNCER_MODE:
+        return {}
+    return {"options": " ".join(f"-c {name}={value}" for name, value in _server_settings().items())}
+
+
+def _async_connect_args() -> dict:
+    if settings.DB_PGBOUNCER_MODE:
+        # transaction pooling では接続ごとのプリペアドステートメントが共有されないため無効にする
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {"server_settings": _server_settings()}
+
+
+def _replica_connect_args() -> dict:
+    # 応答しないレプリカで読み取りのリクエストが止まらないよう、接続の待ち時間を短くする
+    return dict(_async_connect_args(), timeout=settings.REPLICA_CONNECT_TIMEOUT)
+
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    poolclass=TimedQueuePool,
+    connect_args=_sync_connect_args(),
+    **_pool_options()
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 非同期ルート用（イベントループ上でasyncpgを使用し、スレッドプールを占有しない）
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    poolclass=TimedAsyncAdaptedQueuePool,
+    connect_args=_async_connect_args(),
+    **_pool_options()
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# 読み取り専用ルート用のレプリカ（非同期ルートからのみ使用）
+replica_engines = [
+    create_async_engine(
+        async_database_url(url),
+        poolclass=TimedAsyncAdaptedQueuePool,
+        connect_args=_replica_connect_args(),
+        **_pool_options()
+    )
+    for url in settings.DATABASE_REPLICA_URL_LIST
+]
+
+pool_metrics = {
+    "sync": attach_metrics(engine, "sync"),
+    "async": attach_metrics(async_engine.sync_engine, "async"),
+}
+for index, replica_engine in enumerate(replica_engines):
+    pool_metrics[f"replica-{index}"] = attach_metrics(replica_engine.sync_engine, f"replica-{index}")
+
+
+def get_pool_status() -> list:
+    """各エンジンのプールの状態とチェックアウトの集計を取得"""
+    engines = [engine, async_engine.sync_engine] + [e.sync_engine for e in replica_engines]
+    return [pool.metrics.snapshot(pool) for pool in (e.pool for e in engines)]
+
+
+class ReplicaRouter:
+    """
+    読み取り用のセッションをレプリカにラウンドロビンで振り分ける
+
+    接続に失敗したレプリカは retry_seconds の間は振り分け対象から外す。
+    """
+
+    def __init__(self, engines: list, retry_seconds: float):
+        self._sessionmakers = [
+            async_sessionmaker(e, autoflush=False, expire_on_commit=False) for e in engines
+        ]
+        self._counter = itertools.count()
+        self._down_until = [0.0] * len(engines)
+        self.retry_seconds = retry_seconds
+
+    def candidates(self) -> List[int]:
+        """今回のリクエストで試すレプリカの順序（利用可能なものだけ）"""
+        if not self._sessionmakers:
+            return []
+        count = len(self._sessionmakers)
+        start = next(self._counter) % count
+        now = time.monotonic()
+        order = [(start + offset) % count for offset in range(count)]
+        return [index for index in order if self._down_until[index] <= now]
+
+    def mark_down(self, index: int) -> None:
+        self._down_until[index] = time.monotonic() + self.retry_seconds
+
+    def session(self, index: int) -> AsyncSession:
+        return self._sessionmakers[index]()
+
+
+replica_router = ReplicaRouter(replica_engines, settings.REPLICA_RETRY_SECONDS)
+
+# 直近に書き込んだユーザー（期限切れまで読み取りをプライマリに固定する）
+write_pin_store = write_pins.create_store(settings.READ_YOUR_WRITES_BACKEND)
+
+
+def mark_user_write(user_id: UUID) -> None:
+    """ユーザーの書き込みを記録し、しばらく読み取りをプライマリに固定する"""
+    write_pin_store.mark(user_id)
+
+
+def is_pinned_to_primary(user_id: UUID) -> bool:
+    return write_pin_store.is_pinned(user_id)
+
+
+async def open_read_session(user_id: Optional[UUID] = None) -> AsyncSession:
+    """
+    読み取り専用のセッションを開く
+
+    レプリカが未設定・全て接続不可の場合や、ユーザーが直前に書き込んだ場合はプライマリを使用する。
+    """
+    if user_id is None or not is_pinned_to_primary(user_id):
+        for index in replica_router.candidates():
+            session = replica_router.session(index)
+            try:
+                # 接続できるか確認するため、ここでチェックアウトしておく
+                await session.connection()
+            except (exc.DBAPIError, exc.TimeoutError, OSError):
+                logger.warning("Read replica %d is unavailable, trying next", index, exc_info=True)
+                await session.close()
+                replica_router.mark_down(index)
+                continue
+            return session
+    return AsyncSessionLocal()
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flush(session: Session, flush_context) -> None:
+    session.info[_HAS_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_bulk_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_HAS_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_writer_to_primary(session: Session) -> None:
+    if session.info.pop(_HAS_WRITES_KEY, False) and session.info.get(USER_ID_KEY) is not None:
+        mark_user_write(session.info[USER_ID_KEY])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_writes(session: Session) -> None:
+    session.info.pop(_HAS_WRITES_KEY, None)
+
+
+def _apply_timeouts(connection, statement_timeout_ms: int) -> None:
+    # SET LOCAL 相当（トランザクション終了時に接続のデフォルトに戻る）
+    connection.execute(
+        text(
+            "SELECT set_config('statement_timeout', :statement_timeout, true), "
+            "set_config('idle_in_transaction_session_timeout', :idle_timeout, true)"
+        ),
+        {
+            "statement_timeout": str(statement_timeout_ms),
+            "idle_timeout": str(settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS),
+        }
+    )
+
+
+@event.listens_for(Session, "after_begin")
+def _set_transaction_timeouts(session: Session, transaction, connection) -> None:
+    timeout = session.info.get(STATEMENT_TIMEOUT_KEY)
+    if timeout is None:
+        # PgBouncer 経由では接続時に設定できないデフォルト値をトランザクションごとに設定する（レプリカも同様）
+        if settings.DB_PGBOUNCER_MODE:
+            _apply_timeouts(connection, settings.DB_STATEMENT_TIMEOUT_MS)
+        return
+    if settings.DB_PGBOUNCER_MODE or timeout != settings.DB_STATEMENT_TIMEOUT_MS:
+        _apply_timeouts(connection, timeout)
+
+
+def set_statement_timeout(db: Session, route_class: str) -> None:
+    """
+    セッションの statement_timeout をルートの種類に合わせて変更
+
+    以降に開始するトランザクションに適用する（開始済みのトランザクションには即時に適用する）。
+    """
+    timeout = STATEMENT_TIMEOUTS_MS[route_class]
+    if db.info.get(STATEMENT_TIMEOUT_KEY) == timeout:
+        return
+    db.info[STATEMENT_TIMEOUT_KEY] = timeout
+    if db.in_transaction():
+        _apply_timeouts(db.connection(), timeout)
+
 
 def get_db() -> Generator[Session, None, None]:
     """Get database session"""
@@ -14,4 +251,10 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
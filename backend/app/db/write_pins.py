@@ -0,0 +1,66 @@
+"""
+read-your-writes の固定（書き込み直後のユーザーの読み取りをプライマリに向ける）
+
+書き込みをコミットしたユーザーを READ_YOUR_WRITES_SECONDS の間記録する。保存先は
+READ_YOUR_WRITES_BACKEND で選択する:
+
+- memory: プロセス内（ワーカーごと。単一ワーカー・開発環境向け）
+- redis: 複数ワーカー間で共有（REDIS_URL を使用）
+
+複数ワーカーの場合、書き込んだワーカーと次に読み取るワーカーが異なるため redis を使用する。
+"""
+import logging
+from uuid import UUID
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('memory', 'redis')
+
+
+class MemoryWritePinStore:
+    """プロセス内の記録"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 100000):
+        self._cache = TTLCache(ttl_seconds, max_entries)
+
+    def mark(self, user_id: UUID) -> None:
+        self._cache.set(str(user_id), True)
+
+    def is_pinned(self, user_id: UUID) -> bool:
+        return self._cache.get(str(user_id)) is not None
+
+
+class RedisWritePinStore:
+    """Redisの記録（Redisの障害時は古い値を返さないよう、読み取りをプライマリに固定する）"""
+
+    key_prefix = 'primary-pin:'
+
+    def __init__(self, url: str, ttl_seconds: float):
+        import redis
+
+        self.ttl_ms = max(int(ttl_seconds * 1000), 1)
+        self._client = redis.Redis.from_url(url, socket_timeout=0.1)
+
+    def mark(self, user_id: UUID) -> None:
+        try:
+            self._client.set(self.key_prefix + str(user_id), 1, px=self.ttl_ms)
+        except Exception:
+            logger.warning("Primary pin store failed", exc_info=True)
+
+    def is_pinned(self, user_id: UUID) -> bool:
+        try:
+            return bool(self._client.exists(self.key_prefix + str(user_id)))
+        except Exception:
+            logger.warning("Primary pin lookup failed", exc_info=True)
+            return True
+
+
+def create_store(backend: str):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown read-your-writes backend: {backend}")
+    if backend == 'redis':
+        return RedisWritePinStore(settings.REDIS_URL, settings.READ_YOUR_WRITES_SECONDS)
+    return MemoryWritePinStore(settings.READ_YOUR_WRITES_SECONDS)
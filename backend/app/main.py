@@ -2,15 +2,19 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import os
 
 from app.core.config import settings
+from app.core.loop_monitor import loop_monitor
+from app.db.session import get_pool_status
 from app.utils.rate_limiter import limiter, rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from app.middleware.security import SecurityHeadersMiddleware, RequestLoggingMiddleware
+from app.middleware.security import SecurityMiddleware
 from app.api.auth import auth
 from app.api.partnerships import partnerships
 from app.api.categories.categories import router as categories_router
@@ -22,6 +26,8 @@ from app.api.love import love
 from app.api import recurring_transactions
 from app.api import users
 from app.api import notifications
+from app.services.transaction_events import transaction_events
+from app.services.recurring_scheduler import run_periodically as run_recurring_scheduler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -32,9 +38,21 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("💕 Money Dairy Lovers backend starting up...")
+    if settings.LOOP_LAG_THRESHOLD_MS > 0:
+        loop_monitor.start()
+    scheduler_task = None
+    if settings.RECURRING_SCHEDULER_INTERVAL_SECONDS > 0:
+        scheduler_task = asyncio.create_task(
+            run_recurring_scheduler(settings.RECURRING_SCHEDULER_INTERVAL_SECONDS)
+        )
     yield
     # Shutdown
     logger.info("💕 Money Dairy Lovers backend shutting down...")
+    if scheduler_task is not None:
+        scheduler_task.cancel()
+    await loop_monitor.stop()
+    # 実行待ちの取引変更イベントを処理してから終了
+    transaction_events.shutdown(wait=True)
 
 
 app = FastAPI(
@@ -50,15 +68,12 @@ app.state.limiter = limiter
 # Rate limit exception handler を追加
 app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
-# セキュリティミドルウェアを追加
+# セキュリティミドルウェアを追加（セキュリティヘッダー・リクエストのログ・メトリクス）
 app.add_middleware(
-    SecurityHeadersMiddleware,
+    SecurityMiddleware,
     debug=(settings.ENVIRONMENT == "development")
 )
 
-# リクエストロギングミドルウェアを追加
-app.add_middleware(RequestLoggingMiddleware)
-
 # CORS設定（セキュリティ強化）
 app.add_middleware(
     CORSMiddleware,
@@ -81,23 +96,6 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
-# Add request logging middleware for debugging
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    # Log request details for login endpoint
-    if request.url.path == "/api/v1/auth/login":
-        logger.info(f"Login request - Method: {request.method}")
-        logger.info(f"Login request - Headers: {dict(request.headers)}")
-    
-    response = await call_next(request)
-    
-    # Log response status for login endpoint
-    if request.url.path == "/api/v1/auth/login":
-        logger.info(f"Login response - Status: {response.status_code}")
-    
-    return response
-
-
 # ルートエンドポイント
 @app.get("/")
 async def root():
@@ -139,6 +137,18 @@ async def love_health_check():
     }
 
 
+# Prometheusのメトリクス
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+# コネクションプールの状態（チェックアウト待ち時間からプールサイズを見積もる）
+@app.get("/health/db")
+async def db_pool_status():
+    return {"pools": get_pool_status()}
+
+
 # 静的ファイルのマウント（プロフィール画像用）
 if os.path.exists("uploads"):
     app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
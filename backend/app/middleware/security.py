@@ -1,78 +1,167 @@
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, List, Optional, Tuple
+import json
 import logging
+import time
+
+from app.core import loop_monitor, metrics, sql_profiler
+from app.core.config import settings
+from app.middleware.suspicious_patterns import DEFAULT_RULES, PatternMatcher, load_rules
 
 logger = logging.getLogger(__name__)
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+
+class SecurityMiddleware:
     """
-    セキュリティヘッダーを追加するミドルウェア
+    セキュリティヘッダーの追加・リクエストのセキュリティログ・メトリクスの記録を行うミドルウェア
+
+    BaseHTTPMiddleware を重ねるとリクエストごとにタスクとストリームのラップが増え、
+    ストリーミングレスポンスも扱えなくなるため、1つのASGIミドルウェアで1回の処理にまとめている。
     """
-    
-    def __init__(self, app, debug: bool = False):
-        super().__init__(app)
+
+    def __init__(self, app: ASGIApp, debug: bool = False):
+        self.app = app
         self.debug = debug
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        
-        # セキュリティヘッダーを追加
-        self._add_security_headers(response, request)
-        
-        return response
-    
-    def _add_security_headers(self, response: Response, request: Request) -> None:
-        """
-        レスポンスにセキュリティヘッダーを追加
-        """
-        # X-Content-Type-Options: MIMEタイプの推測を防ぐ
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        
-        # X-Frame-Options: クリックジャッキング攻撃を防ぐ
-        response.headers["X-Frame-Options"] = "DENY"
-        
-        # X-XSS-Protection: XSS攻撃を防ぐ（古いブラウザ対応）
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        
-        # Referrer-Policy: リファラー情報の制御
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
-        # Content-Security-Policy: XSS攻撃を防ぐ
-        csp_policy = self._get_csp_policy(request)
-        response.headers["Content-Security-Policy"] = csp_policy
-        
-        # Strict-Transport-Security: HTTPS強制（本番環境のみ）
-        if not self.debug and request.url.scheme == "https":
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains; preload"
+        # リクエストによらないヘッダーは起動時に組み立てておく
+        self._security_headers = self._build_security_headers()
+        self._no_cache_headers = [
+            (b"cache-control", b"no-store, no-cache, must-revalidate, proxy-revalidate"),
+            (b"pragma", b"no-cache"),
+            (b"expires", b"0"),
+        ]
+        self._hsts_header = (b"strict-transport-security", b"max-age=31536000; includeSubDomains; preload")
+        self._pattern_matcher = PatternMatcher(self._load_suspicious_rules())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        headers = Headers(scope=scope)
+        db_stats = metrics.start_request_stats()
+        profile = sql_profiler.start_profile() if sql_profiler.should_profile(headers) else None
+        metrics.REQUESTS_IN_PROGRESS.labels(method).inc()
+        loop_monitor.track_request(scope)
+
+        # セキュリティ関連の情報をログ記録
+        client_ip = self._get_client_ip(scope, headers)
+        user_agent = headers.get("user-agent", "Unknown")
+
+        # 認証関連エンドポイントでは詳細ログ
+        if "/auth/" in path:
+            logger.info(
+                f"Auth request - IP: {client_ip}, "
+                f"Path: {path}, "
+                f"Method: {method}, "
+                f"User-Agent: {user_agent[:50]}..."
             )
-        
-        # Permissions-Policy: 機能の使用を制限
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), microphone=(), camera=(), "
-            "payment=(), usb=(), magnetometer=(), gyroscope=(), "
-            "accelerometer=(), ambient-light-sensor=()"
-        )
-        
-        # X-Permitted-Cross-Domain-Policies: Flash/PDF関連の制限
-        response.headers["X-Permitted-Cross-Domain-Policies"] = "none"
-        
-        # Cache-Control: 機密情報のキャッシュを防ぐ
-        if self._is_sensitive_endpoint(request.url.path):
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, proxy-revalidate"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
-        
-        # セキュリティ関連のカスタムヘッダー
-        response.headers["X-Money-Dairy-Lovers"] = "Secure API"
-        response.headers["X-API-Version"] = "v1"
-        
+
+        # 疑わしいリクエストパターンを検出
+        self._detect_suspicious_patterns(scope, headers, client_ip)
+
+        status_code = 500
+        response_size: Optional[int] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = list(message.get("headers", []))
+                for name, value in response_headers:
+                    if name == b"content-length":
+                        response_size = int(value)
+
+                extra_headers = self._response_headers(scope, path)
+                if profile is not None:
+                    extra_headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                replaced = {name for name, _ in extra_headers if name != b"server-timing"}
+                message["headers"] = [
+                    (name, value) for name, value in response_headers if name.lower() not in replaced
+                ] + extra_headers
+
+                # レスポンスコードのログ記録
+                if status_code >= 400:
+                    logger.warning(
+                        f"Error response - IP: {client_ip}, "
+                        f"Path: {path}, "
+                        f"Status: {status_code}"
+                    )
+                elif "/auth/" in path:
+                    logger.info(f"Auth response - Path: {path}, Status: {status_code}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            loop_monitor.untrack_request()
+            metrics.REQUESTS_IN_PROGRESS.labels(method).dec()
+            route = metrics.route_template(scope)
+            metrics.observe_request(
+                method,
+                route,
+                status_code,
+                time.perf_counter() - started,
+                response_size,
+                db_stats
+            )
+            if profile is not None:
+                self._report_sql_profile(f"{method} {route}", profile)
+
+    def _build_security_headers(self) -> List[Tuple[bytes, bytes]]:
+        """
+        全てのレスポンスに追加するセキュリティヘッダー
+        """
+        headers = [
+            # X-Content-Type-Options: MIMEタイプの推測を防ぐ
+            ("X-Content-Type-Options", "nosniff"),
+            # X-Frame-Options: クリックジャッキング攻撃を防ぐ
+            ("X-Frame-Options", "DENY"),
+            # X-XSS-Protection: XSS攻撃を防ぐ（古いブラウザ対応）
+            ("X-XSS-Protection", "1; mode=block"),
+            # Referrer-Policy: リファラー情報の制御
+            ("Referrer-Policy", "strict-origin-when-cross-origin"),
+            # Content-Security-Policy: XSS攻撃を防ぐ
+            ("Content-Security-Policy", self._get_csp_policy()),
+            # Permissions-Policy: 機能の使用を制限
+            ("Permissions-Policy", (
+                "geolocation=(), microphone=(), camera=(), "
+                "payment=(), usb=(), magnetometer=(), gyroscope=(), "
+                "accelerometer=(), ambient-light-sensor=()"
+            )),
+            # X-Permitted-Cross-Domain-Policies: Flash/PDF関連の制限
+            ("X-Permitted-Cross-Domain-Policies", "none"),
+            # セキュリティ関連のカスタムヘッダー
+            ("X-Money-Dairy-Lovers", "Secure API"),
+            ("X-API-Version", "v1"),
+        ]
+
         # 開発環境でのみデバッグ情報
         if self.debug:
-            response.headers["X-Debug-Mode"] = "true"
-    
-    def _get_csp_policy(self, request: Request) -> str:
+            headers.append(("X-Debug-Mode", "true"))
+
+        return [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+
+    def _response_headers(self, scope: Scope, path: str) -> List[Tuple[bytes, bytes]]:
+        """
+        レスポンスに追加するヘッダー
+        """
+        headers = list(self._security_headers)
+
+        # Strict-Transport-Security: HTTPS強制（本番環境のみ）
+        if not self.debug and scope.get("scheme") == "https":
+            headers.append(self._hsts_header)
+
+        # Cache-Control: 機密情報のキャッシュを防ぐ
+        if self._is_sensitive_endpoint(path):
+            headers.extend(self._no_cache_headers)
+
+        return headers
+
+    def _get_csp_policy(self) -> str:
         """
         Content Security Policy を生成
         """
@@ -91,17 +180,17 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "frame-ancestors 'none'",
             "upgrade-insecure-requests"
         ]
-        
+
         # 開発環境では制限を緩和
         if self.debug:
             # WebSocketとHMRを許可
             base_policy = [p.replace("connect-src 'self'", "connect-src 'self' ws: wss:") for p in base_policy]
             # 開発サーバーのアセットを許可
-            base_policy = [p.replace("script-src 'self' 'unsafe-inline'", 
+            base_policy = [p.replace("script-src 'self' 'unsafe-inline'",
                                     "script-src 'self' 'unsafe-inline' 'unsafe-eval'") for p in base_policy]
-        
+
         return "; ".join(base_policy)
-    
+
     def _is_sensitive_endpoint(self, path: str) -> bool:
         """
         機密情報を含むエンドポイントかどうかを判定
@@ -116,97 +205,62 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         ]
         return any(pattern in path for pattern in sensitive_patterns)
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """
-    リクエストのセキュリティログを記録するミドルウェア
-    """
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # セキュリティ関連の情報をログ記録
-        client_ip = self._get_client_ip(request)
-        user_agent = request.headers.get("user-agent", "Unknown")
-        
-        # 認証関連エンドポイントでは詳細ログ
-        if "/auth/" in request.url.path:
-            logger.info(
-                f"Auth request - IP: {client_ip}, "
-                f"Path: {request.url.path}, "
-                f"Method: {request.method}, "
-                f"User-Agent: {user_agent[:50]}..."
-            )
-        
-        # 疑わしいリクエストパターンを検出
-        self._detect_suspicious_patterns(request, client_ip)
-        
-        response = await call_next(request)
-        
-        # レスポンスコードのログ記録
-        if response.status_code >= 400:
+    def _report_sql_profile(self, endpoint: str, profile: sql_profiler.SQLProfile) -> None:
+        """
+        SQLプロファイルをログに出力（Server-Timing ヘッダーはレスポンス開始時に追加済み）
+        """
+        n_plus_one = profile.n_plus_one()
+        if n_plus_one:
             logger.warning(
-                f"Error response - IP: {client_ip}, "
-                f"Path: {request.url.path}, "
-                f"Status: {response.status_code}"
+                f"Possible N+1 queries - Endpoint: {endpoint}, "
+                f"Shapes: {[f'{entry.count}x {entry.shape[:120]}' for entry in n_plus_one]}"
             )
-        
-        return response
-    
-    def _get_client_ip(self, request: Request) -> str:
+        if settings.SQL_PROFILING_LOG:
+            logger.info(json.dumps({"sql_profile": endpoint, **profile.to_dict()}, ensure_ascii=False))
+        sql_profiler.publish(endpoint, profile)
+
+    def _get_client_ip(self, scope: Scope, headers: Headers) -> str:
         """
         クライアントIPアドレスを取得（プロキシ対応）
         """
         # X-Forwarded-For ヘッダーを確認（信頼できるプロキシからのみ）
-        forwarded_for = request.headers.get("x-forwarded-for")
+        forwarded_for = headers.get("x-forwarded-for")
         if forwarded_for:
             # 最初のIPアドレスを使用
             return forwarded_for.split(",")[0].strip()
-        
+
         # X-Real-IP ヘッダーを確認
-        real_ip = request.headers.get("x-real-ip")
+        real_ip = headers.get("x-real-ip")
         if real_ip:
             return real_ip
-        
+
         # 直接接続の場合
-        return getattr(request.client, "host", "unknown")
-    
-    def _detect_suspicious_patterns(self, request: Request, client_ip: str) -> None:
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _load_suspicious_rules(self) -> Dict[str, List[str]]:
+        """
+        疑わしいリクエストパターンのルールを設定から読み込む
+        """
+        return load_rules(
+            DEFAULT_RULES if settings.SUSPICIOUS_PATTERN_DEFAULT_RULES else {},
+            settings.SUSPICIOUS_PATTERN_RULES,
+            rules_file=settings.SUSPICIOUS_PATTERN_RULES_FILE
+        )
+
+    def _detect_suspicious_patterns(self, scope: Scope, headers: Headers, client_ip: str) -> None:
         """
         疑わしいリクエストパターンを検出
         """
-        path = request.url.path.lower()
-        query = str(request.url.query).lower()
-        
-        # SQL インジェクション試行の検出
-        sql_injection_patterns = [
-            "union select", "drop table", "insert into", "delete from",
-            "update set", "exec ", "script>", "javascript:", "vbscript:",
-            "' or '", "' union", "' and '", "' having", "' group by"
-        ]
-        
-        # XSS 試行の検出
-        xss_patterns = [
-            "<script", "</script>", "javascript:", "vbscript:", "onload=",
-            "onerror=", "onclick=", "onmouseover=", "eval(", "alert("
-        ]
-        
-        # パストラバーサル試行の検出
-        path_traversal_patterns = [
-            "../", "..\\", "%2e%2e", "%2f", "%5c", "..%2f", "..%5c"
-        ]
-        
-        # 検出ロジック
-        all_patterns = {
-            "SQL Injection": sql_injection_patterns,
-            "XSS": xss_patterns,
-            "Path Traversal": path_traversal_patterns
-        }
-        
-        for attack_type, patterns in all_patterns.items():
-            for pattern in patterns:
-                if pattern in path or pattern in query:
-                    logger.warning(
-                        f"Suspicious request detected - Type: {attack_type}, "
-                        f"Pattern: {pattern}, IP: {client_ip}, "
-                        f"Path: {request.url.path}, "
-                        f"User-Agent: {request.headers.get('user-agent', 'Unknown')[:50]}"
-                    )
-                    break
\ No newline at end of file
+        detected = self._pattern_matcher.inspect(
+            scope["path"],
+            scope.get("query_string", b"").decode("latin-1")
+        )
+        for attack_type, pattern in detected.items():
+            metrics.SUSPICIOUS_REQUESTS.labels(attack_type).inc()
+            logger.warning(
+                f"Suspicious request detected - Type: {attack_type}, "
+                f"Pattern: {pattern}, IP: {client_ip}, "
+                f"Path: {scope['path']}, "
+                f"User-Agent: {headers.get('user-agent', 'Unknown')[:50]}"
+            )
@@ -0,0 +1,184 @@
+"""
+疑わしいリクエストパターン（SQLインジェクション・XSS・パストラバーサルなど）の検出
+
+ルール（攻撃の種類ごとの部分文字列）は起動時に1つの正規表現にまとめる。
+各パターンは最も出現しにくい文字（記号など）を先頭にした形でトライにするため、
+正規表現エンジンはその文字が現れるまでC言語の文字集合の判定で読み飛ばし、
+ルールを数百に増やしてもルールごとに文字列を走査することはない。
+パス・クエリは小文字化とURLデコードを1回ずつ行い、エンコードされた形のパターン（"%" や "+" を含むもの）は
+デコード前の文字列、それ以外のパターンはデコード後の文字列をそれぞれ1回ずつ走査して検査する。
+"""
+import json
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# 検査対象の文字列を連結する区切り（パターンに含めることはできない）
+SEPARATOR = "\n"
+
+# URL・クエリ文字列に出現しやすい文字（出現しやすい順）。これ以外の記号などは最も出現しにくいとみなす
+_ASCII_ESCAPE = re.compile(r"%([0-7][0-9a-f])", re.IGNORECASE)
+
+_COMMON_CHARS = "=&/.-_0123456789etaoinsrhldcumfpgwybvkxjqz"
+
+DEFAULT_RULES: Dict[str, List[str]] = {
+    # SQL インジェクション試行の検出
+    "SQL Injection": [
+        "union select", "drop table", "insert into", "delete from",
+        "update set", "exec ", "script>", "javascript:", "vbscript:",
+        "' or '", "' union", "' and '", "' having", "' group by"
+    ],
+    # XSS 試行の検出
+    "XSS": [
+        "<script", "</script>", "javascript:", "vbscript:", "onload=",
+        "onerror=", "onclick=", "onmouseover=", "eval(", "alert("
+    ],
+    # パストラバーサル試行の検出
+    "Path Traversal": [
+        "../", "..\\", "%2e%2e", "%2f", "%5c", "..%2f", "..%5c"
+    ],
+}
+
+
+def load_rules(
+    *rule_sets: Mapping[str, Iterable[str]],
+    rules_file: str = ""
+) -> Dict[str, List[str]]:
+    """ルールと、ルールファイル（{"攻撃の種類": ["パターン", ...]} のJSON）をまとめる"""
+    if rules_file:
+        with open(rules_file, encoding="utf-8") as f:
+            rule_sets = (*rule_sets, json.load(f))
+    merged: Dict[str, List[str]] = {}
+    for rules in rule_sets:
+        for attack_type, patterns in rules.items():
+            merged.setdefault(attack_type, []).extend(patterns)
+    return merged
+
+
+def _char_frequency(char: str) -> int:
+    """URL・クエリ文字列での文字の出現しやすさ（大きいほど出現しやすい）"""
+    index = _COMMON_CHARS.find(char)
+    return len(_COMMON_CHARS) - index if index >= 0 else 0
+
+
+def _is_encoded(text: str) -> bool:
+    return "%" in text or "+" in text
+
+
+def _decode(text: str) -> str:
+    """
+    URLデコード（ASCIIの文字のみ）
+
+    パターンはASCIIの記号を含むものを想定しているため、日本語などのマルチバイト文字はデコードせず、
+    unquote_plus より大幅に速くする。
+    """
+    text = text.replace("+", " ")
+    if "%" in text:
+        text = _ASCII_ESCAPE.sub(lambda match: chr(int(match.group(1), 16)), text)
+    return text.lower()
+
+
+def _trie_regex(node: dict, key: str = "") -> str:
+    """
+    トライを正規表現に変換（長いパターンを優先）
+
+    終端ではアンカーより前の部分を後読みで確認するため、パターン全体が一致した位置でのみ一致する。
+    """
+    branches = [
+        re.escape(char) + _trie_regex(child, key + char) for char, child in sorted(node.items()) if char
+    ]
+    prefixes = node.get("", None)
+    if prefixes is None:
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in prefixes:
+        # アンカーが先頭のパターンは常に一致
+        return "(?:" + "|".join(branches) + ")?" if branches else ""
+    lookbehinds = [f"(?<={re.escape(prefix + key)})" for prefix in sorted(prefixes)]
+    return "(?:" + "|".join(branches + lookbehinds) + ")"
+
+
+class _CompiledPatterns:
+    """パターンの集合をアンカーの文字から始まるトライの正規表現にしたもの"""
+
+    def __init__(self, owners: Mapping[str, Dict[str, str]]):
+        self._owners = owners
+        self.attack_types = {attack_type for types in owners.values() for attack_type in types}
+
+        # パターンを最も出現しにくい文字（アンカー）で分け、アンカー以降を正規表現で検索し、
+        # アンカーより前は後読みで確認する
+        self._anchored: Dict[str, List[Tuple[str, str]]] = {}
+        for pattern in owners:
+            anchor = min(range(len(pattern)), key=lambda index: _char_frequency(pattern[index]))
+            self._anchored.setdefault(pattern[anchor:], []).append((pattern[:anchor], pattern))
+
+        trie: dict = {}
+        for key, candidates in self._anchored.items():
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[""] = {prefix for prefix, _ in candidates}
+        self._regex: Optional["re.Pattern[str]"] = re.compile(_trie_regex(trie)) if trie else None
+
+    def match(self, text: str, found: Dict[str, str]) -> None:
+        """検出した攻撃の種類と、最初に一致したパターンを found に追加"""
+        if self._regex is None:
+            return
+        search = self._regex.search
+        match = search(text)
+        while match is not None:
+            start = match.start()
+            matched = match.group()
+            # トライは最長の一致を返すため、短いキー（一致した文字列の接頭辞）も確認する
+            for end in range(1, len(matched) + 1):
+                for prefix, pattern in self._anchored.get(matched[:end], ()):
+                    if start >= len(prefix) and text.startswith(prefix, start - len(prefix)):
+                        for attack_type, owner in self._owners[pattern].items():
+                            found.setdefault(attack_type, owner)
+            if self.attack_types.issubset(found):
+                return
+            # パターン同士が重なる場合（"</script>" と "script>" など）も検出するため、1文字ずつ進める
+            match = search(text, start + 1)
+
+
+class PatternMatcher:
+    """複数の攻撃の種類のパターンを1回の走査で検出する"""
+
+    def __init__(self, rules: Mapping[str, Iterable[str]]):
+        owners: Dict[str, Dict[str, str]] = {}
+        for attack_type, patterns in rules.items():
+            for pattern in patterns:
+                pattern = pattern.lower()
+                if not pattern or SEPARATOR in pattern:
+                    raise ValueError(f"Invalid suspicious pattern for {attack_type}: {pattern!r}")
+                owners.setdefault(pattern, {}).setdefault(attack_type, pattern)
+
+        # "%" や "+" を含むパターン（エンコードされた形）はデコード前の文字列、それ以外はデコード後の文字列で検索する
+        self._encoded = _CompiledPatterns(
+            {pattern: types for pattern, types in owners.items() if _is_encoded(pattern)}
+        )
+        self._decoded = _CompiledPatterns(
+            {pattern: types for pattern, types in owners.items() if not _is_encoded(pattern)}
+        )
+
+    def match(self, text: str) -> Dict[str, str]:
+        """
+        検出した攻撃の種類と、最初に一致したパターン
+
+        text は小文字化済みで、URLデコードが不要なもの（"%" や "+" を含まない）であること
+        """
+        found: Dict[str, str] = {}
+        self._decoded.match(text, found)
+        return found
+
+    def inspect(self, path: str, query: str) -> Dict[str, str]:
+        """リクエストのパス（デコード済み）とクエリ（デコード前）を検査"""
+        raw = (path + SEPARATOR + query).lower()
+        if not _is_encoded(raw):
+            return self.match(raw)
+
+        # エンコードで検出を逃れる試行も検出するため、その他のパターンはデコード後の文字列で検索する
+        decoded = _decode(raw)
+        found: Dict[str, str] = {}
+        # 二重にエンコードされたもの（%252f など）も検出するため、デコード後の文字列も含める
+        self._encoded.match(raw + SEPARATOR + decoded, found)
+        self._decoded.match(decoded, found)
+        return found
@@ -9,4 +9,5 @@ from .budget import Budget
 from .love_event import LoveEvent
 from .love_memory import LoveMemory
 from .recurring_transaction import RecurringTransaction
-from .notification import Notification
\ No newline at end of file
+from .notification import Notification
+from .user_monthly_rollup import UserMonthlyRollup
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Numeric, Date, Boolean, CheckConstraint
+from sqlalchemy import Column, String, DateTime, ForeignKey, Numeric, Date, Boolean, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -34,4 +34,5 @@ class Budget(Base):
     __table_args__ = (
         CheckConstraint('amount > 0', name='positive_budget_amount'),
         CheckConstraint('alert_threshold >= 0 AND alert_threshold <= 100', name='valid_alert_threshold'),
+        Index('ix_budgets_user_active', user_id, is_active, category_id),
     )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Date, Boolean, Integer
+from sqlalchemy import Column, String, DateTime, ForeignKey, Date, Boolean, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -25,4 +25,8 @@ class LoveEvent(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    partnership = relationship("Partnership", backref="love_events")
\ No newline at end of file
+    partnership = relationship("Partnership", backref="love_events")
+    
+    __table_args__ = (
+        Index('ix_love_events_partnership_active_date', partnership_id, is_active, event_date),
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Text, JSON, DateTime, ForeignKey
+from sqlalchemy import Column, String, Boolean, Text, JSON, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -24,4 +24,16 @@ class Notification(Base):
     read_at = Column(DateTime(timezone=True))
     
     # Relationships
-    user = relationship("User", back_populates="notifications")
\ No newline at end of file
+    user = relationship("User", back_populates="notifications")
+    
+    __table_args__ = (
+        # 通知一覧（新しい順）
+        Index('ix_notifications_user_created', user_id, created_at.desc()),
+        # 未読通知の件数・一覧（期限はnow()に依存するため部分条件に含めずINCLUDEで判定）
+        Index(
+            'ix_notifications_user_unread',
+            user_id, type,
+            postgresql_include=['expires_at'],
+            postgresql_where=text('is_read = false')
+        ),
+    )
\ No newline at end of file
@@ -1,10 +1,11 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Numeric, Date, Text, CheckConstraint, ARRAY, Integer
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, ForeignKey, Numeric, Date, Text, CheckConstraint, ARRAY, Integer, Index, event, inspect
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import uuid
 
 from app.db.base_class import Base
+from app.utils.text_search import build_search_vector
 
 
 class Transaction(Base):
@@ -23,6 +24,8 @@ class Transaction(Base):
     love_rating = Column(Integer, nullable=True)  # Love度評価 1-5
     tags = Column(ARRAY(Text), nullable=True)  # タグ配列
     location = Column(String(200), nullable=True)  # 場所情報
+    # 説明・場所・タグのバイグラム（検索用）。検索条件でのみ使い、説明より大きいため取引の読み込みには含めない
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -38,6 +41,20 @@ class Transaction(Base):
         CheckConstraint("sharing_type IN ('personal', 'shared')", name='valid_sharing_type'),
         CheckConstraint("payment_method IN ('cash', 'credit_card', 'bank_transfer', 'digital_wallet')", name='valid_payment_method'),
         CheckConstraint('love_rating >= 1 AND love_rating <= 5', name='valid_love_rating'),
+        # 期間指定の集計・一覧（ダッシュボード、レポート、最近の取引、一覧のキーセットページネーション）
+        Index(
+            'ix_transactions_user_date_created',
+            user_id, transaction_date.desc(), created_at.desc(), id.desc(),
+            postgresql_include=['amount', 'transaction_type', 'category_id']
+        ),
+        # カテゴリ別の期間集計（予算の進捗、Love Goal）
+        Index(
+            'ix_transactions_user_category_date',
+            user_id, category_id, transaction_date,
+            postgresql_include=['amount', 'transaction_type']
+        ),
+        # 説明・場所・タグの検索
+        Index('ix_transactions_search_vector', 'search_vector', postgresql_using='gin'),
     )
 
 
@@ -57,4 +74,17 @@ class SharedTransaction(Base):
     # Relationships
     transaction = relationship("Transaction", back_populates="shared_transaction")
     partnership = relationship("Partnership", backref="shared_transactions")
-    payer = relationship("User", backref="paid_shared_transactions")
\ No newline at end of file
+    payer = relationship("User", backref="paid_shared_transactions")
+
+
+SEARCH_FIELDS = ('description', 'location', 'tags')
+
+
+@event.listens_for(Transaction, 'before_insert')
+@event.listens_for(Transaction, 'before_update')
+def _update_search_vector(mapper, connection, target: Transaction) -> None:
+    # 検索対象の列が変更された場合のみ作り直す
+    state = inspect(target)
+    if state.pending or any(state.attrs[name].history.has_changes() for name in SEARCH_FIELDS):
+        target.search_vector = build_search_vector(target.description, target.location, target.tags)
+
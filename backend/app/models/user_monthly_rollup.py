@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Integer, SmallInteger, Numeric, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class UserMonthlyRollup(Base):
+    """ユーザー別・月別の取引集計（取引の作成・更新・削除時に差分更新）"""
+    __tablename__ = "user_monthly_rollups"
+    
+    # 集計キー
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    month = Column(SmallInteger, primary_key=True)
+    category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    transaction_type = Column(String(10), primary_key=True)  # income, expense
+    sharing_type = Column(String(10), primary_key=True)  # personal, shared
+    
+    # 集計値
+    total_amount = Column(Numeric(14, 2), nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    love_rating_sum = Column(Integer, nullable=False, default=0)
+    love_rating_count = Column(Integer, nullable=False, default=0)  # 平均算出用（評価済み件数）
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -129,4 +129,39 @@ class CustomReport(BaseModel):
     
     # オプション統計
     love_statistics: Optional[LoveStatistics] = None
-    budget_performance: Optional[Dict[str, Any]] = None
\ No newline at end of file
+    budget_performance: Optional[Dict[str, Any]] = None
+
+
+class ForecastCategory(BaseModel):
+    """カテゴリ別の予測"""
+    category_id: UUID
+    category_name: str
+    category_icon: str
+    transaction_type: str  # income, expense
+    recurring_amount: Decimal  # 定期取引の実行予定額
+    baseline_amount: Decimal  # 定期取引以外の月平均
+    total_amount: Decimal
+
+
+class ForecastMonth(BaseModel):
+    """月別の予測"""
+    month: str  # YYYY-MM format
+    income: Decimal
+    expense: Decimal
+    balance: Decimal
+    recurring_income: Decimal
+    recurring_expense: Decimal
+    categories: List[ForecastCategory]
+
+
+class CashFlowForecast(BaseModel):
+    """収支予測"""
+    base_date: date
+    months: int
+    history_months: int
+    
+    total_income: Decimal
+    total_expense: Decimal
+    total_balance: Decimal
+    
+    monthly: List[ForecastMonth]
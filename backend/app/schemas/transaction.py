@@ -104,4 +104,5 @@ class TransactionFilter(BaseModel):
     min_amount: Optional[Decimal] = Field(None, ge=0)
     max_amount: Optional[Decimal] = Field(None, ge=0)
     love_rating: Optional[int] = Field(None, ge=1, le=5)
-    search: Optional[str] = Field(None, max_length=200)
\ No newline at end of file
+    search: Optional[str] = Field(None, max_length=200)
+    tags: Optional[List[str]] = None
\ No newline at end of file
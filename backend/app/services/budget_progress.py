@@ -0,0 +1,283 @@
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Date, and_, bindparam, column, func, true
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services.monthly_rollup import month_range_filter
+
+ROLLUP_PERIODS = ('monthly', 'yearly')
+BUDGET_ALERT_NOTIFICATIONS = ('budget_warning', 'budget_exceeded')
+
+
+def build_budget_notification(
+    user_id: UUID,
+    budget_name: str,
+    notification_type: str,
+    percentage: float,
+    amount_used: float,
+    amount_total: float,
+    **extra_data
+) -> models.Notification:
+    """予算の警告・超過の通知を作成（extra_data は data に追加する）"""
+    if notification_type == 'budget_exceeded':
+        title = f"予算「{budget_name}」を超過しました"
+    else:
+        title = f"予算「{budget_name}」が{int(percentage)}%に達しました"
+    return models.Notification(
+        user_id=user_id,
+        type=notification_type,
+        title=title,
+        message=f"¥{amount_used:,.0f} / ¥{amount_total:,.0f} を使用しています。",
+        priority="high" if percentage >= 90 else "normal",
+        data={
+            **extra_data,
+            "budget_name": budget_name,
+            "percentage": percentage,
+            "amount_used": amount_used,
+            "amount_total": amount_total
+        }
+    )
+
+
+def budget_period_window(budget: models.Budget, today: date) -> Tuple[date, date]:
+    """予算の集計期間 [start_date, end_date) を取得"""
+    if budget.period == 'monthly':
+        start_date = date(today.year, today.month, 1)
+        if today.month == 12:
+            end_date = date(today.year + 1, 1, 1)
+        else:
+            end_date = date(today.year, today.month + 1, 1)
+    elif budget.period == 'yearly':
+        start_date = date(today.year, 1, 1)
+        end_date = date(today.year + 1, 1, 1)
+    else:  # custom
+        start_date = budget.start_date
+        end_date = budget.end_date or today
+    return start_date, end_date
+
+
+def build_budget_progress(
+    budget: models.Budget,
+    spent_amount: Decimal,
+    end_date: date,
+    today: date
+) -> dict:
+    """支出額から予算の進捗情報を作成"""
+    remaining_amount = budget.amount - spent_amount
+    usage_percentage = (spent_amount / budget.amount * 100) if budget.amount > 0 else Decimal('0')
+
+    # 残り日数
+    days_remaining = (end_date - today).days if end_date > today else 0
+
+    # アラート判定
+    is_over_budget = spent_amount > budget.amount
+    is_alert_threshold_reached = usage_percentage >= budget.alert_threshold
+
+    return {
+        "spent_amount": float(spent_amount),
+        "remaining_amount": float(remaining_amount),
+        "usage_percentage": float(usage_percentage),
+        "days_remaining": days_remaining,
+        "is_over_budget": is_over_budget,
+        "is_alert_threshold_reached": is_alert_threshold_reached
+    }
+
+
+def _rollup_spent_by_category(db: Session, user_id: UUID, today: date) -> Tuple[Dict[UUID, Decimal], Dict[UUID, Decimal]]:
+    """今月・今年の支出をカテゴリ別に月次集計から1クエリで取得"""
+    rollup = models.UserMonthlyRollup
+    rows = db.query(
+        rollup.category_id,
+        func.sum(rollup.total_amount).filter(rollup.month == today.month).label('month_spent'),
+        func.sum(rollup.total_amount).label('year_spent')
+    ).filter(
+        rollup.user_id == user_id,
+        rollup.transaction_type == 'expense',
+        *month_range_filter(date(today.year, 1, 1), date(today.year + 1, 1, 1))
+    ).group_by(rollup.category_id).all()
+
+    month_spent = {row.category_id: row.month_spent or Decimal('0') for row in rows}
+    year_spent = {row.category_id: row.year_spent or Decimal('0') for row in rows}
+    return month_spent, year_spent
+
+
+def expense_totals_by_window(
+    db: Session,
+    user_id: UUID,
+    windows: Dict[UUID, Tuple[Optional[UUID], date, date]],
+    love_categories_only: bool = False
+) -> Dict[UUID, Tuple[Decimal, int]]:
+    """
+    期間ごとの支出合計と件数を、期間一覧とのJOINで1クエリで取得
+
+    Args:
+        windows: キーをIDとした (カテゴリID, 開始日, 終了日) の辞書。期間は [開始日, 終了日)。
+            カテゴリIDがNoneの場合は全カテゴリを対象とする
+        love_categories_only: Loveカテゴリの支出のみを対象とする
+
+    Returns:
+        IDをキーとした (支出合計, 件数) の辞書（支出がない期間は含まない）
+    """
+    # 期間一覧は配列パラメータのunnestで渡す（期間数が変わってもSQL文が同じになりコンパイル結果を再利用できる）
+    window_ids = list(windows)
+    expense_windows = func.unnest(
+        bindparam('window_ids', window_ids, type_=ARRAY(PG_UUID(as_uuid=True))),
+        bindparam('category_ids', [windows[i][0] for i in window_ids], type_=ARRAY(PG_UUID(as_uuid=True))),
+        bindparam('start_dates', [windows[i][1] for i in window_ids], type_=ARRAY(Date)),
+        bindparam('end_dates', [windows[i][2] for i in window_ids], type_=ARRAY(Date))
+    ).table_valued(
+        column('window_id', PG_UUID(as_uuid=True)),
+        column('category_id', PG_UUID(as_uuid=True)),
+        column('start_date', Date),
+        column('end_date', Date)
+    ).render_derived(name='expense_windows')
+
+    transaction = models.Transaction
+    in_window = and_(
+        transaction.user_id == user_id,
+        transaction.transaction_type == 'expense',
+        transaction.transaction_date >= expense_windows.c.start_date,
+        transaction.transaction_date < expense_windows.c.end_date
+    )
+
+    def totals_query(join_condition, window_filter):
+        query = db.query(
+            expense_windows.c.window_id,
+            func.sum(transaction.amount).label('spent'),
+            func.count(transaction.id).label('transaction_count')
+        ).select_from(expense_windows).join(
+            transaction, and_(in_window, join_condition)
+        )
+        if love_categories_only:
+            query = query.join(
+                models.Category, models.Category.id == transaction.category_id
+            ).filter(models.Category.is_love_category == True)
+        return query.filter(window_filter).group_by(expense_windows.c.window_id)
+
+    # カテゴリ指定と全体で結合条件を分け、それぞれインデックスで範囲検索させる
+    rows = totals_query(
+        transaction.category_id == expense_windows.c.category_id,
+        expense_windows.c.category_id.isnot(None)
+    ).union_all(
+        totals_query(true(), expense_windows.c.category_id.is_(None))
+    ).all()
+
+    return {row.window_id: (row.spent, row.transaction_count) for row in rows}
+
+
+def calculate_budgets_progress(
+    db: Session,
+    budgets: Iterable[models.Budget],
+    user_id: UUID,
+    today: Optional[date] = None
+) -> Dict[UUID, dict]:
+    """
+    複数の予算の進捗をまとめて計算
+
+    月次・年次予算は月次集計をカテゴリ単位で集計する1クエリ、カスタム期間の
+    予算は期間一覧とJOINする1クエリで支出を取得するため、発行するSQLは
+    予算の数に関係なく最大2回。
+
+    Returns:
+        予算IDをキーとした進捗情報の辞書
+    """
+    today = today or date.today()
+    budgets = list(budgets)
+
+    windows = {budget.id: budget_period_window(budget, today) for budget in budgets}
+
+    month_spent: Dict[UUID, Decimal] = {}
+    year_spent: Dict[UUID, Decimal] = {}
+    if any(budget.period in ROLLUP_PERIODS for budget in budgets):
+        month_spent, year_spent = _rollup_spent_by_category(db, user_id, today)
+
+    custom_windows = {
+        budget.id: (budget.category_id, *windows[budget.id])
+        for budget in budgets
+        if budget.period not in ROLLUP_PERIODS
+    }
+    custom_totals = expense_totals_by_window(db, user_id, custom_windows) if custom_windows else {}
+
+    progress = {}
+    for budget in budgets:
+        if budget.period in ROLLUP_PERIODS:
+            spent_by_category = month_spent if budget.period == 'monthly' else year_spent
+            if budget.category_id:
+                spent_amount = spent_by_category.get(budget.category_id, Decimal('0'))
+            else:
+                spent_amount = sum(spent_by_category.values(), Decimal('0'))
+        else:
+            spent_amount = custom_totals.get(budget.id, (Decimal('0'), 0))[0]
+
+        progress[budget.id] = build_budget_progress(
+            budget, Decimal(str(spent_amount)), windows[budget.id][1], today
+        )
+
+    return progress
+
+
+def create_budget_alert_notifications(db: Session, user_id: UUID, today: Optional[date] = None) -> int:
+    """
+    アラート閾値・予算額に達した予算の通知を作成
+
+    同じ予算・期間・種別の通知は一度だけ作成する。
+
+    Returns:
+        作成した通知の数
+    """
+    today = today or date.today()
+    budgets = db.query(models.Budget).filter(
+        models.Budget.user_id == user_id,
+        models.Budget.is_love_budget == False,
+        models.Budget.is_active == True
+    ).all()
+    if not budgets:
+        return 0
+
+    progress_by_budget = calculate_budgets_progress(db, budgets, user_id, today)
+    alerts = []
+    for budget in budgets:
+        progress = progress_by_budget[budget.id]
+        if progress["is_over_budget"]:
+            alerts.append((budget, 'budget_exceeded', progress))
+        elif progress["is_alert_threshold_reached"]:
+            alerts.append((budget, 'budget_warning', progress))
+    if not alerts:
+        return 0
+
+    # 通知済みの (予算ID, 種別, 期間開始日) を1クエリで取得
+    data = models.Notification.data
+    notified = set(db.query(
+        data['budget_id'].as_string(),
+        models.Notification.type,
+        data['period_start'].as_string()
+    ).filter(
+        models.Notification.user_id == user_id,
+        models.Notification.type.in_(BUDGET_ALERT_NOTIFICATIONS),
+        data['budget_id'].as_string().in_([str(budget.id) for budget, _, _ in alerts])
+    ).all())
+
+    created = 0
+    for budget, notification_type, progress in alerts:
+        period_start = budget_period_window(budget, today)[0].isoformat()
+        if (str(budget.id), notification_type, period_start) in notified:
+            continue
+
+        db.add(build_budget_notification(
+            user_id,
+            budget.name,
+            notification_type,
+            progress["usage_percentage"],
+            progress["spent_amount"],
+            float(budget.amount),
+            budget_id=str(budget.id),
+            period_start=period_start
+        ))
+        created += 1
+
+    return created
@@ -0,0 +1,160 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session, joinedload
+
+from app import models
+
+RECENT_TRANSACTIONS_LIMIT = 10
+
+
+def build_dashboard_summary(
+    db: Session,
+    user_id: UUID,
+    today: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    ダッシュボードサマリーを構築
+
+    今月・前月の収支、カテゴリ内訳、Love統計は前月初日以降の取引を
+    カテゴリ単位で条件付き集計する1クエリから、最近の取引はカテゴリを
+    JOINで同時取得する1クエリから組み立てる（合計2ラウンドトリップ）。
+    """
+    today = today or date.today()
+    current_month_start = date(today.year, today.month, 1)
+    prev_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
+    tomorrow = today + timedelta(days=1)
+
+    transaction = models.Transaction
+    is_income = transaction.transaction_type == 'income'
+    is_expense = transaction.transaction_type == 'expense'
+    is_current_month = transaction.transaction_date >= current_month_start
+    is_current_to_date = and_(is_current_month, transaction.transaction_date < tomorrow)
+    is_previous_month = transaction.transaction_date < current_month_start
+
+    # カテゴリ単位の条件付き集計（今月・前月・Love統計をまとめて取得）
+    category_rows = db.query(
+        models.Category,
+        func.sum(transaction.amount).filter(and_(is_current_to_date, is_income)).label('current_income'),
+        func.sum(transaction.amount).filter(and_(is_current_to_date, is_expense)).label('current_expense'),
+        func.sum(transaction.amount).filter(and_(is_previous_month, is_income)).label('prev_income'),
+        func.sum(transaction.amount).filter(and_(is_previous_month, is_expense)).label('prev_expense'),
+        func.sum(transaction.amount).filter(and_(is_current_month, is_expense)).label('month_expense'),
+        func.count(transaction.id).filter(and_(is_current_month, is_expense)).label('month_expense_count'),
+        func.sum(transaction.amount).filter(is_current_month).label('month_amount'),
+        func.count(transaction.id).filter(is_current_month).label('month_count'),
+        func.sum(transaction.love_rating).filter(is_current_month).label('month_rating_sum'),
+        func.count(transaction.love_rating).filter(is_current_month).label('month_rating_count')
+    ).join(
+        transaction, transaction.category_id == models.Category.id
+    ).filter(
+        transaction.user_id == user_id,
+        transaction.transaction_date >= prev_month_start
+    ).group_by(models.Category.id).all()
+
+    current_income = Decimal('0')
+    current_expense = Decimal('0')
+    prev_income = Decimal('0')
+    prev_expense = Decimal('0')
+    love_spending = Decimal('0')
+    love_transactions = 0
+    love_rating_sum = 0
+    love_rating_count = 0
+
+    for row in category_rows:
+        current_income += row.current_income or 0
+        current_expense += row.current_expense or 0
+        prev_income += row.prev_income or 0
+        prev_expense += row.prev_expense or 0
+
+        if row.Category.is_love_category:
+            love_spending += row.month_amount or 0
+            love_transactions += row.month_count or 0
+            love_rating_sum += row.month_rating_sum or 0
+            love_rating_count += row.month_rating_count or 0
+
+    # 今月の支出カテゴリ内訳
+    expense_rows = [row for row in category_rows if row.month_expense_count]
+    total_expense = sum(row.month_expense or 0 for row in expense_rows)
+
+    categories = []
+    for row in sorted(expense_rows, key=lambda r: r.month_expense or 0, reverse=True):
+        amount = row.month_expense or 0
+        categories.append({
+            "category": {
+                "id": str(row.Category.id),
+                "name": row.Category.name,
+                "icon": row.Category.icon,
+                "color": row.Category.color,
+                "is_default": row.Category.is_default,
+                "is_love_category": row.Category.is_love_category
+            },
+            "amount": float(amount),
+            "percentage": float(amount / total_expense * 100) if total_expense > 0 else 0,
+            "transaction_count": row.month_expense_count
+        })
+
+    return {
+        "current_month": {
+            "income": float(current_income),
+            "expense": float(current_expense),
+            "balance": float(current_income - current_expense)
+        },
+        "previous_month": {
+            "income": float(prev_income),
+            "expense": float(prev_expense),
+            "balance": float(prev_income - prev_expense)
+        },
+        "categories": categories,
+        "recent_transactions": get_recent_transactions(db, user_id),
+        "love_stats": {
+            "love_spending": float(love_spending),
+            "love_transactions": love_transactions,
+            "average_love_rating": (
+                float(love_rating_sum / love_rating_count) if love_rating_count else 0
+            )
+        }
+    }
+
+
+def get_recent_transactions(
+    db: Session,
+    user_id: UUID,
+    limit: int = RECENT_TRANSACTIONS_LIMIT
+) -> List[Dict[str, Any]]:
+    """最近の取引をカテゴリと一緒に1クエリで取得"""
+    transactions = db.query(models.Transaction).options(
+        joinedload(models.Transaction.category)
+    ).filter(
+        models.Transaction.user_id == user_id
+    ).order_by(
+        models.Transaction.transaction_date.desc(),
+        models.Transaction.created_at.desc()
+    ).limit(limit).all()
+
+    recent_transactions = []
+    for transaction in transactions:
+        category = transaction.category
+        recent_transactions.append({
+            "id": str(transaction.id),
+            "amount": float(transaction.amount),
+            "transaction_type": transaction.transaction_type,
+            "sharing_type": transaction.sharing_type,
+            "payment_method": transaction.payment_method,
+            "description": transaction.description,
+            "transaction_date": transaction.transaction_date.isoformat(),
+            "category": {
+                "id": str(category.id),
+                "name": category.name,
+                "icon": category.icon,
+                "color": category.color,
+                "is_love_category": category.is_love_category
+            } if category else None,
+            "love_rating": transaction.love_rating,
+            "created_at": transaction.created_at.isoformat()
+        })
+
+    return recent_transactions
@@ -0,0 +1,240 @@
+"""
+収支予測
+
+定期取引の今後の実行予定と、月次集計から求めた定期取引以外の支出・収入の
+移動平均（ベースライン）を組み合わせて、今後数ヶ月のカテゴリ別収支を予測する。
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+
+from app import models
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.schemas.report import CashFlowForecast, ForecastCategory, ForecastMonth
+from app.services.monthly_rollup import month_range_filter
+from app.services.recurrence import RecurrenceRule, expand_occurrences
+
+# ユーザーID -> {(予測月数, 履歴月数, 基準日): CashFlowForecast}
+_forecast_cache = TTLCache(settings.FORECAST_CACHE_TTL_SECONDS)
+
+CENT = Decimal('0.01')
+
+
+def invalidate_forecast(user_id: UUID) -> None:
+    """ユーザーの予測キャッシュを破棄（取引・定期取引の変更時に呼び出す）"""
+    _forecast_cache.delete(str(user_id))
+
+
+def _month_key(value: date) -> Tuple[int, int]:
+    return value.year, value.month
+
+
+def get_history_totals(
+    db: Session,
+    user_id: UUID,
+    history_start: date,
+    history_end: date
+) -> Tuple[Dict[Tuple[UUID, str], Decimal], int, Dict[UUID, models.Category]]:
+    """
+    月次集計から履歴期間 [history_start, history_end) のカテゴリ・種別ごとの合計を1クエリで取得
+
+    Returns:
+        ((カテゴリID, 取引種別) -> 合計金額, データのある月数, カテゴリID -> カテゴリ)
+    """
+    rollup = models.UserMonthlyRollup
+    rows = db.query(
+        models.Category,
+        rollup.year,
+        rollup.month,
+        rollup.transaction_type,
+        func.sum(rollup.total_amount).label('total_amount')
+    ).join(
+        models.Category, models.Category.id == rollup.category_id
+    ).filter(
+        rollup.user_id == user_id,
+        rollup.transaction_count > 0,
+        *month_range_filter(history_start, history_end)
+    ).group_by(
+        models.Category.id, rollup.year, rollup.month, rollup.transaction_type
+    ).all()
+
+    totals: Dict[Tuple[UUID, str], Decimal] = defaultdict(Decimal)
+    months = set()
+    categories = {}
+    for category, year, month, transaction_type, total_amount in rows:
+        totals[(category.id, transaction_type)] += Decimal(str(total_amount))
+        months.add((year, month))
+        categories[category.id] = category
+    return totals, len(months), categories
+
+
+def _schedule_rule(rt: models.RecurringTransaction, next_execution_date: date) -> RecurrenceRule:
+    """定期取引と同じ周期で、指定日から始まるルールを作成"""
+    return RecurrenceRule(
+        frequency=rt.frequency,
+        next_execution_date=next_execution_date,
+        interval_value=rt.interval_value or 1,
+        day_of_month=rt.day_of_month,
+        day_of_week=rt.day_of_week
+    )
+
+
+def estimate_recurring_history(
+    rules: List[models.RecurringTransaction],
+    history_start: date,
+    history_end: date
+) -> Dict[Tuple[UUID, str], Decimal]:
+    """
+    履歴期間の集計に含まれる定期取引の金額を推定
+
+    月次集計は定期取引による取引を区別しないため、各ルールの周期で履歴期間内に
+    実行される回数を展開し、最終実行日までの回・実行回数を上限として見積もる。
+    """
+    history_last = history_end - timedelta(days=1)
+    executed_rules = [
+        rt for rt in rules
+        if rt.last_execution_date and rt.last_execution_date >= history_start
+    ]
+    expansions = expand_occurrences(
+        [_schedule_rule(rt, history_start) for rt in executed_rules],
+        until=history_last
+    )
+
+    estimated: Dict[Tuple[UUID, str], Decimal] = defaultdict(Decimal)
+    for rt, expansion in zip(executed_rules, expansions):
+        executed = [
+            occurrence for occurrence in expansion.occurrences
+            if occurrence <= rt.last_execution_date
+        ]
+        count = min(len(executed), rt.execution_count or 0)
+        estimated[(rt.category_id, rt.transaction_type)] += Decimal(str(rt.amount)) * count
+    return estimated
+
+
+def build_cash_flow_forecast(
+    db: Session,
+    user_id: UUID,
+    months: int = 6,
+    history_months: int = 3,
+    today: Optional[date] = None
+) -> CashFlowForecast:
+    """
+    来月から months ヶ月分の収支を予測
+
+    直近 history_months ヶ月（今月を除く）の月次集計の平均から定期取引分を除いたものを
+    ベースラインとし、各月の定期取引の実行予定額を加算する。
+    """
+    today = today or date.today()
+    current_month = today.replace(day=1)
+    forecast_start = current_month + relativedelta(months=1)
+    forecast_end = forecast_start + relativedelta(months=months)
+    history_start = current_month - relativedelta(months=history_months)
+
+    # 履歴（1クエリ）と有効な定期取引
+    history, history_month_count, categories = get_history_totals(db, user_id, history_start, current_month)
+    rules = db.query(models.RecurringTransaction).options(
+        joinedload(models.RecurringTransaction.category)
+    ).filter(
+        models.RecurringTransaction.user_id == user_id,
+        models.RecurringTransaction.is_active == True
+    ).all()
+    for rt in rules:
+        categories.setdefault(rt.category_id, rt.category)
+
+    # ベースライン: 定期取引以外の月平均
+    recurring_history = estimate_recurring_history(rules, history_start, current_month)
+    baseline: Dict[Tuple[UUID, str], Decimal] = {}
+    if history_month_count:
+        for key, total in history.items():
+            non_recurring = max(total - recurring_history.get(key, Decimal('0')), Decimal('0'))
+            average = (non_recurring / history_month_count).quantize(CENT)
+            if average > 0:
+                baseline[key] = average
+
+    # 定期取引の実行予定を月ごとに集計
+    recurring: Dict[Tuple[int, int], Dict[Tuple[UUID, str], Decimal]] = defaultdict(lambda: defaultdict(Decimal))
+    expansions = expand_occurrences(rules, until=forecast_end - timedelta(days=1), start=forecast_start)
+    for rt, expansion in zip(rules, expansions):
+        amount = Decimal(str(rt.amount))
+        for occurrence in expansion.occurrences:
+            recurring[_month_key(occurrence)][(rt.category_id, rt.transaction_type)] += amount
+
+    monthly = []
+    for offset in range(months):
+        month_start = forecast_start + relativedelta(months=offset)
+        month_recurring = recurring.get(_month_key(month_start), {})
+
+        month_categories = []
+        for key in set(baseline) | set(month_recurring):
+            category_id, transaction_type = key
+            category = categories.get(category_id)
+            recurring_amount = month_recurring.get(key, Decimal('0'))
+            baseline_amount = baseline.get(key, Decimal('0'))
+            month_categories.append(ForecastCategory(
+                category_id=category_id,
+                category_name=category.name if category else '',
+                category_icon=(category.icon or '') if category else '',
+                transaction_type=transaction_type,
+                recurring_amount=recurring_amount,
+                baseline_amount=baseline_amount,
+                total_amount=recurring_amount + baseline_amount
+            ))
+        month_categories.sort(key=lambda x: (x.transaction_type, -x.total_amount))
+
+        income = sum((c.total_amount for c in month_categories if c.transaction_type == 'income'), Decimal('0'))
+        expense = sum((c.total_amount for c in month_categories if c.transaction_type == 'expense'), Decimal('0'))
+        monthly.append(ForecastMonth(
+            month=f"{month_start.year}-{month_start.month:02d}",
+            income=income,
+            expense=expense,
+            balance=income - expense,
+            recurring_income=sum(
+                (amount for (_, transaction_type), amount in month_recurring.items() if transaction_type == 'income'),
+                Decimal('0')
+            ),
+            recurring_expense=sum(
+                (amount for (_, transaction_type), amount in month_recurring.items() if transaction_type == 'expense'),
+                Decimal('0')
+            ),
+            categories=month_categories
+        ))
+
+    total_income = sum((month.income for month in monthly), Decimal('0'))
+    total_expense = sum((month.expense for month in monthly), Decimal('0'))
+    return CashFlowForecast(
+        base_date=today,
+        months=months,
+        history_months=history_months,
+        total_income=total_income,
+        total_expense=total_expense,
+        total_balance=total_income - total_expense,
+        monthly=monthly
+    )
+
+
+def get_cash_flow_forecast(
+    db: Session,
+    user_id: UUID,
+    months: int = 6,
+    history_months: int = 3,
+    today: Optional[date] = None
+) -> CashFlowForecast:
+    """収支予測を取得（次の取引・定期取引の変更までユーザーごとにキャッシュ）"""
+    today = today or date.today()
+    cache_key = str(user_id)
+    params = (months, history_months, today)
+
+    cached = _forecast_cache.get(cache_key) or {}
+    if params in cached:
+        return cached[params]
+
+    forecast = build_cash_flow_forecast(db, user_id, months, history_months, today)
+    _forecast_cache.set(cache_key, {**cached, params: forecast})
+    return forecast
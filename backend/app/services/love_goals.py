@@ -0,0 +1,124 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services.budget_progress import expense_totals_by_window
+
+GOAL_ACHIEVED_NOTIFICATION = 'love_goal_achieved'
+
+
+def love_goal_window(goal: models.Budget, today: date) -> Tuple[date, date]:
+    """Love Goalの集計期間 [start_date, end_date) を取得（終了日未設定の場合は今日まで）"""
+    end_date = goal.end_date or today
+    return goal.start_date, end_date + timedelta(days=1)
+
+
+def evaluate_love_goals(
+    db: Session,
+    goals: Iterable[models.Budget],
+    user_id: UUID,
+    today: Optional[date] = None
+) -> Dict[UUID, Tuple[Decimal, int]]:
+    """
+    複数のLove Goalの支出合計と取引数をまとめて計算
+
+    Loveカテゴリの支出を、ゴールごとの期間・カテゴリで1クエリで集計する。
+
+    Returns:
+        ゴールIDをキーとした (支出合計, 取引数) の辞書
+    """
+    today = today or date.today()
+    goals = list(goals)
+    if not goals:
+        return {}
+
+    windows = {
+        goal.id: (goal.category_id, *love_goal_window(goal, today))
+        for goal in goals
+    }
+    totals = expense_totals_by_window(db, user_id, windows, love_categories_only=True)
+
+    return {
+        goal.id: totals.get(goal.id, (Decimal('0'), 0))
+        for goal in goals
+    }
+
+
+def get_notified_goal_ids(db: Session, user_id: UUID, goal_ids: Iterable[UUID]) -> Set[str]:
+    """達成通知が作成済みのゴールIDを1クエリで取得"""
+    goal_ids = [str(goal_id) for goal_id in goal_ids]
+    if not goal_ids:
+        return set()
+
+    goal_id_value = models.Notification.data['goal_id'].as_string()
+    rows = db.query(goal_id_value).filter(
+        models.Notification.user_id == user_id,
+        models.Notification.type == GOAL_ACHIEVED_NOTIFICATION,
+        goal_id_value.in_(goal_ids)
+    ).all()
+    return {row[0] for row in rows}
+
+
+def find_newly_achieved_goals(
+    db: Session,
+    goals: Iterable[models.Budget],
+    user_id: UUID,
+    today: Optional[date] = None
+) -> List[Tuple[models.Budget, Decimal]]:
+    """
+    達成済みで、まだ達成通知がないLove Goalを取得
+
+    Returns:
+        (ゴール, 支出合計) のリスト
+    """
+    goals = list(goals)
+    totals = evaluate_love_goals(db, goals, user_id, today)
+    achieved = [
+        (goal, totals[goal.id][0])
+        for goal in goals
+        if totals[goal.id][0] >= goal.amount
+    ]
+    if not achieved:
+        return []
+
+    notified = get_notified_goal_ids(db, user_id, [goal.id for goal, _ in achieved])
+    return [
+        (goal, spent_amount)
+        for goal, spent_amount in achieved
+        if str(goal.id) not in notified
+    ]
+
+
+def create_goal_achievement_notifications(db: Session, user_id: UUID, today: Optional[date] = None) -> int:
+    """
+    新たに達成したLove Goalの達成通知を作成
+
+    Returns:
+        作成した通知の数
+    """
+    love_goals = db.query(models.Budget).filter(
+        models.Budget.user_id == user_id,
+        models.Budget.is_love_budget == True,
+        models.Budget.is_active == True
+    ).all()
+
+    achieved = find_newly_achieved_goals(db, love_goals, user_id, today)
+    for goal, spent_amount in achieved:
+        db.add(models.Notification(
+            user_id=user_id,
+            type=GOAL_ACHIEVED_NOTIFICATION,
+            title='🎉 Love Goal達成！',
+            message=f'目標「{goal.name}」を達成しました！',
+            data={
+                'goal_id': str(goal.id),
+                'goal_name': goal.name,
+                'amount': float(goal.amount),
+                'spent_amount': float(spent_amount)
+            },
+            priority='high'
+        ))
+    return len(achieved)
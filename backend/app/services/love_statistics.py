@@ -0,0 +1,126 @@
+"""
+Love統計のSQL側での集計
+
+Love取引をORMで全件読み込まず、期間 [start_date, end_date) の集計結果（数行）だけを取得する。
+- get_love_aggregates: Love取引の件数・支出・評価と全体の支出（条件付き集計）
+- get_most_loved_day / get_most_loved_category: Love支出が最も多い日・カテゴリ（GROUP BY + LIMIT 1）
+- get_love_streak: Love取引がある日の最長連続日数（gaps-and-islands）
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import Integer, and_, cast, func
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def _love_transactions_filter(user_id: UUID, start_date: date, end_date: date):
+    transaction = models.Transaction
+    return (
+        transaction.user_id == user_id,
+        models.Category.is_love_category == True,
+        transaction.transaction_date >= start_date,
+        transaction.transaction_date < end_date
+    )
+
+
+def get_love_aggregates(db: Session, user_id: UUID, start_date: date, end_date: date) -> Dict[str, Any]:
+    """
+    Love取引の件数・支出・評価の合計と件数、全体の支出を1回の条件付き集計で取得
+
+    戻り値のキーは reports.build_love_statistics の引数と同じ。
+    """
+    transaction = models.Transaction
+    is_love = models.Category.is_love_category == True
+    is_expense = transaction.transaction_type == 'expense'
+    row = db.query(
+        func.count(transaction.id).filter(is_love).label('love_transaction_count'),
+        func.coalesce(func.sum(transaction.amount).filter(and_(is_love, is_expense)), 0).label('love_spending'),
+        func.coalesce(func.sum(transaction.love_rating).filter(is_love), 0).label('love_rating_sum'),
+        func.count(transaction.love_rating).filter(is_love).label('love_rating_count'),
+        func.coalesce(func.sum(transaction.amount).filter(is_expense), 0).label('total_expense')
+    ).join(
+        models.Category, models.Category.id == transaction.category_id
+    ).filter(
+        transaction.user_id == user_id,
+        transaction.transaction_date >= start_date,
+        transaction.transaction_date < end_date
+    ).one()
+
+    return {
+        "love_spending": Decimal(str(row.love_spending)),
+        "love_transaction_count": int(row.love_transaction_count),
+        "love_rating_sum": int(row.love_rating_sum),
+        "love_rating_count": int(row.love_rating_count),
+        "total_expense": Decimal(str(row.total_expense))
+    }
+
+
+def get_most_loved_day(db: Session, user_id: UUID, start_date: date, end_date: date) -> Optional[date]:
+    """Love支出の合計が最も多い日（同額の場合は早い日）"""
+    transaction = models.Transaction
+    return db.query(
+        transaction.transaction_date
+    ).join(
+        models.Category, models.Category.id == transaction.category_id
+    ).filter(
+        *_love_transactions_filter(user_id, start_date, end_date),
+        transaction.transaction_type == 'expense'
+    ).group_by(
+        transaction.transaction_date
+    ).order_by(
+        func.sum(transaction.amount).desc(),
+        transaction.transaction_date
+    ).limit(1).scalar()
+
+
+def get_most_loved_category(db: Session, user_id: UUID, start_date: date, end_date: date) -> Optional[str]:
+    """Love支出の合計が最も多いカテゴリ名（同額の場合は名前順）"""
+    transaction = models.Transaction
+    return db.query(
+        models.Category.name
+    ).join(
+        transaction, transaction.category_id == models.Category.id
+    ).filter(
+        *_love_transactions_filter(user_id, start_date, end_date),
+        transaction.transaction_type == 'expense'
+    ).group_by(
+        models.Category.name
+    ).order_by(
+        func.sum(transaction.amount).desc(),
+        models.Category.name
+    ).limit(1).scalar()
+
+
+def get_love_streak(db: Session, user_id: UUID, start_date: date, end_date: date) -> int:
+    """
+    Love取引がある日の最長連続日数
+
+    日付から日付順の連番を引いた値は、連続した日の間で同じになる（gaps-and-islands）。
+    その値ごとの日数の最大を求める。
+    """
+    transaction = models.Transaction
+    love_days = db.query(
+        transaction.transaction_date.label('day')
+    ).join(
+        models.Category, models.Category.id == transaction.category_id
+    ).filter(
+        *_love_transactions_filter(user_id, start_date, end_date)
+    ).distinct().subquery()
+
+    islands = db.query(
+        (love_days.c.day - cast(func.row_number().over(order_by=love_days.c.day), Integer)).label('island')
+    ).subquery()
+
+    streaks = db.query(
+        func.count().label('days')
+    ).select_from(
+        islands
+    ).group_by(
+        islands.c.island
+    ).subquery()
+
+    return db.query(func.coalesce(func.max(streaks.c.days), 0)).scalar()
@@ -0,0 +1,177 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Integer, func, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import models
+
+ROLLUP_KEY = ('user_id', 'year', 'month', 'category_id', 'transaction_type', 'sharing_type')
+ROLLUP_VALUES = ('total_amount', 'transaction_count', 'love_rating_sum', 'love_rating_count')
+
+
+def rollup_snapshot(transaction: models.Transaction) -> Dict[str, Any]:
+    """集計に影響する取引の値を取得（更新前の値の退避にも使用）"""
+    return {
+        "user_id": transaction.user_id,
+        "transaction_date": transaction.transaction_date,
+        "category_id": transaction.category_id,
+        "transaction_type": transaction.transaction_type,
+        "sharing_type": transaction.sharing_type,
+        "amount": transaction.amount,
+        "love_rating": transaction.love_rating
+    }
+
+
+def apply_rollup_deltas(db: Session, changes: Iterable[Tuple[Dict[str, Any], int]]) -> None:
+    """
+    取引の増減を月次集計に反映
+
+    Args:
+        changes: (rollup_snapshot, 符号) のリスト。追加は+1、削除は-1
+
+    同じ集計キーの変更はまとめてから1回のUPSERTで反映する。
+    """
+    deltas: Dict[tuple, Dict[str, Any]] = {}
+    for snapshot, sign in changes:
+        transaction_date = snapshot["transaction_date"]
+        if isinstance(transaction_date, str):
+            transaction_date = date.fromisoformat(transaction_date)
+        key = (
+            snapshot["user_id"],
+            transaction_date.year,
+            transaction_date.month,
+            snapshot["category_id"],
+            snapshot["transaction_type"],
+            snapshot["sharing_type"]
+        )
+        delta = deltas.setdefault(key, {
+            "total_amount": Decimal('0'),
+            "transaction_count": 0,
+            "love_rating_sum": 0,
+            "love_rating_count": 0
+        })
+        delta["total_amount"] += Decimal(str(snapshot["amount"])) * sign
+        delta["transaction_count"] += sign
+        if snapshot["love_rating"] is not None:
+            delta["love_rating_sum"] += snapshot["love_rating"] * sign
+            delta["love_rating_count"] += sign
+
+    rows = [
+        {**dict(zip(ROLLUP_KEY, key)), **delta}
+        for key, delta in deltas.items()
+        if any(delta.values())
+    ]
+    if not rows:
+        return
+
+    table = models.UserMonthlyRollup.__table__
+    stmt = insert(table).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={
+            **{column: table.c[column] + stmt.excluded[column] for column in ROLLUP_VALUES},
+            "updated_at": func.now()
+        }
+    )
+    db.execute(stmt)
+
+
+def add_transaction_to_rollups(db: Session, transaction: models.Transaction) -> None:
+    """新規取引を月次集計に加算"""
+    apply_rollup_deltas(db, [(rollup_snapshot(transaction), 1)])
+
+
+def remove_transaction_from_rollups(db: Session, transaction: models.Transaction) -> None:
+    """削除する取引を月次集計から減算"""
+    apply_rollup_deltas(db, [(rollup_snapshot(transaction), -1)])
+
+
+def update_transaction_rollups(
+    db: Session,
+    before: Dict[str, Any],
+    transaction: models.Transaction
+) -> None:
+    """更新前後の差分を月次集計に反映"""
+    after = rollup_snapshot(transaction)
+    if before == after:
+        return
+    apply_rollup_deltas(db, [(before, -1), (after, 1)])
+
+
+def rebuild_user_rollups(db: Session, user_id: Optional[UUID] = None) -> None:
+    """
+    取引テーブルから月次集計を再作成（バックフィル・整合性修復用）
+
+    user_idを省略すると全ユーザー分を再作成する。
+    """
+    transaction = models.Transaction
+    year = func.extract('year', transaction.transaction_date).cast(Integer)
+    month = func.extract('month', transaction.transaction_date).cast(Integer)
+    key_columns = [
+        transaction.user_id,
+        year,
+        month,
+        transaction.category_id,
+        transaction.transaction_type,
+        transaction.sharing_type
+    ]
+
+    delete_query = db.query(models.UserMonthlyRollup)
+    source = db.query(
+        *key_columns,
+        func.sum(transaction.amount),
+        func.count(transaction.id),
+        func.coalesce(func.sum(transaction.love_rating), 0),
+        func.count(transaction.love_rating)
+    )
+    if user_id is not None:
+        delete_query = delete_query.filter(models.UserMonthlyRollup.user_id == user_id)
+        source = source.filter(transaction.user_id == user_id)
+    source = source.group_by(*key_columns)
+
+    delete_query.delete(synchronize_session=False)
+    db.execute(
+        insert(models.UserMonthlyRollup.__table__).from_select(
+            list(ROLLUP_KEY) + list(ROLLUP_VALUES),
+            source.statement
+        )
+    )
+
+
+def month_range_filter(start: date, end: date):
+    """
+    [start, end) の月範囲に一致する集計行の条件
+
+    start・endは月初日。行値比較なので (user_id, year, month) の主キーを範囲検索できる。
+    """
+    period = tuple_(models.UserMonthlyRollup.year, models.UserMonthlyRollup.month)
+    return (
+        period >= tuple_(start.year, start.month),
+        period < tuple_(end.year, end.month)
+    )
+
+
+def sum_rollup_amount(
+    db: Session,
+    user_id: UUID,
+    start: date,
+    end: date,
+    transaction_type: str,
+    category_id: Optional[UUID] = None
+) -> Decimal:
+    """月範囲 [start, end) の合計金額を集計テーブルから取得"""
+    rollup = models.UserMonthlyRollup
+    query = db.query(
+        func.coalesce(func.sum(rollup.total_amount), 0)
+    ).filter(
+        rollup.user_id == user_id,
+        rollup.transaction_type == transaction_type,
+        *month_range_filter(start, end)
+    )
+    if category_id:
+        query = query.filter(rollup.category_id == category_id)
+    return Decimal(str(query.scalar()))
@@ -0,0 +1,183 @@
+"""
+定期取引の実行日展開
+
+多数の定期取引について、期間内の実行日をまとめて展開する。
+relativedelta で1回ずつ進める calculate_next_execution_date と同じ結果を、
+月の日数テーブルと序数（date.toordinal）の整数演算で求める。
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, List, NamedTuple, Optional
+
+# グレゴリオ暦は400年（4800ヶ月）周期で繰り返すため、1周期分の月の日数を事前計算
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_CYCLE_MONTHS = 4800
+FREQUENCIES = ('daily', 'weekly', 'monthly', 'yearly')
+
+
+def _is_leap(year: int) -> bool:
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+_MONTH_LENGTHS = tuple(
+    _DAYS_IN_MONTH[month] + (1 if month == 1 and _is_leap(year) else 0)
+    for year in range(400)
+    for month in range(12)
+)
+
+
+def month_length(month_index: int) -> int:
+    """月番号（year * 12 + month - 1）の月の日数"""
+    return _MONTH_LENGTHS[month_index % _CYCLE_MONTHS]
+
+
+class RecurrenceRule(NamedTuple):
+    """展開対象の定期取引ルール（models.RecurringTransaction と同じ属性名）"""
+    frequency: str
+    next_execution_date: date
+    interval_value: int = 1
+    day_of_month: Optional[int] = None
+    day_of_week: Optional[int] = None
+    end_date: Optional[date] = None
+    max_executions: Optional[int] = None
+    execution_count: int = 0
+
+
+@dataclass
+class RecurrenceExpansion:
+    """ルール1件の展開結果"""
+    # 期間内の実行日（古い順）
+    occurrences: List[date]
+    # 展開後の次回実行日
+    next_execution_date: date
+    # 展開後の実行回数（期間の開始前に実行される回も含む）
+    execution_count: int
+    # 終了日・最大実行回数に達した、または日付が進まないルール
+    exhausted: bool
+
+
+def _step_dates(rule, first: date, until: date, max_count: Optional[int]) -> List[date]:
+    """
+    ルールの実行日を first から until まで（最大 max_count 件）生成
+
+    until を超える最初の実行日も末尾に含める（次回実行日として使用する）。
+    """
+    interval = rule.interval_value or 1
+    frequency = rule.frequency
+    first_ordinal = first.toordinal()
+    until_ordinal = until.toordinal()
+
+    if frequency in ('daily', 'weekly'):
+        if frequency == 'daily':
+            step = interval
+            second_offset = interval
+        else:
+            step = 7 * interval
+            if rule.day_of_week is not None:
+                second_offset = rule.day_of_week - first.weekday()
+                if second_offset <= 0:
+                    second_offset += step
+            else:
+                second_offset = step
+
+        second_ordinal = first_ordinal + second_offset
+        if second_ordinal > until_ordinal:
+            count = 2
+        else:
+            count = (until_ordinal - second_ordinal) // step + 3
+        if max_count is not None:
+            count = min(count, max_count)
+        dates = [first]
+        dates.extend(map(date.fromordinal, range(second_ordinal, second_ordinal + (count - 1) * step, step)))
+        return dates
+
+    if frequency in ('monthly', 'yearly'):
+        months = interval if frequency == 'monthly' else 12 * interval
+        month_index = first.year * 12 + first.month - 1
+        day_of_month = rule.day_of_month if frequency == 'monthly' else None
+        # 日指定がない場合、relativedelta は月末で丸めた日をそのまま引き継ぐ
+        day = first.day
+        dates = [first]
+        while dates[-1] <= until and (max_count is None or len(dates) < max_count):
+            month_index += months
+            length = month_length(month_index)
+            if day_of_month:
+                current_day = min(day_of_month, length)
+            else:
+                day = min(day, length)
+                current_day = day
+            year, month = divmod(month_index, 12)
+            dates.append(date(year, month + 1, current_day))
+        return dates
+
+    # 未知の頻度は日付が進まない
+    return [first]
+
+
+def expand_occurrences(
+    rules: Iterable,
+    until: date,
+    start: Optional[date] = None,
+    limit: Optional[int] = None
+) -> List[RecurrenceExpansion]:
+    """
+    複数の定期取引ルールの実行日をまとめて展開
+
+    各ルールの next_execution_date から until（この日を含む）までの実行日を、
+    終了日・最大実行回数を考慮して展開する。
+
+    Args:
+        rules: RecurrenceRule または models.RecurringTransaction
+        until: 展開する期間の最終日
+        start: 指定した場合、この日より前の実行日は結果に含めない（実行回数には数える）
+        limit: ルール1件あたりの展開件数の上限（残りは次回実行日以降として扱う）
+
+    Returns:
+        ルールと同じ順序の展開結果
+    """
+    expansions = []
+    for rule in rules:
+        first = rule.next_execution_date
+        execution_count = rule.execution_count or 0
+        remaining = None
+        if rule.max_executions:
+            remaining = max(rule.max_executions - execution_count, 0)
+        if limit is not None:
+            remaining = limit if remaining is None else min(remaining, limit)
+
+        last_date = until
+        if rule.end_date and rule.end_date < last_date:
+            last_date = rule.end_date
+
+        # 実行日と、その次の実行日（次回実行日）を生成
+        max_count = None if remaining is None else remaining + 1
+        dates = _step_dates(rule, first, last_date, max_count)
+        advances = rule.frequency in FREQUENCIES
+
+        if advances:
+            executed = 0
+            while executed < len(dates) - 1 and dates[executed] <= last_date:
+                executed += 1
+            next_execution_date = dates[executed]
+        else:
+            # 日付が進まないルールは1回だけ実行して停止
+            executed = 1 if first <= last_date and (remaining is None or remaining > 0) else 0
+            next_execution_date = first
+
+        occurrences = dates[:executed]
+        if start is not None:
+            occurrences = [occurrence for occurrence in occurrences if occurrence >= start]
+
+        execution_count += executed
+        exhausted = (
+            (not advances and executed > 0)
+            or (rule.max_executions is not None and rule.max_executions > 0 and execution_count >= rule.max_executions)
+            or (rule.end_date is not None and next_execution_date > rule.end_date)
+        )
+        expansions.append(RecurrenceExpansion(
+            occurrences=occurrences,
+            next_execution_date=next_execution_date,
+            execution_count=execution_count,
+            exhausted=exhausted
+        ))
+    return expansions
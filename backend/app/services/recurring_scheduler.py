@@ -0,0 +1,165 @@
+"""
+定期取引スケジューラ
+
+実行日を迎えた定期取引をまとめて実行する。複数のプロセスから同時に実行しても、
+行ロック（FOR UPDATE SKIP LOCKED）により同じ定期取引が二重に実行されることはない。
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app import models
+from app.db.session import SessionLocal
+from app.services.monthly_rollup import apply_rollup_deltas
+from app.services.recurrence import expand_occurrences
+from app.services.transaction_events import notify_transactions_changed
+from app.utils.text_search import build_search_vector
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+# 1回の実行で1件の定期取引から作成する取引の上限（残りは次回の実行で追いつく）
+MAX_CATCH_UP_OCCURRENCES = 1000
+
+
+@dataclass
+class SchedulerResult:
+    """スケジューラの実行結果"""
+    processed: int = 0
+    transactions_created: int = 0
+    deactivated: int = 0
+    batches: int = 0
+    user_ids: Set[UUID] = field(default_factory=set)
+
+
+def _build_transaction_row(rt: models.RecurringTransaction, occurrence: date) -> Dict[str, Any]:
+    description = f"[定期] {rt.description}" if rt.description else "[定期取引]"
+    return {
+        "user_id": rt.user_id,
+        "category_id": rt.category_id,
+        "amount": rt.amount,
+        "transaction_type": rt.transaction_type,
+        "sharing_type": rt.sharing_type,
+        "payment_method": rt.payment_method,
+        "description": description,
+        "transaction_date": occurrence,
+        # 一括INSERTではORMのイベントが発生しないため、検索用の列もここで作成する
+        "search_vector": build_search_vector(description, None, None)
+    }
+
+
+def run_due_batch(
+    db: Session,
+    today: date,
+    after_id: Optional[UUID],
+    batch_size: int,
+    result: SchedulerResult
+) -> Optional[UUID]:
+    """
+    実行日を迎えた定期取引を1バッチ処理してコミット
+
+    Returns:
+        処理した最後の定期取引ID（次のバッチのキー）。対象がなければNone
+    """
+    rt_model = models.RecurringTransaction
+    query = db.query(rt_model).filter(
+        rt_model.is_active == True,
+        rt_model.next_execution_date <= today
+    )
+    if after_id is not None:
+        query = query.filter(rt_model.id > after_id)
+
+    # 他のワーカーがロック中の行は飛ばす
+    batch = query.order_by(rt_model.id).limit(batch_size).with_for_update(skip_locked=True).all()
+    if not batch:
+        db.rollback()
+        return None
+
+    # 止まっていた期間の回も、本来の実行日ごとに1件ずつ作成する（キャッチアップ）
+    expansions = expand_occurrences(batch, until=today, limit=MAX_CATCH_UP_OCCURRENCES)
+
+    transaction_rows = []
+    for rt, expansion in zip(batch, expansions):
+        for occurrence in expansion.occurrences:
+            transaction_rows.append(_build_transaction_row(rt, occurrence))
+        if expansion.occurrences:
+            rt.last_execution_date = expansion.occurrences[-1]
+            result.user_ids.add(rt.user_id)
+        rt.next_execution_date = expansion.next_execution_date
+        rt.execution_count = expansion.execution_count
+        if expansion.exhausted:
+            # 終了日・最大実行回数に達したルールは停止
+            rt.is_active = False
+            result.deactivated += 1
+
+    if transaction_rows:
+        db.execute(insert(models.Transaction), transaction_rows)
+        apply_rollup_deltas(db, [
+            ({**row, "love_rating": None}, 1) for row in transaction_rows
+        ])
+
+    db.commit()
+
+    result.processed += len(batch)
+    result.transactions_created += len(transaction_rows)
+    result.batches += 1
+    return batch[-1].id
+
+
+def run_due_recurring_transactions(
+    db: Session,
+    today: Optional[date] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> SchedulerResult:
+    """
+    実行日を迎えた全ての定期取引を、IDのキーセットページングでバッチ実行
+
+    バッチごとにコミットしてロックを解放する。取引を作成したユーザーには
+    取引変更イベントを通知する。
+    """
+    today = today or date.today()
+    result = SchedulerResult()
+
+    after_id = None
+    while True:
+        after_id = run_due_batch(db, today, after_id, batch_size, result)
+        if after_id is None:
+            break
+
+    for user_id in result.user_ids:
+        notify_transactions_changed(user_id)
+
+    logger.info(
+        f"Recurring scheduler: processed={result.processed}, "
+        f"created={result.transactions_created}, deactivated={result.deactivated}, "
+        f"batches={result.batches}"
+    )
+    return result
+
+
+def run_scheduler_job(today: Optional[date] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> SchedulerResult:
+    """専用のセッションでスケジューラを実行（CLI・定期実行用）"""
+    db = SessionLocal()
+    try:
+        return run_due_recurring_transactions(db, today, batch_size)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def run_periodically(interval_seconds: int) -> None:
+    """プロセス内でスケジューラを定期実行（アプリのlifespanから起動）"""
+    while True:
+        try:
+            await asyncio.to_thread(run_scheduler_job)
+        except Exception:
+            logger.exception("Recurring scheduler failed")
+        await asyncio.sleep(interval_seconds)
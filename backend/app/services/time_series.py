@@ -0,0 +1,169 @@
+"""
+取引の時系列（日別・週別・月別）の集計
+
+期間 [start_date, end_date) を日・週（月曜始まり）・月の区間に分け、区間ごとの合計を
+取引がない区間も0で埋めて返す。
+- PostgreSQL: generate_series で作った区間に、date_trunc で区間ごとに集計した取引を外部結合する
+- それ以外のデータベース: 日別に集計した取引を、区間の開始日をキーとする辞書でメモリ上で区間に振り分ける
+
+値は Measure（条件を満たす取引の式の合計・件数）で指定するため、平均は合計と件数から呼び出し側で求める。
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import Date, DateTime, Interval, cast, func, literal
+from sqlalchemy.orm import Query, Session
+
+from app import models
+
+# 集計単位と、date_trunc・generate_series の単位
+GRANULARITIES = {"daily": "day", "weekly": "week", "monthly": "month"}
+
+
+@dataclass(frozen=True)
+class Measure:
+    """区間ごとの値（condition を満たす取引の expression の合計。expression がNoneの場合は件数）"""
+    expression: Any = None
+    condition: Any = None
+
+    def aggregate(self):
+        total = func.count() if self.expression is None else func.sum(self.expression)
+        return total.filter(self.condition) if self.condition is not None else total
+
+
+def cash_flow_measures() -> Dict[str, Measure]:
+    """収入・支出の合計"""
+    transaction = models.Transaction
+    return {
+        "income": Measure(transaction.amount, transaction.transaction_type == 'income'),
+        "expense": Measure(transaction.amount, transaction.transaction_type == 'expense')
+    }
+
+
+def bucket_start(day: date, granularity: str) -> date:
+    """日付を含む区間の開始日"""
+    if granularity == "weekly":
+        return day - timedelta(days=day.weekday())
+    if granularity == "monthly":
+        return day.replace(day=1)
+    return day
+
+
+def bucket_starts(start_date: date, end_date: date, granularity: str) -> List[date]:
+    """期間 [start_date, end_date) の区間の開始日（先頭の区間は start_date より前から始まる場合がある）"""
+    step = {
+        "daily": relativedelta(days=1),
+        "weekly": relativedelta(weeks=1),
+        "monthly": relativedelta(months=1)
+    }[granularity]
+    starts = []
+    current = bucket_start(start_date, granularity)
+    while current < end_date:
+        starts.append(current)
+        current += step
+    return starts
+
+
+def period_label(bucket: date, granularity: str) -> str:
+    """区間の表示名（日別・週別は開始日、月別は YYYY-MM）"""
+    if granularity == "monthly":
+        return f"{bucket.year}-{bucket.month:02d}"
+    return bucket.isoformat()
+
+
+def fill_buckets(
+    rows: List[Any],
+    start_date: date,
+    end_date: date,
+    granularity: str,
+    names: List[str]
+) -> List[Dict[str, Any]]:
+    """日別の集計行（transaction_date と各値）を区間に振り分け、取引がない区間を0で埋める"""
+    series = {
+        bucket: dict({"period_start": bucket}, **{name: 0 for name in names})
+        for bucket in bucket_starts(start_date, end_date, granularity)
+    }
+    for row in rows:
+        point = series[bucket_start(row.transaction_date, granularity)]
+        for name in names:
+            point[name] += getattr(row, name) or 0
+    return list(series.values())
+
+
+def build_time_series(
+    db: Session,
+    query: Query,
+    start_date: date,
+    end_date: date,
+    granularity: str,
+    measures: Mapping[str, Measure]
+) -> List[Dict[str, Any]]:
+    """
+    取引のクエリを区間ごとに集計した時系列
+
+    Args:
+        query: models.Transaction を対象とし、ユーザーなどの条件を適用したクエリ（期間の条件はここで適用する）
+        granularity: daily, weekly, monthly
+
+    Returns:
+        区間の開始日の順の {"period_start": date, <measures のキー>: 合計} のリスト
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}")
+    starts = bucket_starts(start_date, end_date, granularity)
+    if not starts:
+        return []
+
+    transaction = models.Transaction
+    names = list(measures)
+    query = query.filter(
+        transaction.transaction_date >= start_date,
+        transaction.transaction_date < end_date
+    )
+
+    if db.get_bind().dialect.name != "postgresql":
+        rows = query.with_entities(
+            transaction.transaction_date,
+            *(measure.aggregate().label(name) for name, measure in measures.items())
+        ).group_by(transaction.transaction_date).all()
+        return fill_buckets(rows, start_date, end_date, granularity, names)
+
+    unit = GRANULARITIES[granularity]
+    bucket = cast(func.date_trunc(unit, transaction.transaction_date), Date)
+    totals = query.with_entities(
+        bucket.label("bucket"),
+        *(measure.aggregate().label(name) for name, measure in measures.items())
+    ).group_by(bucket).subquery()
+
+    series = func.generate_series(
+        cast(literal(starts[0]), DateTime),
+        cast(literal(starts[-1]), DateTime),
+        cast(literal(f"1 {unit}"), Interval)
+    ).table_valued("bucket").render_derived(name="series")
+    period_start = cast(series.c.bucket, Date)
+    rows = db.query(
+        period_start.label("period_start"),
+        *(func.coalesce(totals.c[name], 0).label(name) for name in names)
+    ).select_from(series).outerjoin(
+        totals, totals.c.bucket == period_start
+    ).order_by(series.c.bucket).all()
+    return [row._asdict() for row in rows]
+
+
+def build_cash_flow_series(
+    db: Session,
+    query: Query,
+    start_date: date,
+    end_date: date,
+    granularity: str
+) -> List[Dict[str, Any]]:
+    """区間ごとの収入・支出・収支（Decimal）"""
+    series = build_time_series(db, query, start_date, end_date, granularity, cash_flow_measures())
+    for point in series:
+        point["income"] = Decimal(str(point["income"]))
+        point["expense"] = Decimal(str(point["expense"]))
+        point["balance"] = point["income"] - point["expense"]
+    return series
@@ -0,0 +1,62 @@
+"""
+取引変更イベントの非同期処理
+
+取引の作成・更新・削除後に notify_transactions_changed() を呼ぶと、
+ユーザー単位でまとめてLove Goal達成・予算アラートの判定をリクエスト外で実行する。
+"""
+import logging
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.task_queue import CoalescingTaskQueue
+from app.db.session import SessionLocal
+from app.services.budget_progress import create_budget_alert_notifications
+from app.services.forecast import invalidate_forecast
+from app.services.love_goals import create_goal_achievement_notifications
+
+logger = logging.getLogger(__name__)
+
+CELERY_TASK_NAME = "transactions.process_changes"
+
+
+def process_transaction_changes(db: Session, user_id: UUID) -> None:
+    """ユーザーのLove Goal達成・予算アラートを判定して通知を作成"""
+    goal_notifications = create_goal_achievement_notifications(db, user_id)
+    budget_notifications = create_budget_alert_notifications(db, user_id)
+    db.commit()
+
+    if goal_notifications or budget_notifications:
+        logger.info(
+            f"Created notifications for user {user_id}: "
+            f"goals={goal_notifications}, budgets={budget_notifications}"
+        )
+
+
+def run_transaction_changes_job(user_id) -> None:
+    """キュー・Celeryワーカーから実行するジョブ（専用のセッションを使用）"""
+    db = SessionLocal()
+    try:
+        process_transaction_changes(db, UUID(str(user_id)))
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+transaction_events = CoalescingTaskQueue(
+    name="transaction-events",
+    handler=run_transaction_changes_job,
+    backend=settings.TASK_QUEUE_BACKEND,
+    workers=settings.TASK_QUEUE_WORKERS,
+    coalesce_seconds=settings.TASK_QUEUE_COALESCE_SECONDS,
+    celery_task_name=CELERY_TASK_NAME
+)
+
+
+def notify_transactions_changed(user_id: UUID) -> None:
+    """ユーザーの取引が変更されたことを通知（コミット後に呼ぶ）"""
+    invalidate_forecast(user_id)
+    transaction_events.enqueue(user_id)
@@ -0,0 +1,109 @@
+"""
+取引一覧のキーセット（カーソル）ページネーション
+
+OFFSET は読み飛ばす行数に比例して遅くなるため、(transaction_date, created_at, id) の降順で並べ、
+前のページの最後の行より後ろの行を行値比較で取得する（ix_transactions_user_date_created を範囲検索できる）。
+カーソルは最後の行のキーをエンコードした不透明な文字列。
+
+総件数は毎回数えると件数に比例して遅くなるため、月次集計（user_monthly_rollups）からの推定値も選べる。
+"""
+import base64
+import calendar
+import json
+from datetime import date, datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services.monthly_rollup import month_range_filter
+
+CursorPosition = Tuple[date, datetime, UUID]
+
+# 一覧の並び順（同じ日付・作成日時の取引は id で一意に並べる）
+KEYSET_ORDER = (
+    models.Transaction.transaction_date.desc(),
+    models.Transaction.created_at.desc(),
+    models.Transaction.id.desc()
+)
+
+
+def encode_cursor(transaction: models.Transaction) -> str:
+    """取引の位置を示すカーソルを作成"""
+    payload = json.dumps([
+        transaction.transaction_date.isoformat(),
+        transaction.created_at.isoformat(),
+        str(transaction.id)
+    ])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> CursorPosition:
+    """カーソルから取引の位置を取得（不正な値の場合はValueError）"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        transaction_date, created_at, transaction_id = json.loads(payload)
+        return (
+            date.fromisoformat(transaction_date),
+            datetime.fromisoformat(created_at),
+            UUID(transaction_id)
+        )
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def after_cursor(position: CursorPosition):
+    """カーソルの位置より後ろ（並び順で次）の取引の条件"""
+    return tuple_(
+        models.Transaction.transaction_date,
+        models.Transaction.created_at,
+        models.Transaction.id
+    ) < tuple_(*position)
+
+
+def estimate_transaction_count(
+    db: Session,
+    user_id: UUID,
+    *,
+    category_id: Optional[UUID] = None,
+    transaction_type: Optional[str] = None,
+    sharing_type: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    exact_filters: bool = True
+) -> Tuple[int, bool]:
+    """
+    月次集計から取引の件数を取得
+
+    Returns:
+        (件数, 正確な件数かどうか)。月の途中からの期間や、集計にない条件（exact_filters=False）
+        がある場合は、それらを含む月全体の件数（上限値）になる。
+    """
+    rollup = models.UserMonthlyRollup
+    query = db.query(func.coalesce(func.sum(rollup.transaction_count), 0)).filter(
+        rollup.user_id == user_id
+    )
+    if category_id:
+        query = query.filter(rollup.category_id == category_id)
+    if transaction_type:
+        query = query.filter(rollup.transaction_type == transaction_type)
+    if sharing_type:
+        query = query.filter(rollup.sharing_type == sharing_type)
+
+    exact = exact_filters
+    if date_from or date_to:
+        start = date_from.replace(day=1) if date_from else date(1900, 1, 1)
+        end = _next_month(date_to) if date_to else date(9999, 1, 1)
+        query = query.filter(*month_range_filter(start, end))
+        if date_from and date_from.day != 1:
+            exact = False
+        if date_to and date_to.day != calendar.monthrange(date_to.year, date_to.month)[1]:
+            exact = False
+
+    return int(query.scalar()), exact
+
+
+def _next_month(day: date) -> date:
+    return date(day.year + 1, 1, 1) if day.month == 12 else date(day.year, day.month + 1, 1)
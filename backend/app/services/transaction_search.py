@@ -0,0 +1,55 @@
+"""
+取引の検索（説明・場所・タグ）
+
+PostgreSQL では transactions.search_vector（バイグラムの tsvector、GINインデックス）で候補を絞り込み、
+バイグラムの偶然の一致を除くため、候補の正規化した文字列を正規表現で再確認する。
+順位は ts_rank（説明 > 場所 > タグ の重み）。
+それ以外のデータベースでは、条件に一致する取引からメモリ上の NgramIndex を作り、同じ条件で検索する。
+"""
+from typing import Optional, Tuple
+
+from sqlalchemy import case, cast, func, literal, literal_column
+from sqlalchemy.dialects.postgresql import TSQUERY
+from sqlalchemy.orm import Query, Session
+
+from app import models
+from app.utils.text_search import NgramIndex, SearchQuery
+
+
+def normalized_search_text():
+    """再確認に使う、正規化した説明・場所・タグ（text_search.document_text と同じ値）"""
+    transaction = models.Transaction
+    return func.lower(func.normalize(
+        func.concat_ws(" ", transaction.description, transaction.location, func.array_to_string(transaction.tags, " ")),
+        literal_column("NFKC")
+    ))
+
+
+def apply_search(db: Session, query: Query, search: SearchQuery) -> Tuple[Query, Optional[object]]:
+    """
+    取引のクエリに検索条件を適用
+
+    Returns:
+        (検索条件を適用したクエリ, 順位の式)。検索条件がない場合は順位の式はNone
+    """
+    if not search:
+        return query, None
+
+    transaction = models.Transaction
+    if db.get_bind().dialect.name == "postgresql":
+        tsquery = cast(literal(search.tsquery()), TSQUERY)
+        query = query.filter(transaction.search_vector.bool_op("@@")(tsquery))
+        text = normalized_search_text()
+        query = query.filter(*(text.regexp_match(pattern) for pattern in search.recheck_patterns()))
+        return query, func.ts_rank(transaction.search_vector, tsquery)
+
+    index = NgramIndex()
+    rows = query.with_entities(
+        transaction.id, transaction.description, transaction.location, transaction.tags
+    ).all()
+    for row in rows:
+        index.add(row.id, row.description, row.location, row.tags)
+    scores = dict(index.search(search))
+    query = query.filter(transaction.id.in_(list(scores)))
+    rank = case(scores, value=transaction.id, else_=0.0) if scores else literal(0.0)
+    return query, rank
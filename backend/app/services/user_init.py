@@ -2,6 +2,7 @@ from datetime import date, timedelta
 from decimal import Decimal
 from sqlalchemy.orm import Session
 from app import models
+from app.services.monthly_rollup import add_transaction_to_rollups
 import logging
 
 logger = logging.getLogger(__name__)
@@ -111,4 +112,5 @@ def create_welcome_transaction(db: Session, user_id: str) -> None:
     )
     
     db.add(welcome_transaction)
+    add_transaction_to_rollups(db, welcome_transaction)
     logger.info(f"Created welcome transaction for user {user_id}")
\ No newline at end of file
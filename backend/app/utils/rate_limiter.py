@@ -1,14 +1,267 @@
+"""
+レート制限
+
+slowapi（limits）のスライディングウィンドウのカウンターで制限する。保存先は RATE_LIMIT_BACKEND で選択する:
+
+- memory: プロセス内（ワーカーごとに別のカウンター）
+- redis: 複数ワーカー間で共有（REDIS_URL を使用。カウンターの確認と加算はLuaスクリプトで1回の往復で行う）
+
+redis の場合、制限に十分な余裕があるクライアントは上限の一部をまとめてRedisから前借りし、
+プロセス内のトークンバケットから消費することで、リクエストごとのRedisへの往復を省略する。
+前借りしたトークンはRedisのカウンターに加算済みのため、ワーカーが複数でも合計は上限を超えない。
+期限切れで使わなかったトークンはカウンターに返却するため、上限より少ないクライアントは制限されない。
+
+認証済みのリクエストはJWTのユーザーID（DBは参照しない）、それ以外はIPアドレスごとに制限する。
+"""
+from limits.storage import MemoryStorage, RedisStorage
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
+from jose import JWTError, jwt
+from typing import Optional, Tuple
 import logging
+import threading
+import time
+
+from app.core.cache import TTLCache
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Redis を使用したレート制限
-limiter = Limiter(key_func=get_remote_address)
+BACKENDS = ('memory', 'redis')
+STRATEGY = "sliding-window-counter"
+
+# limits の acquire_sliding_window.lua と同じカウンターに、余裕があれば requested 件をまとめて加算する。
+# 加算の前に、同じウィンドウで前借りして使わなかった returned 件をカウンターから差し引く。
+# {加算した件数（余裕がない場合は amount 件、上限を超える場合は0）, 現在のウィンドウのキーの残りTTL（ミリ秒）} を返す
+ACQUIRE_SLIDING_WINDOW_LEASE = """
+local limit = tonumber(ARGV[1])
+local expiry = tonumber(ARGV[2]) * 1000
+local amount = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+local returned = tonumber(ARGV[5])
+
+if returned > 0 and redis.call('exists', KEYS[2]) == 1 then
+    if redis.call('decrby', KEYS[2], returned) < 0 then
+        redis.call('set', KEYS[2], 0, 'KEEPTTL')
+    end
+end
+
+if amount > limit then
+    return {0, 0}
+end
+
+local current_ttl = tonumber(redis.call('pttl', KEYS[2]))
+if current_ttl > 0 and current_ttl < expiry then
+    -- 現在のウィンドウが終わっていれば、前のウィンドウに移す
+    redis.call('rename', KEYS[2], KEYS[1])
+    redis.call('set', KEYS[2], 0, 'PX', current_ttl + expiry)
+end
+
+local previous_count = tonumber(redis.call('get', KEYS[1])) or 0
+local previous_ttl = tonumber(redis.call('pttl', KEYS[1])) or 0
+local current_count = tonumber(redis.call('get', KEYS[2])) or 0
+if previous_ttl <= 0 then
+    previous_ttl = 0
+end
+local weighted_count = math.floor(previous_count * previous_ttl / expiry) + current_count
+
+local granted = 0
+if weighted_count + requested <= limit then
+    granted = requested
+elseif weighted_count + amount <= limit then
+    granted = amount
+else
+    return {0, 0}
+end
+
+if redis.call('exists', KEYS[2]) == 1 then
+    redis.call('incrby', KEYS[2], granted)
+else
+    redis.call('set', KEYS[2], granted, 'PX', expiry * 2)
+end
+return {granted, redis.call('pttl', KEYS[2])}
+"""
+
+# 期限切れの前借りを返却するまで保持する時間（これより長いウィンドウでは、ウィンドウの途中で破棄される場合がある）
+LEASE_RECORD_SECONDS = 3600
+
+
+class _LeasedStorageMixin:
+    """
+    スライディングウィンドウのカウンターから上限の一部を前借りし、プロセス内で消費する
+
+    前借りする件数は上限 × RATE_LIMIT_LEASE_FRACTION。前借りしたトークンは
+    RATE_LIMIT_LEASE_SECONDS か、加算したウィンドウが終わるまでの短い方の間だけ使う。
+    期限切れで使わなかったトークンは、同じウィンドウの間であれば次のリクエストでカウンターに返却するため、
+    前借りの件数より少ないリクエストしか送らないクライアントも、使わなかったトークンの分は数えられない。
+    """
+
+    def _init_leases(self, lease_fraction: float, lease_seconds: float, max_entries: int = 10000) -> None:
+        self.lease_fraction = lease_fraction
+        self.lease_seconds = lease_seconds
+        # キー -> [有効期限, 残りのトークン数, 加算したウィンドウが終わる時刻]（いずれも time.monotonic）
+        self._leases = TTLCache(LEASE_RECORD_SECONDS, max_entries)
+        self._lease_lock = threading.Lock()
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        now = time.monotonic()
+        returned = 0
+        with self._lease_lock:
+            lease = self._leases.get(key)
+            if lease is not None:
+                if lease[0] > now and lease[1] >= amount:
+                    lease[1] -= amount
+                    return True
+                self._leases.delete(key)
+                # ウィンドウが終わった後は、カウンターが前のウィンドウに移っているため返却しない
+                if lease[2] > now:
+                    returned = lease[1]
+
+        requested = max(amount, int(limit * self.lease_fraction))
+        granted, window_seconds = self._acquire_up_to(key, limit, expiry, amount, requested, returned)
+        if granted < amount:
+            return False
+        if granted > amount:
+            with self._lease_lock:
+                self._leases.set(key, [
+                    now + min(self.lease_seconds, window_seconds), granted - amount, now + window_seconds
+                ])
+        return True
+
+    def _acquire_up_to(
+        self,
+        key: str,
+        limit: int,
+        expiry: int,
+        amount: int,
+        requested: int,
+        returned: int
+    ) -> Tuple[int, float]:
+        """
+        returned 件を返却し、余裕があれば requested 件、なければ amount 件を加算する
+
+        加算した件数と、加算したウィンドウが終わるまでの秒数を返す。
+        """
+        raise NotImplementedError
+
+    def reset(self) -> Optional[int]:
+        self._leases.clear()
+        return super().reset()
+
+
+class LeasedMemoryStorage(_LeasedStorageMixin, MemoryStorage):
+    """プロセス内のカウンター（前借りの動作確認用）"""
+
+    STORAGE_SCHEME = ["leased+memory"]
+
+    def __init__(
+        self,
+        uri: Optional[str] = None,
+        lease_fraction: float = 0.1,
+        lease_seconds: float = 2.0,
+        **options
+    ):
+        super().__init__(uri, **options)
+        self._init_leases(lease_fraction, lease_seconds)
+
+    def _acquire_up_to(
+        self,
+        key: str,
+        limit: int,
+        expiry: int,
+        amount: int,
+        requested: int,
+        returned: int
+    ) -> Tuple[int, float]:
+        now = time.time()
+        if returned:
+            self.decr(self.sliding_window_keys(key, expiry, now)[1], returned)
+        # ウィンドウは time.time() をウィンドウの長さで区切った区間
+        window_seconds = expiry - now % expiry
+        if requested > amount and MemoryStorage.acquire_sliding_window_entry(self, key, limit, expiry, requested):
+            return requested, window_seconds
+        if MemoryStorage.acquire_sliding_window_entry(self, key, limit, expiry, amount):
+            return amount, window_seconds
+        return 0, 0
+
+
+class LeasedRedisStorage(_LeasedStorageMixin, RedisStorage):
+    """Redisのカウンター（返却・確認・加算・前借りをLuaスクリプトで1回の往復で行う）"""
+
+    STORAGE_SCHEME = ["leased+redis", "leased+rediss"]
+
+    def __init__(self, uri: str, lease_fraction: float = 0.1, lease_seconds: float = 2.0, **options):
+        super().__init__(uri.replace("leased+", "", 1), **options)
+        self._init_leases(lease_fraction, lease_seconds)
+
+    def initialize_storage(self, uri: str) -> None:
+        super().initialize_storage(uri)
+        self.lua_acquire_sliding_window_lease = self.get_connection().register_script(
+            ACQUIRE_SLIDING_WINDOW_LEASE
+        )
+
+    def _acquire_up_to(
+        self,
+        key: str,
+        limit: int,
+        expiry: int,
+        amount: int,
+        requested: int,
+        returned: int
+    ) -> Tuple[int, float]:
+        previous_key = self.prefixed_key(self._previous_window_key(key))
+        current_key = self.prefixed_key(self._current_window_key(key))
+        granted, current_ttl = self.lua_acquire_sliding_window_lease(
+            [previous_key, current_key], [limit, expiry, amount, requested, returned]
+        )
+        # 現在のウィンドウのキーは、残りTTLがウィンドウの長さを下回ると前のウィンドウに移る
+        return int(granted), max(int(current_ttl) / 1000 - expiry, 0)
+
+
+def get_user_key(request: Request) -> str:
+    """
+    認証されたユーザーのキーを取得
+    認証されていない場合はIPアドレスを使用
+    """
+    # JWTの署名のみ検証し、DBは参照しない（ユーザーの有効性は各エンドポイントで確認する）
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            payload = {}
+        if payload.get("type") == "access" and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{get_remote_address(request)}"
+
+
+def _storage_options() -> dict:
+    if settings.RATE_LIMIT_BACKEND not in BACKENDS:
+        raise ValueError(f"Unknown rate limit backend: {settings.RATE_LIMIT_BACKEND}")
+    if settings.RATE_LIMIT_BACKEND == 'redis':
+        return {
+            "storage_uri": "leased+" + settings.REDIS_URL,
+            "storage_options": {
+                "lease_fraction": settings.RATE_LIMIT_LEASE_FRACTION,
+                "lease_seconds": settings.RATE_LIMIT_LEASE_SECONDS,
+                "socket_timeout": 0.1,
+            },
+            # Redisの障害時はプロセス内のカウンターで制限する
+            "in_memory_fallback_enabled": True,
+        }
+    return {"storage_uri": "memory://"}
+
+
+def create_limiter(key_func) -> Limiter:
+    # パスではなくエンドポイントごとに数える（/transactions/{id} などがIDごとに別のカウンターにならないように）
+    return Limiter(key_func=key_func, strategy=STRATEGY, key_style="endpoint", **_storage_options())
+
+
+# ユーザー（未認証の場合はIPアドレス）ごとのレート制限
+limiter = create_limiter(get_user_key)
 
 # カスタムエラーハンドラー
 def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
@@ -16,18 +269,20 @@ def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
     レート制限超過時のカスタムエラーレスポンス
     """
     logger.warning(
-        f"Rate limit exceeded for {get_remote_address(request)}: "
+        f"Rate limit exceeded for {get_user_key(request)}: "
         f"{request.method} {request.url.path}"
     )
+    # ウィンドウの長さ（スライディングウィンドウのため、これより早く再試行できる場合もある）
+    retry_after = exc.limit.limit.get_expiry()
     
     return JSONResponse(
         status_code=429,
         content={
             "detail": "リクエストの制限に達しました。しばらく時間をおいてから再試行してください。",
             "error_code": "RATE_LIMIT_EXCEEDED",
-            "retry_after": exc.retry_after,
+            "retry_after": retry_after,
         },
-        headers={"Retry-After": str(exc.retry_after)}
+        headers={"Retry-After": str(retry_after)}
     )
 
 # レート制限の設定
@@ -54,17 +309,10 @@ class RateLimits:
     PARTNERSHIP_INVITE = "3/minute"    # パートナー招待
     PARTNERSHIP_ACCEPT = "5/minute"    # パートナー承認
 
-def get_user_key(request: Request) -> str:
-    """
-    認証されたユーザーのキーを取得
-    認証されていない場合はIPアドレスを使用
-    """
-    # JWTトークンからユーザーIDを取得する場合
-    # 現在は簡単のためIPアドレスを使用
-    return get_remote_address(request)
-
+# IPアドレスごとのリミッター
+ip_limiter = create_limiter(get_remote_address)
 # ユーザーベースのリミッター
-user_limiter = Limiter(key_func=get_user_key)
+user_limiter = limiter
 
 def create_rate_limiter(rate: str, per_user: bool = False):
     """
@@ -77,4 +325,4 @@ def create_rate_limiter(rate: str, per_user: bool = False):
     if per_user:
         return user_limiter.limit(rate)
     else:
-        return limiter.limit(rate)
\ No newline at end of file
+        return ip_limiter.limit(rate)
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""
+バイグラム（2文字ずつのn-gram）による全文検索
+
+文字列を正規化（NFKC・小文字化）して空白で単語に分け、単語の前後に境界の記号を付けて2文字ずつに分割する。
+日本語は単語の区切りがなく、3文字単位（pg_trgm）では「外食」などの2文字の語を検索できないため、
+pg_bigm と同様にバイグラムを使う。
+
+- build_search_vector: PostgreSQL の tsvector の値（位置・重み付き）
+- SearchQuery: 検索語（空白区切りで全てを含む）の tsquery と、バイグラムの偶然の一致を除くための再確認の正規表現
+- NgramIndex: PostgreSQL 以外で使う、同じ分割・一致・順位付けのメモリ上のインデックス
+
+検索語は末尾が "*" の場合は単語の前方一致、それ以外は部分一致（1文字の場合はその文字から始まるバイグラムの前方一致）。
+タグは部分一致の対象にもなり、tags の指定では完全一致（正規化後）で絞り込む。
+"""
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Tuple
+
+WORD_START = "^"
+WORD_END = "$"
+TAG_PREFIX = "#"
+
+# tsvector の位置の上限と、1つの語彙素に保存できる位置の数
+MAX_POSITION = 16383
+MAX_POSITIONS_PER_LEXEME = 256
+
+# ts_rank の既定の重み（D, C, B, A）。説明 > 場所 > タグ の順に重視する
+WEIGHT_VALUES = {"D": 0.1, "C": 0.2, "B": 0.4, "A": 1.0}
+DESCRIPTION_WEIGHT = "A"
+LOCATION_WEIGHT = "B"
+TAG_WEIGHT = "C"
+
+Lexemes = Dict[str, List[Tuple[int, str]]]
+
+
+def normalize(text: str) -> str:
+    """全角・半角、大文字・小文字を区別しないよう正規化"""
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def _word_bigrams(word: str) -> List[str]:
+    padded = WORD_START + word + WORD_END
+    return [padded[index:index + 2] for index in range(len(padded) - 1)]
+
+
+def document_lexemes(
+    description: Optional[str],
+    location: Optional[str],
+    tags: Optional[Sequence[str]]
+) -> Lexemes:
+    """語彙素（バイグラムとタグ）ごとの位置と重み"""
+    lexemes: Lexemes = {}
+    position = 1
+    fields = [(description, DESCRIPTION_WEIGHT), (location, LOCATION_WEIGHT)]
+    fields.extend((tag, TAG_WEIGHT) for tag in tags or ())
+    for text, weight in fields:
+        for word in normalize(text or "").split():
+            for bigram in _word_bigrams(word):
+                lexemes.setdefault(bigram, []).append((min(position, MAX_POSITION), weight))
+                position += 1
+    for tag in tags or ():
+        lexemes.setdefault(TAG_PREFIX + normalize(tag), []).append((min(position, MAX_POSITION), TAG_WEIGHT))
+        position += 1
+    return lexemes
+
+
+def document_text(
+    description: Optional[str],
+    location: Optional[str],
+    tags: Optional[Sequence[str]]
+) -> str:
+    """再確認に使う、正規化した文字列（フィールドは空白で区切る）"""
+    return normalize(" ".join(text for text in (description, location, *(tags or ())) if text))
+
+
+def _quote(lexeme: str) -> str:
+    return "'" + lexeme.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def build_search_vector(
+    description: Optional[str],
+    location: Optional[str],
+    tags: Optional[Sequence[str]]
+) -> str:
+    """tsvector の値（文字列）を作成"""
+    return " ".join(
+        _quote(lexeme) + ":" + ",".join(
+            f"{position}{weight}" for position, weight in positions[:MAX_POSITIONS_PER_LEXEME]
+        )
+        for lexeme, positions in document_lexemes(description, location, tags).items()
+    )
+
+
+class SearchQuery:
+    """検索語とタグの条件"""
+
+    def __init__(self, search: Optional[str] = None, tags: Optional[Sequence[str]] = None):
+        # (正規化した語, 前方一致かどうか)
+        self.terms: List[Tuple[str, bool]] = []
+        for term in normalize(search or "").split():
+            prefix = term.endswith("*")
+            term = term.rstrip("*")
+            if term:
+                self.terms.append((term, prefix))
+        self.tags = [normalize(tag) for tag in tags or () if tag.strip()]
+
+    def __bool__(self) -> bool:
+        return bool(self.terms or self.tags)
+
+    def required_lexemes(self) -> List[Tuple[str, bool]]:
+        """全てが含まれる必要がある語彙素（語彙素, 前方一致かどうか）"""
+        lexemes = []
+        for term, prefix in self.terms:
+            if prefix:
+                lexemes.extend((bigram, False) for bigram in _word_bigrams(term)[:-1])
+            elif len(term) == 1:
+                lexemes.append((term, True))
+            else:
+                lexemes.extend((bigram, False) for bigram in _word_bigrams(term)[1:-1])
+        lexemes.extend((TAG_PREFIX + tag, False) for tag in self.tags)
+        # 重複を除く（順序は維持）
+        return list(dict.fromkeys(lexemes))
+
+    def tsquery(self) -> str:
+        """tsquery の値（文字列）"""
+        return " & ".join(
+            _quote(lexeme) + (":*" if prefix else "") for lexeme, prefix in self.required_lexemes()
+        )
+
+    def recheck_patterns(self) -> List[str]:
+        """
+        正規化した文字列が一致する必要がある正規表現（PostgreSQL・Python 共通の構文）
+
+        バイグラムが全て含まれていても、連続していない場合（"abc" に対する "xab bcx" など）を除く。
+        """
+        patterns = []
+        for term, prefix in self.terms:
+            if len(term) == 1 and not prefix:
+                continue
+            escaped = "".join(char if char.isalnum() else "\\" + char for char in term)
+            patterns.append(r"(^|\s)" + escaped if prefix else escaped)
+        return patterns
+
+
+class NgramIndex:
+    """メモリ上のバイグラムの転置インデックス（PostgreSQL 以外のデータベースで使う）"""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[object, List[Tuple[int, str]]]] = {}
+        self._texts: Dict[object, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(
+        self,
+        key: object,
+        description: Optional[str],
+        location: Optional[str],
+        tags: Optional[Sequence[str]]
+    ) -> None:
+        self._texts[key] = document_text(description, location, tags)
+        for lexeme, positions in document_lexemes(description, location, tags).items():
+            self._postings.setdefault(lexeme, {})[key] = positions
+
+    def _matching(self, lexeme: str, prefix: bool) -> Dict[object, List[Tuple[int, str]]]:
+        if not prefix:
+            return self._postings.get(lexeme, {})
+        matched: Dict[object, List[Tuple[int, str]]] = {}
+        for candidate, postings in self._postings.items():
+            if candidate.startswith(lexeme):
+                for key, positions in postings.items():
+                    matched.setdefault(key, []).extend(positions)
+        return matched
+
+    def search(self, query: SearchQuery) -> List[Tuple[object, float]]:
+        """一致するキーと順位のスコア（スコアの降順）"""
+        required = query.required_lexemes()
+        if not required:
+            return [(key, 0.0) for key in self._texts]
+
+        scores: Optional[Dict[object, float]] = None
+        for lexeme, prefix in required:
+            matched = self._matching(lexeme, prefix)
+            if scores is None:
+                scores = {key: 0.0 for key in matched}
+            else:
+                scores = {key: score for key, score in scores.items() if key in matched}
+            for key in scores:
+                scores[key] += sum(WEIGHT_VALUES[weight] for _, weight in matched[key])
+            if not scores:
+                return []
+
+        patterns = [re.compile(pattern) for pattern in query.recheck_patterns()]
+        results = [
+            (key, score) for key, score in scores.items()
+            if all(pattern.search(self._texts[key]) for pattern in patterns)
+        ]
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results
+
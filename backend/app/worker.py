@@ -0,0 +1,25 @@
+"""
+Celeryワーカー
+
+TASK_QUEUE_BACKEND=celery の場合に、プロセス内キューでまとめたイベントを処理する。
+
+起動:
+    celery -A app.worker worker --loglevel=info
+"""
+from celery import Celery
+
+from app.core.config import settings
+from app.services.transaction_events import CELERY_TASK_NAME, run_transaction_changes_job
+
+celery_app = Celery(
+    "money_dairy_lovers",
+    broker=settings.REDIS_URL,
+    backend=settings.REDIS_URL
+)
+celery_app.conf.task_ignore_result = True
+
+
+@celery_app.task(name=CELERY_TASK_NAME)
+def process_transaction_changes_task(user_id: str) -> None:
+    """取引変更イベントの処理"""
+    run_transaction_changes_job(user_id)
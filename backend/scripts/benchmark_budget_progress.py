@@ -0,0 +1,138 @@
+"""
+予算進捗計算のベンチマーク
+
+予算ごとに集計クエリを発行する方式と、calculate_budgets_progress による
+一括計算のレイテンシを予算数ごとに比較する。
+一時ユーザーと取引を作成し、終了時に削除する。
+
+使い方:
+    python scripts/benchmark_budget_progress.py [--transactions 20000] [--repeat 20]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+
+from app.db.session import SessionLocal
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.budget_progress import calculate_budgets_progress
+from app.services.monthly_rollup import rebuild_user_rollups
+
+BUDGET_COUNTS = (1, 10, 30, 100)
+PERIODS = ('monthly', 'yearly', 'custom')
+
+
+def seed(db, transaction_count: int):
+    """ベンチマーク用のユーザー・カテゴリ・取引・予算を作成"""
+    user = User(
+        email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password="x",
+        display_name="Benchmark",
+        is_active=True
+    )
+    db.add(user)
+    db.flush()
+
+    categories = [
+        Category(name=f"bench-{i}", user_id=user.id, is_default=False, is_love_category=False)
+        for i in range(max(BUDGET_COUNTS))
+    ]
+    db.add_all(categories)
+    db.flush()
+
+    rng = random.Random(0)
+    today = date.today()
+    db.bulk_save_objects([
+        Transaction(
+            user_id=user.id,
+            category_id=rng.choice(categories).id,
+            amount=Decimal(rng.randint(100, 20000)),
+            transaction_type='expense',
+            sharing_type='personal',
+            transaction_date=today - timedelta(days=rng.randint(0, 730))
+        )
+        for _ in range(transaction_count)
+    ])
+
+    budgets = [
+        Budget(
+            user_id=user.id,
+            category_id=category.id,
+            name=category.name,
+            amount=Decimal('50000'),
+            period=PERIODS[i % len(PERIODS)],
+            start_date=today - timedelta(days=90),
+            end_date=today + timedelta(days=30),
+            alert_threshold=Decimal('80'),
+            is_active=True
+        )
+        for i, category in enumerate(categories)
+    ]
+    db.add_all(budgets)
+    rebuild_user_rollups(db, user.id)
+    db.commit()
+
+    # 投入直後の統計情報で実行計画が歪まないようにする
+    for table in ('transactions', 'user_monthly_rollups', 'budgets'):
+        db.execute(text(f"ANALYZE {table}"))
+    return user, budgets
+
+
+def measure(func, repeat: int) -> float:
+    """中央値のレイテンシ（ミリ秒）を計測"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user_id = None
+    try:
+        user, budgets = seed(db, args.transactions)
+        user_id = user.id
+
+        print(f"{'budgets':>8} {'per-budget (ms)':>16} {'batched (ms)':>13}")
+        for count in BUDGET_COUNTS:
+            subset = budgets[:count]
+            per_budget = measure(
+                lambda: [calculate_budgets_progress(db, [budget], user_id) for budget in subset],
+                args.repeat
+            )
+            batched = measure(
+                lambda: calculate_budgets_progress(db, subset, user_id),
+                args.repeat
+            )
+            print(f"{count:>8} {per_budget:>16.2f} {batched:>13.2f}")
+    finally:
+        db.rollback()
+        if user_id is not None:
+            # 取引・カテゴリ・予算・月次集計はユーザー削除でCASCADE削除される
+            db.query(User).filter(User.id == user_id).delete(synchronize_session=False)
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Love統計のベンチマーク
+
+Love取引の件数ごとに、Love統計（/love/stats と月次レポートのLove統計）のレイテンシを以下の2通りで比較する。
+- legacy: 以前の実装（Love取引をORMで全件読み込み、平均・日別/カテゴリ別の最大・連続記録をPythonで集計）
+- sql: 条件付き集計・GROUP BY + LIMIT・gaps-and-islands のウィンドウ関数で集計した数行だけを取得
+一時ユーザーと取引を作成し、終了時に削除する。
+
+使い方:
+    python scripts/benchmark_love_statistics.py [--transactions 50000] [--repeat 10]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import func, text
+
+from app import models
+from app.api.love.love import _get_love_stats
+from app.api.reports.reports import get_category_report, get_love_statistics, get_love_trend
+from app.db.session import SessionLocal
+
+LOVE_COUNTS = (1000, 10000, 50000)
+
+
+def seed(db, transaction_count: int):
+    """ベンチマーク用のユーザー・カテゴリと、過去2年間のLove取引（とLove以外の取引）を作成"""
+    user = models.User(
+        email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password="x",
+        display_name="Benchmark",
+        is_active=True
+    )
+    db.add(user)
+    db.flush()
+
+    love_categories = [
+        models.Category(name=f"love-{i}", icon="💕", user_id=user.id, is_default=False, is_love_category=True)
+        for i in range(4)
+    ]
+    other = models.Category(name="other", icon="💰", user_id=user.id, is_default=False, is_love_category=False)
+    db.add_all([*love_categories, other])
+    db.flush()
+
+    rng = random.Random(0)
+    today = date.today()
+    rows = []
+    for index in range(transaction_count + transaction_count // 4):
+        is_love = index < transaction_count
+        rows.append({
+            "id": uuid.uuid4(),
+            "user_id": user.id,
+            "category_id": rng.choice(love_categories).id if is_love else other.id,
+            "amount": rng.randint(100, 20000),
+            "transaction_date": today - timedelta(days=rng.randint(0, 730)),
+            "love_rating": rng.randint(1, 5) if is_love and rng.random() < 0.7 else None
+        })
+    db.execute(text("""
+        INSERT INTO transactions (
+            id, user_id, category_id, amount, transaction_type, sharing_type, transaction_date, love_rating
+        )
+        VALUES (
+            :id, :user_id, :category_id, :amount, 'expense', 'personal', :transaction_date, :love_rating
+        )
+    """), rows)
+    db.commit()
+
+    # 投入直後の統計情報で実行計画が歪まないようにする
+    db.execute(text("ANALYZE transactions"))
+    return user
+
+
+def legacy_love_stats(db, user, start_date: date, end_date: date):
+    """以前の /love/stats の集計（パートナーシップ・イベント数を除く）"""
+    love_transactions = db.query(models.Transaction).join(
+        models.Category
+    ).filter(
+        models.Transaction.user_id == user.id,
+        models.Category.is_love_category == True,
+        models.Transaction.transaction_date >= start_date,
+        models.Transaction.transaction_date <= end_date
+    ).all()
+    rated = [t for t in love_transactions if t.love_rating is not None]
+    sum(t.love_rating for t in rated) / len(rated) if rated else 0.0
+    sum(t.amount for t in love_transactions if t.transaction_type == 'expense')
+    db.query(func.coalesce(func.sum(models.Transaction.amount), 0)).filter(
+        models.Transaction.user_id == user.id,
+        models.Transaction.transaction_type == 'expense',
+        models.Transaction.transaction_date >= start_date,
+        models.Transaction.transaction_date <= end_date
+    ).scalar()
+
+    love_by_date = {}
+    love_by_category = {}
+    for t in love_transactions:
+        if t.transaction_type == 'expense':
+            love_by_date[t.transaction_date] = love_by_date.get(t.transaction_date, 0) + t.amount
+            love_by_category[t.category.name] = love_by_category.get(t.category.name, 0) + t.amount
+    max(love_by_date, key=love_by_date.get) if love_by_date else None
+    max(love_by_category, key=love_by_category.get) if love_by_category else None
+
+    love_dates = sorted(set(t.transaction_date for t in love_transactions))
+    love_streak = current_streak = 0
+    for i, day in enumerate(love_dates):
+        current_streak = current_streak + 1 if i and (day - love_dates[i - 1]).days == 1 else 1
+        love_streak = max(love_streak, current_streak)
+    # 以前の実装はリクエストごとに新しいセッションで読み込む
+    db.expunge_all()
+
+
+def legacy_love_statistics(db, user, start_date: date, end_date: date):
+    """以前の reports.get_love_statistics（Love取引の全件読み込み）"""
+    love_transactions = db.query(models.Transaction).join(
+        models.Category
+    ).filter(
+        models.Transaction.user_id == user.id,
+        models.Category.is_love_category == True,
+        models.Transaction.transaction_date >= start_date,
+        models.Transaction.transaction_date <= end_date
+    ).all()
+    rated = [t for t in love_transactions if t.love_rating is not None]
+    sum(t.love_rating for t in rated) / len(rated) if rated else 0.0
+    sum(t.amount for t in love_transactions if t.transaction_type == 'expense')
+    db.query(func.coalesce(func.sum(models.Transaction.amount), 0)).filter(
+        models.Transaction.user_id == user.id,
+        models.Transaction.transaction_type == 'expense',
+        models.Transaction.transaction_date >= start_date,
+        models.Transaction.transaction_date <= end_date
+    ).scalar()
+    get_category_report(db, user.id, start_date, end_date, 'expense')
+    get_love_trend(db, user.id, start_date, end_date + timedelta(days=1))
+    db.expunge_all()
+
+
+def measure(func, repeat: int) -> float:
+    """中央値のレイテンシ（ミリ秒）を計測"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=max(LOVE_COUNTS))
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user_id = None
+    try:
+        print(f"{'love':>7} {'endpoint':<18} {'legacy (ms)':>12} {'sql (ms)':>10}")
+        for count in sorted({*(c for c in LOVE_COUNTS if c < args.transactions), args.transactions}):
+            user = seed(db, count)
+            user_id = user.id
+            start_date, end_date = date.today() - timedelta(days=730), date.today()
+
+            legacy_ms = measure(lambda: legacy_love_stats(db, user, start_date, end_date), args.repeat)
+            sql_ms = measure(
+                lambda: _get_love_stats(db, current_user=user, start_date=start_date, end_date=end_date),
+                args.repeat
+            )
+            print(f"{count:>7} {'/love/stats':<18} {legacy_ms:>12.2f} {sql_ms:>10.2f}")
+
+            legacy_ms = measure(lambda: legacy_love_statistics(db, user, start_date, end_date), args.repeat)
+            sql_ms = measure(lambda: get_love_statistics(db, user.id, start_date, end_date), args.repeat)
+            print(f"{count:>7} {'report love stats':<18} {legacy_ms:>12.2f} {sql_ms:>10.2f}")
+
+            # 取引・カテゴリはユーザー削除でCASCADE削除される
+            db.query(models.User).filter(models.User.id == user_id).delete(synchronize_session=False)
+            db.commit()
+            user_id = None
+    finally:
+        db.rollback()
+        if user_id is not None:
+            db.query(models.User).filter(models.User.id == user_id).delete(synchronize_session=False)
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+ミドルウェアのリクエストごとのオーバーヘッドのベンチマーク
+
+以下の3通りで、同じ最小のルート（JSONを返すだけ）を直接ASGIで呼び出し、1リクエストあたりの時間を比較する。
+- none: ミドルウェアなし（基準）
+- before: 以前の構成（BaseHTTPMiddleware を3段重ねる: セキュリティヘッダー・リクエストログ・ログインのログ）
+- after: SecurityMiddleware（1つのASGIミドルウェア）
+before の各段は SecurityMiddleware と同じ処理（ヘッダーの追加・疑わしいパターンの検出・メトリクス）を行うため、
+差はミドルウェアの構成によるものになる。HTTPサーバー・ネットワークは含まない。
+
+使い方:
+    python scripts/benchmark_middleware.py [--requests 20000] [--path /api/v1/transactions/]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from starlette.applications import Starlette
+from starlette.datastructures import Headers
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core import metrics
+from app.middleware.security import SecurityMiddleware
+
+
+async def endpoint(request):
+    return JSONResponse({"status": "ok", "items": list(range(20))})
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """以前の SecurityHeadersMiddleware 相当"""
+
+    def __init__(self, app, debug: bool = False):
+        super().__init__(app)
+        self.helper = SecurityMiddleware(app, debug=debug)
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for name, value in self.helper._response_headers(request.scope, request.url.path):
+            response.headers[name.decode("latin-1")] = value.decode("latin-1")
+        return response
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """以前の RequestLoggingMiddleware 相当"""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.helper = SecurityMiddleware(app)
+
+    async def dispatch(self, request, call_next):
+        started = time.perf_counter()
+        db_stats = metrics.start_request_stats()
+        headers = Headers(scope=request.scope)
+        client_ip = self.helper._get_client_ip(request.scope, headers)
+        self.helper._detect_suspicious_patterns(request.scope, headers, client_ip)
+        response = await call_next(request)
+        metrics.observe_request(
+            request.method,
+            metrics.route_template(request.scope),
+            response.status_code,
+            time.perf_counter() - started,
+            None,
+            db_stats
+        )
+        return response
+
+
+class LegacyLoginLoggingMiddleware(BaseHTTPMiddleware):
+    """以前の main.log_requests 相当"""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        if request.url.path == "/api/v1/auth/login":
+            logging.getLogger(__name__).info(f"Login response - Status: {response.status_code}")
+        return response
+
+
+def build_app(mode: str, path: str) -> Starlette:
+    middleware = []
+    if mode == "before":
+        # add_middleware と同じく、後に追加したものが外側になる
+        middleware = [
+            Middleware(LegacyLoginLoggingMiddleware),
+            Middleware(LegacyRequestLoggingMiddleware),
+            Middleware(LegacySecurityHeadersMiddleware, debug=False),
+        ]
+    elif mode == "after":
+        middleware = [Middleware(SecurityMiddleware, debug=False)]
+    return Starlette(routes=[Route(path, endpoint)], middleware=middleware)
+
+
+async def call(app, scope):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(dict(scope), receive, send)
+    assert sent[0]["status"] == 200
+
+
+async def run(mode: str, path: str, requests: int, rounds: int) -> float:
+    app = build_app(mode, path)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"year=2024&month=5&category_id=3",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"user-agent", b"benchmark/1.0"),
+            (b"accept", b"application/json"),
+            (b"authorization", b"Bearer x"),
+        ],
+        "client": ("127.0.0.1", 12345),
+        "server": ("localhost", 8000),
+    }
+    # ウォームアップ
+    for _ in range(500):
+        await call(app, scope)
+
+    per_request = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(requests):
+            await call(app, scope)
+        per_request.append((time.perf_counter() - started) / requests)
+    return statistics.median(per_request)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ミドルウェアのオーバーヘッドのベンチマーク")
+    parser.add_argument("--requests", type=int, default=20000, help="1回の計測のリクエスト数")
+    parser.add_argument("--rounds", type=int, default=5, help="計測の回数（中央値を使用）")
+    parser.add_argument("--path", default="/api/v1/transactions/", help="リクエストのパス")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = {}
+    for mode in ("none", "before", "after"):
+        results[mode] = asyncio.run(run(mode, args.path, args.requests, args.rounds))
+
+    print(f"{'mode':<8} {'us/req':>10} {'overhead us':>12}")
+    for mode, seconds in results.items():
+        overhead = (seconds - results["none"]) * 1_000_000
+        print(f"{mode:<8} {seconds * 1_000_000:>10.1f} {overhead:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+月次レポートのベンチマーク
+
+月の取引数ごとに、月次レポートのレイテンシを以下の2通りで比較する。
+- legacy: 以前の実装（収入・支出のカテゴリ別集計を別々に取得し、Love統計は取引を全件読み込んで集計、最大支出は別のクエリ）
+- consolidated: 月次集計の1回の条件付き集計、種別ごとのカテゴリ別集計、ウィンドウ関数による最大支出とLove支出の日別推移
+一時ユーザーと取引を作成し、終了時に削除する。
+
+使い方:
+    python scripts/benchmark_monthly_report.py [--repeat 20]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import and_, func, text
+
+from app import models
+from app.api.reports.reports import _get_monthly_report, get_category_report_from_rollups, get_love_statistics
+from app.db.session import SessionLocal
+from app.services.monthly_rollup import month_range_filter, rebuild_user_rollups
+
+# 1か月の取引数（月ごとに異なる件数の取引を作成する）
+MONTHLY_COUNTS = (100, 1000, 10000, 50000)
+
+
+def seed(db):
+    """ベンチマーク用のユーザー・カテゴリと、月ごとに MONTHLY_COUNTS 件の取引を作成"""
+    user = models.User(
+        email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password="x",
+        display_name="Benchmark",
+        is_active=True
+    )
+    db.add(user)
+    db.flush()
+
+    categories = [
+        models.Category(
+            name=f"bench-{i}", icon="💰", user_id=user.id, is_default=False, is_love_category=i < 3
+        )
+        for i in range(12)
+    ]
+    db.add_all(categories)
+    db.flush()
+
+    rng = random.Random(0)
+    first_month = date.today().replace(day=1) - relativedelta(months=len(MONTHLY_COUNTS))
+    months = []
+    for offset, count in enumerate(MONTHLY_COUNTS):
+        month_start = first_month + relativedelta(months=offset)
+        days = ((month_start + relativedelta(months=1)) - month_start).days
+        months.append((month_start, count))
+        rows = []
+        for _ in range(count):
+            category = rng.choice(categories)
+            income = not category.is_love_category and rng.random() < 0.1
+            rows.append({
+                "id": uuid.uuid4(),
+                "user_id": user.id,
+                "category_id": category.id,
+                "amount": rng.randint(100, 20000),
+                "transaction_type": 'income' if income else 'expense',
+                "sharing_type": 'shared' if rng.random() < 0.3 else 'personal',
+                "transaction_date": month_start + timedelta(days=rng.randrange(days)),
+                "love_rating": rng.randint(1, 5) if category.is_love_category else None
+            })
+        db.execute(text("""
+            INSERT INTO transactions (
+                id, user_id, category_id, amount, transaction_type, sharing_type, transaction_date, love_rating
+            )
+            VALUES (
+                :id, :user_id, :category_id, :amount, :transaction_type, :sharing_type, :transaction_date, :love_rating
+            )
+        """), rows)
+    rebuild_user_rollups(db, user.id)
+    db.commit()
+
+    # 投入直後の統計情報で実行計画が歪まないようにする
+    for table in ('transactions', 'user_monthly_rollups'):
+        db.execute(text(f"ANALYZE {table}"))
+    return user, months
+
+
+def legacy_monthly_report(db, user, month_start: date):
+    """以前の実装と同じクエリ"""
+    rollup = models.UserMonthlyRollup
+    next_month_start = month_start + relativedelta(months=1)
+    is_current_month = and_(rollup.year == month_start.year, rollup.month == month_start.month)
+    db.query(
+        func.coalesce(func.sum(rollup.total_amount).filter(is_current_month), 0),
+        func.coalesce(func.sum(rollup.total_amount).filter(~is_current_month), 0)
+    ).filter(
+        rollup.user_id == user.id,
+        *month_range_filter(month_start - relativedelta(months=1), next_month_start)
+    ).one()
+    for transaction_type in ('expense', 'income'):
+        get_category_report_from_rollups(db, user.id, month_start, next_month_start, transaction_type)
+    get_love_statistics(db, user.id, month_start, next_month_start - timedelta(days=1))
+    db.query(models.Transaction).filter(
+        models.Transaction.user_id == user.id,
+        models.Transaction.transaction_type == 'expense',
+        models.Transaction.transaction_date >= month_start,
+        models.Transaction.transaction_date < next_month_start
+    ).order_by(models.Transaction.amount.desc()).first()
+
+
+def measure(func, repeat: int) -> float:
+    """中央値のレイテンシ（ミリ秒）を計測"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user_id = None
+    try:
+        user, months = seed(db)
+        user_id = user.id
+
+        print(f"{'transactions':>12} {'legacy (ms)':>12} {'consolidated (ms)':>18}")
+        for month_start, count in months:
+            legacy_ms = measure(lambda: legacy_monthly_report(db, user, month_start), args.repeat)
+            consolidated_ms = measure(
+                lambda: _get_monthly_report(db, current_user=user, year=month_start.year, month=month_start.month),
+                args.repeat
+            )
+            print(f"{count:>12} {legacy_ms:>12.2f} {consolidated_ms:>18.2f}")
+    finally:
+        db.rollback()
+        if user_id is not None:
+            # 取引・カテゴリ・月次集計はユーザー削除でCASCADE削除される
+            db.query(models.User).filter(models.User.id == user_id).delete(synchronize_session=False)
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+定期取引の実行日展開のベンチマーク
+
+calculate_next_execution_date を1回ずつ呼び出す方式と、expand_occurrences による
+一括展開の処理時間を比較する（データベースは使用しない）。
+ランダムに生成したルールについて、今日から指定月数先までの実行日を展開する。
+
+使い方:
+    python scripts/benchmark_recurrence.py [--rules 100000] [--months 12]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dateutil.relativedelta import relativedelta
+
+from app.api.recurring_transactions import calculate_next_execution_date
+from app.services.recurrence import RecurrenceRule, expand_occurrences
+
+FREQUENCIES = ('daily', 'weekly', 'monthly', 'monthly', 'monthly', 'yearly')
+
+
+def generate_rules(count: int, today: date) -> list:
+    """ベンチマーク用のルールを生成（月次を多めにする）"""
+    rng = random.Random(42)
+    rules = []
+    for _ in range(count):
+        frequency = rng.choice(FREQUENCIES)
+        rules.append(RecurrenceRule(
+            frequency=frequency,
+            next_execution_date=today + timedelta(days=rng.randrange(-60, 30)),
+            interval_value=rng.choice((1, 1, 1, 2, 3)),
+            day_of_month=rng.choice((None, 1, 10, 25, 31)) if frequency == 'monthly' else None,
+            day_of_week=rng.randrange(7) if frequency == 'weekly' else None,
+            end_date=today + timedelta(days=rng.randrange(30, 720)) if rng.random() < 0.2 else None,
+            max_executions=rng.randrange(1, 24) if rng.random() < 0.1 else None
+        ))
+    return rules
+
+
+def expand_scalar(rules: list, until: date) -> int:
+    """1回ずつ次回実行日を計算して展開"""
+    total = 0
+    for rule in rules:
+        current = rule.next_execution_date
+        count = rule.execution_count
+        last_date = min(until, rule.end_date) if rule.end_date else until
+        while current <= last_date and not (rule.max_executions and count >= rule.max_executions):
+            total += 1
+            count += 1
+            current = calculate_next_execution_date(
+                rule.frequency, rule.interval_value, current, rule.day_of_month, rule.day_of_week
+            )
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rules', type=int, default=100000)
+    parser.add_argument('--months', type=int, default=12)
+    args = parser.parse_args()
+
+    today = date.today()
+    until = today + relativedelta(months=args.months)
+    rules = generate_rules(args.rules, today)
+
+    started = time.perf_counter()
+    scalar_total = expand_scalar(rules, until)
+    scalar_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    expansions = expand_occurrences(rules, until)
+    batched_seconds = time.perf_counter() - started
+    batched_total = sum(len(expansion.occurrences) for expansion in expansions)
+
+    assert scalar_total == batched_total, (scalar_total, batched_total)
+
+    print(f"rules: {args.rules}, window: {today} - {until}, occurrences: {batched_total}")
+    print(f"{'scalar (s)':>12} {'batched (s)':>12} {'speedup':>8}")
+    print(f"{scalar_seconds:>12.2f} {batched_seconds:>12.2f} {scalar_seconds / batched_seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
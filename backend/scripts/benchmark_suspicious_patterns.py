@@ -0,0 +1,94 @@
+"""
+疑わしいリクエストパターンの検出のベンチマーク
+
+以下の2通りで、クエリ文字列の長さ・ルール数ごとに1リクエストあたりの検出時間を比較する。
+- legacy: 以前の実装（攻撃の種類ごとにパターンを順に、パスとクエリに対して `in` で検索）
+- matcher: PatternMatcher（トライの形の正規表現1つ・URLデコード後の文字列も検査）
+ルールは組み込みのルールに、ランダムな英字のパターンを追加して増やす。
+クエリは検出されない通常のリクエスト（全てのルールを走査する最悪の場合）を想定する。
+
+使い方:
+    python scripts/benchmark_suspicious_patterns.py [--lengths 100,2000,8000] [--rules 31,300,1000]
+"""
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.middleware.suspicious_patterns import DEFAULT_RULES, PatternMatcher
+
+PATH = "/api/v1/transactions/"
+
+
+def legacy_detect(rules, path: str, query: str) -> dict:
+    path = path.lower()
+    query = query.lower()
+    found = {}
+    for attack_type, patterns in rules.items():
+        for pattern in patterns:
+            if pattern in path or pattern in query:
+                found[attack_type] = pattern
+                break
+    return found
+
+
+def build_rules(count: int, rng: random.Random) -> dict:
+    rules = {attack_type: list(patterns) for attack_type, patterns in DEFAULT_RULES.items()}
+    extra = count - sum(len(patterns) for patterns in rules.values())
+    for index in range(max(extra, 0)):
+        pattern = "".join(rng.choices(string.ascii_lowercase + " ='(<", k=rng.randint(6, 14)))
+        rules.setdefault(f"Custom {index % 20}", []).append(pattern)
+    return rules
+
+
+def build_query(length: int, rng: random.Random) -> str:
+    # 通常のリクエストに近い、英数字の値とエンコードされた日本語を含むクエリ
+    parts = []
+    while sum(len(part) + 1 for part in parts) < length:
+        value = "".join(rng.choices(string.ascii_lowercase + string.digits, k=rng.randint(4, 16)))
+        if rng.random() < 0.2:
+            value = "%E3%83%87%E3%83%BC%E3%83%88"
+        parts.append(f"k{len(parts)}={value}")
+    return "&".join(parts)[:length]
+
+
+def measure(func, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="疑わしいリクエストパターンの検出のベンチマーク")
+    parser.add_argument("--lengths", default="100,2000,8000", help="クエリ文字列の長さ（カンマ区切り）")
+    parser.add_argument("--rules", default="31,300,1000", help="ルール数（カンマ区切り）")
+    parser.add_argument("--iterations", type=int, default=500, help="計測の回数")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'rules':>6} {'query':>6} {'legacy us':>10} {'matcher us':>11} {'speedup':>8}")
+    for rule_count in [int(value) for value in args.rules.split(",")]:
+        rules = build_rules(rule_count, rng)
+        started = time.perf_counter()
+        matcher = PatternMatcher(rules)
+        compile_ms = (time.perf_counter() - started) * 1000
+        for length in [int(value) for value in args.lengths.split(",")]:
+            query = build_query(length, rng)
+            assert legacy_detect(rules, PATH, query) == {} and matcher.inspect(PATH, query) == {}
+            legacy = measure(lambda: legacy_detect(rules, PATH, query), args.iterations)
+            compiled = measure(lambda: matcher.inspect(PATH, query), args.iterations)
+            print(
+                f"{rule_count:>6} {length:>6} {legacy * 1_000_000:>10.1f} "
+                f"{compiled * 1_000_000:>11.1f} {legacy / compiled:>7.1f}x"
+            )
+        print(f"       (compile: {compile_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+時系列（日別・週別・月別の推移）のベンチマーク
+
+期間の長さごとに、カスタムレポートの日別推移とLove傾向のレイテンシを以下の2通りで比較する。
+- legacy: 以前の実装（日別推移は日ごとに日別集計の全行を走査、Love傾向は日別集計をPythonで週・月に振り分け）
+- series: generate_series と date_trunc で区間ごとに集計し、取引がない区間を0で埋める
+一時ユーザーと取引を作成し、終了時に削除する。
+
+使い方:
+    python scripts/benchmark_time_series.py [--transactions 20000] [--repeat 10]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import func, text
+
+from app import models
+from app.db.session import SessionLocal
+from app.services.time_series import Measure, build_cash_flow_series, build_time_series
+
+RANGE_DAYS = (30, 365, 730)
+
+
+def seed(db, transaction_count: int):
+    """ベンチマーク用のユーザー・カテゴリ・過去2年間の取引を作成"""
+    user = models.User(
+        email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password="x",
+        display_name="Benchmark",
+        is_active=True
+    )
+    db.add(user)
+    db.flush()
+
+    categories = [
+        models.Category(
+            name=f"bench-{i}", icon="💰", user_id=user.id, is_default=False, is_love_category=i < 2
+        )
+        for i in range(6)
+    ]
+    db.add_all(categories)
+    db.flush()
+
+    rng = random.Random(0)
+    today = date.today()
+    rows = []
+    for _ in range(transaction_count):
+        category = rng.choice(categories)
+        rows.append({
+            "id": uuid.uuid4(),
+            "user_id": user.id,
+            "category_id": category.id,
+            "amount": rng.randint(100, 20000),
+            "transaction_type": 'income' if rng.random() < 0.1 else 'expense',
+            "transaction_date": today - timedelta(days=rng.randint(0, max(RANGE_DAYS))),
+            "love_rating": rng.randint(1, 5) if category.is_love_category else None
+        })
+    db.execute(text("""
+        INSERT INTO transactions (
+            id, user_id, category_id, amount, transaction_type, sharing_type, transaction_date, love_rating
+        )
+        VALUES (
+            :id, :user_id, :category_id, :amount, :transaction_type, 'personal', :transaction_date, :love_rating
+        )
+    """), rows)
+    db.commit()
+
+    # 投入直後の統計情報で実行計画が歪まないようにする
+    db.execute(text("ANALYZE transactions"))
+    return user
+
+
+def legacy_daily_trends(db, user, start_date: date, end_date: date):
+    """以前のカスタムレポートの日別推移（期間の両端を含む）"""
+    daily_stats = db.query(
+        models.Transaction.transaction_date,
+        models.Transaction.transaction_type,
+        func.sum(models.Transaction.amount).label('total')
+    ).filter(
+        models.Transaction.user_id == user.id,
+        models.Transaction.transaction_date >= start_date,
+        models.Transaction.transaction_date <= end_date
+    ).group_by(
+        models.Transaction.transaction_date,
+        models.Transaction.transaction_type
+    ).order_by(
+        models.Transaction.transaction_date
+    ).all()
+
+    daily_trends = []
+    current_date = start_date
+    while current_date <= end_date:
+        day_income = sum(
+            stat.total for stat in daily_stats
+            if stat.transaction_date == current_date and stat.transaction_type == 'income'
+        )
+        day_expense = sum(
+            stat.total for stat in daily_stats
+            if stat.transaction_date == current_date and stat.transaction_type == 'expense'
+        )
+        daily_trends.append((current_date, day_income, day_expense, day_income - day_expense))
+        current_date += timedelta(days=1)
+    return daily_trends
+
+
+def series_daily_trends(db, user, start_date: date, end_date: date):
+    return build_cash_flow_series(
+        db,
+        db.query(models.Transaction).filter(models.Transaction.user_id == user.id),
+        start_date,
+        end_date + timedelta(days=1),
+        'daily'
+    )
+
+
+def legacy_weekly_love_trends(db, user, start_date: date, end_date: date):
+    """以前のLove傾向（日別集計をPythonで週に振り分け）"""
+    rows = db.query(
+        models.Transaction.transaction_date,
+        func.sum(models.Transaction.amount).label('amount'),
+        func.count(models.Transaction.id).label('count')
+    ).join(
+        models.Category
+    ).filter(
+        models.Transaction.user_id == user.id,
+        models.Category.is_love_category == True,
+        models.Transaction.transaction_type == 'expense',
+        models.Transaction.transaction_date >= start_date,
+        models.Transaction.transaction_date <= end_date
+    ).group_by(models.Transaction.transaction_date).all()
+
+    weeks = {}
+    for row in rows:
+        key = (row.transaction_date - timedelta(days=row.transaction_date.weekday())).isoformat()
+        week = weeks.setdefault(key, {"amount": Decimal('0'), "count": 0})
+        week["amount"] += row.amount
+        week["count"] += row.count
+    return sorted(weeks.items())
+
+
+def series_weekly_love_trends(db, user, start_date: date, end_date: date):
+    transaction = models.Transaction
+    love_query = db.query(transaction).join(models.Category).filter(
+        transaction.user_id == user.id,
+        models.Category.is_love_category == True,
+        transaction.transaction_type == 'expense'
+    )
+    return build_time_series(
+        db, love_query, start_date, end_date + timedelta(days=1), 'weekly',
+        {"amount": Measure(transaction.amount), "count": Measure()}
+    )
+
+
+def measure(func, repeat: int) -> float:
+    """中央値のレイテンシ（ミリ秒）を計測"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user_id = None
+    try:
+        user = seed(db, args.transactions)
+        user_id = user.id
+        end_date = date.today()
+
+        print(f"{'days':>5} {'series':<20} {'legacy (ms)':>12} {'series (ms)':>12}")
+        for days in RANGE_DAYS:
+            start_date = end_date - timedelta(days=days - 1)
+            for label, legacy, series in (
+                ("custom daily trends", legacy_daily_trends, series_daily_trends),
+                ("weekly love trends", legacy_weekly_love_trends, series_weekly_love_trends),
+            ):
+                legacy_ms = measure(lambda: legacy(db, user, start_date, end_date), args.repeat)
+                series_ms = measure(lambda: series(db, user, start_date, end_date), args.repeat)
+                print(f"{days:>5} {label:<20} {legacy_ms:>12.2f} {series_ms:>12.2f}")
+    finally:
+        db.rollback()
+        if user_id is not None:
+            # 取引・カテゴリはユーザー削除でCASCADE削除される
+            db.query(models.User).filter(models.User.id == user_id).delete(synchronize_session=False)
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+取引一覧のページネーションのベンチマーク
+
+取引一覧（_get_transactions）の以下の2通りで、ページ番号ごとのレイテンシを比較する。
+- offset: ページ番号で取得（OFFSET と正確な総件数）
+- cursor: 前のページの next_cursor で取得（キーセットページネーション、総件数なし）
+一時ユーザーと取引を作成し、終了時に削除する。
+
+使い方:
+    python scripts/benchmark_transaction_pagination.py [--transactions 100000] [--pages 1,50,500] [--repeat 20]
+"""
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+
+from app import models
+from app.api.transactions.transactions import _get_transactions
+from app.db.session import SessionLocal
+from app.services.monthly_rollup import rebuild_user_rollups
+from app.services.transaction_pagination import KEYSET_ORDER, encode_cursor
+
+LIMIT = 20
+
+
+def seed(db, transaction_count: int):
+    """ベンチマーク用のユーザー・カテゴリ・取引を作成"""
+    user = models.User(
+        email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password="x",
+        display_name="Benchmark",
+        is_active=True
+    )
+    db.add(user)
+    db.flush()
+    category = models.Category(name="bench", user_id=user.id, is_default=False, is_love_category=False)
+    db.add(category)
+    db.flush()
+
+    # 1日あたり複数の取引（同じ日付の取引の並び順も確認する）
+    db.execute(text("""
+        INSERT INTO transactions (
+            id, user_id, category_id, amount, transaction_type, sharing_type, transaction_date, created_at
+        )
+        SELECT
+            gen_random_uuid(), :user_id, :category_id, 100 + i % 5000, 'expense', 'personal',
+            CURRENT_DATE - (i % 1500), now() - i * interval '1 second'
+        FROM generate_series(1, CAST(:n AS int)) AS i
+    """), {"user_id": user.id, "category_id": category.id, "n": transaction_count})
+    rebuild_user_rollups(db, user.id)
+    db.commit()
+
+    # 投入直後の統計情報で実行計画が歪まないようにする
+    for table in ('transactions', 'user_monthly_rollups'):
+        db.execute(text(f"ANALYZE {table}"))
+    return user
+
+
+def measure(func, repeat: int) -> float:
+    """中央値のレイテンシ（ミリ秒）を計測"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=100000)
+    parser.add_argument('--pages', default="1,50,500", help="ページ番号（カンマ区切り）")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user_id = None
+    try:
+        user = seed(db, args.transactions)
+        user_id = user.id
+
+        print(f"{'page':>6} {'offset (ms)':>12} {'cursor (ms)':>12}")
+        for page in [int(value) for value in args.pages.split(",")]:
+            # 前のページの最後の取引（ページをたどった場合の next_cursor）
+            cursor = None
+            if page > 1:
+                previous = db.query(models.Transaction).filter(
+                    models.Transaction.user_id == user_id
+                ).order_by(*KEYSET_ORDER).offset((page - 1) * LIMIT - 1).first()
+                cursor = encode_cursor(previous)
+
+            by_offset = _get_transactions(db, current_user=user, page=page, limit=LIMIT)
+            by_cursor = _get_transactions(db, current_user=user, limit=LIMIT, cursor=cursor, count="none")
+            assert [t["id"] for t in by_offset["transactions"]] == [t["id"] for t in by_cursor["transactions"]]
+
+            offset_ms = measure(
+                lambda: _get_transactions(db, current_user=user, page=page, limit=LIMIT),
+                args.repeat
+            )
+            cursor_ms = measure(
+                lambda: _get_transactions(db, current_user=user, limit=LIMIT, cursor=cursor, count="none"),
+                args.repeat
+            )
+            print(f"{page:>6} {offset_ms:>12.2f} {cursor_ms:>12.2f}")
+    finally:
+        db.rollback()
+        if user_id is not None:
+            # 取引・カテゴリ・月次集計はユーザー削除でCASCADE削除される
+            db.query(models.User).filter(models.User.id == user_id).delete(synchronize_session=False)
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
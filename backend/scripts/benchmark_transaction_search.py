@@ -0,0 +1,156 @@
+"""
+取引の検索のベンチマーク
+
+取引一覧の検索（総件数と1ページ目）のレイテンシを、以下の2通りで検索語ごとに比較する。
+- ilike: 以前の実装（説明・場所の ILIKE '%...%'）
+- search_vector: バイグラムの tsvector（GINインデックス）と再確認
+一時ユーザーと取引を作成し、終了時に削除する。
+
+使い方:
+    python scripts/benchmark_transaction_search.py [--transactions 100000] [--repeat 20]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import or_, text
+
+from app import models
+from app.api.transactions.transactions import _get_transactions
+from app.db.session import SessionLocal
+from app.services.monthly_rollup import rebuild_user_rollups
+from app.services.transaction_pagination import KEYSET_ORDER
+from app.utils.text_search import build_search_vector
+
+LIMIT = 20
+WORDS = (
+    "ランチ", "ディナー", "カフェ", "スーパー", "コンビニ", "外食", "居酒屋", "映画", "記念日", "プレゼント",
+    "電車", "タクシー", "ガソリン", "家賃", "電気代", "水道代", "日用品", "洋服", "美容院", "旅行",
+    "ホテル", "お土産", "ケーキ", "花束", "ドラッグストア", "本", "ゲーム", "ジム", "病院", "薬"
+)
+PLACES = ("渋谷", "新宿", "池袋", "横浜", "表参道", "吉祥寺", "品川", "上野", "銀座", "自宅")
+TAGS = ("デート", "記念日", "家族", "仕事", "旅行")
+# (検索語, 説明)
+QUERIES = (
+    ("外食", "よく出現する2文字の語"),
+    ("ドラッグストア", "長い語"),
+    ("花束 銀座", "複数の語"),
+    ("プレ*", "前方一致"),
+    ("存在しない", "一致なし"),
+)
+
+
+def seed(db, transaction_count: int):
+    """ベンチマーク用のユーザー・カテゴリ・取引を作成"""
+    user = models.User(
+        email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password="x",
+        display_name="Benchmark",
+        is_active=True
+    )
+    db.add(user)
+    db.flush()
+    category = models.Category(name="bench", user_id=user.id, is_default=False, is_love_category=False)
+    db.add(category)
+    db.flush()
+
+    rng = random.Random(0)
+    today = date.today()
+    rows = []
+    for _ in range(transaction_count):
+        description = " ".join(rng.sample(WORDS, rng.randint(1, 3)))
+        location = rng.choice(PLACES) if rng.random() < 0.5 else None
+        tags = rng.sample(TAGS, rng.randint(0, 2)) or None
+        rows.append({
+            "id": uuid.uuid4(),
+            "user_id": user.id,
+            "category_id": category.id,
+            "amount": rng.randint(100, 20000),
+            "transaction_date": today - timedelta(days=rng.randint(0, 1500)),
+            "description": description,
+            "location": location,
+            "tags": tags,
+            "search_vector": build_search_vector(description, location, tags)
+        })
+    db.execute(text("""
+        INSERT INTO transactions (
+            id, user_id, category_id, amount, transaction_type, sharing_type,
+            transaction_date, description, location, tags, search_vector
+        )
+        VALUES (
+            :id, :user_id, :category_id, :amount, 'expense', 'personal',
+            :transaction_date, :description, :location, :tags, CAST(:search_vector AS tsvector)
+        )
+    """), rows)
+    rebuild_user_rollups(db, user.id)
+    db.commit()
+
+    # 投入直後の統計情報で実行計画が歪まないようにする
+    for table in ('transactions', 'user_monthly_rollups'):
+        db.execute(text(f"ANALYZE {table}"))
+    return user
+
+
+def legacy_search(db, user, search: str):
+    """以前の実装の検索（総件数と1ページ目）"""
+    query = db.query(models.Transaction).filter(
+        models.Transaction.user_id == user.id,
+        or_(
+            models.Transaction.description.ilike(f"%{search}%"),
+            models.Transaction.location.ilike(f"%{search}%")
+        )
+    )
+    total = query.count()
+    return total, query.order_by(*KEYSET_ORDER).limit(LIMIT).all()
+
+
+def measure(func, repeat: int) -> float:
+    """中央値のレイテンシ（ミリ秒）を計測"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user_id = None
+    try:
+        user = seed(db, args.transactions)
+        user_id = user.id
+
+        print(f"{'query':<16} {'hits':>7} {'ilike (ms)':>11} {'search_vector (ms)':>19}")
+        for search, label in QUERIES:
+            result = _get_transactions(db, current_user=user, limit=LIMIT, search=search)
+            ilike_ms = measure(lambda: legacy_search(db, user, search.rstrip("*")), args.repeat)
+            vector_ms = measure(
+                lambda: _get_transactions(db, current_user=user, limit=LIMIT, search=search),
+                args.repeat
+            )
+            print(f"{search:<16} {result['pagination']['total']:>7} {ilike_ms:>11.2f} {vector_ms:>19.2f}  {label}")
+    finally:
+        db.rollback()
+        if user_id is not None:
+            # 取引・カテゴリ・月次集計はユーザー削除でCASCADE削除される
+            db.query(models.User).filter(models.User.id == user_id).delete(synchronize_session=False)
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+年次レポートのベンチマーク
+
+5年分の取引がある場合の年次レポートのレイテンシを、年ごとに以下の2通りで比較する。
+- legacy: 以前の実装（月別の収支の集計、カテゴリ別集計、Love取引の取得・カテゴリ別・評価の集計とトレンド）
+- rollup: 月別の収支とLove支出・件数・評価を1回の集計で取得し、Love統計を導出する実装
+一時ユーザーと取引を作成し、終了時に削除する。
+
+使い方:
+    python scripts/benchmark_yearly_report.py [--transactions 50000] [--years 5] [--repeat 20]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import func, text
+
+from app import models
+from app.api.reports.reports import (
+    _get_yearly_report,
+    get_category_report_from_rollups,
+    get_love_statistics
+)
+from app.db.session import SessionLocal
+from app.services.monthly_rollup import month_range_filter, rebuild_user_rollups
+
+
+def seed(db, transaction_count: int, years: int):
+    """ベンチマーク用のユーザー・カテゴリ・取引を作成（Loveカテゴリを含む）"""
+    user = models.User(
+        email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password="x",
+        display_name="Benchmark",
+        is_active=True
+    )
+    db.add(user)
+    db.flush()
+
+    categories = [
+        models.Category(
+            name=f"bench-{i}", icon="💰", user_id=user.id, is_default=False, is_love_category=i < 3
+        )
+        for i in range(12)
+    ]
+    db.add_all(categories)
+    db.flush()
+
+    rng = random.Random(0)
+    today = date.today()
+    rows = []
+    for _ in range(transaction_count):
+        category = rng.choice(categories)
+        income = not category.is_love_category and rng.random() < 0.1
+        rows.append({
+            "id": uuid.uuid4(),
+            "user_id": user.id,
+            "category_id": category.id,
+            "amount": rng.randint(100, 20000),
+            "transaction_type": 'income' if income else 'expense',
+            "transaction_date": today - timedelta(days=rng.randint(0, years * 365)),
+            "love_rating": rng.randint(1, 5) if category.is_love_category else None
+        })
+    db.execute(text("""
+        INSERT INTO transactions (
+            id, user_id, category_id, amount, transaction_type, sharing_type, transaction_date, love_rating
+        )
+        VALUES (
+            :id, :user_id, :category_id, :amount, :transaction_type, 'personal', :transaction_date, :love_rating
+        )
+    """), rows)
+    rebuild_user_rollups(db, user.id)
+    db.commit()
+
+    # 投入直後の統計情報で実行計画が歪まないようにする
+    for table in ('transactions', 'user_monthly_rollups'):
+        db.execute(text(f"ANALYZE {table}"))
+    return user
+
+
+def legacy_yearly_report(db, user, year: int):
+    """以前の実装と同じクエリ（Love統計は取引から集計）"""
+    rollup = models.UserMonthlyRollup
+    year_start = date(year, 1, 1)
+    next_year_start = date(year + 1, 1, 1)
+    db.query(
+        rollup.month,
+        func.coalesce(func.sum(rollup.total_amount).filter(rollup.transaction_type == 'income'), 0),
+        func.coalesce(func.sum(rollup.total_amount).filter(rollup.transaction_type == 'expense'), 0),
+        func.coalesce(func.sum(rollup.transaction_count), 0)
+    ).join(
+        models.Category, models.Category.id == rollup.category_id
+    ).filter(
+        rollup.user_id == user.id,
+        *month_range_filter(year_start, next_year_start)
+    ).group_by(rollup.month).all()
+    get_category_report_from_rollups(db, user.id, year_start, next_year_start, 'expense')
+    get_love_statistics(db, user.id, year_start, date(year, 12, 31))
+
+
+def measure(func, repeat: int) -> float:
+    """中央値のレイテンシ（ミリ秒）を計測"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=50000)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user_id = None
+    try:
+        user = seed(db, args.transactions, args.years)
+        user_id = user.id
+
+        print(f"{'year':<6} {'love':>6} {'legacy (ms)':>12} {'rollup (ms)':>12}")
+        current_year = date.today().year
+        for year in range(current_year - args.years, current_year + 1):
+            report = _get_yearly_report(db, current_user=user, year=year)
+            legacy_ms = measure(lambda: legacy_yearly_report(db, user, year), args.repeat)
+            rollup_ms = measure(lambda: _get_yearly_report(db, current_user=user, year=year), args.repeat)
+            love_count = report.yearly_love_statistics.love_transaction_count
+            print(f"{year:<6} {love_count:>6} {legacy_ms:>12.2f} {rollup_ms:>12.2f}")
+    finally:
+        db.rollback()
+        if user_id is not None:
+            # 取引・カテゴリ・月次集計はユーザー削除でCASCADE削除される
+            db.query(models.User).filter(models.User.id == user_id).delete(synchronize_session=False)
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+同期ルートと非同期ルートの負荷試験
+
+同じダッシュボード集計（build_dashboard_summary）を、
+- sync: def ルート + 同期エンジン（Starlette のスレッドプールで実行）
+- async: async def ルート + AsyncSession.run_sync（イベントループ上で asyncpg を使用）
+の2通りで提供し、同時リクエスト数ごとのスループットとレイテンシを比較する。
+どちらも同じサイズのコネクションプールを使うため、async では同時実行数がプールで、
+sync ではスレッドプール（デフォルト40スレッド）とプールの小さい方で制限される。
+--delay を指定すると、各リクエストで pg_sleep を実行してネットワーク遅延を模擬する。
+一時ユーザーと取引を作成し、終了時に削除する。
+
+使い方:
+    python scripts/load_test_async_routes.py [--requests 2000] [--pool-size 80] [--delay 0.02]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.session import async_database_url
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.dashboard_summary import build_dashboard_summary
+from app.services.monthly_rollup import rebuild_user_rollups
+
+CONCURRENCY_LEVELS = (10, 50, 100, 200)
+
+
+def seed(db: Session, transaction_count: int) -> uuid.UUID:
+    """負荷試験用のユーザー・カテゴリ・取引を作成"""
+    user = User(
+        email=f"load-{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password="x",
+        display_name="Load Test",
+        is_active=True
+    )
+    db.add(user)
+    db.flush()
+
+    categories = [
+        Category(name=f"load-{i}", user_id=user.id, is_default=False, is_love_category=i < 2)
+        for i in range(10)
+    ]
+    db.add_all(categories)
+    db.flush()
+
+    rng = random.Random(0)
+    today = date.today()
+    db.bulk_save_objects([
+        Transaction(
+            user_id=user.id,
+            category_id=rng.choice(categories).id,
+            amount=Decimal(rng.randint(100, 20000)),
+            transaction_type=rng.choice(('income', 'expense', 'expense')),
+            sharing_type='personal',
+            transaction_date=today - timedelta(days=rng.randint(0, 365))
+        )
+        for _ in range(transaction_count)
+    ])
+    rebuild_user_rollups(db, user.id)
+    db.commit()
+    return user.id
+
+
+def create_app(user_id: uuid.UUID, pool_size: int, delay: float) -> FastAPI:
+    """同じ集計を同期・非同期の両方で提供するアプリを作成"""
+    engine = create_engine(settings.DATABASE_URL, pool_size=pool_size, max_overflow=0)
+    SyncSession = sessionmaker(autoflush=False, bind=engine)
+    async_engine = create_async_engine(
+        async_database_url(settings.DATABASE_URL), pool_size=pool_size, max_overflow=0
+    )
+    AsyncSessionTest = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def get_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionTest() as db:
+            yield db
+
+    def summary(db: Session):
+        if delay:
+            db.execute(text("SELECT pg_sleep(:delay)"), {"delay": delay})
+        return build_dashboard_summary(db, user_id)
+
+    app = FastAPI()
+
+    @app.get("/sync")
+    def sync_summary(db: Session = Depends(get_db)):
+        return summary(db)
+
+    @app.get("/async")
+    async def async_summary(db: AsyncSession = Depends(get_async_db)):
+        return await db.run_sync(summary)
+
+    # 両方のプールが同時に max_connections を使い切らないよう、計測後にモードごとに解放する
+    async def dispose(mode: str):
+        if mode == "sync":
+            engine.dispose()
+        else:
+            await async_engine.dispose()
+
+    app.state.dispose = dispose
+    return app
+
+
+async def run_load(client: httpx.AsyncClient, path: str, total: int, concurrency: int) -> dict:
+    """同時実行数を制限してリクエストを送信し、スループットとレイテンシを計測"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def request():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+async def benchmark(app: FastAPI, total: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        print(f"{'mode':>6} {'concurrency':>11} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+        for mode in ("sync", "async"):
+            # コネクションの確立をウォームアップで済ませる
+            await run_load(client, f"/{mode}", 100, max(CONCURRENCY_LEVELS))
+            for concurrency in CONCURRENCY_LEVELS:
+                result = await run_load(client, f"/{mode}", total, concurrency)
+                print(
+                    f"{mode:>6} {concurrency:>11} {result['rps']:>8.1f} "
+                    f"{result['p50']:>9.1f} {result['p95']:>9.1f}"
+                )
+            await app.state.dispose(mode)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--transactions', type=int, default=5000)
+    parser.add_argument('--pool-size', type=int, default=80)
+    parser.add_argument('--delay', type=float, default=0.02)
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+    db = sessionmaker(bind=engine)()
+    user_id = None
+    try:
+        user_id = seed(db, args.transactions)
+        app = create_app(user_id, args.pool_size, args.delay)
+        asyncio.run(benchmark(app, args.requests))
+    finally:
+        db.rollback()
+        if user_id is not None:
+            # 取引・カテゴリ・月次集計はユーザー削除でCASCADE削除される
+            db.query(User).filter(User.id == user_id).delete(synchronize_session=False)
+            db.commit()
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+定期取引スケジューラ：実行日を迎えた定期取引をまとめて実行するスクリプト
+
+cronなどから定期的に実行する。複数のプロセスで同時に実行しても二重に実行されない。
+
+使い方:
+    python scripts/run_recurring_transactions.py
+    python scripts/run_recurring_transactions.py --date 2025-01-31 --batch-size 1000
+"""
+import argparse
+import logging
+import sys
+from datetime import date
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.recurring_scheduler import DEFAULT_BATCH_SIZE, run_scheduler_job
+from app.services.transaction_events import transaction_events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="実行日を迎えた定期取引を実行")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="基準日（YYYY-MM-DD、デフォルトは今日）")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="1バッチで処理する定期取引の数")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        result = run_scheduler_job(args.date, args.batch_size)
+    finally:
+        # 取引変更イベント（Love Goal・予算アラート）を処理してから終了
+        transaction_events.shutdown(wait=True)
+
+    print(
+        f"✅ Processed {result.processed} recurring transactions, "
+        f"created {result.transactions_created} transactions "
+        f"({result.deactivated} deactivated, {result.batches} batches)"
+    )
+
+
+if __name__ == "__main__":
+    main()
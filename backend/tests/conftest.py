@@ -4,6 +4,10 @@ import os
 
 import pytest
 import pytest_asyncio
+
+# バックグラウンドタスクはテストからdrain()で同期的に実行する
+os.environ.setdefault("TASK_QUEUE_BACKEND", "sync")
+
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
@@ -11,10 +15,15 @@ from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 from app.core.security import create_access_token, get_password_hash
 from app.db.base import Base
-from app.db.session import get_db
+from app.core.deps import get_read_db
+from app.db.session import get_async_db, get_db
 from app.main import app
 from app.models.user import User
 
+# エンドポイントごとのSQLクエリ数の上限を検証する（@pytest.mark.query_budget）
+# ルートがイベントループを止める時間の上限を検証する（loop_lag_monitor フィクスチャ）
+pytest_plugins = ["tests.query_budget", "tests.loop_lag"]
+
 # テスト用データベースURL
 # Docker環境内で実行される場合はそのまま使用、そうでなければlocalhostに変更
 if os.getenv("RUNNING_IN_DOCKER"):
@@ -62,6 +71,8 @@ async def async_client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient,
         yield db_session
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     
     # ASGITransportを使用してAsyncClientを作成
     transport = ASGITransport(app=app)
@@ -116,4 +127,19 @@ def auth_headers(test_user: User) -> dict:
 def auth_headers2(test_user2: User) -> dict:
     """認証ヘッダー2のフィクスチャ"""
     access_token = create_access_token(data={"sub": test_user2.email})
-    return {"Authorization": f"Bearer {access_token}"}
\ No newline at end of file
+    return {"Authorization": f"Bearer {access_token}"}
+
+@pytest.fixture(scope="session")
+def redis_url() -> str:
+    """Redisを使うテスト用のURL（Redisに接続できない場合はスキップ。docker-compose.dev.yml の redis を使用）"""
+    import redis
+
+    url = os.getenv("TEST_REDIS_URL", settings.REDIS_URL)
+    client = redis.Redis.from_url(url, socket_timeout=0.5)
+    try:
+        client.ping()
+    except redis.RedisError:
+        pytest.skip(f"Redis is not available at {url}")
+    finally:
+        client.close()
+    return url
@@ -0,0 +1,44 @@
+"""
+イベントループの停止を検出するpytestプラグイン
+
+loop_lag_monitor フィクスチャを使うテストでは、テスト中のイベントループの停止を記録し、
+テストの終了時に上限（@pytest.mark.max_loop_lag(ミリ秒)、省略時は100ms）を超えた停止を失敗として報告する。
+フィクスチャの準備（パスワードのハッシュ化など）を計測しないよう、引数の最後に指定する。
+
+    @pytest.mark.max_loop_lag(50)
+    async def test_upload(self, async_client, test_user, loop_lag_monitor):
+        ...
+"""
+import pytest
+
+from app.core.loop_monitor import LoopLagMonitor
+
+DEFAULT_MAX_LOOP_LAG_MS = 100
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "max_loop_lag(ms): loop_lag_monitor フィクスチャで許容するイベントループの停止時間の上限（ミリ秒）"
+    )
+
+
+@pytest.fixture
+async def loop_lag_monitor(request):
+    """テスト中のイベントループの停止を記録し、終了時に上限を検証"""
+    marker = request.node.get_closest_marker("max_loop_lag")
+    max_lag_ms = marker.args[0] if marker else DEFAULT_MAX_LOOP_LAG_MS
+    monitor = LoopLagMonitor(threshold=max_lag_ms / 1000, interval=0.01)
+    monitor.start()
+    try:
+        yield monitor
+    finally:
+        await monitor.stop()
+
+    if monitor.stalls:
+        pytest.fail(
+            f"Event loop blocked for more than {max_lag_ms} ms:\n" + "\n".join(
+                f"{stall.route}: {stall.seconds * 1000:.0f} ms\n{stall.stack}" for stall in monitor.stalls
+            ),
+            pytrace=False
+        )
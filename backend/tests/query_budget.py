@@ -0,0 +1,83 @@
+"""
+エンドポイントごとのSQLクエリ数の上限（クエリバジェット）を検証するpytestプラグイン
+
+@pytest.mark.query_budget を付けたテストでは、テスト中のリクエストごとにSQLを計測し、
+テストの終了時に上限を超えたエンドポイント・N+1の疑いがあるエンドポイントを失敗として報告する。
+
+    @pytest.mark.query_budget({"GET /api/v1/dashboard/summary": 4})
+    async def test_summary(self, async_client, ...):
+        ...
+
+上限を整数で指定した場合は、テスト中の全てのリクエストに適用する。
+"""
+from typing import Dict, List, Tuple, Union
+
+import pytest
+
+from app.core import sql_profiler
+from app.core.config import settings
+
+Budget = Union[int, Dict[str, int]]
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(budget, allow_n_plus_one=False): "
+        "リクエストごとのSQLクエリ数の上限（整数、または 'METHOD /path/{param}' ごとの辞書）"
+    )
+
+
+def check_budget(
+    recorded: List[Tuple[str, sql_profiler.SQLProfile]],
+    budget: Budget,
+    allow_n_plus_one: bool = False
+) -> List[str]:
+    """記録したリクエストのうち、上限を超えたもの・N+1の疑いがあるものを取得"""
+    violations = []
+    if isinstance(budget, dict):
+        requested = {endpoint for endpoint, _ in recorded}
+        violations.extend(
+            f"{endpoint}: was not requested" for endpoint in budget if endpoint not in requested
+        )
+
+    for endpoint, profile in recorded:
+        limit = budget.get(endpoint) if isinstance(budget, dict) else budget
+        if limit is None:
+            continue
+        if profile.total_queries > limit:
+            shapes = "\n".join(
+                f"    {entry.count}x {entry.shape}" for entry in profile.shapes.values()
+            )
+            violations.append(f"{endpoint}: {profile.total_queries} queries (budget {limit})\n{shapes}")
+        if not allow_n_plus_one:
+            violations.extend(
+                f"{endpoint}: possible N+1 ({entry.count}x {entry.shape})"
+                for entry in profile.n_plus_one()
+            )
+    return violations
+
+
+@pytest.fixture(autouse=True)
+def query_budget(request, monkeypatch):
+    """query_budget マーカーが付いたテストのリクエストを計測し、終了時に上限を検証"""
+    marker = request.node.get_closest_marker("query_budget")
+    if marker is None:
+        yield None
+        return
+
+    recorded: List[Tuple[str, sql_profiler.SQLProfile]] = []
+    monkeypatch.setattr(settings, "SQL_PROFILING_ENABLED", True)
+    unsubscribe = sql_profiler.subscribe(lambda endpoint, profile: recorded.append((endpoint, profile)))
+    try:
+        yield recorded
+    finally:
+        unsubscribe()
+
+    violations = check_budget(
+        recorded,
+        marker.args[0],
+        marker.kwargs.get("allow_n_plus_one", False)
+    )
+    if violations:
+        pytest.fail("Query budget exceeded:\n" + "\n".join(violations), pytrace=False)
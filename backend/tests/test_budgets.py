@@ -8,6 +8,9 @@ from app.models.user import User
 from app.models.category import Category
 from app.models.budget import Budget
 from app.models.transaction import Transaction
+from app.services.budget_progress import calculate_budgets_progress
+from app.services.monthly_rollup import add_transaction_to_rollups
+from tests.utils import count_queries
 
 
 class TestBudgets:
@@ -467,4 +470,119 @@ class TestBudgets:
             f"/api/v1/budgets/{budget.id}",
             headers=auth_headers2
         )
-        assert response.status_code == 404
\ No newline at end of file
+        assert response.status_code == 404
+
+
+class TestBudgetProgressBatch:
+    """予算進捗の一括計算のテストクラス"""
+
+    @pytest.fixture
+    async def categories(self, db_session: AsyncSession) -> dict:
+        """テスト用カテゴリのフィクスチャ"""
+        food = Category(name="食費", is_default=True, is_love_category=False)
+        date_category = Category(name="デート代", is_default=True, is_love_category=True)
+        db_session.add_all([food, date_category])
+        await db_session.commit()
+        return {"food": food, "date": date_category}
+
+    @pytest.fixture
+    async def transactions(self, db_session: AsyncSession, test_user: User, categories: dict) -> None:
+        """今月・今年・カスタム期間の支出を作成"""
+        today = date(2025, 6, 15)
+        rows = [
+            ("food", "expense", "3000", today),
+            ("food", "expense", "2000", date(2025, 6, 1)),
+            ("date", "expense", "5000", date(2025, 6, 10)),
+            ("food", "expense", "4000", date(2025, 3, 3)),
+            ("food", "income", "9000", date(2025, 6, 5)),
+            ("food", "expense", "7000", date(2024, 12, 31)),
+        ]
+
+        def write(session):
+            for key, transaction_type, amount, transaction_date in rows:
+                transaction = Transaction(
+                    user_id=test_user.id,
+                    category_id=categories[key].id,
+                    amount=Decimal(amount),
+                    transaction_type=transaction_type,
+                    sharing_type="personal",
+                    transaction_date=transaction_date
+                )
+                session.add(transaction)
+                add_transaction_to_rollups(session, transaction)
+            session.commit()
+
+        await db_session.run_sync(write)
+
+    async def create_budgets(self, db_session: AsyncSession, user: User, specs: list) -> list:
+        budgets = [
+            Budget(
+                user_id=user.id,
+                name=f"予算{i}",
+                amount=Decimal("10000"),
+                alert_threshold=Decimal("80"),
+                is_active=True,
+                **spec
+            )
+            for i, spec in enumerate(specs)
+        ]
+        db_session.add_all(budgets)
+        await db_session.commit()
+        return budgets
+
+    @pytest.mark.asyncio
+    async def test_progress_for_each_period(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        categories: dict,
+        transactions: None
+    ):
+        """期間・カテゴリごとの支出額と進捗のテスト"""
+        food_id = categories["food"].id
+        budgets = await self.create_budgets(db_session, test_user, [
+            {"period": "monthly", "start_date": date(2025, 1, 1), "category_id": food_id},
+            {"period": "monthly", "start_date": date(2025, 1, 1), "category_id": None},
+            {"period": "yearly", "start_date": date(2025, 1, 1), "category_id": food_id},
+            {"period": "custom", "start_date": date(2024, 12, 1), "end_date": date(2025, 6, 1), "category_id": food_id},
+            {"period": "custom", "start_date": date(2025, 6, 1), "end_date": date(2025, 7, 1), "category_id": None},
+        ])
+
+        progress = await db_session.run_sync(
+            lambda session: calculate_budgets_progress(session, budgets, test_user.id, today=date(2025, 6, 15))
+        )
+
+        assert [progress[budget.id]["spent_amount"] for budget in budgets] == [
+            5000.0, 10000.0, 9000.0, 11000.0, 10000.0
+        ]
+        assert progress[budgets[0].id]["days_remaining"] == 16
+        assert progress[budgets[1].id]["is_alert_threshold_reached"] is True
+        assert progress[budgets[1].id]["is_over_budget"] is False
+        assert progress[budgets[3].id]["is_over_budget"] is True
+        assert progress[budgets[3].id]["days_remaining"] == 0
+
+    @pytest.mark.asyncio
+    async def test_query_count_independent_of_budget_count(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        categories: dict,
+        transactions: None
+    ):
+        """予算の数が増えてもSQLの発行回数が変わらないことを確認"""
+        specs = [
+            {"period": period, "start_date": date(2025, 1, 1), "end_date": date(2025, 12, 31), "category_id": category.id}
+            for period in ("monthly", "yearly", "custom")
+            for category in categories.values()
+        ]
+        budgets = await self.create_budgets(db_session, test_user, specs * 5)
+
+        counts = []
+        for subset in (budgets[:len(specs)], budgets):
+            with count_queries(db_session) as statements:
+                await db_session.run_sync(
+                    lambda session: calculate_budgets_progress(session, subset, test_user.id)
+                )
+            counts.append(len(statements))
+
+        assert counts == [2, 2]
@@ -0,0 +1,130 @@
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.services.dashboard_summary import build_dashboard_summary
+from tests.utils import count_queries
+
+
+class TestDashboardSummary:
+    """ダッシュボードサマリーのテストクラス"""
+
+    @pytest.fixture
+    async def categories(self, db_session: AsyncSession) -> dict:
+        """テスト用カテゴリのフィクスチャ"""
+        food = Category(name="食費", icon="🍽️", is_default=True, is_love_category=False)
+        date_category = Category(name="デート代", icon="💕", is_default=True, is_love_category=True)
+        salary = Category(name="給与", icon="💰", is_default=True, is_love_category=False)
+        db_session.add_all([food, date_category, salary])
+        await db_session.commit()
+        return {"food": food, "date": date_category, "salary": salary}
+
+    @pytest.fixture
+    async def transactions(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        categories: dict
+    ) -> list:
+        """今月・前月の取引を作成"""
+        today = date.today()
+        month_start = date(today.year, today.month, 1)
+        prev_month_day = month_start - timedelta(days=1)
+
+        rows = [
+            ("salary", "income", Decimal("300000"), month_start, None),
+            ("food", "expense", Decimal("3000"), month_start, None),
+            ("food", "expense", Decimal("2000"), today, None),
+            ("date", "expense", Decimal("5000"), today, 5),
+            ("date", "expense", Decimal("3000"), month_start, 3),
+            ("salary", "income", Decimal("280000"), prev_month_day, None),
+            ("food", "expense", Decimal("4000"), prev_month_day, None),
+        ]
+        transactions = []
+        for key, transaction_type, amount, transaction_date, love_rating in rows:
+            transactions.append(Transaction(
+                user_id=test_user.id,
+                category_id=categories[key].id,
+                amount=amount,
+                transaction_type=transaction_type,
+                sharing_type="personal",
+                transaction_date=transaction_date,
+                love_rating=love_rating
+            ))
+        db_session.add_all(transactions)
+        await db_session.commit()
+        return transactions
+
+    @pytest.mark.asyncio
+    async def test_summary_totals(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        transactions: list
+    ):
+        """今月・前月の集計とLove統計のテスト"""
+        summary = await db_session.run_sync(
+            lambda session: build_dashboard_summary(session, test_user.id)
+        )
+
+        assert summary["current_month"] == {
+            "income": 300000.0,
+            "expense": 13000.0,
+            "balance": 287000.0
+        }
+        assert summary["previous_month"] == {
+            "income": 280000.0,
+            "expense": 4000.0,
+            "balance": 276000.0
+        }
+        assert summary["love_stats"] == {
+            "love_spending": 8000.0,
+            "love_transactions": 2,
+            "average_love_rating": 4.0
+        }
+
+        categories = {c["category"]["name"]: c for c in summary["categories"]}
+        assert set(categories) == {"食費", "デート代"}
+        assert categories["デート代"]["amount"] == 8000.0
+        assert categories["食費"]["transaction_count"] == 2
+        assert sum(c["percentage"] for c in summary["categories"]) == pytest.approx(100.0)
+
+        assert len(summary["recent_transactions"]) == len(transactions)
+        assert all(t["category"] is not None for t in summary["recent_transactions"])
+
+    @pytest.mark.asyncio
+    async def test_summary_query_count(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        transactions: list
+    ):
+        """サマリーのSQL発行回数が取引数に依存しないことを確認"""
+        db_session.expunge_all()
+
+        with count_queries(db_session) as statements:
+            await db_session.run_sync(
+                lambda session: build_dashboard_summary(session, test_user.id)
+            )
+
+        assert len(statements) == 2
+
+    @pytest.mark.asyncio
+    async def test_summary_without_transactions(
+        self,
+        db_session: AsyncSession,
+        test_user: User
+    ):
+        """取引がない場合のテスト"""
+        summary = await db_session.run_sync(
+            lambda session: build_dashboard_summary(session, test_user.id)
+        )
+
+        assert summary["current_month"]["balance"] == 0.0
+        assert summary["categories"] == []
+        assert summary["recent_transactions"] == []
+        assert summary["love_stats"]["average_love_rating"] == 0
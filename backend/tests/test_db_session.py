@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.db import session as db_session_module
+from app.db.pool import TimedQueuePool, attach_metrics
+from app.db.session import ReplicaRouter, open_read_session, set_statement_timeout
+from app.core.config import settings
+from tests.conftest import TEST_DATABASE_URL
+
+
+def show_statement_timeout(session) -> str:
+    return session.execute(text("SHOW statement_timeout")).scalar()
+
+
+class TestStatementTimeout:
+    """ルートの種類ごとの statement_timeout のテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_report_timeout_applies_to_each_transaction(self, db_session: AsyncSession):
+        """開始済みのトランザクションと、以降のトランザクションに延長後の値が適用されることを確認"""
+        def run(session):
+            default = show_statement_timeout(session)
+            set_statement_timeout(session, "report")
+            current = show_statement_timeout(session)
+            session.commit()
+            next_transaction = show_statement_timeout(session)
+            session.commit()
+            return default, current, next_transaction
+
+        default, current, next_transaction = await db_session.run_sync(run)
+
+        expected = f"{settings.DB_REPORT_STATEMENT_TIMEOUT_MS // 1000}s"
+        assert default != expected
+        assert current == expected
+        assert next_transaction == expected
+
+    @pytest.mark.asyncio
+    async def test_pgbouncer_mode_applies_defaults_to_replicas(self, monkeypatch):
+        """PgBouncer 経由では、レプリカのセッションにもトランザクションごとにデフォルト値が適用されることを確認"""
+        monkeypatch.setattr(settings, "DB_PGBOUNCER_MODE", True)
+        replica = create_async_engine(TEST_DATABASE_URL, connect_args=db_session_module._async_connect_args())
+        monkeypatch.setattr(db_session_module, "replica_router", ReplicaRouter([replica], retry_seconds=60))
+        try:
+            session = await open_read_session()
+            assert session.bind is replica
+            statement_timeout = await session.run_sync(show_statement_timeout)
+            idle_timeout = (await session.execute(text("SHOW idle_in_transaction_session_timeout"))).scalar()
+            await session.close()
+        finally:
+            await replica.dispose()
+
+        assert statement_timeout == f"{settings.DB_STATEMENT_TIMEOUT_MS // 1000}s"
+        assert idle_timeout == f"{settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS // 60000}min"
+
+
+class TestPoolMetrics:
+    """コネクションプールのメトリクスのテストクラス"""
+
+    def test_records_checkouts_and_timeouts(self):
+        """チェックアウト回数・タイムアウト回数が集計され、dispose後も引き継がれることを確認"""
+        engine = create_engine(
+            TEST_DATABASE_URL.replace("+asyncpg", ""),
+            poolclass=TimedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05
+        )
+        metrics = attach_metrics(engine, "test")
+        try:
+            with engine.connect():
+                status = metrics.snapshot(engine.pool)
+                assert status["checked_out"] == 1
+
+                with pytest.raises(exc.TimeoutError):
+                    engine.connect()
+
+            status = metrics.snapshot(engine.pool)
+            assert status["checkouts"] == 1
+            assert status["timeouts"] == 1
+            assert status["checked_out"] == 0
+            assert status["wait_seconds_max"] >= 0.05
+
+            engine.dispose()
+            with engine.connect():
+                pass
+            assert metrics.snapshot(engine.pool)["checkouts"] == 2
+        finally:
+            engine.dispose()
@@ -0,0 +1,125 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.category import Category
+from app.models.recurring_transaction import RecurringTransaction
+from app.models.transaction import Transaction
+from app.services.forecast import build_cash_flow_forecast, get_cash_flow_forecast
+from app.services.monthly_rollup import add_transaction_to_rollups
+from app.services.transaction_events import notify_transactions_changed, transaction_events
+from tests.utils import count_queries
+
+TODAY = date(2025, 5, 10)
+
+
+class TestCashFlowForecast:
+    """収支予測のテストクラス"""
+
+    @pytest.fixture
+    async def setup_data(self, db_session: AsyncSession, test_user: User) -> dict:
+        """過去3ヶ月の食費・家賃（定期取引）と、未実行の給与の定期取引を作成"""
+        food = Category(name="食費", icon="🍚", is_default=True, is_love_category=False)
+        rent = Category(name="住居費", icon="🏠", is_default=True, is_love_category=False)
+        salary = Category(name="給与", icon="💰", is_default=True, is_love_category=False)
+        db_session.add_all([food, rent, salary])
+        await db_session.commit()
+
+        db_session.add_all([
+            RecurringTransaction(
+                user_id=test_user.id, category_id=rent.id, amount=Decimal("80000"),
+                transaction_type="expense", sharing_type="shared", frequency="monthly",
+                interval_value=1, day_of_month=25, next_execution_date=date(2025, 5, 25),
+                last_execution_date=date(2025, 4, 25), execution_count=10, is_active=True
+            ),
+            RecurringTransaction(
+                user_id=test_user.id, category_id=salary.id, amount=Decimal("300000"),
+                transaction_type="income", sharing_type="personal", frequency="monthly",
+                interval_value=1, day_of_month=25, next_execution_date=date(2025, 5, 25),
+                execution_count=0, is_active=True
+            ),
+        ])
+
+        def write(session):
+            rows = []
+            for month in (2, 3, 4):
+                rows.append((food, "12000", date(2025, month, 3)))
+                rows.append((food, "18000", date(2025, month, 20)))
+                rows.append((rent, "80000", date(2025, month, 25)))
+            # 今月の取引はベースラインに含めない
+            rows.append((food, "99000", date(2025, 5, 1)))
+            for category, amount, transaction_date in rows:
+                transaction = Transaction(
+                    user_id=test_user.id,
+                    category_id=category.id,
+                    amount=Decimal(amount),
+                    transaction_type="expense",
+                    sharing_type="personal",
+                    transaction_date=transaction_date
+                )
+                session.add(transaction)
+                add_transaction_to_rollups(session, transaction)
+            session.commit()
+
+        await db_session.run_sync(write)
+        return {"food": food, "rent": rent, "salary": salary}
+
+    @pytest.mark.asyncio
+    async def test_combines_recurring_and_baseline(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        setup_data: dict
+    ):
+        """定期取引の予定額と、定期取引を除いた月平均が合算されることを確認"""
+        forecast = await db_session.run_sync(
+            lambda session: build_cash_flow_forecast(session, test_user.id, months=3, today=TODAY)
+        )
+
+        assert [month.month for month in forecast.monthly] == ["2025-06", "2025-07", "2025-08"]
+        for month in forecast.monthly:
+            assert month.income == Decimal("300000")
+            assert month.expense == Decimal("110000")
+            assert month.recurring_expense == Decimal("80000")
+
+            amounts = {
+                c.category_name: (c.recurring_amount, c.baseline_amount) for c in month.categories
+            }
+            assert amounts == {
+                "給与": (Decimal("300000"), Decimal("0")),
+                "食費": (Decimal("0"), Decimal("30000.00")),
+                # 家賃の履歴は定期取引分として除かれる
+                "住居費": (Decimal("80000"), Decimal("0")),
+            }
+
+        assert forecast.total_balance == Decimal("570000")
+
+    @pytest.mark.asyncio
+    async def test_cached_until_next_write(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        setup_data: dict
+    ):
+        """予測がキャッシュされ、取引の変更で破棄されることを確認"""
+        async def fetch_forecast():
+            with count_queries(db_session) as statements:
+                forecast = await db_session.run_sync(
+                    lambda session: get_cash_flow_forecast(session, test_user.id, months=3, today=TODAY)
+                )
+            return forecast, len(statements)
+
+        first, first_queries = await fetch_forecast()
+        cached, cached_queries = await fetch_forecast()
+        assert first_queries <= 2
+        assert cached_queries == 0
+        assert cached is first
+
+        notify_transactions_changed(test_user.id)
+        transaction_events.drain(lambda user_id: None)
+
+        refreshed, refreshed_queries = await fetch_forecast()
+        assert refreshed_queries == first_queries
+        assert refreshed == first
@@ -0,0 +1,156 @@
+import asyncio
+import base64
+import io
+import json
+import os
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from httpx import ASGITransport, AsyncClient
+from PIL import Image
+
+from app.core.loop_monitor import LoopLagMonitor
+from app.core.security import create_access_token
+from app.middleware.security import SecurityMiddleware
+from app.models.category import Category
+from app.models.user import User
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(SecurityMiddleware)
+
+    @app.get("/blocking/{item_id}")
+    async def blocking(item_id: int):
+        time.sleep(0.3)
+        return {}
+
+    @app.get("/non-blocking")
+    async def non_blocking():
+        await asyncio.sleep(0.3)
+        await run_in_threadpool(time.sleep, 0.3)
+        return {}
+
+    return app
+
+
+@pytest.fixture(scope="module")
+def large_image() -> bytes:
+    """縮小に数百ミリ秒かかる画像"""
+    image = Image.linear_gradient("L").resize((4000, 4000)).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=50)
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="module")
+def large_receipt() -> str:
+    """デコード・検証に数十ミリ秒かかるレシート画像（上限に近い約4MBの無圧縮PNGのBase64）"""
+    image = Image.linear_gradient("L").resize((1200, 1200)).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", compress_level=0)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+@pytest.fixture
+async def warmed_up_upload_route(async_client: AsyncClient) -> None:
+    """ルートの初回照合時の準備（レスポンスモデルの構築など）を計測しないよう、先にリクエストしておく"""
+    await async_client.post("/api/v1/users/profile-image")
+
+
+@pytest.fixture
+async def warmed_up_transaction_route(async_client: AsyncClient) -> None:
+    await async_client.post("/api/v1/transactions/", json={})
+
+
+class TestLoopLagMonitor:
+    """イベントループの停止の検出のテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_detects_blocking_route(self):
+        """イベントループを止めたルートと、そのスタックを記録することを確認"""
+        monitor = LoopLagMonitor(threshold=0.1, interval=0.01)
+        monitor.start()
+        try:
+            async with AsyncClient(transport=ASGITransport(app=create_app()), base_url="http://test") as client:
+                response = await client.get("/blocking/1")
+                assert response.status_code == 200
+                await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+
+        assert len(monitor.stalls) == 1
+        stall = monitor.stalls[0]
+        assert stall.route == "GET /blocking/{item_id}"
+        assert stall.seconds >= 0.25
+        assert "in blocking" in stall.stack and "time.sleep(0.3)" in stall.stack
+
+    @pytest.mark.asyncio
+    async def test_ignores_awaiting_route(self, loop_lag_monitor: LoopLagMonitor):
+        """await・スレッドプールで待つルートは停止として記録しないことを確認"""
+        async with AsyncClient(transport=ASGITransport(app=create_app()), base_url="http://test") as client:
+            response = await client.get("/non-blocking")
+            assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    @pytest.mark.max_loop_lag(100)
+    async def test_upload_profile_image_does_not_block(
+        self,
+        async_client: AsyncClient,
+        test_user: User,
+        large_image: bytes,
+        warmed_up_upload_route: None,
+        loop_lag_monitor: LoopLagMonitor
+    ):
+        """プロフィール画像の変換中もイベントループを止めないことを確認"""
+        response = await async_client.post(
+            "/api/v1/users/profile-image",
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"},
+            files={"file": ("large.jpg", large_image, "image/jpeg")}
+        )
+        assert response.status_code == 200
+        file_path = response.json()["profile_image_url"].lstrip("/")
+        assert os.path.exists(file_path)
+        os.remove(file_path)
+
+    @pytest.mark.asyncio
+    @pytest.mark.max_loop_lag(30)
+    async def test_create_transaction_with_receipt_does_not_block(
+        self,
+        async_client: AsyncClient,
+        db_session: AsyncSession,
+        test_user: User,
+        large_receipt: str,
+        warmed_up_transaction_route: None,
+        loop_lag_monitor: LoopLagMonitor
+    ):
+        """レシート画像のデコード・検証・保存中もイベントループを止めないことを確認"""
+        category = Category(name="食費", icon="🍽️", is_default=True, is_love_category=False)
+        db_session.add(category)
+        await db_session.commit()
+
+        # テスト側のJSONのエンコードを計測しないよう、Base64の文字列はそのまま連結する
+        fields = json.dumps({
+            "amount": "1200.00",
+            "category_id": str(category.id),
+            "transaction_type": "expense",
+            "sharing_type": "personal",
+            "transaction_date": "2024-03-01"
+        })
+        body = f'{fields[:-1]}, "receipt_image": "{large_receipt}"}}'.encode()
+        response = await async_client.post(
+            "/api/v1/transactions/",
+            headers={
+                "Authorization": f"Bearer {create_access_token(test_user.id)}",
+                "Content-Type": "application/json"
+            },
+            content=body
+        )
+        assert response.status_code == 200
+        receipt_url = response.json()["receipt_image_url"]
+        file_path = os.path.join("uploads", receipt_url.split("/uploads/", 1)[1])
+        assert os.path.exists(file_path)
+        os.remove(file_path)
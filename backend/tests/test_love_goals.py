@@ -0,0 +1,160 @@
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.notification import Notification
+from app.models.transaction import Transaction
+from app.services.love_goals import create_goal_achievement_notifications, evaluate_love_goals
+from tests.utils import count_queries
+
+
+class TestLoveGoals:
+    """Love Goal進捗の一括計算のテストクラス"""
+
+    @pytest.fixture
+    async def categories(self, db_session: AsyncSession) -> dict:
+        """テスト用カテゴリのフィクスチャ"""
+        food = Category(name="食費", is_default=True, is_love_category=False)
+        date_category = Category(name="デート代", is_default=True, is_love_category=True)
+        gift = Category(name="プレゼント", is_default=True, is_love_category=True)
+        db_session.add_all([food, date_category, gift])
+        await db_session.commit()
+        return {"food": food, "date": date_category, "gift": gift}
+
+    @pytest.fixture
+    async def transactions(self, db_session: AsyncSession, test_user: User, categories: dict) -> None:
+        """Loveカテゴリとそれ以外の支出を作成"""
+        today = date.today()
+        rows = [
+            ("date", "5000", today),
+            ("date", "3000", today - timedelta(days=40)),
+            ("gift", "8000", today - timedelta(days=2)),
+            ("food", "9000", today),
+            ("date", "7000", today + timedelta(days=3)),
+        ]
+        db_session.add_all([
+            Transaction(
+                user_id=test_user.id,
+                category_id=categories[key].id,
+                amount=Decimal(amount),
+                transaction_type="expense",
+                sharing_type="personal",
+                transaction_date=transaction_date
+            )
+            for key, amount, transaction_date in rows
+        ])
+        await db_session.commit()
+
+    async def create_goals(self, db_session: AsyncSession, user: User, specs: list) -> list:
+        goals = [
+            Budget(
+                user_id=user.id,
+                name=f"ゴール{i}",
+                period="custom",
+                alert_threshold=Decimal("80"),
+                is_love_budget=True,
+                is_active=True,
+                **spec
+            )
+            for i, spec in enumerate(specs)
+        ]
+        db_session.add_all(goals)
+        await db_session.commit()
+        return goals
+
+    @pytest.mark.asyncio
+    async def test_evaluate_love_goals(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        categories: dict,
+        transactions: None
+    ):
+        """ゴールごとの期間・カテゴリでLove支出が集計されることを確認"""
+        today = date.today()
+        goals = await self.create_goals(db_session, test_user, [
+            {"amount": Decimal("10000"), "start_date": today - timedelta(days=30)},
+            {"amount": Decimal("10000"), "start_date": today - timedelta(days=60), "category_id": categories["date"].id},
+            {"amount": Decimal("10000"), "start_date": today - timedelta(days=60), "end_date": today - timedelta(days=1)},
+            {"amount": Decimal("10000"), "start_date": today - timedelta(days=60), "category_id": categories["food"].id},
+        ])
+
+        totals = await db_session.run_sync(
+            lambda session: evaluate_love_goals(session, goals, test_user.id)
+        )
+
+        assert [totals[goal.id] for goal in goals] == [
+            (Decimal("13000"), 2),
+            (Decimal("8000"), 2),
+            (Decimal("11000"), 2),
+            (Decimal("0"), 0),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_achievement_notified_once(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        categories: dict,
+        transactions: None
+    ):
+        """達成したゴールの通知が一度だけ作成されることを確認"""
+        today = date.today()
+        goals = await self.create_goals(db_session, test_user, [
+            {"amount": Decimal("10000"), "start_date": today - timedelta(days=30)},
+            {"amount": Decimal("50000"), "start_date": today - timedelta(days=30)},
+        ])
+
+        created = []
+        for _ in range(2):
+            created.append(await db_session.run_sync(
+                lambda session: create_goal_achievement_notifications(session, test_user.id)
+            ))
+            await db_session.commit()
+
+        result = await db_session.execute(
+            select(Notification).where(Notification.type == "love_goal_achieved")
+        )
+        notifications = result.scalars().all()
+        assert created == [1, 0]
+        assert len(notifications) == 1
+        assert notifications[0].data["goal_id"] == str(goals[0].id)
+        assert notifications[0].data["spent_amount"] == 13000.0
+
+    @pytest.mark.asyncio
+    async def test_query_count_independent_of_goal_count(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        categories: dict,
+        transactions: None
+    ):
+        """ゴールの数が増えても達成チェックのSQL発行回数が変わらないことを確認"""
+        today = date.today()
+        await self.create_goals(db_session, test_user, [
+            {"amount": Decimal("1000"), "start_date": today - timedelta(days=30), "category_id": category.id}
+            for category in (categories["date"], categories["gift"])
+        ])
+
+        async def count_check_queries() -> int:
+            with count_queries(db_session) as statements:
+                await db_session.run_sync(
+                    lambda session: create_goal_achievement_notifications(session, test_user.id)
+                )
+            await db_session.commit()
+            return len([s for s in statements if s.lstrip().upper().startswith("SELECT")])
+
+        few_goals = await count_check_queries()
+
+        await self.create_goals(db_session, test_user, [
+            {"amount": Decimal("1000"), "start_date": today - timedelta(days=i)}
+            for i in range(20)
+        ])
+        many_goals = await count_check_queries()
+
+        assert few_goals == many_goals == 3
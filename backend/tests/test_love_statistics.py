@@ -0,0 +1,128 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_access_token
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.love_statistics import (
+    get_love_aggregates,
+    get_love_streak,
+    get_most_loved_category,
+    get_most_loved_day
+)
+
+PERIOD = (date(2024, 3, 1), date(2024, 4, 1))
+
+
+@pytest.fixture
+async def love_transactions(db_session: AsyncSession, test_user: User) -> dict:
+    """連続した日・途切れた日・Love以外の取引を含むLove取引"""
+    dating = Category(name="デート代", icon="💕", is_default=True, is_love_category=True)
+    gift = Category(name="プレゼント", icon="🎁", is_default=True, is_love_category=True)
+    food = Category(name="食費", icon="🍽️", is_default=True, is_love_category=False)
+    db_session.add_all([dating, gift, food])
+    await db_session.commit()
+
+    rows = [
+        # 3日連続
+        (dating, 'expense', date(2024, 3, 1), 3000, 5),
+        (gift, 'expense', date(2024, 3, 2), 8000, 4),
+        (dating, 'expense', date(2024, 3, 3), 2000, None),
+        # Love以外の取引は連続記録をつながない
+        (food, 'expense', date(2024, 3, 4), 50000, None),
+        (dating, 'expense', date(2024, 3, 5), 1000, 3),
+        # 収入も含めて5日連続（最長）
+        (dating, 'expense', date(2024, 3, 10), 1500, None),
+        (gift, 'expense', date(2024, 3, 11), 4000, 5),
+        (dating, 'expense', date(2024, 3, 11), 4000, 2),
+        (dating, 'expense', date(2024, 3, 12), 500, None),
+        (dating, 'expense', date(2024, 3, 13), 700, None),
+        (gift, 'income', date(2024, 3, 14), 10000, None),
+        # 期間外
+        (gift, 'expense', date(2024, 2, 29), 90000, 1),
+        (dating, 'expense', date(2024, 4, 1), 90000, 1),
+    ]
+    transactions = [
+        Transaction(
+            user_id=test_user.id,
+            category_id=category.id,
+            amount=Decimal(amount),
+            transaction_type=transaction_type,
+            sharing_type='personal',
+            transaction_date=day,
+            love_rating=rating
+        )
+        for category, transaction_type, day, amount, rating in rows
+    ]
+    db_session.add_all(transactions)
+    await db_session.commit()
+    return {"dating": dating, "gift": gift, "food": food}
+
+
+class TestLoveStatistics:
+    """Love統計の集計のテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_aggregates(self, db_session: AsyncSession, test_user: User, love_transactions: dict):
+        """Love取引の件数・支出・評価と全体の支出を確認"""
+        aggregates = await db_session.run_sync(
+            lambda session: get_love_aggregates(session, test_user.id, *PERIOD)
+        )
+        assert aggregates == {
+            "love_spending": Decimal(24700),
+            "love_transaction_count": 10,
+            "love_rating_sum": 19,
+            "love_rating_count": 5,
+            "total_expense": Decimal(74700)
+        }
+
+    @pytest.mark.asyncio
+    async def test_most_loved_day_and_category(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        love_transactions: dict
+    ):
+        """Love支出が最も多い日（同額の日が複数ある）・カテゴリを確認"""
+        most_loved_day = await db_session.run_sync(
+            lambda session: get_most_loved_day(session, test_user.id, *PERIOD)
+        )
+        most_loved_category = await db_session.run_sync(
+            lambda session: get_most_loved_category(session, test_user.id, *PERIOD)
+        )
+        assert most_loved_day == date(2024, 3, 2)
+        assert most_loved_category == "デート代"
+
+    @pytest.mark.asyncio
+    async def test_love_streak(self, db_session: AsyncSession, test_user: User, love_transactions: dict):
+        """Love取引がある日の最長連続日数を確認"""
+        streak = await db_session.run_sync(lambda session: get_love_streak(session, test_user.id, *PERIOD))
+        assert streak == 5
+
+        empty_streak = await db_session.run_sync(
+            lambda session: get_love_streak(session, test_user.id, date(2024, 5, 1), date(2024, 6, 1))
+        )
+        assert empty_streak == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.query_budget({"GET /api/v1/love/stats": 5})
+    async def test_love_stats_endpoint(self, async_client: AsyncClient, test_user: User, love_transactions: dict):
+        """Love統計のエンドポイントが取引を読み込まずに集計することを確認"""
+        response = await async_client.get(
+            "/api/v1/love/stats",
+            params={"start_date": "2024-03-01", "end_date": "2024-03-31"},
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+        )
+        assert response.status_code == 200
+        stats = response.json()
+        assert stats["total_love_transactions"] == 10
+        assert stats["average_love_rating"] == pytest.approx(19 / 5)
+        assert Decimal(stats["total_love_spending"]) == Decimal(24700)
+        assert stats["most_love_day"] == "2024-03-02"
+        assert stats["most_love_category"] == "デート代"
+        assert stats["love_streak"] == 5
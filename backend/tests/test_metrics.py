@@ -0,0 +1,45 @@
+import pytest
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+
+from app.core.security import create_access_token
+from app.models.user import User
+
+ROUTE = "/api/v1/dashboard/summary"
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetrics:
+    """Prometheusのメトリクスのテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_records_request_and_db_metrics(self, async_client: AsyncClient, test_user: User):
+        """ルートのテンプレートごとにレイテンシ・クエリ数が記録されることを確認"""
+        labels = {"method": "GET", "route": ROUTE}
+        requests_before = sample("http_request_duration_seconds_count", status="200", **labels)
+        queries_before = sample("http_request_db_queries_sum", **labels)
+
+        response = await async_client.get(
+            ROUTE, headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+        )
+        assert response.status_code == 200
+
+        assert sample("http_request_duration_seconds_count", status="200", **labels) == requests_before + 1
+        assert sample("http_request_db_queries_sum", **labels) > queries_before
+        assert sample("http_response_size_bytes_count", **labels) >= 1
+        assert sample("http_requests_in_progress", method="GET") == 0
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self, async_client: AsyncClient):
+        """/metrics でプールの状態を含むメトリクスを取得でき、未定義のパスはまとめられることを確認"""
+        await async_client.get("/no-such-path/12345")
+
+        response = await async_client.get("/metrics")
+        assert response.status_code == 200
+        body = response.text
+        assert 'db_pool_checked_out{pool="async"}' in body
+        assert 'route="unmatched"' in body
+        assert "12345" not in body
@@ -0,0 +1,139 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.models.user_monthly_rollup import UserMonthlyRollup
+from app.services.monthly_rollup import (
+    add_transaction_to_rollups,
+    rebuild_user_rollups,
+    remove_transaction_from_rollups,
+    rollup_snapshot,
+    sum_rollup_amount,
+    update_transaction_rollups
+)
+
+
+async def fetch_rollups(db_session: AsyncSession) -> dict:
+    """集計行をキーごとの辞書で取得（件数0の行は除外）"""
+    result = await db_session.execute(select(UserMonthlyRollup))
+    return {
+        (r.year, r.month, r.category_id, r.transaction_type, r.sharing_type): (
+            r.total_amount, r.transaction_count, r.love_rating_sum, r.love_rating_count
+        )
+        for r in result.scalars().all()
+        if r.transaction_count
+    }
+
+
+class TestMonthlyRollups:
+    """月次集計テーブルのテストクラス"""
+
+    @pytest.fixture
+    async def categories(self, db_session: AsyncSession) -> dict:
+        """テスト用カテゴリのフィクスチャ"""
+        food = Category(name="食費", is_default=True, is_love_category=False)
+        date_category = Category(name="デート代", is_default=True, is_love_category=True)
+        db_session.add_all([food, date_category])
+        await db_session.commit()
+        return {"food": food, "date": date_category}
+
+    def make_transaction(self, user: User, category: Category, amount: str, transaction_date: date, **kwargs):
+        return Transaction(
+            user_id=user.id,
+            category_id=category.id,
+            amount=Decimal(amount),
+            transaction_type=kwargs.get("transaction_type", "expense"),
+            sharing_type=kwargs.get("sharing_type", "personal"),
+            transaction_date=transaction_date,
+            love_rating=kwargs.get("love_rating")
+        )
+
+    @pytest.mark.asyncio
+    async def test_incremental_maintenance_matches_rebuild(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        categories: dict
+    ):
+        """差分更新の結果が再集計と一致することを確認"""
+        transactions = [
+            self.make_transaction(test_user, categories["food"], "1200", date(2025, 5, 3)),
+            self.make_transaction(test_user, categories["food"], "800", date(2025, 5, 20), sharing_type="shared"),
+            self.make_transaction(test_user, categories["date"], "5000", date(2025, 5, 24), love_rating=5),
+            self.make_transaction(test_user, categories["date"], "3000", date(2025, 6, 1), love_rating=4),
+        ]
+
+        def write(session):
+            for transaction in transactions:
+                session.add(transaction)
+                add_transaction_to_rollups(session, transaction)
+            session.flush()
+
+            # 更新: 金額・月・評価を変更
+            before = rollup_snapshot(transactions[0])
+            transactions[0].amount = Decimal("1500")
+            transactions[0].transaction_date = date(2025, 6, 2)
+            update_transaction_rollups(session, before, transactions[0])
+
+            before = rollup_snapshot(transactions[2])
+            transactions[2].love_rating = 3
+            update_transaction_rollups(session, before, transactions[2])
+
+            # 削除
+            remove_transaction_from_rollups(session, transactions[3])
+            session.delete(transactions[3])
+            session.commit()
+
+        await db_session.run_sync(write)
+        incremental = await fetch_rollups(db_session)
+
+        await db_session.run_sync(lambda session: rebuild_user_rollups(session, test_user.id))
+        await db_session.commit()
+        rebuilt = await fetch_rollups(db_session)
+
+        assert incremental == rebuilt
+        assert rebuilt[(2025, 5, categories["date"].id, "expense", "personal")] == (
+            Decimal("5000.00"), 1, 3, 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_sum_rollup_amount(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        categories: dict
+    ):
+        """月範囲・カテゴリ指定での合計取得のテスト"""
+        transactions = [
+            self.make_transaction(test_user, categories["food"], "1000", date(2024, 12, 31)),
+            self.make_transaction(test_user, categories["food"], "2000", date(2025, 1, 15)),
+            self.make_transaction(test_user, categories["date"], "3000", date(2025, 2, 10)),
+            self.make_transaction(test_user, categories["food"], "9000", date(2025, 1, 10), transaction_type="income"),
+        ]
+
+        def write(session):
+            for transaction in transactions:
+                session.add(transaction)
+                add_transaction_to_rollups(session, transaction)
+            session.commit()
+
+        await db_session.run_sync(write)
+
+        def read(session):
+            return (
+                sum_rollup_amount(session, test_user.id, date(2025, 1, 1), date(2026, 1, 1), "expense"),
+                sum_rollup_amount(
+                    session, test_user.id, date(2025, 1, 1), date(2025, 2, 1), "expense", categories["food"].id
+                ),
+                sum_rollup_amount(session, test_user.id, date(2024, 12, 1), date(2025, 1, 1), "expense"),
+            )
+
+        year_total, january_food, december_total = await db_session.run_sync(read)
+        assert year_total == Decimal("5000")
+        assert january_food == Decimal("2000")
+        assert december_total == Decimal("1000")
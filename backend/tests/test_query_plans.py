@@ -0,0 +1,231 @@
+import uuid
+
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import cast, func, literal, or_, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import TSQUERY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.love_event import LoveEvent
+from app.models.notification import Notification
+from app.models.partnership import Partnership
+from app.models.transaction import Transaction
+from app.models.user_monthly_rollup import UserMonthlyRollup
+from app.services.monthly_rollup import month_range_filter
+from app.services.transaction_pagination import KEYSET_ORDER, after_cursor
+from app.utils.text_search import SearchQuery
+
+SEED_TRANSACTIONS = 3000
+
+
+INDEX_SCAN_NODES = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+
+
+def find_full_scans(plan: dict) -> list:
+    """
+    実行計画からテーブル全体を走査するノードを再帰的に取得
+
+    Seq Scanに加え、検索条件なしでインデックス全体をなめるIndex Scanも対象とする。
+    """
+    node_type = plan["Node Type"]
+    full_scans = []
+    if node_type == "Seq Scan":
+        full_scans.append(f"Seq Scan on {plan['Relation Name']}")
+    elif node_type in INDEX_SCAN_NODES and "Index Cond" not in plan:
+        full_scans.append(f"{node_type} on {plan['Index Name']} without condition")
+    for child in plan.get("Plans", []):
+        full_scans.extend(find_full_scans(child))
+    return full_scans
+
+
+class TestHotQueryPlans:
+    """主要クエリがインデックスを使用することのテストクラス"""
+
+    @pytest.fixture
+    async def seeded(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_user2: User
+    ) -> dict:
+        """実行計画確認用のデータを投入"""
+        food = Category(name="食費", is_default=True, is_love_category=False)
+        date_category = Category(name="デート代", is_default=True, is_love_category=True)
+        partnership = Partnership(user1_id=test_user.id, user2_id=test_user2.id, status='active')
+        db_session.add_all([food, date_category, partnership])
+        await db_session.commit()
+
+        params = {
+            "user_ids": [test_user.id, test_user2.id],
+            "food_id": food.id,
+            "date_id": date_category.id,
+            "partnership_id": partnership.id,
+            "n": SEED_TRANSACTIONS
+        }
+        await db_session.execute(text("""
+            INSERT INTO transactions (
+                id, user_id, category_id, amount, transaction_type, sharing_type,
+                transaction_date, love_rating, created_at
+            )
+            SELECT
+                gen_random_uuid(),
+                (CAST(:user_ids AS uuid[]))[1 + i % 2],
+                CASE WHEN i % 3 = 0 THEN CAST(:date_id AS uuid) ELSE CAST(:food_id AS uuid) END,
+                100 + i % 5000,
+                CASE WHEN i % 10 = 0 THEN 'income' ELSE 'expense' END,
+                CASE WHEN i % 4 = 0 THEN 'shared' ELSE 'personal' END,
+                CURRENT_DATE - (i % 730),
+                CASE WHEN i % 3 = 0 THEN 1 + i % 5 END,
+                now()
+            FROM generate_series(1, CAST(:n AS int)) AS i
+        """), params)
+        await db_session.execute(text("""
+            INSERT INTO notifications (id, user_id, type, title, message, is_read, expires_at, created_at)
+            SELECT
+                gen_random_uuid(),
+                (CAST(:user_ids AS uuid[]))[1 + i % 2],
+                'budget_warning',
+                'title',
+                'message',
+                i % 5 <> 0,
+                CASE WHEN i % 7 = 0 THEN now() - interval '1 day' END,
+                now() - i * interval '1 hour'
+            FROM generate_series(1, CAST(:n AS int)) AS i
+        """), params)
+        await db_session.execute(text("""
+            INSERT INTO budgets (id, user_id, category_id, name, amount, period, start_date, is_active)
+            SELECT gen_random_uuid(), (CAST(:user_ids AS uuid[]))[1 + i % 2], CAST(:food_id AS uuid), 'budget', 10000, 'monthly', CURRENT_DATE, i % 3 <> 0
+            FROM generate_series(1, CAST(:n AS int)) AS i
+        """), params)
+        await db_session.execute(text("""
+            INSERT INTO love_events (id, partnership_id, event_type, name, event_date, is_active)
+            SELECT gen_random_uuid(), CAST(:partnership_id AS uuid), 'custom', 'event', CURRENT_DATE + i, i % 2 = 0
+            FROM generate_series(1, CAST(:n AS int)) AS i
+        """), params)
+        await db_session.execute(text("""
+            INSERT INTO user_monthly_rollups (
+                user_id, year, month, category_id, transaction_type, sharing_type,
+                total_amount, transaction_count, love_rating_sum, love_rating_count
+            )
+            SELECT
+                user_id,
+                EXTRACT(YEAR FROM transaction_date)::int,
+                EXTRACT(MONTH FROM transaction_date)::int,
+                category_id, transaction_type, sharing_type,
+                SUM(amount), COUNT(*), COALESCE(SUM(love_rating), 0), COUNT(love_rating)
+            FROM transactions
+            GROUP BY 1, 2, 3, 4, 5, 6
+        """))
+        await db_session.commit()
+
+        for table in ("transactions", "notifications", "budgets", "love_events", "user_monthly_rollups", "categories"):
+            await db_session.execute(text(f"ANALYZE {table}"))
+
+        return {"user": test_user, "food": food, "partnership": partnership}
+
+    def hot_queries(self, seeded: dict) -> dict:
+        """ダッシュボード・レポート・予算・Love・通知の代表的なクエリ"""
+        user_id = seeded["user"].id
+        today = date.today()
+        month_start = today.replace(day=1)
+        prev_month_start = (month_start - timedelta(days=1)).replace(day=1)
+        year_start = date(today.year, 1, 1)
+        now = datetime.utcnow()
+        not_expired = or_(Notification.expires_at.is_(None), Notification.expires_at > now)
+
+        return {
+            "dashboard_summary": select(
+                Category.id,
+                func.sum(Transaction.amount).filter(Transaction.transaction_type == 'expense')
+            ).join(
+                Transaction, Transaction.category_id == Category.id
+            ).where(
+                Transaction.user_id == user_id,
+                Transaction.transaction_date >= prev_month_start
+            ).group_by(Category.id),
+            "recent_transactions": select(Transaction).where(
+                Transaction.user_id == user_id
+            ).order_by(
+                Transaction.transaction_date.desc(),
+                Transaction.created_at.desc()
+            ).limit(10),
+            "transaction_list_keyset": select(Transaction).where(
+                Transaction.user_id == user_id,
+                after_cursor((today, now, uuid.UUID(int=0)))
+            ).order_by(*KEYSET_ORDER).limit(21),
+            "transaction_search": select(Transaction).where(
+                Transaction.user_id == user_id,
+                Transaction.search_vector.bool_op("@@")(cast(literal(SearchQuery("ランチ").tsquery()), TSQUERY))
+            ).order_by(*KEYSET_ORDER).limit(20),
+            "love_expense": select(func.sum(Transaction.amount)).where(
+                Transaction.user_id == user_id,
+                Transaction.transaction_type == 'expense',
+                Transaction.love_rating.isnot(None),
+                Transaction.transaction_date >= month_start,
+                Transaction.transaction_date < today + timedelta(days=1)
+            ),
+            "budget_spent": select(func.sum(Transaction.amount)).where(
+                Transaction.user_id == user_id,
+                Transaction.category_id == seeded["food"].id,
+                Transaction.transaction_type == 'expense',
+                Transaction.transaction_date >= year_start,
+                Transaction.transaction_date <= today
+            ),
+            "active_budgets": select(Budget).where(
+                Budget.user_id == user_id,
+                Budget.is_active == True
+            ),
+            "yearly_report_rollups": select(
+                UserMonthlyRollup.month,
+                func.sum(UserMonthlyRollup.total_amount)
+            ).where(
+                UserMonthlyRollup.user_id == user_id,
+                *month_range_filter(year_start, date(today.year + 1, 1, 1))
+            ).group_by(UserMonthlyRollup.month),
+            "love_events": select(LoveEvent).where(
+                LoveEvent.partnership_id == seeded["partnership"].id,
+                LoveEvent.is_active == True
+            ).order_by(LoveEvent.event_date),
+            "notification_list": select(Notification).where(
+                Notification.user_id == user_id,
+                not_expired
+            ).order_by(Notification.created_at.desc()).limit(20),
+            "unread_notification_count": select(func.count(Notification.id)).where(
+                Notification.user_id == user_id,
+                Notification.is_read == False,
+                not_expired
+            ),
+            "unread_notification_type_count": select(func.count(Notification.id)).where(
+                Notification.user_id == user_id,
+                Notification.type == 'budget_warning',
+                Notification.is_read == False,
+                not_expired
+            ),
+        }
+
+    @pytest.mark.asyncio
+    async def test_hot_queries_avoid_sequential_scans(
+        self,
+        db_session: AsyncSession,
+        seeded: dict
+    ):
+        """主要クエリの実行計画にSeq Scanが含まれないことを確認"""
+        # 小さいテーブルでは順次スキャンの方が安くなるため、使えるインデックスがあるかを判定する
+        await db_session.execute(text("SET LOCAL enable_seqscan = off"))
+
+        full_scans = {}
+        for name, query in self.hot_queries(seeded).items():
+            compiled = query.compile(
+                dialect=postgresql.dialect(),
+                compile_kwargs={"literal_binds": True}
+            )
+            result = await db_session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+            scans = find_full_scans(result.scalar()[0]["Plan"])
+            if scans:
+                full_scans[name] = scans
+
+        assert full_scans == {}
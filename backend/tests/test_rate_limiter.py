@@ -0,0 +1,164 @@
+import time
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from limits import parse
+from limits.strategies import SlidingWindowCounterRateLimiter
+from starlette.requests import Request
+
+from app.core.security import create_access_token, create_refresh_token
+from app.models.user import User
+from app.utils.rate_limiter import LeasedMemoryStorage, LeasedRedisStorage, get_user_key, limiter
+
+
+def make_request(authorization: str = None) -> Request:
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    return Request({"type": "http", "headers": headers, "client": ("203.0.113.7", 5000)})
+
+
+class TestRateLimiter:
+    """レート制限のテストクラス"""
+
+    def test_user_key_from_jwt(self):
+        """アクセストークンのユーザーID、それ以外はIPアドレスがキーになることを確認"""
+        user_id = uuid.uuid4()
+
+        assert get_user_key(make_request(f"Bearer {create_access_token(user_id)}")) == f"user:{user_id}"
+        assert get_user_key(make_request(f"Bearer {create_refresh_token(user_id)}")) == "ip:203.0.113.7"
+        assert get_user_key(make_request("Bearer invalid-token")) == "ip:203.0.113.7"
+        assert get_user_key(make_request()) == "ip:203.0.113.7"
+
+    def test_leased_tokens_skip_storage(self):
+        """余裕がある間は前借りしたトークンで許可し、合計は上限を超えないことを確認"""
+        storage = LeasedMemoryStorage(lease_fraction=0.3, lease_seconds=60)
+        rate_limiter = SlidingWindowCounterRateLimiter(storage)
+        item = parse("10/minute")
+        key = item.key_for("user:1")
+
+        assert rate_limiter.hit(item, "user:1")
+        # 1回目で3件を前借りし、残りの2件はカウンターを更新しない
+        assert storage.get_sliding_window(key, 60)[2] == 3
+        assert rate_limiter.hit(item, "user:1")
+        assert rate_limiter.hit(item, "user:1")
+        assert storage.get_sliding_window(key, 60)[2] == 3
+
+        results = [rate_limiter.hit(item, "user:1") for _ in range(10)]
+        assert results == [True] * 7 + [False] * 3
+        assert storage.get_sliding_window(key, 60)[2] == 10
+
+        storage.reset()
+        assert rate_limiter.hit(item, "user:1")
+
+    def test_expired_lease_is_returned(self):
+        """期限切れで使わなかったトークンはカウンターに返却され、上限まで許可されることを確認"""
+        storage = LeasedMemoryStorage(lease_fraction=0.5, lease_seconds=0)
+        rate_limiter = SlidingWindowCounterRateLimiter(storage)
+        item = parse("4/minute")
+        key = item.key_for("user:1")
+
+        # 2件ずつ前借りするが、前借りした2件目は期限切れのため次のリクエストで返却される
+        assert [rate_limiter.hit(item, "user:1") for _ in range(5)] == [True] * 4 + [False]
+        assert storage.get_sliding_window(key, 60)[2] == 4
+
+    def test_client_under_limit_is_never_limited(self, monkeypatch):
+        """上限の半分程度のクライアントは、前借りの期限切れを何度経ても制限されないことを確認"""
+        clock = [1_700_000_000.0]
+        monkeypatch.setattr(time, "time", lambda: clock[0])
+        monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+        storage = LeasedMemoryStorage(lease_fraction=0.1, lease_seconds=2)
+        rate_limiter = SlidingWindowCounterRateLimiter(storage)
+        item = parse("60/minute")
+
+        # 2.1秒ごと（約28件/分）に10分間。前借りした6件の大半は使われずに期限切れになる
+        results = []
+        for _ in range(286):
+            results.append(rate_limiter.hit(item, "user:1"))
+            clock[0] += 2.1
+        assert all(results)
+
+    def test_redis_lease_script(self, redis_url: str):
+        """Redisのカウンターで前借り・上限付近での1件ずつの加算をワーカー間で共有することを確認"""
+        worker1 = LeasedRedisStorage("leased+" + redis_url, lease_fraction=0.3, lease_seconds=60)
+        worker2 = LeasedRedisStorage("leased+" + redis_url, lease_fraction=0.3, lease_seconds=60)
+        limiter1 = SlidingWindowCounterRateLimiter(worker1)
+        limiter2 = SlidingWindowCounterRateLimiter(worker2)
+        item = parse("10/minute")
+        identifier = f"user:{uuid.uuid4()}"
+        key = item.key_for(identifier)
+
+        # 1回目で3件を前借りする（残りの2件はワーカー1のプロセス内に残る）
+        assert limiter1.hit(item, identifier)
+        assert worker1.get_sliding_window(key, 60)[2] == 3
+
+        # 別のワーカーも同じカウンターから前借りし、前借りしたトークンの間はRedisを更新しない（3 + 3 + 3 = 9件）
+        assert [limiter2.hit(item, identifier) for _ in range(3)] == [True] * 3
+        assert worker2.get_sliding_window(key, 60)[2] == 6
+        assert [limiter2.hit(item, identifier) for _ in range(3)] == [True] * 3
+        assert worker2.get_sliding_window(key, 60)[2] == 9
+
+        # 残りが前借りの件数に満たない場合は1件だけ加算し、上限に達したら拒否する
+        assert limiter2.hit(item, identifier)
+        assert worker2.get_sliding_window(key, 60)[2] == 10
+        assert not limiter2.hit(item, identifier)
+        assert worker2.get_sliding_window(key, 60)[2] == 10
+
+        # 前借り済みのトークンは上限の内数のため、使い切るまでは許可される
+        assert [limiter1.hit(item, identifier) for _ in range(3)] == [True, True, False]
+        assert worker1.get_sliding_window(key, 60)[2] == 10
+
+    def test_redis_expired_lease_is_returned(self, redis_url: str):
+        """Redisのカウンターでも、期限切れで使わなかったトークンが返却されることを確認"""
+        storage = LeasedRedisStorage("leased+" + redis_url, lease_fraction=0.5, lease_seconds=0)
+        rate_limiter = SlidingWindowCounterRateLimiter(storage)
+        item = parse("4/minute")
+        identifier = f"user:{uuid.uuid4()}"
+
+        assert [rate_limiter.hit(item, identifier) for _ in range(5)] == [True] * 4 + [False]
+        assert storage.get_sliding_window(item.key_for(identifier), 60)[2] == 4
+
+    def test_redis_lease_window_rollover(self, redis_url: str):
+        """ウィンドウが終わると現在のカウンターを前のウィンドウに移し、新しいウィンドウで前借りすることを確認"""
+        storage = LeasedRedisStorage("leased+" + redis_url, lease_fraction=0.5, lease_seconds=60)
+        rate_limiter = SlidingWindowCounterRateLimiter(storage)
+        item = parse("4/second")
+        identifier = f"user:{uuid.uuid4()}"
+        key = item.key_for(identifier)
+
+        # 2件ずつ前借りして上限に達する（前借りの有効期間はウィンドウの長さまで）
+        assert [rate_limiter.hit(item, identifier) for _ in range(5)] == [True] * 4 + [False]
+        assert storage.get_sliding_window(key, 1)[2] == 4
+
+        # 次のウィンドウの途中では、前のウィンドウの4件は残り時間の割合（2件以下）で数える
+        time.sleep(1.5)
+        assert rate_limiter.hit(item, identifier)
+        previous_count, _, current_count, _ = storage.get_sliding_window(key, 1)
+        assert previous_count == 4
+        assert current_count == 2
+
+    @pytest.mark.asyncio
+    async def test_limits_are_per_user(self, async_client: AsyncClient, test_user: User, test_user2: User):
+        """同じIPアドレスからのリクエストでも、ユーザーごとに制限されることを確認"""
+        limiter.reset()
+        try:
+            for _ in range(10):
+                response = await async_client.delete(
+                    f"/api/v1/transactions/{uuid.uuid4()}",
+                    headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+                )
+                assert response.status_code == 404
+            limited = await async_client.delete(
+                f"/api/v1/transactions/{uuid.uuid4()}",
+                headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+            )
+            assert limited.status_code == 429
+            assert limited.json()["error_code"] == "RATE_LIMIT_EXCEEDED"
+            assert limited.headers["retry-after"] == "60"
+
+            other = await async_client.delete(
+                f"/api/v1/transactions/{uuid.uuid4()}",
+                headers={"Authorization": f"Bearer {create_access_token(test_user2.id)}"}
+            )
+            assert other.status_code == 404
+        finally:
+            limiter.reset()
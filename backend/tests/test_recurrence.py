@@ -0,0 +1,96 @@
+import calendar
+import random
+from datetime import date, timedelta
+
+from app.api.recurring_transactions import calculate_next_execution_date
+from app.services.recurrence import RecurrenceRule, expand_occurrences, month_length
+
+
+def expand_with_scalar(rule: RecurrenceRule, until: date, start=None, limit=None):
+    """calculate_next_execution_date を1回ずつ呼び出して展開（比較用の基準実装）"""
+    executed = []
+    current = rule.next_execution_date
+    execution_count = rule.execution_count
+    advances = True
+    last_date = min(until, rule.end_date) if rule.end_date else until
+
+    while current <= last_date:
+        if rule.max_executions and execution_count >= rule.max_executions:
+            break
+        if limit is not None and len(executed) >= limit:
+            break
+        executed.append(current)
+        execution_count += 1
+        next_date = calculate_next_execution_date(
+            rule.frequency, rule.interval_value, current, rule.day_of_month, rule.day_of_week
+        )
+        if next_date <= current:
+            advances = False
+            break
+        current = next_date
+
+    exhausted = (
+        not advances
+        or bool(rule.max_executions and execution_count >= rule.max_executions)
+        or bool(rule.end_date and current > rule.end_date)
+    )
+    occurrences = [d for d in executed if start is None or d >= start]
+    return occurrences, current, execution_count, exhausted
+
+
+def random_rule(rng: random.Random) -> RecurrenceRule:
+    frequency = rng.choice(['daily', 'weekly', 'monthly', 'yearly', 'monthly', 'hourly'])
+    # 月末・うるう日を多めに含める
+    if rng.random() < 0.3:
+        first = rng.choice([date(2024, 2, 29), date(2025, 1, 31), date(2024, 1, 30), date(2023, 12, 31)])
+    else:
+        first = date(2020, 1, 1) + timedelta(days=rng.randrange(3650))
+    return RecurrenceRule(
+        frequency=frequency,
+        next_execution_date=first,
+        interval_value=rng.choice([1, 1, 2, 3]),
+        day_of_month=rng.choice([None, 1, 15, 28, 29, 30, 31]),
+        day_of_week=rng.choice([None, 0, 3, 6]),
+        end_date=first + timedelta(days=rng.randrange(1500)) if rng.random() < 0.3 else None,
+        max_executions=rng.randrange(1, 40) if rng.random() < 0.3 else None,
+        execution_count=rng.randrange(4)
+    )
+
+
+class TestRecurrenceExpansion:
+    """実行日の一括展開のテストクラス"""
+
+    def test_month_length_table(self):
+        """月の日数テーブルが calendar と一致することを確認"""
+        for year in (1900, 2000, 2023, 2024, 2100, 2400, 9999):
+            for month in range(1, 13):
+                assert month_length(year * 12 + month - 1) == calendar.monthrange(year, month)[1]
+
+    def test_matches_scalar_calculation(self):
+        """ランダムなルールで、1回ずつ計算した結果と一致することを確認"""
+        rng = random.Random(20250101)
+        for _ in range(3000):
+            rule = random_rule(rng)
+            until = rule.next_execution_date + timedelta(days=rng.randrange(-30, 1200))
+            start = until - timedelta(days=rng.randrange(400)) if rng.random() < 0.3 else None
+            limit = rng.randrange(1, 20) if rng.random() < 0.2 else None
+
+            expansion = expand_occurrences([rule], until, start=start, limit=limit)[0]
+
+            assert (
+                expansion.occurrences,
+                expansion.next_execution_date,
+                expansion.execution_count,
+                expansion.exhausted
+            ) == expand_with_scalar(rule, until, start, limit), rule
+
+    def test_month_end_rules(self):
+        """月末指定・日指定なしの月次ルールの展開を確認"""
+        month_end, drifting = expand_occurrences([
+            RecurrenceRule('monthly', date(2024, 1, 31), day_of_month=31),
+            RecurrenceRule('monthly', date(2024, 1, 31)),
+        ], until=date(2024, 4, 30))
+
+        assert month_end.occurrences == [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)]
+        assert drifting.occurrences == [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 29), date(2024, 4, 29)]
+        assert drifting.next_execution_date == date(2024, 5, 29)
@@ -0,0 +1,156 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.category import Category
+from app.models.recurring_transaction import RecurringTransaction
+from app.models.transaction import Transaction
+from app.models.user_monthly_rollup import UserMonthlyRollup
+from app.services.recurring_scheduler import run_due_recurring_transactions
+from app.services.transaction_events import transaction_events
+
+
+class TestRecurringScheduler:
+    """定期取引スケジューラのテストクラス"""
+
+    @pytest.fixture
+    async def category(self, db_session: AsyncSession) -> Category:
+        category = Category(name="固定費", is_default=True, is_love_category=False)
+        db_session.add(category)
+        await db_session.commit()
+        return category
+
+    @pytest.fixture(autouse=True)
+    def discard_events(self):
+        """スケジューラが登録した取引変更イベントを破棄"""
+        yield
+        transaction_events.drain(lambda user_id: None)
+
+    async def create_rule(self, db_session: AsyncSession, user: User, category: Category, **kwargs) -> RecurringTransaction:
+        values = {
+            "amount": Decimal("1000"),
+            "transaction_type": "expense",
+            "sharing_type": "personal",
+            "description": "家賃",
+            "frequency": "monthly",
+            "interval_value": 1,
+            "execution_count": 0,
+            "is_active": True,
+            **kwargs
+        }
+        rule = RecurringTransaction(user_id=user.id, category_id=category.id, **values)
+        db_session.add(rule)
+        await db_session.commit()
+        return rule
+
+    async def fetch_transaction_dates(self, db_session: AsyncSession) -> list:
+        result = await db_session.execute(
+            select(Transaction.transaction_date).order_by(Transaction.transaction_date)
+        )
+        return list(result.scalars().all())
+
+    @pytest.mark.asyncio
+    async def test_catches_up_missed_periods(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        category: Category
+    ):
+        """止まっていた期間の回が本来の実行日で作成され、次回実行日が進むことを確認"""
+        rule = await self.create_rule(
+            db_session, test_user, category,
+            next_execution_date=date(2025, 1, 31), day_of_month=31
+        )
+
+        result = await db_session.run_sync(
+            lambda session: run_due_recurring_transactions(session, today=date(2025, 4, 15))
+        )
+
+        assert result.transactions_created == 3
+        assert await self.fetch_transaction_dates(db_session) == [
+            date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31)
+        ]
+
+        await db_session.refresh(rule)
+        assert rule.next_execution_date == date(2025, 4, 30)
+        assert rule.last_execution_date == date(2025, 3, 31)
+        assert rule.execution_count == 3
+        assert rule.is_active is True
+
+        # 月次集計にも反映される
+        rollup_total = await db_session.scalar(select(func.sum(UserMonthlyRollup.total_amount)))
+        assert rollup_total == Decimal("3000")
+
+        # 再実行しても重複しない
+        result = await db_session.run_sync(
+            lambda session: run_due_recurring_transactions(session, today=date(2025, 4, 15))
+        )
+        assert result.transactions_created == 0
+
+    @pytest.mark.asyncio
+    async def test_respects_end_date_and_max_executions(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        category: Category
+    ):
+        """終了日・最大実行回数で停止し、非アクティブになることを確認"""
+        limited = await self.create_rule(
+            db_session, test_user, category,
+            frequency="weekly", next_execution_date=date(2025, 1, 6), day_of_week=0, max_executions=2
+        )
+        ended = await self.create_rule(
+            db_session, test_user, category,
+            frequency="daily", next_execution_date=date(2025, 1, 1), end_date=date(2025, 1, 3)
+        )
+
+        result = await db_session.run_sync(
+            lambda session: run_due_recurring_transactions(session, today=date(2025, 2, 1), batch_size=1)
+        )
+
+        assert result.transactions_created == 5
+        assert result.deactivated == 2
+        assert result.batches == 2
+
+        await db_session.refresh(limited)
+        await db_session.refresh(ended)
+        assert (limited.execution_count, limited.is_active) == (2, False)
+        assert limited.last_execution_date == date(2025, 1, 13)
+        assert (ended.execution_count, ended.is_active) == (3, False)
+        assert ended.last_execution_date == date(2025, 1, 3)
+
+    @pytest.mark.asyncio
+    async def test_skips_rows_locked_by_another_worker(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        category: Category
+    ):
+        """他のワーカーがロック中の定期取引は飛ばされ、二重に実行されないことを確認"""
+        locked = await self.create_rule(db_session, test_user, category, next_execution_date=date(2025, 3, 1))
+        await self.create_rule(db_session, test_user, category, next_execution_date=date(2025, 3, 1))
+
+        other_worker = AsyncSession(bind=db_session.bind)
+        try:
+            await other_worker.execute(
+                select(RecurringTransaction).where(RecurringTransaction.id == locked.id).with_for_update()
+            )
+
+            result = await db_session.run_sync(
+                lambda session: run_due_recurring_transactions(session, today=date(2025, 3, 1))
+            )
+            assert result.processed == 1
+            assert result.transactions_created == 1
+        finally:
+            await other_worker.rollback()
+            await other_worker.close()
+
+        # ロック解放後の実行で残りが処理される
+        result = await db_session.run_sync(
+            lambda session: run_due_recurring_transactions(session, today=date(2025, 3, 1))
+        )
+        assert result.processed == 1
+        assert len(await self.fetch_transaction_dates(db_session)) == 2
@@ -0,0 +1,165 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.reports.reports import get_category_report, get_love_statistics
+from app.core.security import create_access_token
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.monthly_rollup import rebuild_user_rollups
+
+
+@pytest.fixture
+async def seeded(db_session: AsyncSession, test_user: User) -> dict:
+    """前後の年を含む取引"""
+    food = Category(name="食費", icon="🍽️", is_default=True, is_love_category=False)
+    dating = Category(name="デート代", icon="💕", is_default=True, is_love_category=True)
+    salary = Category(name="給与", icon="💰", is_default=True, is_love_category=False)
+    db_session.add_all([food, dating, salary])
+    await db_session.commit()
+
+    transactions = []
+    day = date(2023, 12, 25)
+    for index in range(120):
+        category = (food, dating, salary)[index % 3]
+        transactions.append(Transaction(
+            user_id=test_user.id,
+            category_id=category.id,
+            amount=Decimal(1000 + index * 37),
+            transaction_type='income' if category is salary else 'expense',
+            sharing_type='shared' if index % 4 == 0 else 'personal',
+            transaction_date=day,
+            love_rating=1 + index % 5 if category is dating and index % 2 == 0 else None
+        ))
+        day += timedelta(days=3)
+    db_session.add_all(transactions)
+    await db_session.commit()
+    await db_session.run_sync(lambda session: rebuild_user_rollups(session, test_user.id))
+    await db_session.commit()
+    return {"transactions": transactions}
+
+
+class TestYearlyReport:
+    """年次レポートのテストクラス"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.query_budget({"GET /api/v1/reports/yearly/{year}": 4})
+    async def test_yearly_report(
+        self,
+        async_client: AsyncClient,
+        db_session: AsyncSession,
+        test_user: User,
+        seeded: dict
+    ):
+        """年の範囲の取引の集計と、取引から求めたLove統計が一致することを確認"""
+        # 取引から求めたLove統計（計測対象のリクエストより前に取得）
+        expected = await db_session.run_sync(
+            lambda session: get_love_statistics(session, test_user.id, date(2024, 1, 1), date(2024, 12, 31))
+        )
+        response = await async_client.get(
+            "/api/v1/reports/yearly/2024",
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+        )
+        assert response.status_code == 200
+        report = response.json()
+
+        in_year = [t for t in seeded["transactions"] if t.transaction_date.year == 2024]
+        expense = sum(t.amount for t in in_year if t.transaction_type == 'expense')
+        income = sum(t.amount for t in in_year if t.transaction_type == 'income')
+        assert Decimal(report["total_expense"]) == expense
+        assert Decimal(report["total_income"]) == income
+        assert sum(trend["transaction_count"] for trend in report["monthly_trends"]) == len(in_year)
+        march = report["monthly_trends"][2]
+        assert Decimal(march["expense"]) == sum(
+            t.amount for t in in_year if t.transaction_type == 'expense' and t.transaction_date.month == 3
+        )
+
+        love_statistics = report["yearly_love_statistics"]
+        assert Decimal(love_statistics.pop("total_love_spending")) == expected.total_love_spending
+        assert love_statistics == expected.model_dump(mode="json", exclude={"total_love_spending"})
+
+    @pytest.mark.asyncio
+    async def test_yearly_report_without_transactions(self, async_client: AsyncClient, test_user: User):
+        """取引がない年は0の統計を返すことを確認"""
+        response = await async_client.get(
+            "/api/v1/reports/yearly/2024",
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+        )
+        assert response.status_code == 200
+        report = response.json()
+        assert report["yearly_love_statistics"]["love_transaction_count"] == 0
+        assert report["highest_expense_month"] == ""
+
+
+class TestMonthlyReport:
+    """月次レポートのテストクラス"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.query_budget({"GET /api/v1/reports/monthly/{year}/{month}": 4})
+    async def test_monthly_report(
+        self,
+        async_client: AsyncClient,
+        db_session: AsyncSession,
+        test_user: User,
+        seeded: dict
+    ):
+        """集計・カテゴリ別・最大支出・Love統計が取引から求めた値と一致することを確認"""
+        # 取引から求めた値（計測対象のリクエストより前に取得）
+        period_start, period_end = date(2024, 3, 1), date(2024, 3, 31)
+        expected_love = await db_session.run_sync(
+            lambda session: get_love_statistics(session, test_user.id, period_start, period_end)
+        )
+        expected_categories = {}
+        for transaction_type in ('expense', 'income'):
+            reports = await db_session.run_sync(
+                lambda session: get_category_report(session, test_user.id, period_start, period_end, transaction_type)
+            )
+            expected_categories[transaction_type] = [report.model_dump(mode="json") for report in reports]
+
+        response = await async_client.get(
+            "/api/v1/reports/monthly/2024/3",
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+        )
+        assert response.status_code == 200
+        report = response.json()
+
+        def month_transactions(month: int, transaction_type: str):
+            return [
+                t for t in seeded["transactions"]
+                if t.transaction_date.year == 2024 and t.transaction_date.month == month
+                and t.transaction_type == transaction_type
+            ]
+
+        expenses = month_transactions(3, 'expense')
+        assert Decimal(report["total_expense"]) == sum(t.amount for t in expenses)
+        assert Decimal(report["total_income"]) == sum(t.amount for t in month_transactions(3, 'income'))
+        assert Decimal(report["previous_month_expense"]) == sum(t.amount for t in month_transactions(2, 'expense'))
+        assert Decimal(report["shared_expense"]) == sum(t.amount for t in expenses if t.sharing_type == 'shared')
+        assert report["transaction_count"] == len(expenses) + len(month_transactions(3, 'income'))
+        assert report["expense_by_category"] == expected_categories['expense']
+        assert report["income_by_category"] == expected_categories['income']
+
+        largest = max(expenses, key=lambda t: t.amount)
+        assert report["largest_expense"]["id"] == str(largest.id)
+        assert report["largest_expense"]["amount"] == float(largest.amount)
+
+        love_statistics = report["love_statistics"]
+        assert Decimal(love_statistics.pop("total_love_spending")) == expected_love.total_love_spending
+        assert love_statistics == expected_love.model_dump(mode="json", exclude={"total_love_spending"})
+
+    @pytest.mark.asyncio
+    async def test_monthly_report_without_transactions(self, async_client: AsyncClient, test_user: User):
+        """取引がない月はLove統計・最大支出がないことを確認"""
+        response = await async_client.get(
+            "/api/v1/reports/monthly/2024/3",
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+        )
+        assert response.status_code == 200
+        report = response.json()
+        assert report["love_statistics"] is None
+        assert report["largest_expense"] is None
+        assert report["expense_by_category"] == []
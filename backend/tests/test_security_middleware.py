@@ -0,0 +1,123 @@
+import json
+import logging
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+from starlette.datastructures import Headers
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.middleware.security import SecurityMiddleware
+from app.middleware.suspicious_patterns import DEFAULT_RULES, PatternMatcher
+from app.models.user import User
+
+
+def build_app(debug: bool = False) -> Starlette:
+    async def stream(request):
+        async def chunks():
+            for index in range(3):
+                yield f"chunk-{index}\n"
+        return StreamingResponse(chunks(), media_type="text/plain", headers={"Cache-Control": "max-age=60"})
+
+    async def fail(request):
+        raise RuntimeError("boom")
+
+    async def ok(request):
+        return JSONResponse({"status": "ok"})
+
+    app = Starlette(routes=[
+        Route("/api/v1/reports/stream", stream),
+        Route("/api/v1/fail", fail),
+        Route("/api/v1/ok", ok),
+    ])
+    return SecurityMiddleware(app, debug=debug)
+
+
+class TestSecurityMiddleware:
+    """SecurityMiddleware のテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_security_headers(self, async_client: AsyncClient, test_user: User):
+        """セキュリティヘッダーと機密エンドポイントのキャッシュ制御が追加されることを確認"""
+        response = await async_client.get(
+            "/api/v1/transactions/",
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+        )
+        assert response.status_code == 200
+        assert response.headers["x-frame-options"] == "DENY"
+        assert response.headers["x-content-type-options"] == "nosniff"
+        assert "default-src 'self'" in response.headers["content-security-policy"]
+        assert response.headers["cache-control"].startswith("no-store")
+        assert "strict-transport-security" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_and_header_override(self):
+        """ストリーミングレスポンスがそのまま返り、既存のヘッダーは重複せず上書きされることを確認"""
+        transport = ASGITransport(app=build_app())
+        async with AsyncClient(transport=transport, base_url="https://test") as client:
+            response = await client.get("/api/v1/reports/stream")
+
+        assert response.text == "chunk-0\nchunk-1\nchunk-2\n"
+        assert response.headers.get_list("cache-control") == [
+            "no-store, no-cache, must-revalidate, proxy-revalidate"
+        ]
+        assert response.headers["strict-transport-security"].startswith("max-age=")
+
+    @pytest.mark.asyncio
+    async def test_logs_suspicious_requests_and_errors(self, caplog):
+        """疑わしいパターンとエラーレスポンスがログに記録されることを確認"""
+        transport = ASGITransport(app=build_app(debug=True), raise_app_exceptions=False)
+        with caplog.at_level(logging.WARNING, logger="app.middleware.security"):
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                ok = await client.get("/api/v1/ok?file=..%2Fetc%2Fpasswd")
+                failed = await client.get("/api/v1/fail")
+
+        assert ok.status_code == 200
+        assert ok.headers["x-debug-mode"] == "true"
+        assert failed.status_code == 500
+        messages = [record.getMessage() for record in caplog.records]
+        assert any("Type: Path Traversal" in message for message in messages)
+        assert not any("Error response" in message and "/api/v1/ok" in message for message in messages)
+
+
+class TestPatternMatcher:
+    """疑わしいリクエストパターンの検出のテストクラス"""
+
+    def test_detects_each_attack_type(self):
+        """重なったパターン・エンコードされたパターンも攻撃の種類ごとに検出されることを確認"""
+        matcher = PatternMatcher(DEFAULT_RULES)
+
+        assert matcher.inspect("/api/v1/ok", "q=</script>") == {"XSS": "</script>", "SQL Injection": "script>"}
+        assert matcher.inspect("/api/v1/ok", "q=1%27+UNION+SELECT+password") == {"SQL Injection": "' union"}
+        assert matcher.inspect("/api/v1/ok", "q=%3Cimg%20onerror%3Dx%3E") == {"XSS": "onerror="}
+        assert matcher.inspect("/api/v1/files/%252e%252e/etc", "") == {"Path Traversal": "%2e%2e"}
+        assert matcher.inspect("/api/v1/transactions", "category=%E3%83%87%E3%83%BC%E3%83%88&page=2") == {}
+
+    def test_rules_from_settings(self, tmp_path, monkeypatch):
+        """設定・ルールファイルのルールが追加され、攻撃の種類ごとに数えられることを確認"""
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(json.dumps({"Scanner": ["wp-admin"]}), encoding="utf-8")
+        monkeypatch.setattr(settings, "SUSPICIOUS_PATTERN_DEFAULT_RULES", False)
+        monkeypatch.setattr(settings, "SUSPICIOUS_PATTERN_RULES", {"SSRF": ["169.254.169.254"]})
+        monkeypatch.setattr(settings, "SUSPICIOUS_PATTERN_RULES_FILE", str(rules_file))
+        middleware = build_app()
+        before = REGISTRY.get_sample_value("suspicious_requests_total", {"attack_type": "Scanner"}) or 0.0
+
+        assert middleware._pattern_matcher.inspect("/wp-admin/setup.php", "") == {"Scanner": "wp-admin"}
+        assert middleware._pattern_matcher.inspect("/api/v1/ok", "url=http://169.254.169.254/") == {
+            "SSRF": "169.254.169.254"
+        }
+        assert middleware._pattern_matcher.inspect("/api/v1/ok", "q=<script>") == {}
+
+        scope = {"path": "/wp-admin/setup.php", "query_string": b""}
+        middleware._detect_suspicious_patterns(scope, Headers(scope={"headers": []}), "127.0.0.1")
+        assert REGISTRY.get_sample_value("suspicious_requests_total", {"attack_type": "Scanner"}) == before + 1
+
+    def test_invalid_pattern(self):
+        """空のパターンはエラーになることを確認"""
+        with pytest.raises(ValueError):
+            PatternMatcher({"Empty": [""]})
@@ -0,0 +1,97 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.recurring_transactions import get_recurring_transactions
+from app.core.security import create_access_token
+from app.core.sql_profiler import normalize_statement, profile_queries
+from app.models.category import Category
+from app.models.recurring_transaction import RecurringTransaction
+from app.models.user import User
+
+
+class TestSQLProfiler:
+    """SQLプロファイラのテストクラス"""
+
+    def test_normalize_statement(self):
+        """パラメータ・リテラル・IN句の値の数によらず同じ形になることを確認"""
+        psycopg = normalize_statement(
+            "SELECT categories.id FROM categories\n WHERE categories.id = %(pk_1)s "
+            "AND categories.name = 'food' LIMIT 1"
+        )
+        asyncpg = normalize_statement(
+            "SELECT categories.id FROM categories WHERE categories.id = $1::UUID "
+            "AND categories.name = 'rent' LIMIT 20"
+        )
+        assert psycopg == asyncpg
+        assert psycopg == "SELECT categories.id FROM categories WHERE categories.id = ? AND categories.name = ? LIMIT ?"
+
+        assert normalize_statement("SELECT 1 FROM t WHERE id IN ($1, $2, $3)") == \
+            normalize_statement("SELECT 1 FROM t WHERE id IN ($1)")
+
+    @pytest.fixture
+    async def recurring_rules(self, db_session: AsyncSession, test_user: User) -> None:
+        """カテゴリの異なる定期取引を5件作成"""
+        categories = [
+            Category(name=f"カテゴリ{i}", is_default=True, is_love_category=False) for i in range(5)
+        ]
+        db_session.add_all(categories)
+        await db_session.flush()
+        db_session.add_all([
+            RecurringTransaction(
+                user_id=test_user.id, category_id=category.id, amount=Decimal("1000"),
+                transaction_type="expense", sharing_type="personal", frequency="monthly",
+                interval_value=1, next_execution_date=date(2025, 6, 1), is_active=True
+            )
+            for category in categories
+        ])
+        await db_session.commit()
+        db_session.expunge_all()
+
+    @pytest.mark.asyncio
+    async def test_detects_n_plus_one(self, db_session: AsyncSession, recurring_rules):
+        """同じ形のクエリの繰り返しがN+1として検出されることを確認"""
+        def load_categories_one_by_one(session):
+            rules = session.query(RecurringTransaction).all()
+            return [session.get(Category, rule.category_id) for rule in rules]
+
+        with profile_queries() as profile:
+            await db_session.run_sync(load_categories_one_by_one)
+
+        assert profile.total_queries == 6
+        [suspect] = profile.n_plus_one()
+        assert suspect.count == 5
+        assert "FROM categories" in suspect.shape
+
+    @pytest.mark.asyncio
+    async def test_recurring_list_loads_categories_together(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        recurring_rules
+    ):
+        """定期取引一覧でカテゴリを定期取引ごとに取得しないことを確認"""
+        user = await db_session.get(User, test_user.id)
+        with profile_queries() as profile:
+            result = await db_session.run_sync(
+                lambda session: get_recurring_transactions(db=session, current_user=user)
+            )
+
+        assert result["total"] == 5
+        assert {item["category_name"] for item in result["recurring_transactions"]} == {f"カテゴリ{i}" for i in range(5)}
+        assert profile.n_plus_one() == []
+        assert profile.total_queries == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.query_budget({"GET /api/v1/dashboard/summary": 4})
+    async def test_dashboard_summary_budget(self, async_client: AsyncClient, test_user: User):
+        """ダッシュボードのサマリーがクエリバジェット内で、Server-Timing に集計が出力されることを確認"""
+        response = await async_client.get(
+            "/api/v1/dashboard/summary",
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["Server-Timing"].startswith("db;dur=")
@@ -0,0 +1,194 @@
+import pytest
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.task_queue import CoalescingTaskQueue
+from app.models.user import User
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.notification import Notification
+from app.models.transaction import Transaction
+from app.services.monthly_rollup import add_transaction_to_rollups
+from app.services.transaction_events import (
+    notify_transactions_changed,
+    process_transaction_changes,
+    transaction_events
+)
+
+
+class TestCoalescingTaskQueue:
+    """タスクキューのテストクラス"""
+
+    def test_sync_backend_coalesces_until_drain(self):
+        """同期モードではdrain()まで実行されず、同じキーは1回にまとめられることを確認"""
+        calls = []
+        queue = CoalescingTaskQueue("test", calls.append, backend="sync")
+
+        for _ in range(5):
+            queue.enqueue("user-a")
+        queue.enqueue("user-b")
+
+        assert calls == []
+        assert queue.pending_count() == 2
+        assert queue.drain() == 2
+        assert sorted(calls) == ["user-a", "user-b"]
+        assert queue.drain() == 0
+
+    def test_thread_backend_coalesces_bursts(self):
+        """スレッドモードで連続したイベントがまとめて実行されることを確認"""
+        calls = []
+        done = threading.Event()
+
+        def handler(key):
+            calls.append(key)
+            if len(calls) == 2:
+                done.set()
+
+        queue = CoalescingTaskQueue("test", handler, backend="thread", coalesce_seconds=0.05)
+        try:
+            for _ in range(20):
+                queue.enqueue("user-a")
+                queue.enqueue("user-b")
+
+            assert done.wait(timeout=5)
+            time.sleep(0.1)
+            assert sorted(calls) == ["user-a", "user-b"]
+        finally:
+            queue.shutdown()
+
+    def test_same_key_never_runs_concurrently(self):
+        """実行中のキーに届いたイベントは、実行完了後にもう一度実行されることを確認"""
+        started = threading.Event()
+        release = threading.Event()
+        finished = threading.Event()
+        active = []
+        max_active = []
+        calls = []
+
+        def handler(key):
+            active.append(key)
+            max_active.append(len(active))
+            calls.append(key)
+            if len(calls) == 1:
+                started.set()
+                release.wait(timeout=5)
+            active.remove(key)
+            if len(calls) == 2:
+                finished.set()
+
+        queue = CoalescingTaskQueue("test", handler, backend="thread", workers=4, coalesce_seconds=0.01)
+        try:
+            queue.enqueue("user-a")
+            assert started.wait(timeout=5)
+
+            # 実行中に届いたイベント
+            queue.enqueue("user-a")
+            time.sleep(0.1)
+            assert calls == ["user-a"]
+
+            release.set()
+            assert finished.wait(timeout=5)
+            assert max(max_active) == 1
+        finally:
+            queue.shutdown()
+
+    def test_handler_errors_are_contained(self):
+        """ハンドラの例外が他のキーの実行を妨げないことを確認"""
+        calls = []
+
+        def handler(key):
+            if key == "broken":
+                raise RuntimeError("boom")
+            calls.append(key)
+
+        queue = CoalescingTaskQueue("test", handler, backend="sync")
+        queue.enqueue("broken")
+        queue.enqueue("user-a")
+
+        assert queue.drain() == 2
+        assert calls == ["user-a"]
+
+
+class TestTransactionEvents:
+    """取引変更イベント処理のテストクラス"""
+
+    @pytest.fixture
+    async def setup_data(self, db_session: AsyncSession, test_user: User) -> dict:
+        """予算・Love Goalと、それを超える支出を作成"""
+        today = date.today()
+        food = Category(name="食費", is_default=True, is_love_category=False)
+        date_category = Category(name="デート代", is_default=True, is_love_category=True)
+        db_session.add_all([food, date_category])
+        await db_session.commit()
+
+        db_session.add_all([
+            Budget(
+                user_id=test_user.id, category_id=food.id, name="食費予算", amount=Decimal("10000"),
+                period="monthly", start_date=today, alert_threshold=Decimal("80"), is_active=True
+            ),
+            Budget(
+                user_id=test_user.id, category_id=date_category.id, name="デート予算", amount=Decimal("4000"),
+                period="monthly", start_date=today, alert_threshold=Decimal("80"), is_active=True
+            ),
+            Budget(
+                user_id=test_user.id, name="旅行", amount=Decimal("5000"), period="custom",
+                start_date=today.replace(day=1), alert_threshold=Decimal("80"),
+                is_love_budget=True, is_active=True
+            ),
+        ])
+
+        def write(session):
+            for category, amount in ((food, "8500"), (date_category, "6000")):
+                transaction = Transaction(
+                    user_id=test_user.id,
+                    category_id=category.id,
+                    amount=Decimal(amount),
+                    transaction_type="expense",
+                    sharing_type="personal",
+                    transaction_date=today
+                )
+                session.add(transaction)
+                add_transaction_to_rollups(session, transaction)
+            session.commit()
+
+        await db_session.run_sync(write)
+        return {"food": food, "date": date_category}
+
+    async def fetch_notification_types(self, db_session: AsyncSession) -> list:
+        result = await db_session.execute(select(Notification.type).order_by(Notification.type))
+        return list(result.scalars().all())
+
+    @pytest.mark.asyncio
+    async def test_drain_creates_notifications_once(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        setup_data: dict
+    ):
+        """イベントの処理でLove Goal達成・予算アラートの通知が一度だけ作成されることを確認"""
+        # 他のテストで残ったイベントを破棄
+        transaction_events.drain(lambda user_id: None)
+
+        for _ in range(3):
+            notify_transactions_changed(test_user.id)
+        assert transaction_events.pending_count() == 1
+
+        # 実行前は通知なし（書き込みリクエスト内では判定しない）
+        assert await self.fetch_notification_types(db_session) == []
+
+        def drain(session):
+            return transaction_events.drain(lambda user_id: process_transaction_changes(session, user_id))
+
+        assert await db_session.run_sync(drain) == 1
+        assert await self.fetch_notification_types(db_session) == [
+            "budget_exceeded", "budget_warning", "love_goal_achieved"
+        ]
+
+        # 再度処理しても重複しない
+        notify_transactions_changed(test_user.id)
+        assert await db_session.run_sync(drain) == 1
+        assert len(await self.fetch_notification_types(db_session)) == 3
@@ -0,0 +1,39 @@
+from app.utils.text_search import NgramIndex, SearchQuery, build_search_vector
+
+
+def build_index() -> NgramIndex:
+    index = NgramIndex()
+    index.add("lunch", "ランチ 外食", "渋谷", ["デート"])
+    index.add("cafe", "Ｃａｆｅ ラテ", "表参道", None)
+    index.add("dinner", "夕食", "外食チェーン", ["家族"])
+    index.add("scattered", "xab bcx", None, None)
+    index.add("abc", "abc", None, ["デート", "記念日"])
+    return index
+
+
+def keys(results) -> list:
+    return [key for key, _ in results]
+
+
+class TestNgramIndex:
+    """メモリ上のバイグラムのインデックスのテストクラス"""
+
+    def test_search(self):
+        """PostgreSQL の検索と同じ条件で一致することを確認"""
+        index = build_index()
+
+        assert keys(index.search(SearchQuery("外食"))) == ["lunch", "dinner"]
+        assert keys(index.search(SearchQuery("CAFE"))) == ["cafe"]
+        assert set(keys(index.search(SearchQuery("ラ")))) == {"lunch", "cafe"}
+        assert keys(index.search(SearchQuery("ラテ*"))) == ["cafe"]
+        assert keys(index.search(SearchQuery("ーン*"))) == []
+        assert keys(index.search(SearchQuery("abc"))) == ["abc"]
+        assert keys(index.search(SearchQuery("渋谷", ["デート"]))) == ["lunch"]
+        assert keys(index.search(SearchQuery(tags=["デート", "記念日"]))) == ["abc"]
+        assert len(index.search(SearchQuery())) == len(index)
+
+    def test_search_vector_escapes_quotes(self):
+        """引用符・バックスラッシュを含む語彙素をエスケープすることを確認"""
+        assert build_search_vector("it's", None, None) == "'^i':1A 'it':2A 't''':3A '''s':4A 's$':5A"
+        assert build_search_vector(None, None, ["a\\b"]) == "'^a':1C 'a\\\\':2C '\\\\b':3C 'b$':4C '#a\\\\b':5C"
+        assert build_search_vector(None, None, None) == ""
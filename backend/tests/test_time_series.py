@@ -0,0 +1,191 @@
+from collections import namedtuple
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_access_token
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.time_series import (
+    build_cash_flow_series,
+    bucket_starts,
+    fill_buckets
+)
+
+DailyRow = namedtuple("DailyRow", ["transaction_date", "income", "expense"])
+
+
+@pytest.fixture
+async def cash_flow(db_session: AsyncSession, test_user: User) -> list:
+    """取引がない日・週・月を含む取引"""
+    dating = Category(name="デート代", icon="💕", is_default=True, is_love_category=True)
+    salary = Category(name="給与", icon="💰", is_default=True, is_love_category=False)
+    db_session.add_all([dating, salary])
+    await db_session.commit()
+
+    rows = [
+        (salary, 'income', date(2024, 1, 25), 300000, None),
+        (dating, 'expense', date(2024, 1, 27), 5000, 5),
+        (dating, 'expense', date(2024, 1, 27), 3000, None),
+        (dating, 'expense', date(2024, 1, 29), 2000, 3),
+        (dating, 'expense', date(2024, 3, 3), 12000, 4),
+        (salary, 'income', date(2024, 3, 25), 300000, None),
+    ]
+    transactions = [
+        Transaction(
+            user_id=test_user.id,
+            category_id=category.id,
+            amount=Decimal(amount),
+            transaction_type=transaction_type,
+            sharing_type='personal',
+            transaction_date=day,
+            love_rating=rating
+        )
+        for category, transaction_type, day, amount, rating in rows
+    ]
+    db_session.add_all(transactions)
+    await db_session.commit()
+    return transactions
+
+
+class TestTimeSeries:
+    """時系列の集計のテストクラス"""
+
+    def test_bucket_starts(self):
+        """区間の開始日（週は月曜始まり、先頭の区間は期間の開始日より前から始まる）を確認"""
+        assert bucket_starts(date(2024, 1, 30), date(2024, 2, 2), "daily") == [
+            date(2024, 1, 30), date(2024, 1, 31), date(2024, 2, 1)
+        ]
+        assert bucket_starts(date(2024, 1, 3), date(2024, 1, 16), "weekly") == [
+            date(2024, 1, 1), date(2024, 1, 8), date(2024, 1, 15)
+        ]
+        assert bucket_starts(date(2024, 1, 31), date(2024, 3, 1), "monthly") == [
+            date(2024, 1, 1), date(2024, 2, 1)
+        ]
+        assert bucket_starts(date(2024, 1, 1), date(2024, 1, 1), "daily") == []
+
+    def test_fill_buckets(self):
+        """日別の集計行を区間に振り分け、取引がない区間を0で埋めることを確認"""
+        rows = [
+            DailyRow(date(2024, 1, 2), Decimal(100), None),
+            DailyRow(date(2024, 1, 7), None, Decimal(30)),
+            DailyRow(date(2024, 1, 20), Decimal(5), Decimal(7)),
+        ]
+        series = fill_buckets(rows, date(2024, 1, 1), date(2024, 1, 22), "weekly", ["income", "expense"])
+        assert series == [
+            {"period_start": date(2024, 1, 1), "income": Decimal(100), "expense": Decimal(30)},
+            {"period_start": date(2024, 1, 8), "income": 0, "expense": 0},
+            {"period_start": date(2024, 1, 15), "income": Decimal(5), "expense": Decimal(7)},
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("granularity", ["daily", "weekly", "monthly"])
+    async def test_matches_in_memory_fallback(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        cash_flow: list,
+        granularity: str
+    ):
+        """generate_series による集計が、メモリ上で区間に振り分けた結果と一致することを確認"""
+        start_date, end_date = date(2024, 1, 10), date(2024, 4, 1)
+        series = await db_session.run_sync(
+            lambda session: build_cash_flow_series(
+                session,
+                session.query(Transaction).filter(Transaction.user_id == test_user.id),
+                start_date,
+                end_date,
+                granularity
+            )
+        )
+
+        daily = {}
+        for transaction in cash_flow:
+            row = daily.setdefault(transaction.transaction_date, {"income": 0, "expense": 0})
+            row[transaction.transaction_type] += transaction.amount
+        rows = [DailyRow(day, values["income"], values["expense"]) for day, values in daily.items()]
+        expected = fill_buckets(rows, start_date, end_date, granularity, ["income", "expense"])
+
+        assert [point["period_start"] for point in series] == bucket_starts(start_date, end_date, granularity)
+        assert [(point["income"], point["expense"]) for point in series] == [
+            (point["income"], point["expense"]) for point in expected
+        ]
+        assert all(point["balance"] == point["income"] - point["expense"] for point in series)
+
+    @pytest.mark.asyncio
+    async def test_custom_report_daily_trends(self, async_client: AsyncClient, test_user: User, cash_flow: list):
+        """カスタムレポートの日別推移が取引のない日も含むことを確認"""
+        response = await async_client.post(
+            "/api/v1/reports/custom",
+            json={"start_date": "2024-01-25", "end_date": "2024-01-31"},
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+        )
+        assert response.status_code == 200
+        report = response.json()
+        assert Decimal(report["total_income"]) == Decimal(300000)
+        assert Decimal(report["total_expense"]) == Decimal(10000)
+        trends = report["daily_trends"]
+        assert [trend["date"] for trend in trends] == [
+            str(date(2024, 1, 25) + timedelta(days=offset)) for offset in range(7)
+        ]
+        assert trends[2] == {"date": "2024-01-27", "income": 0.0, "expense": 8000.0, "balance": -8000.0}
+        assert trends[3]["expense"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_dashboard_monthly_stats(self, async_client: AsyncClient, test_user: User, cash_flow: list):
+        """月の日別の収支が全ての日を含むことを確認"""
+        response = await async_client.get(
+            "/api/v1/dashboard/monthly-stats",
+            params={"year": 2024, "month": 2},
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+        )
+        assert response.status_code == 200
+        daily_stats = response.json()["daily_stats"]
+        assert len(daily_stats) == 29
+        assert daily_stats["2024-02-01"] == {"income": 0.0, "expense": 0.0}
+
+    @pytest.mark.asyncio
+    async def test_love_trends(self, async_client: AsyncClient, db_session: AsyncSession, test_user: User):
+        """Love傾向の月別推移が取引のない月も含み、評価は評価済みの取引で平均することを確認"""
+        dating = Category(name="デート代", icon="💕", is_default=True, is_love_category=True)
+        db_session.add(dating)
+        await db_session.commit()
+        this_month = date.today().replace(day=1)
+        two_months_ago = (this_month - timedelta(days=40)).replace(day=1)
+        db_session.add_all([
+            Transaction(
+                user_id=test_user.id,
+                category_id=dating.id,
+                amount=Decimal(amount),
+                transaction_type='expense',
+                sharing_type='personal',
+                transaction_date=day,
+                love_rating=rating
+            )
+            for day, amount, rating in [
+                (two_months_ago, 4000, 5),
+                (two_months_ago, 2000, None),
+                (this_month, 6000, 4),
+            ]
+        ])
+        await db_session.commit()
+
+        response = await async_client.get(
+            "/api/v1/love/trends",
+            params={"period": "monthly", "months": 3},
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+        )
+        assert response.status_code == 200
+        result = response.json()
+        trends = {trend["period"]: trend for trend in result["trends"]}
+        assert len(result["trends"]) == 4
+        assert trends[two_months_ago.strftime("%Y-%m")] == {
+            "period": two_months_ago.strftime("%Y-%m"), "amount": 6000.0, "count": 2, "avg_rating": 5.0
+        }
+        assert trends[(two_months_ago + timedelta(days=31)).strftime("%Y-%m")]["count"] == 0
+        assert result["peak_love_period"] == two_months_ago.strftime("%Y-%m")
+        assert Decimal(result["love_growth_rate"]) == Decimal(0)
@@ -1,12 +1,17 @@
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date, datetime
 from decimal import Decimal
+from uuid import UUID, uuid4
 
+from app.api.transactions import transactions as transactions_api
 from app.models.user import User
 from app.models.category import Category
+from app.core.security import create_access_token
 from app.models.transaction import Transaction
+from app.services.monthly_rollup import rebuild_user_rollups
 
 
 class TestTransactions:
@@ -416,4 +421,234 @@ class TestTransactions:
         assert data["total_income"] == 10000
         assert data["total_expense"] == 7000
         assert data["balance"] == 3000
-        assert data["transaction_count"] == 3
\ No newline at end of file
+        assert data["transaction_count"] == 3
+
+class TestTransactionPagination:
+    """取引一覧のカーソルページネーションのテストクラス"""
+
+    @pytest.fixture
+    async def seeded_transactions(self, db_session: AsyncSession, test_user: User) -> list:
+        """同じ日付・作成日時の取引を含むテスト用の取引"""
+        category = Category(name="食費", is_default=True, is_love_category=False)
+        db_session.add(category)
+        await db_session.commit()
+
+        created_at = datetime(2024, 6, 30, 12, 0)
+        transactions = [
+            Transaction(
+                user_id=test_user.id,
+                category_id=category.id,
+                amount=Decimal(100 + index),
+                transaction_type="expense",
+                sharing_type="personal",
+                transaction_date=date(2024, 5 + index % 2, 1 + index % 3),
+                created_at=created_at
+            )
+            for index in range(7)
+        ]
+        db_session.add_all(transactions)
+        await db_session.commit()
+        await db_session.run_sync(lambda session: rebuild_user_rollups(session, test_user.id))
+        await db_session.commit()
+        return transactions
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_cover_all_transactions(
+        self,
+        async_client: AsyncClient,
+        test_user: User,
+        seeded_transactions: list
+    ):
+        """カーソルで全てのページを取得すると、重複・欠落なくページ番号と同じ順序になることを確認"""
+        headers = {"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+        response = await async_client.get("/api/v1/transactions/", headers=headers, params={"limit": 100})
+        assert response.status_code == 200
+        expected = [transaction["id"] for transaction in response.json()["transactions"]]
+        assert len(expected) == 7
+
+        ids = []
+        params = {"limit": 3}
+        while True:
+            response = await async_client.get("/api/v1/transactions/", headers=headers, params=params)
+            assert response.status_code == 200
+            data = response.json()
+            ids.extend(transaction["id"] for transaction in data["transactions"])
+            if not data["pagination"]["has_next"]:
+                break
+            params = {"limit": 3, "cursor": data["pagination"]["next_cursor"]}
+            # カーソルの場合、総件数は指定しない限り取得しない
+            response = await async_client.get("/api/v1/transactions/", headers=headers, params=params)
+            assert response.json()["pagination"]["total"] is None
+
+        assert ids == expected
+
+    @pytest.mark.asyncio
+    async def test_estimated_count(
+        self,
+        async_client: AsyncClient,
+        test_user: User,
+        seeded_transactions: list
+    ):
+        """月次集計からの件数と、月の途中からの期間の場合に推定値となることを確認"""
+        headers = {"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+        response = await async_client.get(
+            "/api/v1/transactions/",
+            headers=headers,
+            params={"count": "estimated", "date_from": "2024-06-01", "date_to": "2024-06-30"}
+        )
+        pagination = response.json()["pagination"]
+        assert pagination["total"] == 3
+        assert pagination["total_is_estimate"] is False
+
+        response = await async_client.get(
+            "/api/v1/transactions/",
+            headers=headers,
+            params={"count": "estimated", "date_from": "2024-05-02"}
+        )
+        pagination = response.json()["pagination"]
+        assert pagination["total"] == 7
+        assert pagination["total_is_estimate"] is True
+        assert len(response.json()["transactions"]) == 5
+
+        response = await async_client.get("/api/v1/transactions/", headers=headers, params={"count": "none"})
+        assert response.json()["pagination"]["total"] is None
+        assert response.json()["pagination"]["total_pages"] is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, async_client: AsyncClient, test_user: User):
+        """不正なカーソルは400エラーになることを確認"""
+        response = await async_client.get(
+            "/api/v1/transactions/",
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"},
+            params={"cursor": "not-a-cursor"}
+        )
+        assert response.status_code == 400
+
+
+class TestTransactionSearch:
+    """取引の検索のテストクラス"""
+
+    @pytest.fixture
+    async def seeded_transactions(self, db_session: AsyncSession, test_user: User) -> dict:
+        """検索用の取引"""
+        category = Category(name="食費", is_default=True, is_love_category=False)
+        db_session.add(category)
+        await db_session.commit()
+
+        rows = {
+            "lunch": ("ランチ 外食", "渋谷", ["デート"]),
+            "cafe": ("Ｃａｆｅ ラテ", "表参道", None),
+            "dinner": ("夕食", "外食チェーン", ["家族"]),
+            "scattered": ("xab bcx", None, None),
+            "abc": ("abc", None, ["デート", "記念日"]),
+        }
+        transactions = {}
+        for index, (name, (description, location, tags)) in enumerate(rows.items()):
+            transactions[name] = Transaction(
+                user_id=test_user.id,
+                category_id=category.id,
+                amount=Decimal(1000),
+                transaction_type="expense",
+                sharing_type="personal",
+                transaction_date=date(2024, 6, 1 + index),
+                description=description,
+                location=location,
+                tags=tags
+            )
+        db_session.add_all(transactions.values())
+        await db_session.commit()
+        return {name: str(transaction.id) for name, transaction in transactions.items()}
+
+    async def search(self, async_client: AsyncClient, test_user: User, **params) -> list:
+        response = await async_client.get(
+            "/api/v1/transactions/",
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"},
+            params=params
+        )
+        assert response.status_code == 200
+        return [transaction["id"] for transaction in response.json()["transactions"]]
+
+    @pytest.mark.asyncio
+    async def test_search_matches(self, async_client: AsyncClient, test_user: User, seeded_transactions: dict):
+        """部分一致・正規化・前方一致・タグの絞り込みを確認"""
+        ids = seeded_transactions
+
+        # 説明・場所の2文字の部分一致（関連度順では説明に含むものが先）
+        assert await self.search(async_client, test_user, search="外食", sort="relevance") == [ids["lunch"], ids["dinner"]]
+        # 全角・大文字は正規化して一致
+        assert await self.search(async_client, test_user, search="CAFE") == [ids["cafe"]]
+        # 1文字の検索
+        assert set(await self.search(async_client, test_user, search="ラ")) == {ids["lunch"], ids["cafe"]}
+        # 単語の前方一致（"チェーン" の途中の "ェー" などには一致しない）
+        assert await self.search(async_client, test_user, search="ラテ*") == [ids["cafe"]]
+        assert await self.search(async_client, test_user, search="ーン*") == []
+        # バイグラムが全て含まれていても連続していないものは一致しない
+        assert await self.search(async_client, test_user, search="abc") == [ids["abc"]]
+        # タグの完全一致での絞り込みと、検索語との組み合わせ
+        assert set(await self.search(async_client, test_user, tags=["デート"])) == {ids["lunch"], ids["abc"]}
+        assert await self.search(async_client, test_user, tags=["デート", "記念日"]) == [ids["abc"]]
+        assert await self.search(async_client, test_user, tags=["デー"]) == []
+        assert await self.search(async_client, test_user, search="渋谷", tags=["デート"]) == [ids["lunch"]]
+
+    @pytest.mark.asyncio
+    async def test_search_vector_follows_updates(
+        self,
+        async_client: AsyncClient,
+        db_session: AsyncSession,
+        test_user: User,
+        seeded_transactions: dict
+    ):
+        """取引の更新で検索用の列が更新されることを確認"""
+        transaction = await db_session.get(Transaction, UUID(seeded_transactions["dinner"]))
+        transaction.description = "焼肉"
+        await db_session.commit()
+
+        assert await self.search(async_client, test_user, search="夕食") == []
+        assert await self.search(async_client, test_user, search="焼肉") == [seeded_transactions["dinner"]]
+
+    @pytest.mark.asyncio
+    async def test_search_vector_not_loaded(self, db_session: AsyncSession, seeded_transactions: dict):
+        """取引の読み込みでは検索用の列を取得しないことを確認"""
+        db_session.expunge_all()
+        transaction = await db_session.get(Transaction, UUID(seeded_transactions["dinner"]))
+        assert "search_vector" in inspect(transaction).unloaded
+
+    @pytest.mark.asyncio
+    async def test_relevance_with_cursor(self, async_client: AsyncClient, test_user: User):
+        """関連度順とカーソルは併用できないことを確認"""
+        response = await async_client.get(
+            "/api/v1/transactions/",
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"},
+            params={"search": "外食", "sort": "relevance", "cursor": "x"}
+        )
+        assert response.status_code == 400
+
+
+class TestReceiptImage:
+    """レシート画像のテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_oversized_receipt_rejected_before_decoding(
+        self,
+        async_client: AsyncClient,
+        test_user: User,
+        monkeypatch
+    ):
+        """上限を超えるBase64の画像はデコードせずに拒否することを確認"""
+        def fail_decode(*args, **kwargs):
+            raise AssertionError("oversized receipt was decoded")
+
+        monkeypatch.setattr(transactions_api, "_save_base64_receipt_image", fail_decode)
+        response = await async_client.post(
+            "/api/v1/transactions/",
+            headers={"Authorization": f"Bearer {create_access_token(test_user.id)}"},
+            json={
+                "amount": "1200.00",
+                "category_id": str(uuid4()),
+                "transaction_type": "expense",
+                "sharing_type": "personal",
+                "transaction_date": "2024-03-01",
+                "receipt_image": "A" * (transactions_api.MAX_RECEIPT_BASE64_LENGTH + 4)
+            }
+        )
+        assert response.status_code == 413
@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import get_current_user
+from app.core.security import create_access_token, verify_password
+from app.core.user_cache import _decode, _encode, invalidate_user, load_user, user_snapshot
+from app.models.user import User
+from tests.utils import count_queries
+
+
+class TestUserCache:
+    """認証ユーザーのキャッシュのテストクラス"""
+
+    @pytest.fixture(autouse=True)
+    async def clear_cache(self, db_session: AsyncSession, test_user: User):
+        """テストごとにキャッシュとセッション内のユーザーを破棄"""
+        invalidate_user(test_user.id)
+        db_session.expunge_all()
+        yield
+        invalidate_user(test_user.id)
+
+    @pytest.mark.asyncio
+    async def test_get_current_user_uses_cache(self, db_session: AsyncSession, test_user: User):
+        """2回目以降の認証ではユーザー取得のSELECTが発行されないことを確認"""
+        token = create_access_token(test_user.id)
+
+        with count_queries(db_session) as first:
+            user = await db_session.run_sync(lambda session: get_current_user(db=session, token=token))
+        assert len(first) == 1
+        assert user.email == "testuser@example.com"
+
+        db_session.expunge_all()
+        with count_queries(db_session) as cached:
+            user = await db_session.run_sync(lambda session: get_current_user(db=session, token=token))
+        assert cached == []
+        assert user.id == test_user.id
+        assert user.display_name == "Test User"
+
+        # 同じリクエスト（セッション）内では同じオブジェクトを再利用する
+        with count_queries(db_session) as same_request:
+            again = await db_session.run_sync(lambda session: load_user(session, test_user.id))
+        assert same_request == []
+        assert again is user
+
+        # パスワードハッシュはキャッシュせず、参照時に読み込む
+        with count_queries(db_session) as password_load:
+            hashed_password = await db_session.run_sync(lambda session: user.hashed_password)
+        assert len(password_load) == 1
+        assert verify_password("TestPassword123!", hashed_password)
+
+    @pytest.mark.asyncio
+    async def test_update_invalidates_cache(self, db_session: AsyncSession, test_user: User):
+        """キャッシュから復元したユーザーを更新でき、更新後はキャッシュが破棄されることを確認"""
+        def load_and_update(session):
+            load_user(session, test_user.id)
+            session.expunge_all()
+            user = load_user(session, test_user.id)
+            user.display_name = "Renamed"
+            user.is_active = False
+            session.commit()
+
+        await db_session.run_sync(load_and_update)
+        db_session.expunge_all()
+
+        with count_queries(db_session) as statements:
+            user = await db_session.run_sync(lambda session: load_user(session, test_user.id))
+        assert len(statements) == 1
+        assert user.display_name == "Renamed"
+        assert user.is_active is False
+
+    @pytest.mark.asyncio
+    async def test_snapshot_round_trip(self, db_session: AsyncSession, test_user: User):
+        """Redisに保存する形式で列の値が復元されることを確認"""
+        user = await db_session.run_sync(lambda session: load_user(session, test_user.id))
+        snapshot = user_snapshot(user)
+
+        assert "hashed_password" not in snapshot
+        assert _decode(_encode(snapshot)) == snapshot